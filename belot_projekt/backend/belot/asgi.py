@@ -24,6 +24,10 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
 
+# Replay moves left in the move journal by a crashed process before any game is loaded
+from game.services.game_actor import game_actors
+game_actors.start()
+
 # Import WebSocket URL patterns
 from lobby.routing import websocket_urlpatterns as lobby_ws_urlpatterns
 from game.routing import websocket_urlpatterns as game_ws_urlpatterns
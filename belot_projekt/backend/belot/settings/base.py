@@ -289,6 +289,31 @@ BELOT_GAME = {
     'MAX_ROUNDS': 13,
     'INACTIVE_TIMEOUT': 300,  # 5 minuta neaktivnosti prije automatskog napuštanja igre
     'TURN_TIMEOUT': 30,  # 30 sekundi za odigravanje poteza
+    'HEARTBEAT_INTERVAL': 30,  # Ping veze nakon 30 sekundi bez poruka klijenta
+    'TIMER_TICK': 1.0,  # Razmak obrade zajedničkih rokova veza (game.services.timer_wheel)
+}
+
+# Uzorkovano mjerenje vremena vrućih metoda igre (game.utils.profiling)
+BELOT_PROFILING = {
+    'ENABLED': os.environ.get('BELOT_PROFILING_ENABLED', 'True').lower() == 'true',
+    'SAMPLE_RATE': int(os.environ.get('BELOT_PROFILING_SAMPLE_RATE', 100)),  # Mjeri se svaki N-ti poziv
+    'FLUSH_INTERVAL': 60,  # Sažetak u log svakih 60 sekundi
+    'CONFIG_REFRESH_INTERVAL': 30,  # Čitanje zajedničkih postavki iz keša
+}
+
+# Stanje igara u tijeku u memoriji procesa (game.services.game_actor)
+BELOT_GAME_ACTORS = {
+    'ENABLED': os.environ.get('BELOT_GAME_ACTORS_ENABLED', 'True').lower() == 'true',
+    'LEASE_TIMEOUT': 300,  # Zakup igre u kešu (sekunde)
+    'FLUSH_INTERVAL': 0.05,  # Najdulje čekanje pozadinskog spremanja poteza (sekunde)
+    'JOURNAL_DIR': os.environ.get('BELOT_JOURNAL_DIR', os.path.join(BASE_DIR, 'journal')),  # Dnevnik poteza
+    'JOURNAL_FSYNC': os.environ.get('BELOT_JOURNAL_FSYNC', 'False').lower() == 'true',
+}
+
+# Gledatelji igara (game.services.spectators)
+BELOT_SPECTATORS = {
+    'ENABLED': os.environ.get('BELOT_SPECTATORS_ENABLED', 'True').lower() == 'true',
+    'MAX_BACKLOG': 64,  # Promjene nakon zadnje snimke koje se čuvaju za nove gledatelje
 }
 
 # Belot specifične postavke koje traži verify_backend.py
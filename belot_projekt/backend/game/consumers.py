@@ -13,12 +13,19 @@ koji sudjeluju u istoj igri, omogućujući:
 - Slanje vlastitih poteza
 - Zvanje aduta i prijavljivanje zvanja
 - Primanje ažuriranja o rezultatu i promjenama stanja
+
+Cijelo stanje igre šalje se pri spajanju i na zahtjev klijenta ('resync'),
+a nakon toga samo promjene s rednim brojem (vidi services.state_sync).
+Akcije igre (potez, zvanje aduta, zvanja) obrađuju se jednim pozivom u
+thread pool po poruci (run_game_action). Potez igre koju u memoriji drži
+drugi proces prosljeđuje se tom procesu (vidi services.game_actor), koji
+ga obrađuje i šalje promjenu svim igračima. Klijent može podprotokolom
+odabrati binarni MessagePack format (vidi services.wire_protocol).
 """
 
 import json
 import logging
-import asyncio
-from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from channels.generic.websocket import AsyncJsonWebsocketConsumer, AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.contrib.auth import get_user_model
@@ -30,6 +37,11 @@ from game.models.round import Round
 from game.models.move import Move
 from game.services.game_service import GameService
 from game.services.scoring_service import ScoringService
+from game.services import spectators
+from game.services.game_actor import actor_inbox, owner_channel
+from game.services import state_sync
+from game.services import wire_protocol
+from game.services.timer_wheel import timer_wheel
 from game.game_logic.card import Card
 from game.game_logic.deck import Deck
 
@@ -37,12 +49,129 @@ from game.game_logic.deck import Deck
 logger = logging.getLogger('game.consumers')
 User = get_user_model()
 
+
+def run_game_action(game_id, user_id, action, content):
+    """
+    Obrada akcije igre u jednom pozivu (izvodi se u thread poolu).
+    
+    Provjere i obrada dijele isti kontekst igre (GameService.get_context),
+    a redni broj promjene dohvaća se samo za valjanu akciju. Red igrača
+    za potez provjerava process_move, i u memoriji i preko baze.
+    
+    Args:
+        game_id: ID igre
+        user_id: ID igrača
+        action: Akcija iz GameConsumer.GAME_ACTIONS
+        content: Poruka klijenta
+    
+    Returns:
+        tuple: (redni broj promjene, operacije, rezultat)
+    """
+    game_service = GameService(game_id)
+    
+    if action == 'make_move':
+        result = game_service.process_move(user_id, Card.from_code(content.get('card')))
+    elif action == 'call_trump':
+        result = game_service.process_trump_call(user_id, content.get('suit'))
+    elif action == 'pass_trump':
+        result = game_service.process_trump_pass(user_id)
+    elif action == 'declare':
+        result = game_service.process_declaration(user_id, content.get('type'), content.get('cards', []))
+    else:
+        result = game_service.process_bela(user_id)
+    
+    if not result.get('valid', False):
+        return None, None, result
+    return state_sync.next_sequence(game_id), action_ops(user_id, action, content, result), result
+
+
+def action_ops(user_id, action, content, result):
+    """Vraća operacije promjene za valjanu akciju igre (vidi state_sync)."""
+    user_id = str(user_id)
+    if action == 'make_move':
+        return state_sync.move_ops(user_id, content.get('card'), result)
+    if action == 'call_trump':
+        return state_sync.trump_ops(user_id, content.get('suit'), result)
+    if action == 'pass_trump':
+        return state_sync.pass_ops(user_id, result)
+    if action == 'declare':
+        return [['declaration', user_id, content.get('type'), content.get('cards', []), result.get('value')]]
+    return [['bela', user_id, result.get('suit'), result.get('value')]]
+
+
+async def publish_action(channel_layer, game_id, seq, ops):
+    """
+    Šalje promjenu igre svim igračima u sobi i procesima gledatelja.
+    
+    Args:
+        channel_layer: Channel layer
+        game_id: ID igre
+        seq: Redni broj promjene
+        ops: Operacije promjene
+    """
+    from django.conf import settings
+    
+    # Obavještavanje svih igrača o promjeni (privatne operacije samo vlasnicima)
+    event = state_sync.delta_event(seq, ops)
+    await channel_layer.group_send(f'game_{game_id}', event)
+    
+    # Javna promjena procesima koji poslužuju gledatelje (jedna poruka po procesu, ne po gledatelju)
+    if settings.BELOT_SPECTATORS.get('ENABLED', True):
+        await channel_layer.group_send(spectators.spectator_group(game_id), spectators.spectator_event(event))
+
+
+async def handle_forwarded_action(channel_layer, message):
+    """
+    Obrada poteza koji je drugi proces proslijedio vlasniku igre.
+    
+    Potez se obrađuje kao da je stigao izravno; promjena ide svim
+    igračima, a greška samo vezi igrača (message['reply_channel']).
+    
+    Args:
+        channel_layer: Channel layer
+        message: Poruka iz GameConsumer.forward_action
+    """
+    game_id = message['game_id']
+    try:
+        seq, ops, result = await database_sync_to_async(run_game_action)(
+            game_id, message['user_id'], message['action'], message['content']
+        )
+    except Exception as e:
+        logger.error(f"Greška pri obradi proslijeđenog poteza u igri {game_id}: {str(e)}", exc_info=True)
+        result = {'valid': False, 'message': 'Došlo je do greške pri obradi akcije: potez'}
+    
+    if not result.get('valid', False):
+        # Greška (i nakon prelaska igre drugom procesu) ide samo igraču koji je igrao
+        await channel_layer.send(message['reply_channel'], {
+            'type': 'game_error',
+            'message': result.get('message', 'Nevažeći potez')
+        })
+        return
+    
+    await publish_action(channel_layer, game_id, seq, ops)
+    logger.info(f"Korisnik {message['user_id']} izveo proslijeđeni potez u igri {game_id}")
+
 class GameConsumer(AsyncJsonWebsocketConsumer):
     """
     WebSocket potrošač za komunikaciju između igrača tijekom Belot igre.
     Obrađuje povezivanje/odspajanje igrača i razmjenu poruka tijekom igre.
     """
     
+    # Akcije igre: (naziv za poruke, zadana poruka o grešci)
+    GAME_ACTIONS = {
+        'make_move': ('potez', 'Nevažeći potez'),
+        'call_trump': ('zvanje aduta', 'Nevažeće zvanje aduta'),
+        'pass_trump': ('propuštanje zvanja aduta', 'Nije moguće propustiti zvanje aduta'),
+        'declare': ('prijava zvanja', 'Nevažeće zvanje'),
+        'bela': ('prijava bele', 'Nevažeća bela'),
+    }
+    
+    # Akcije koje smije izvesti samo igrač na redu
+    TURN_ACTIONS = frozenset({'make_move', 'call_trump', 'pass_trump'})
+    
+    # Format poruka veze (vidi wire_protocol); bira se pri spajanju
+    protocol = wire_protocol.JSON
+    
     async def connect(self):
         """
         Obrada zahtjeva za povezivanje - provjerava autentikaciju i
@@ -73,6 +202,11 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         self.username = self.scope["user"].username
         self.room_group_name = f'game_{self.game_id}'
         
+        # Proces prima poteze koje mu prosljeđuju drugi procesi (igre koje drži u memoriji)
+        actor_inbox.ensure_running(self.channel_layer, handle_forwarded_action)
+        self.delta_stream = state_sync.DeltaStream()
+        self.turn_gate = state_sync.TurnGate()
+        
         # Provjera postoji li igra i je li korisnik član igre
         try:
             if not await self.is_user_in_game(self.user_id, self.game_id):
@@ -88,8 +222,13 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             self.channel_name
         )
         
-        # Prihvaćanje WebSocket konekcije
-        await self.accept()
+        # Prihvaćanje WebSocket konekcije u formatu koji klijent nudi (JSON ili MessagePack)
+        self.protocol, subprotocol = wire_protocol.negotiate(self.scope.get('subprotocols'))
+        await self.accept(subprotocol=subprotocol)
+        
+        # Heartbeat veze u zajedničkom rasporedu rokova procesa
+        self.heartbeat_pending = False
+        self.schedule_heartbeat()
         
         # Označavanje korisnika kao aktivnog/povezanog u igri
         await self.set_user_active(True)
@@ -123,6 +262,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         Obrada odspajanja korisnika - uklanja korisnika iz grupe
         i ažurira njegov status u igri.
         """
+        timer_wheel.cancel(self.timer_key('heartbeat'))
+        
         if hasattr(self, 'room_group_name'):
             # Označavanje korisnika kao neaktivnog u igri
             await self.set_user_active(False)
@@ -149,7 +290,49 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             # Ako je igra u tijeku, pokreni timer za auto-napuštanje igre
             # nakon određenog perioda neaktivnosti
             if await self.is_game_in_progress():
-                await self.start_inactivity_timer()
+                self.start_inactivity_timer()
+
+    async def receive(self, text_data=None, bytes_data=None, **kwargs):
+        """
+        Čitanje poruke klijenta u formatu veze.
+        
+        Binarni okviri čitaju se kao MessagePack ako je veza u tom formatu,
+        a tekstualni kao JSON. Svaka poruka klijenta potvrđuje da je veza
+        živa, pa pomiče sljedeći heartbeat.
+        """
+        self.heartbeat_pending = False
+        self.schedule_heartbeat()
+        
+        if bytes_data is not None and self.protocol == wire_protocol.MSGPACK:
+            try:
+                content = wire_protocol.decode(bytes_data, wire_protocol.MSGPACK)
+            except ValueError as e:
+                logger.warning(f"Korisnik {self.username} poslao nevažeću binarnu poruku: {str(e)}")
+                await self.send_json({
+                    'type': 'error',
+                    'message': 'Nevažeća poruka'
+                })
+                return
+            await self.receive_json(content, **kwargs)
+            return
+        await super().receive(text_data=text_data, bytes_data=bytes_data, **kwargs)
+
+    async def send_json(self, content, close=False):
+        """Slanje poruke klijentu u formatu veze."""
+        await self.send_encoded(wire_protocol.encode(content, self.protocol), close=close)
+
+    async def send_encoded(self, payload, close=False):
+        """
+        Slanje već serijalizirane poruke klijentu.
+        
+        Args:
+            payload: JSON tekst ili MessagePack okvir (bytes)
+            close: Zatvara vezu nakon slanja
+        """
+        if isinstance(payload, bytes):
+            await self.send(bytes_data=payload, close=close)
+        else:
+            await self.send(text_data=payload, close=close)
 
     async def receive_json(self, content):
         """
@@ -158,25 +341,15 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         """
         action = content.get('action')
         
-        # Resetiranje timera za neaktivnost ako je igra u tijeku
-        if await self.is_game_in_progress():
-            if hasattr(self, 'inactivity_task') and self.inactivity_task:
-                self.inactivity_task.cancel()
-            
-            # Ako je korisnik aktivan i igra u tijeku, pokreni novi timer
-            await self.start_inactivity_timer()
+        # Akcije igre obrađuju se jednim odlaskom u bazu po poruci
+        if action in self.GAME_ACTIONS:
+            await self.handle_game_action(action, content)
+            return
         
         # Usmjeravanje prema tipu akcije
-        if action == 'make_move':
-            await self.make_move(content)
-        elif action == 'call_trump':
-            await self.call_trump(content)
-        elif action == 'pass_trump':
-            await self.pass_trump(content)
-        elif action == 'declare':
-            await self.declare(content)
-        elif action == 'bela':
-            await self.declare_bela(content)
+        if action == 'pong':
+            # Odgovor na heartbeat; veza je već označena živom u receive
+            return
         elif action == 'chat_message':
             await self.chat_message(content)
         elif action == 'leave_game':
@@ -185,7 +358,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             await self.start_game()
         elif action == 'ready':
             await self.mark_ready()
-        elif action == 'get_game_state':
+        elif action in ('get_game_state', 'resync'):
             await self.send_game_state()
         else:
             await self.send_json({
@@ -194,216 +367,81 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             })
             logger.warning(f"Korisnik {self.username} poslao nepoznatu akciju: {action}")
 
-    # Dopune postojeće klase GameConsumer
-
-# Dodajte ove metode unutar klase GameConsumer
-
-    async def play_card(self, content):
+    async def handle_game_action(self, action, content):
         """
-        Obrada igranja karte.
+        Obrada poteza, zvanja aduta, zvanja i bele.
+        
+        Potez igrača za kojeg je poznato da nije na redu odbija se bez
+        odlaska u bazu (state_sync.TurnGate). Inače se provjera, obrada i
+        redni broj promjene dohvaćaju jednim pozivom u thread pool
+        (run_game_action), a promjena se šalje svim igračima u sobi. Potez
+        igre koju u memoriji drži drugi proces prosljeđuje se tom procesu.
         
-        Ova metoda se poziva kada igrač igra kartu putem WebSocketa.
-        Validira potez i obavještava sve igrače o potrezu.
+        Args:
+            action: Akcija iz GAME_ACTIONS
+            content: Poruka klijenta
         """
-        try:
-            card_code = content.get('card')
-            
-            # Provjera je li igrač na potezu
-            if not await self.is_player_turn():
-                await self.send_json({
-                    'type': 'error',
-                    'message': 'Nije tvoj red za potez'
-                })
-                return
-            
-            # Validacija i izvršavanje poteza kroz game_service
-            card = Card.from_code(card_code)
-            move_data = await self.process_move(card)
-            
-            if not move_data.get('valid', False):
-                await self.send_json({
-                    'type': 'error',
-                    'message': move_data.get('message', 'Nevažeći potez')
-                })
-                return
-            
-            # Obavještavanje svih igrača o potrezu
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'game_move',
-                    'user_id': self.user_id,
-                    'username': self.username,
-                    'card': card_code,
-                    'trick_completed': move_data.get('trick_completed', False),
-                    'trick_winner': move_data.get('trick_winner'),
-                    'next_player': move_data.get('next_player'),
-                    'round_completed': move_data.get('round_completed', False),
-                    'round_results': move_data.get('round_results', {}),
-                    'game_completed': move_data.get('game_completed', False),
-                    'game_results': move_data.get('game_results', {})
-                }
-            )
-            
-            logger.info(f"Korisnik {self.username} odigrao kartu {card_code} u igri {self.game_id}")
-            
-        except ValidationError as e:
-            await self.send_json({
-                'type': 'error',
-                'message': str(e)
-            })
-        except Exception as e:
-            logger.error(f"Greška pri obradi poteza: {str(e)}", exc_info=True)
+        label, error_message = self.GAME_ACTIONS[action]
+        
+        if action in self.TURN_ACTIONS and not self.turn_gate.allows(self.user_id):
             await self.send_json({
                 'type': 'error',
-                'message': 'Došlo je do greške pri obradi poteza'
+                'message': 'Nije tvoj red'
             })
-
-    async def bid_trump(self, content):
-        """
-        Obrada zvanja aduta.
+            return
         
-        Ova metoda se poziva kada igrač zove aduta putem WebSocketa.
-        Validira zvanje i obavještava sve igrače o zvanom adutu.
-        """
         try:
-            suit = content.get('suit')
-            
-            # Provjera je li igrač na redu za zvanje aduta
-            if not await self.can_call_trump():
-                await self.send_json({
-                    'type': 'error',
-                    'message': 'Nije tvoj red za zvanje aduta'
-                })
-                return
-            
-            # Validacija i zvanje aduta kroz game_service
-            trump_data = await self.process_trump_call(suit)
-            
-            if not trump_data.get('valid', False):
-                await self.send_json({
-                    'type': 'error',
-                    'message': trump_data.get('message', 'Nevažeće zvanje aduta')
-                })
-                return
-            
-            # Obavještavanje svih igrača o zvanju aduta
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'trump_called',
-                    'user_id': self.user_id,
-                    'username': self.username,
-                    'suit': suit,
-                    'calling_team': trump_data.get('calling_team'),
-                    'round_number': trump_data.get('round_number'),
-                    'next_player': trump_data.get('next_player'),
-                    'player_cards': trump_data.get('player_cards', {})
-                }
-            )
-            
-            logger.info(f"Korisnik {self.username} zvao adut {suit} u igri {self.game_id}")
-            
+            seq, ops, result = await self.run_game_action(action, content)
         except ValidationError as e:
             await self.send_json({
                 'type': 'error',
                 'message': str(e)
             })
+            return
         except Exception as e:
-            logger.error(f"Greška pri zvanju aduta: {str(e)}", exc_info=True)
+            logger.error(f"Greška pri obradi akcije {action}: {str(e)}", exc_info=True)
             await self.send_json({
                 'type': 'error',
-                'message': 'Došlo je do greške pri zvanju aduta'
+                'message': f'Došlo je do greške pri obradi akcije: {label}'
             })
-
-    async def declare(self, content):
-        """
-        Obrada zvanja (belot, niz, četvorke).
+            return
         
-        Ova metoda se poziva kada igrač prijavljuje zvanje putem WebSocketa.
-        Validira zvanje i obavještava sve igrače o prijavljenom zvanju.
-        """
-        try:
-            declaration_type = content.get('type')
-            cards = content.get('cards', [])
-            
-            # Validacija i obrada zvanja kroz game_service
-            declaration_data = await self.process_declaration(declaration_type, cards)
-            
-            if not declaration_data.get('valid', False):
-                await self.send_json({
-                    'type': 'error',
-                    'message': declaration_data.get('message', 'Nevažeće zvanje')
-                })
-                return
-            
-            # Obavještavanje svih igrača o zvanju
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'declaration',
-                    'user_id': self.user_id,
-                    'username': self.username,
-                    'declaration_type': declaration_type,
-                    'cards': cards,
-                    'value': declaration_data.get('value')
-                }
-            )
-            
-            logger.info(f"Korisnik {self.username} prijavio zvanje {declaration_type} u igri {self.game_id}")
-            
-        except ValidationError as e:
-            await self.send_json({
-                'type': 'error',
-                'message': str(e)
-            })
-        except Exception as e:
-            logger.error(f"Greška pri prijavi zvanja: {str(e)}", exc_info=True)
+        if result.get('owner') and action == 'make_move':
+            await self.forward_action(action, content, result['owner'])
+            return
+        
+        if not result.get('valid', False):
             await self.send_json({
                 'type': 'error',
-                'message': 'Došlo je do greške pri prijavi zvanja'
+                'message': result.get('message', error_message)
             })
+            return
+        
+        await publish_action(self.channel_layer, self.game_id, seq, ops)
+        
+        logger.info(f"Korisnik {self.username} izveo akciju {action} u igri {self.game_id}")
 
-    async def declare_bela(self, content):
+    async def forward_action(self, action, content, owner):
         """
-        Obrada zvanja bele (kralj i dama u istoj boji u adutu).
+        Prosljeđivanje poteza procesu koji drži igru u memoriji.
+        
+        Vlasnik obrađuje potez i šalje promjenu svim igračima, pa i ovoj
+        vezi; grešku šalje samo ovoj vezi (game_error).
+        
+        Args:
+            action: Akcija iz GAME_ACTIONS
+            content: Poruka klijenta
+            owner: Oznaka procesa vlasnika igre
         """
-        try:
-            # Validacija i obrada zvanja bele
-            bela_data = await self.process_bela()
-            
-            if not bela_data.get('valid', False):
-                await self.send_json({
-                    'type': 'error',
-                    'message': bela_data.get('message', 'Nevažeća bela')
-                })
-                return
-            
-            # Obavještavanje svih igrača o beli
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'bela_declared',
-                    'user_id': self.user_id,
-                    'username': self.username,
-                    'suit': bela_data.get('suit'),
-                    'value': 20
-                }
-            )
-            
-            logger.info(f"Korisnik {self.username} prijavio belu u igri {self.game_id}")
-            
-        except ValidationError as e:
-            await self.send_json({
-                'type': 'error',
-                'message': str(e)
-            })
-        except Exception as e:
-            logger.error(f"Greška pri prijavi bele: {str(e)}", exc_info=True)
-            await self.send_json({
-                'type': 'error',
-                'message': 'Došlo je do greške pri prijavi bele'
-            })
+        await self.channel_layer.send(owner_channel(owner), {
+            'type': 'actor.action',
+            'game_id': self.game_id,
+            'user_id': self.user_id,
+            'action': action,
+            'content': {'card': content.get('card')},
+            'reply_channel': self.channel_name
+        })
+        logger.info(f"Potez korisnika {self.username} u igri {self.game_id} proslijeđen procesu {owner}")
 
     async def chat_message(self, content):
         """
@@ -543,28 +581,19 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
 
     async def send_game_state(self):
         """
-        Slanje trenutnog stanja igre klijentu.
+        Slanje cijelog stanja igre (snimke) klijentu.
+        
+        Šalje se pri spajanju i na zahtjev klijenta ('resync'); nakon snimke
+        klijent prima samo promjene s rednim brojem većim od 'seq'.
         """
         try:
-            # Dohvaćanje stanja igre
-            game_state = await self.get_game_state()
+            # Dohvaćanje stanja igre i rednog broja zadnje promjene
+            seq, game_state = await self.get_game_snapshot()
             
             # Slanje stanja igre
-            await self.send_json({
-                'type': 'game_state',
-                'game_id': self.game_id,
-                'status': game_state.get('status'),
-                'players': game_state.get('players', []),
-                'teams': game_state.get('teams', {}),
-                'scores': game_state.get('scores', {}),
-                'round': game_state.get('round', {}),
-                'your_turn': game_state.get('your_turn', False),
-                'your_cards': game_state.get('your_cards', []),
-                'current_trick': game_state.get('current_trick', []),
-                'declarations': game_state.get('declarations', []),
-                'history': game_state.get('history', []),
-                'your_team': game_state.get('your_team')
-            })
+            self.delta_stream.reset(seq)
+            self.turn_gate.reset(game_state)
+            await self.send_json(state_sync.snapshot_message(self.game_id, seq, game_state))
             
         except Exception as e:
             logger.error(f"Greška pri slanju stanja igre: {str(e)}", exc_info=True)
@@ -573,31 +602,48 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 'message': 'Došlo je do greške pri dohvaćanju stanja igre'
             })
 
-    async def start_inactivity_timer(self):
+    def timer_key(self, name):
+        """Vraća ključ roka ove veze u zajedničkom rasporedu (timer_wheel)."""
+        return (self.channel_name, name)
+
+    def schedule_heartbeat(self):
+        """Pomiče sljedeći heartbeat veze (HEARTBEAT_INTERVAL bez poruka klijenta)."""
+        from django.conf import settings
+        interval = settings.BELOT_GAME.get('HEARTBEAT_INTERVAL', 30)
+        timer_wheel.schedule(self.timer_key('heartbeat'), interval, self.send_heartbeat)
+
+    async def send_heartbeat(self):
         """
-        Pokretanje timera za automatsko napuštanje igre zbog neaktivnosti.
+        Slanje pinga klijentu koji dulje vrijeme nije poslao poruku.
+        
+        Ako klijent nije odgovorio ni na prethodni ping, veza se zatvara.
+        """
+        if self.heartbeat_pending:
+            logger.info(f"Korisnik {self.username} nije odgovorio na ping u igri {getattr(self, 'game_id', None)}, veza se zatvara")
+            await self.close(code=4008)
+            return
+        self.heartbeat_pending = True
+        await self.send_json({'type': 'ping'})
+        self.schedule_heartbeat()
+
+    def start_inactivity_timer(self):
         """
-        # Otkazivanje postojećeg timera ako postoji
-        if hasattr(self, 'inactivity_task') and self.inactivity_task:
-            self.inactivity_task.cancel()
+        Pokretanje timera za automatsko napuštanje igre zbog neaktivnosti.
         
+        Rok se upisuje u zajednički raspored procesa (timer_wheel) umjesto
+        zasebnog asyncio zadatka po vezi.
+        """
         # Dohvaćanje vremena neaktivnosti iz postavki
         from django.conf import settings
         inactive_timeout = settings.BELOT_GAME.get('INACTIVE_TIMEOUT', 300)  # 5 minuta zadano
         
-        # Pokretanje timera
-        self.inactivity_task = asyncio.create_task(
-            self.handle_inactivity_timeout(inactive_timeout)
-        )
+        timer_wheel.schedule(self.timer_key('inactivity'), inactive_timeout, self.handle_inactivity_timeout)
 
-    async def handle_inactivity_timeout(self, timeout):
+    async def handle_inactivity_timeout(self):
         """
         Rukovanje istekom vremena neaktivnosti - automatsko napuštanje igre.
         """
         try:
-            # Čekanje isteka timera
-            await asyncio.sleep(timeout)
-            
             # Provjera je li korisnik još uvijek neaktivan
             if not await self.is_user_active():
                 # Automatsko napuštanje igre
@@ -620,9 +666,6 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 
                 # Zatvaranje WebSocket konekcije
                 await self.close(code=4000)
-        except asyncio.CancelledError:
-            # Timer je otkazan jer se korisnik vratio u igru
-            pass
         except Exception as e:
             logger.error(f"Greška u timeru neaktivnosti: {str(e)}", exc_info=True)
 
@@ -637,70 +680,33 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             'status': event['status']
         })
 
-    async def game_move(self, event):
-        """Prosljeđivanje informacije o potezu igrača."""
-        await self.send_json({
-            'type': 'game_move',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'card': event['card'],
-            'trick_completed': event['trick_completed'],
-            'trick_winner': event['trick_winner'],
-            'next_player': event['next_player'],
-            'round_completed': event['round_completed'],
-            'round_results': event['round_results'],
-            'game_completed': event['game_completed'],
-            'game_results': event['game_results']
-        })
-
-    async def trump_called(self, event):
-        """Prosljeđivanje informacije o zvanju aduta."""
-        # Filtriraj karte samo za trenutnog igrača
-        player_cards = {}
-        if self.user_id in event.get('player_cards', {}):
-            player_cards = {self.user_id: event['player_cards'][self.user_id]}
+    async def game_delta(self, event):
+        """
+        Prosljeđivanje promjene stanja igre.
         
-        await self.send_json({
-            'type': 'trump_called',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'suit': event['suit'],
-            'calling_team': event['calling_team'],
-            'round_number': event['round_number'],
-            'next_player': event['next_player'],
-            'player_cards': player_cards
-        })
-
-    async def trump_passed(self, event):
-        """Prosljeđivanje informacije o propuštanju zvanja aduta."""
-        await self.send_json({
-            'type': 'trump_passed',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'next_player': event['next_player'],
-            'must_call': event['must_call']
-        })
+        Poruka je serijalizirana jednom kod pošiljatelja (state_sync.delta_event),
+        pa se šalje gotov tekst za ovog igrača. Promjena već sadržana u
+        zadnjoj snimci se preskače, a nakon propuštene promjene šalje se
+        nova snimka.
+        """
+        action = self.delta_stream.accept(event['seq'])
+        if action == state_sync.DeltaStream.SEND:
+            self.turn_gate.update(event['ops'])
+            await self.send_encoded(state_sync.frame_for(event, self.user_id, self.protocol))
+        elif action == state_sync.DeltaStream.RESYNC:
+            logger.info(f"Propuštena promjena igre {self.game_id} za korisnika {self.username}, šalje se snimka")
+            await self.send_game_state()
 
-    async def declaration(self, event):
-        """Prosljeđivanje informacije o zvanju."""
+    async def game_error(self, event):
+        """Prosljeđivanje greške proslijeđenog poteza igraču."""
         await self.send_json({
-            'type': 'declaration',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'declaration_type': event['declaration_type'],
-            'cards': event['cards'],
-            'value': event['value']
+            'type': 'error',
+            'message': event['message']
         })
 
-    async def bela_declared(self, event):
-        """Prosljeđivanje informacije o zvanju bele."""
-        await self.send_json({
-            'type': 'bela_declared',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'suit': event['suit'],
-            'value': event['value']
-        })
+    async def game_event(self, event):
+        """Prosljeđivanje događaja iz events.WebSocketEventHandler (serijaliziran jednom)."""
+        await self.send_encoded(event['frames'][self.protocol])
 
     async def chat_message(self, event):
         """Prosljeđivanje chat poruke."""
@@ -811,34 +817,27 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         return game_service.get_game_state(self.user_id)
 
     @database_sync_to_async
-    def process_move(self, card):
-        """Obrada poteza igrača."""
-        game_service = GameService(self.game_id)
-        return game_service.process_move(self.user_id, card)
-
-    @database_sync_to_async
-    def process_trump_call(self, suit):
-        """Obrada zvanja aduta."""
-        game_service = GameService(self.game_id)
-        return game_service.process_trump_call(self.user_id, suit)
-
-    @database_sync_to_async
-    def process_trump_pass(self):
-        """Obrada propuštanja zvanja aduta."""
-        game_service = GameService(self.game_id)
-        return game_service.process_trump_pass(self.user_id)
-
-    @database_sync_to_async
-    def process_declaration(self, declaration_type, cards):
-        """Obrada zvanja."""
+    def get_game_snapshot(self):
+        """
+        Dohvaćanje rednog broja zadnje promjene i stanja igre.
+        
+        Redni broj čita se prije stanja, pa snimka sadrži barem sve promjene
+        do njega; promjene nakon njega mogu se ponoviti, ali operacije
+        postavljaju vrijednosti pa ponavljanje nema učinka.
+        """
+        seq = state_sync.current_sequence(self.game_id)
         game_service = GameService(self.game_id)
-        return game_service.process_declaration(self.user_id, declaration_type, cards)
+        return seq, game_service.get_game_state(self.user_id)
 
     @database_sync_to_async
-    def process_bela(self):
-        """Obrada zvanja bele."""
-        game_service = GameService(self.game_id)
-        return game_service.process_bela(self.user_id)
+    def run_game_action(self, action, content):
+        """
+        Obrada akcije igre ovog igrača u jednom pozivu iz thread poola.
+        
+        Returns:
+            tuple: (redni broj promjene, operacije, rezultat)
+        """
+        return run_game_action(self.game_id, self.user_id, action, content)
 
     @database_sync_to_async
     def process_leave_game(self, reason="voluntary"):
@@ -856,4 +855,58 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
     def process_mark_ready(self):
         """Obrada označavanja spremnosti."""
         game_service = GameService(self.game_id)
-        return game_service.mark_player_ready(self.user_id)
\ No newline at end of file
+        return game_service.mark_player_ready(self.user_id)
+
+
+class SpectatorConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket potrošač za gledatelje igre (samo čitanje).
+    
+    Veza ne provjerava igru u bazi i ne ulazi u grupu igrača; snimku
+    javnog stanja i promjene bez karata igrača dobiva preko zajedničkog
+    prijenosa procesa (services.spectators.spectator_hub). Poruke klijenta
+    se zanemaruju.
+    """
+    
+    # Format poruka veze (vidi wire_protocol); bira se pri spajanju
+    protocol = wire_protocol.JSON
+    
+    async def connect(self):
+        """Prihvaća gledatelja i šalje mu snimku igre."""
+        from django.conf import settings
+        self.game_id = self.scope['url_route']['kwargs']['game_id']
+        self.joined = False
+        self.closed = False
+        
+        if not settings.BELOT_SPECTATORS.get('ENABLED', True):
+            await self.close(code=4004)  # Gledanje igara je isključeno
+            return
+        
+        self.protocol, subprotocol = wire_protocol.negotiate(self.scope.get('subprotocols'))
+        await self.accept(subprotocol=subprotocol)
+        
+        self.joined = await spectators.spectator_hub.join(self.game_id, self)
+        if not self.joined and not self.closed:
+            await self.close(code=4003)  # Igra ne postoji ili je privatna
+    
+    async def disconnect(self, close_code):
+        """
+        Uklanja gledatelja iz prijenosa igre.
+        
+        Veza se označava zatvorenom i kad još čeka snimku, pa je
+        spectator_hub.join ne dodaje nakon zatvaranja.
+        """
+        self.closed = True
+        if hasattr(self, 'game_id'):
+            await spectators.spectator_hub.leave(self.game_id, self)
+    
+    async def receive(self, text_data=None, bytes_data=None):
+        """Gledatelj ne šalje akcije; poruke se zanemaruju."""
+        return
+    
+    async def send_encoded(self, payload, close=False):
+        """Slanje već serijalizirane poruke gledatelju."""
+        if isinstance(payload, bytes):
+            await self.send(bytes_data=payload, close=close)
+        else:
+            await self.send(text_data=payload, close=close)
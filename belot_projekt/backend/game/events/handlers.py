@@ -166,11 +166,15 @@ class WebSocketEventHandler(EventHandler):
                 # Koristi ID igre za emititranje događaja samo igračima te igre
                 group_name = f"game_{event.game_id}"
                 
-                # Priprema podataka za slanje
+                # Poruka za klijente serijalizira se jednom, a consumer je samo prosljeđuje
+                from game.services.wire_protocol import encode_frames
                 message = {
                     'type': 'game_event',  # Ovo se mapira na game_event metodu u consumer-u
-                    'event_type': event.event_type,
-                    'data': event.to_dict()
+                    'frames': encode_frames({
+                        'type': 'game_event',
+                        'event_type': event.event_type,
+                        'data': event.to_dict()
+                    })
                 }
                 
                 # Asinkrono slanje poruke na grupu
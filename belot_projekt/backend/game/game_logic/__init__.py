@@ -14,6 +14,7 @@ from game.game_logic.player import Player
 from game.game_logic.game import Game, Round
 from game.game_logic.rules import Rules
 from game.game_logic.scoring import Scoring
+from game.game_logic.simulation import SimulationEngine
 
 # Uvoz validatora
 from game.game_logic.validators.move_validator import MoveValidator
@@ -28,6 +29,7 @@ __all__ = [
     'Round',
     'Rules',
     'Scoring',
+    'SimulationEngine',
     'MoveValidator',
     'CallValidator',
 ]
\ No newline at end of file
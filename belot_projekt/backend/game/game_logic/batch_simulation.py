@@ -0,0 +1,338 @@
+"""
+Modul koji pokreće velike serije simuliranih partija na više procesa.
+
+Serija od N partija dijeli se na dijelove (shardove) fiksne veličine.
+Svaki dio dobiva vlastiti seed izveden iz osnovnog seeda i rednog broja
+dijela, pa rezultat ne ovisi o broju procesa ni o redoslijedu njihova
+završetka. Procesi vraćaju samo zbirne brojače (BatchStats), a ne
+pojedinačne partije, tako da se preko granice procesa prenosi tek
+nekoliko stotina bajtova po dijelu.
+
+Primjer:
+    stats = run_batch(100000, strategies=['greedy', 'random'] * 2, workers=8, seed=1)
+    print(stats.summary())
+"""
+
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.game_logic.simulation import SimulationEngine, SEATS, TEAMS
+
+# Zadana veličina dijela serije (broj partija po zadatku)
+DEFAULT_CHUNK_SIZE = 500
+
+
+class BatchStats:
+    """
+    Zbirni brojači za seriju simuliranih partija.
+
+    Brojači se mogu spajati (merge), pa svaki proces puni vlastitu
+    instancu, a glavni proces ih zbraja.
+
+    Attributes:
+        games (int): Broj odigranih partija
+        unfinished_games (int): Partije prekinute zbog max_rounds
+        rounds (int): Broj odigranih rundi
+        team_wins (Counter): Pobjede po timu
+        strategy_games (Counter): Partije po strategiji (po timu u kojem igra)
+        strategy_wins (Counter): Pobjede po strategiji
+        strategy_calls (Counter): Zvanja aduta po strategiji
+        strategy_failed_calls (Counter): Pali zvani aduti po strategiji
+        round_points (list): Zbroj bodova rundi po timu
+        trick_points (list): Zbroj bodova iz štihova po timu
+        failed_contracts (int): Runde u kojima je tim koji je zvao pao
+        sweeps (int): Runde sa štigljom
+        belas (int): Runde s belom
+        declarations (Counter): Bodovana zvanja po tipu
+        declaration_rounds (int): Runde u kojima je bodovano barem jedno zvanje
+        trump_suits (Counter): Zvani aduti po boji
+    """
+
+    COUNTER_FIELDS = (
+        'team_wins', 'strategy_games', 'strategy_wins', 'strategy_calls',
+        'strategy_failed_calls', 'declarations', 'trump_suits',
+    )
+    INT_FIELDS = (
+        'games', 'unfinished_games', 'rounds', 'failed_contracts', 'sweeps',
+        'belas', 'declaration_rounds',
+    )
+    LIST_FIELDS = ('round_points', 'trick_points')
+
+    def __init__(self):
+        """Inicijalizira prazne brojače."""
+        for field in self.INT_FIELDS:
+            setattr(self, field, 0)
+        for field in self.COUNTER_FIELDS:
+            setattr(self, field, Counter())
+        for field in self.LIST_FIELDS:
+            setattr(self, field, [0, 0])
+
+    def add_game(self, result):
+        """
+        Dodaje rezultat jedne partije u brojače.
+
+        Args:
+            result (dict): Rezultat iz SimulationEngine.play_game
+        """
+        self.games += 1
+        winner = result['winner_team']
+        if winner is None:
+            self.unfinished_games += 1
+        else:
+            self.team_wins[winner] += 1
+
+        strategies = result['strategies']
+        for team_index, team in enumerate(TEAMS):
+            for name in set(strategies[team_index::2]):
+                self.strategy_games[name] += 1
+                if winner == team:
+                    self.strategy_wins[name] += 1
+
+        for round_result in result['rounds']:
+            self.add_round(round_result, strategies)
+
+    def add_round(self, result, strategies):
+        """
+        Dodaje rezultat jedne runde u brojače.
+
+        Args:
+            result (dict): Rezultat iz SimulationEngine.play_round
+            strategies (tuple): Nazivi strategija po sjedalu
+        """
+        self.rounds += 1
+        for team_index in (0, 1):
+            self.round_points[team_index] += result['points'][team_index]
+            self.trick_points[team_index] += result['trick_points'][team_index]
+
+        calling_strategy = strategies[result['calling_seat']]
+        self.strategy_calls[calling_strategy] += 1
+        self.trump_suits[result['trump_suit']] += 1
+        if not result['passed']:
+            self.failed_contracts += 1
+            self.strategy_failed_calls[calling_strategy] += 1
+
+        if result['sweep_team']:
+            self.sweeps += 1
+        if result['bela_team']:
+            self.belas += 1
+        if result['declaration_points']:
+            self.declaration_rounds += 1
+            self.declarations.update(result['declarations'])
+
+    def merge(self, other):
+        """
+        Pribraja brojače druge instance ovoj.
+
+        Args:
+            other (BatchStats or dict): Brojači ili njihov rječnik iz to_dict
+
+        Returns:
+            BatchStats: Ova instanca
+        """
+        if isinstance(other, dict):
+            other = self.from_dict(other)
+        for field in self.INT_FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        for field in self.COUNTER_FIELDS:
+            getattr(self, field).update(getattr(other, field))
+        for field in self.LIST_FIELDS:
+            mine, theirs = getattr(self, field), getattr(other, field)
+            setattr(self, field, [mine[0] + theirs[0], mine[1] + theirs[1]])
+        return self
+
+    def to_dict(self):
+        """
+        Vraća brojače kao rječnik jednostavnih tipova (za prijenos i JSON).
+
+        Returns:
+            dict: Brojači
+        """
+        data = {field: getattr(self, field) for field in self.INT_FIELDS}
+        data.update({field: dict(getattr(self, field)) for field in self.COUNTER_FIELDS})
+        data.update({field: list(getattr(self, field)) for field in self.LIST_FIELDS})
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Stvara brojače iz rječnika dobivenog s to_dict.
+
+        Args:
+            data (dict): Brojači
+
+        Returns:
+            BatchStats: Nova instanca
+        """
+        stats = cls()
+        for field in cls.INT_FIELDS:
+            setattr(stats, field, data.get(field, 0))
+        for field in cls.COUNTER_FIELDS:
+            setattr(stats, field, Counter(data.get(field, {})))
+        for field in cls.LIST_FIELDS:
+            setattr(stats, field, list(data.get(field, [0, 0])))
+        return stats
+
+    def summary(self):
+        """
+        Vraća izvedene statistike serije.
+
+        Returns:
+            dict: Postotci pobjeda po strategiji i timu, prosječni bodovi
+                  po rundi, učestalost zvanja i postotak palih aduta
+        """
+        rounds = self.rounds or 1
+        games = self.games or 1
+        return {
+            'games': self.games,
+            'rounds': self.rounds,
+            'unfinished_games': self.unfinished_games,
+            'average_rounds_per_game': self.rounds / games,
+            'team_win_rates': {team: self.team_wins[team] / games for team in TEAMS},
+            'strategy_win_rates': {
+                name: self.strategy_wins[name] / count
+                for name, count in sorted(self.strategy_games.items())
+            },
+            'average_round_points': {
+                team: self.round_points[index] / rounds for index, team in enumerate(TEAMS)
+            },
+            'average_trick_points': {
+                team: self.trick_points[index] / rounds for index, team in enumerate(TEAMS)
+            },
+            'contract_failure_rate': self.failed_contracts / rounds,
+            'strategy_contract_failure_rates': {
+                name: self.strategy_failed_calls[name] / count
+                for name, count in sorted(self.strategy_calls.items())
+            },
+            'declaration_frequencies': {
+                declaration_type: count / rounds
+                for declaration_type, count in self.declarations.most_common()
+            },
+            'declaration_round_rate': self.declaration_rounds / rounds,
+            'sweep_rate': self.sweeps / rounds,
+            'bela_rate': self.belas / rounds,
+            'trump_suit_rates': {
+                suit: count / rounds for suit, count in sorted(self.trump_suits.items())
+            },
+        }
+
+
+def shard_seeds(seed, shards):
+    """
+    Izvodi ponovljive seedove za dijelove serije.
+
+    Args:
+        seed (int): Osnovni seed serije (None za nasumični)
+        shards (int): Broj dijelova
+
+    Returns:
+        list: Seed za svaki dio
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(shards)]
+
+
+def _run_shard(games, strategies, points_to_win, seed):
+    """
+    Odigrava jedan dio serije i vraća samo zbirne brojače.
+
+    Izvršava se u radnom procesu.
+
+    Args:
+        games (int): Broj partija u dijelu
+        strategies (list): Nazivi strategija po sjedalu
+        points_to_win (int): Broj bodova potreban za pobjedu
+        seed (int): Seed dijela
+
+    Returns:
+        dict: Brojači dijela (BatchStats.to_dict)
+    """
+    engine = SimulationEngine(strategies, points_to_win=points_to_win, seed=seed)
+    stats = BatchStats()
+    for result in engine.play_games(games):
+        stats.add_game(result)
+    return stats.to_dict()
+
+
+def _shards(games, chunk_size):
+    """Dijeli broj partija na dijelove najviše chunk_size partija."""
+    full, rest = divmod(games, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def iter_batch(games, strategies='random', workers=None, seed=None,
+               points_to_win=SimulationEngine.POINTS_TO_WIN, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Pokreće seriju partija i vraća međurezultate kako dijelovi završavaju.
+
+    Args:
+        games (int): Ukupan broj partija
+        strategies (str or list): Naziv strategije za sva sjedala ili
+            četiri naziva po sjedalu
+        workers (int, optional): Broj procesa; zadano broj jezgri, 1 za
+            izvršavanje u trenutnom procesu
+        seed (int, optional): Osnovni seed serije
+        points_to_win (int): Broj bodova potreban za pobjedu
+        chunk_size (int): Broj partija po dijelu
+
+    Yields:
+        BatchStats: Zbirni brojači svih dosad završenih dijelova
+
+    Raises:
+        ValueError: Ako su parametri nevažeći
+    """
+    if games < 0 or chunk_size <= 0:
+        raise ValueError("Broj partija ne smije biti negativan, a veličina dijela mora biti pozitivna")
+    if isinstance(strategies, str):
+        strategies = [strategies] * SEATS
+    strategies = list(strategies)
+    # Provjera strategija prije pokretanja procesa
+    SimulationEngine(strategies)
+
+    shards = _shards(games, chunk_size)
+    seeds = shard_seeds(seed, len(shards))
+    workers = workers or os.cpu_count() or 1
+    total = BatchStats()
+
+    if workers == 1 or len(shards) <= 1:
+        for shard_games, shard_seed in zip(shards, seeds):
+            total.merge(_run_shard(shard_games, strategies, points_to_win, shard_seed))
+            yield total
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        futures = [
+            executor.submit(_run_shard, shard_games, strategies, points_to_win, shard_seed)
+            for shard_games, shard_seed in zip(shards, seeds)
+        ]
+        for future in as_completed(futures):
+            total.merge(future.result())
+            yield total
+
+
+def run_batch(games, strategies='random', workers=None, seed=None,
+              points_to_win=SimulationEngine.POINTS_TO_WIN, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Pokreće seriju partija i vraća konačne zbirne brojače.
+
+    Za isti seed i chunk_size rezultat je isti bez obzira na broj procesa.
+
+    Args:
+        games (int): Ukupan broj partija
+        strategies (str or list): Naziv strategije ili četiri naziva po sjedalu
+        workers (int, optional): Broj procesa; zadano broj jezgri
+        seed (int, optional): Osnovni seed serije
+        points_to_win (int): Broj bodova potreban za pobjedu
+        chunk_size (int): Broj partija po dijelu
+
+    Returns:
+        BatchStats: Zbirni brojači serije
+
+    Raises:
+        ValueError: Ako su parametri nevažeći
+    """
+    stats = BatchStats()
+    for stats in iter_batch(games, strategies, workers, seed, points_to_win, chunk_size):
+        pass
+    return stats
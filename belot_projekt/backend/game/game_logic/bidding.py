@@ -0,0 +1,164 @@
+"""
+Modul s fazom zvanja aduta kao malim automatom stanja.
+
+Redoslijed zvanja određuje se jednom, pri dijeljenju: počinje igrač nakon
+djelitelja, a djelitelj je zadnji i mora zvati aduta ako su svi prije
+njega rekli "dalje". Bidding tada za svaki "dalje" ili zvanje samo
+provjerava tko je na redu i bilježi potez u memoriji, bez ponovnog
+dohvaćanja igrača igre i redoslijeda. U Round.round_data['bidding'] se
+sprema redoslijed, niz igrača koji su rekli "dalje" i konačni ugovor
+(igrač i boja aduta).
+
+Primjer:
+    bidding = Bidding.for_deal(deal.player_ids, round_obj.dealer_id)
+    bidding.pass_turn(bidding.current_bidder)
+    bidding.call(bidding.current_bidder, 'H')
+"""
+
+# Ključ pod kojim se stanje sprema u Round.round_data
+BIDDING_KEY = 'bidding'
+
+# Dozvoljene boje aduta
+TRUMP_SUITS = ('S', 'H', 'D', 'C')
+
+
+class Bidding:
+    """
+    Stanje zvanja aduta jedne runde.
+
+    Attributes:
+        order (list): ID-evi igrača redom zvanja (djelitelj je zadnji)
+        passes (list): ID-evi igrača koji su rekli "dalje", redom
+        contract (list): [ID igrača, boja] nakon zvanja ili None
+    """
+
+    __slots__ = ('order', 'passes', 'contract')
+
+    def __init__(self, order, passes=None, contract=None):
+        """
+        Inicijalizira stanje zvanja.
+
+        Args:
+            order (list): ID-evi igrača redom zvanja
+            passes (list, optional): Igrači koji su već rekli "dalje"
+            contract (list, optional): Već zvani adut kao [ID igrača, boja]
+        """
+        self.order = list(order)
+        self.passes = list(passes or [])
+        self.contract = list(contract) if contract else None
+
+    @classmethod
+    def for_deal(cls, player_ids, dealer_id=None):
+        """
+        Stvara zvanje s redoslijedom koji počinje igračem nakon djelitelja.
+
+        Args:
+            player_ids (list): ID-evi igrača po pozicijama za stolom
+            dealer_id: ID djelitelja (bez njega djelitelj je zadnja pozicija)
+
+        Returns:
+            Bidding: Zvanje bez poteza
+        """
+        player_ids = list(player_ids)
+        dealer_seat = len(player_ids) - 1
+        for seat, player_id in enumerate(player_ids):
+            if str(player_id) == str(dealer_id):
+                dealer_seat = seat
+                break
+        start = dealer_seat + 1
+        return cls(player_ids[start:] + player_ids[:start])
+
+    @property
+    def is_finished(self):
+        """bool: Je li adut zvan."""
+        return self.contract is not None
+
+    @property
+    def current_bidder(self):
+        """ID igrača koji je na redu za zvanje ili None ako je zvanje završeno."""
+        if self.is_finished or len(self.passes) >= len(self.order):
+            return None
+        return self.order[len(self.passes)]
+
+    @property
+    def must_call(self):
+        """bool: Mora li igrač na redu zvati aduta (djelitelj nakon tri "dalje")."""
+        return not self.is_finished and bool(self.order) and len(self.passes) == len(self.order) - 1
+
+    def is_turn(self, player_id):
+        """Vraća True ako je zadani igrač na redu za zvanje."""
+        bidder = self.current_bidder
+        return bidder is not None and str(bidder) == str(player_id)
+
+    def _check_turn(self, player_id):
+        if self.is_finished:
+            raise ValueError("Adut je već zvan")
+        if not self.is_turn(player_id):
+            raise ValueError("Igrač nije na redu za zvanje aduta")
+
+    def pass_turn(self, player_id):
+        """
+        Bilježi da igrač kaže "dalje".
+
+        Args:
+            player_id: ID igrača
+
+        Returns:
+            ID igrača koji je sljedeći na redu
+
+        Raises:
+            ValueError: Ako igrač nije na redu ili mora zvati aduta
+        """
+        self._check_turn(player_id)
+        if self.must_call:
+            raise ValueError("Djelitelj mora zvati aduta")
+        self.passes.append(self.current_bidder)
+        return self.current_bidder
+
+    def call(self, player_id, suit):
+        """
+        Bilježi zvanje aduta i završava zvanje.
+
+        Args:
+            player_id: ID igrača
+            suit (str): Boja aduta ('S', 'H', 'D' ili 'C')
+
+        Raises:
+            ValueError: Ako igrač nije na redu ili boja nije valjana
+        """
+        self._check_turn(player_id)
+        if suit not in TRUMP_SUITS:
+            raise ValueError(f"Nevažeća boja aduta: {suit}")
+        self.contract = [self.current_bidder, suit]
+
+    @property
+    def caller(self):
+        """ID igrača koji je zvao aduta ili None."""
+        return self.contract[0] if self.contract else None
+
+    @property
+    def suit(self):
+        """str: Zvana boja aduta ili None."""
+        return self.contract[1] if self.contract else None
+
+    def to_dict(self):
+        """
+        Vraća stanje za spremanje u JSON.
+
+        Returns:
+            dict: Redoslijed, niz "dalje" i ugovor
+        """
+        return {'order': list(self.order), 'passes': list(self.passes), 'contract': self.contract}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Obnavlja stanje iz spremljenih podataka.
+
+        Args:
+            data (dict): Podaci iz to_dict
+
+        Returns:
+            Bidding: Obnovljeno stanje
+        """
+        return cls(data.get('order', []), data.get('passes'), data.get('contract'))
@@ -77,7 +77,6 @@ class Card:
         self.code = value + suit  # Npr. "AS" za asa pik
         self.rank = value  # Dodajemo atribut rank koji verificator očekuje
     
-    @lru_cache(maxsize=128)
     def get_value(self, trump_suit=None):
         """
         Vraća bodovnu vrijednost karte ovisno je li adut ili ne.
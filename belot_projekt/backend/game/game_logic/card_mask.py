@@ -0,0 +1,331 @@
+"""
+Modul koji definira kompaktni bitmask prikaz karata i ruku za Belot igru.
+
+Svaka od 32 karte Belot špila dobiva fiksni indeks (0-31), a ruka se
+prikazuje kao jedan cijeli broj u kojem je postavljen bit svake karte
+koju igrač drži. Uz unaprijed izračunate maske boja i tablice jačine,
+provjere poput "ima li igrač boju", "koje karte smije igrati" i "ima li
+jačeg aduta" svode se na nekoliko cjelobrojnih operacija umjesto
+prolaska kroz liste karata.
+
+Raspored indeksa: indeks = indeks_boje * 8 + indeks_vrijednosti, gdje su
+boje poredane kao Card.VALID_SUITS ('S', 'H', 'D', 'C'), a vrijednosti
+kao Card.VALID_VALUES ('7', '8', '9', '10', 'J', 'Q', 'K', 'A'). Unutar
+jedne boje bitovi zato prate prirodni redoslijed karata za nizove.
+"""
+
+from game.game_logic.card import Card
+
+# Osnovne konstante
+SUITS = tuple(Card.VALID_SUITS)
+VALUES = tuple(Card.VALID_VALUES)
+NUM_CARDS = len(SUITS) * len(VALUES)
+
+# Maska svih 32 karte
+FULL_MASK = (1 << NUM_CARDS) - 1
+
+# Kodovi karata poredani po indeksu i obrnuto mapiranje kod -> indeks
+CARD_CODES = tuple(value + suit for suit in SUITS for value in VALUES)
+CARD_INDEX = {code: index for index, code in enumerate(CARD_CODES)}
+
+# Bit svake karte po indeksu
+CARD_BITS = tuple(1 << index for index in range(NUM_CARDS))
+
+# Boja i vrijednost karte po indeksu
+INDEX_SUIT = tuple(code[-1] for code in CARD_CODES)
+INDEX_VALUE = tuple(code[:-1] for code in CARD_CODES)
+
+# Maske boja (svih 8 karata jedne boje)
+SUIT_MASKS = {suit: 0xFF << (8 * i) for i, suit in enumerate(SUITS)}
+
+# Maska boje po indeksu karte
+INDEX_SUIT_MASK = tuple(SUIT_MASKS[suit] for suit in INDEX_SUIT)
+
+# Mapiranje punih imena boja na kodove (za normalizaciju)
+SUIT_MAP = {
+    'spades': 'S',
+    'hearts': 'H',
+    'diamonds': 'D',
+    'clubs': 'C'
+}
+
+# Redoslijed jačine karata (od najslabije do najjače), isto kao u Rules
+NON_TRUMP_RANKING = ('7', '8', '9', 'J', 'Q', 'K', '10', 'A')
+TRUMP_RANKING = ('7', '8', 'Q', 'K', '10', 'A', '9', 'J')
+
+
+def _build_higher_masks(ranking):
+    """
+    Za svaku kartu gradi masku jačih karata iste boje prema zadanom poretku.
+
+    Args:
+        ranking (tuple): Vrijednosti karata od najslabije do najjače
+
+    Returns:
+        tuple: Maska jačih karata iste boje za svaki indeks karte
+    """
+    strength = {value: i for i, value in enumerate(ranking)}
+    masks = []
+    for index in range(NUM_CARDS):
+        suit = INDEX_SUIT[index]
+        own_strength = strength[INDEX_VALUE[index]]
+        mask = 0
+        for value in VALUES:
+            if strength[value] > own_strength:
+                mask |= CARD_BITS[CARD_INDEX[value + suit]]
+        masks.append(mask)
+    return tuple(masks)
+
+
+# Maske jačih karata iste boje kada boja nije adut, odnosno kada jest
+HIGHER_NON_TRUMP = _build_higher_masks(NON_TRUMP_RANKING)
+HIGHER_TRUMP = _build_higher_masks(TRUMP_RANKING)
+
+# Bodovne vrijednosti karata po adutu i indeksu karte, iste kao u Scoring
+NON_TRUMP_POINTS = {'A': 11, '10': 10, 'K': 4, 'Q': 3, 'J': 2, '9': 0, '8': 0, '7': 0}
+TRUMP_POINTS = {'J': 20, '9': 14, 'A': 11, '10': 10, 'K': 4, 'Q': 3, '8': 0, '7': 0}
+CARD_POINTS = {
+    trump: tuple(
+        TRUMP_POINTS[INDEX_VALUE[index]] if INDEX_SUIT[index] == trump
+        else NON_TRUMP_POINTS[INDEX_VALUE[index]]
+        for index in range(NUM_CARDS)
+    )
+    for trump in SUITS
+}
+
+
+def suit_code(suit):
+    """
+    Pretvara boju (kod ili puno ime) u kod boje.
+
+    Args:
+        suit (str): Boja ('S', 'H', 'D', 'C' ili puno ime)
+
+    Returns:
+        str: Kod boje ili None ako boja nije prepoznata
+    """
+    if suit in SUIT_MASKS:
+        return suit
+    if not suit or not isinstance(suit, str):
+        return None
+    return SUIT_MAP.get(suit.lower())
+
+
+def suit_mask(suit):
+    """
+    Vraća masku svih karata zadane boje.
+
+    Args:
+        suit (str): Boja ('S', 'H', 'D', 'C' ili puno ime)
+
+    Returns:
+        int: Maska boje, 0 ako boja nije prepoznata
+    """
+    mask = SUIT_MASKS.get(suit)
+    if mask is not None:
+        return mask
+    return SUIT_MASKS.get(suit_code(suit), 0)
+
+
+def card_index(card):
+    """
+    Vraća indeks karte (0-31).
+
+    Args:
+        card (Card or str): Karta ili kod karte
+
+    Returns:
+        int: Indeks karte
+
+    Raises:
+        ValueError: Ako karta nije valjana
+    """
+    code = card if isinstance(card, str) else getattr(card, 'code', None)
+    index = CARD_INDEX.get(code)
+    if index is None:
+        raise ValueError(f"Nevažeća karta: {card}")
+    return index
+
+
+def card_bit(card):
+    """
+    Vraća bit karte u maski ruke.
+
+    Args:
+        card (Card or str): Karta ili kod karte
+
+    Returns:
+        int: Maska s postavljenim bitom zadane karte
+
+    Raises:
+        ValueError: Ako karta nije valjana
+    """
+    return CARD_BITS[card_index(card)]
+
+
+def mask_from_cards(cards):
+    """
+    Pretvara kolekciju karata u masku.
+
+    Args:
+        cards (iterable): Karte (Card objekti ili kodovi karata)
+
+    Returns:
+        int: Maska s postavljenim bitovima svih zadanih karata
+
+    Raises:
+        ValueError: Ako neka karta nije valjana
+    """
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[card_index(card)]
+    return mask
+
+
+def hand_mask(hand):
+    """
+    Vraća masku ruke bez obzira na oblik u kojem je ruka zadana.
+
+    Prihvaća već izračunatu masku, objekt s atributom hand_mask (npr. Player)
+    ili listu karata.
+
+    Args:
+        hand (int, Player or iterable): Ruka igrača
+
+    Returns:
+        int: Maska ruke
+    """
+    if isinstance(hand, int):
+        return hand
+    mask = getattr(hand, 'hand_mask', None)
+    if mask is not None:
+        return mask
+    return mask_from_cards(hand or ())
+
+
+def iter_indices(mask):
+    """
+    Prolazi kroz indekse postavljenih bitova maske, od najnižeg prema najvišem.
+
+    Args:
+        mask (int): Maska karata
+
+    Yields:
+        int: Indeks karte
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def codes_from_mask(mask):
+    """
+    Pretvara masku u listu kodova karata.
+
+    Args:
+        mask (int): Maska karata
+
+    Returns:
+        list: Kodovi karata poredani po indeksu
+    """
+    return [CARD_CODES[index] for index in iter_indices(mask)]
+
+
+def cards_from_mask(mask):
+    """
+    Pretvara masku u listu karata.
+
+    Koristi keširane instance iz Card.from_code pa ne stvara nove objekte.
+
+    Args:
+        mask (int): Maska karata
+
+    Returns:
+        list: Karte poredane po indeksu
+    """
+    return [Card.from_code(CARD_CODES[index]) for index in iter_indices(mask)]
+
+
+def filter_cards(cards, mask):
+    """
+    Iz kolekcije karata zadržava samo one čiji je bit postavljen u maski.
+
+    Čuva izvorne objekte i njihov redoslijed.
+
+    Args:
+        cards (iterable): Karte (Card objekti ili kodovi karata)
+        mask (int): Maska dozvoljenih karata
+
+    Returns:
+        list: Karte iz kolekcije koje su u maski
+    """
+    return [card for card in cards if CARD_BITS[card_index(card)] & mask]
+
+
+def count_cards(mask):
+    """
+    Vraća broj karata u maski.
+
+    Args:
+        mask (int): Maska karata
+
+    Returns:
+        int: Broj postavljenih bitova
+    """
+    return bin(mask).count('1')
+
+
+def has_suit(mask, suit):
+    """
+    Provjerava sadrži li maska barem jednu kartu zadane boje.
+
+    Args:
+        mask (int): Maska ruke
+        suit (str): Boja ('S', 'H', 'D', 'C' ili puno ime)
+
+    Returns:
+        bool: True ako ruka ima kartu te boje
+    """
+    return bool(mask & suit_mask(suit))
+
+
+def higher_cards(mask, card, trump_suit=None):
+    """
+    Vraća karte iz maske koje su iste boje i jače od zadane karte.
+
+    Args:
+        mask (int): Maska ruke
+        card (Card or str or int): Karta, kod karte ili indeks karte
+        trump_suit (str, optional): Adutska boja (određuje poredak jačine)
+
+    Returns:
+        int: Maska jačih karata iste boje
+    """
+    index = card if isinstance(card, int) else card_index(card)
+    if INDEX_SUIT[index] == suit_code(trump_suit):
+        return mask & HIGHER_TRUMP[index]
+    return mask & HIGHER_NON_TRUMP[index]
+
+
+def highest_card(mask, suit, trump_suit=None):
+    """
+    Vraća indeks najjače karte zadane boje u maski.
+
+    Args:
+        mask (int): Maska karata
+        suit (str): Boja koja se traži
+        trump_suit (str, optional): Adutska boja (određuje poredak jačine)
+
+    Returns:
+        int: Indeks najjače karte ili -1 ako maska nema kartu te boje
+    """
+    suit = suit_code(suit)
+    cards = mask & SUIT_MASKS.get(suit, 0)
+    if not cards:
+        return -1
+    higher = HIGHER_TRUMP if suit == suit_code(trump_suit) else HIGHER_NON_TRUMP
+    for index in iter_indices(cards):
+        if not cards & higher[index]:
+            return index
+    return -1
@@ -0,0 +1,241 @@
+"""
+Modul za ponovljivo dijeljenje karata s vlastitim generatorom po rundi.
+
+Svaka runda dobiva vlastiti seed iz kojeg se instancom random.Random (ne
+globalnim modulom random) izračuna permutacija 32 karte. Seed i
+permutacija su mali (broj i 64 heksadecimalna znaka), pa se spremaju uz
+rundu, a ruka bilo kojeg igrača dobiva se izravno iz permutacije kao
+osam uzastopnih karata, bez stvaranja i miješanja novog špila. Isti seed
+uvijek daje isto dijeljenje, što omogućuje ponovno odigravanje runde.
+
+Primjer:
+    deal = Deal.new(player_ids=[3, 5, 8, 13])
+    round_obj.round_data['deal'] = deal.to_dict()
+    ...
+    cards = Deal.from_dict(round_obj.round_data['deal']).hand_for(5)
+"""
+
+import hashlib
+import random
+import secrets
+
+from game.game_logic import card_mask
+
+# Broj igrača i karata po igraču
+SEATS = 4
+CARDS_PER_PLAYER = card_mask.NUM_CARDS // SEATS
+
+# Broj bitova seeda runde
+SEED_BITS = 64
+
+
+def new_seed():
+    """
+    Vraća novi nasumični seed iz izvora entropije operacijskog sustava.
+
+    Returns:
+        int: Seed od SEED_BITS bitova
+    """
+    return secrets.randbits(SEED_BITS)
+
+
+def derive_seed(base_seed, *parts):
+    """
+    Izvodi seed iz osnovnog seeda i dodatnih oznaka (npr. broja runde).
+
+    Za razliku od ugrađene funkcije hash, rezultat je isti u svim
+    procesima i pokretanjima.
+
+    Args:
+        base_seed (int): Osnovni seed (npr. seed igre)
+        *parts: Dodatne oznake koje razlikuju izvedene seedove
+
+    Returns:
+        int: Izvedeni seed od SEED_BITS bitova
+    """
+    key = ':'.join(str(part) for part in (base_seed,) + parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=SEED_BITS // 8).digest(), 'big')
+
+
+def permutation(seed):
+    """
+    Vraća permutaciju indeksa karata (card_mask) za seed.
+
+    Args:
+        seed (int): Seed runde
+
+    Returns:
+        tuple: 32 indeksa karata redom dijeljenja
+    """
+    order = list(range(card_mask.NUM_CARDS))
+    random.Random(seed).shuffle(order)
+    return tuple(order)
+
+
+class Deal:
+    """
+    Dijeljenje jedne runde: seed, permutacija karata i redoslijed igrača.
+
+    Igrač na poziciji i dobiva karte order[8 * i:8 * (i + 1)].
+
+    Attributes:
+        seed (int): Seed iz kojeg je permutacija izračunata
+        order (tuple): Indeksi karata redom dijeljenja
+        player_ids (tuple): Identifikatori igrača po poziciji (može biti prazno)
+    """
+
+    __slots__ = ('seed', 'order', 'player_ids', '_seats')
+
+    def __init__(self, seed, order=None, player_ids=()):
+        """
+        Inicijalizira dijeljenje.
+
+        Args:
+            seed (int): Seed runde
+            order (tuple, optional): Već izračunata permutacija za seed
+            player_ids (list, optional): Identifikatori igrača po poziciji
+
+        Raises:
+            ValueError: Ako permutacija ili broj igrača nisu valjani
+        """
+        self.seed = seed
+        self.order = tuple(order) if order is not None else permutation(seed)
+        if sorted(self.order) != list(range(card_mask.NUM_CARDS)):
+            raise ValueError("Permutacija dijeljenja mora sadržavati svaku kartu točno jednom")
+        if player_ids and len(player_ids) != SEATS:
+            raise ValueError(f"Dijeljenje zahtijeva točno {SEATS} igrača")
+        self.player_ids = tuple(player_ids)
+        self._seats = {player_id: seat for seat, player_id in enumerate(self.player_ids)}
+
+    @classmethod
+    def new(cls, seed=None, player_ids=()):
+        """
+        Stvara dijeljenje za novu rundu.
+
+        Args:
+            seed (int, optional): Seed runde; zadano novi nasumični seed
+            player_ids (list, optional): Identifikatori igrača po poziciji
+
+        Returns:
+            Deal: Novo dijeljenje
+        """
+        return cls(new_seed() if seed is None else seed, player_ids=player_ids)
+
+    def hand_indices(self, seat):
+        """
+        Vraća indekse karata podijeljenih igraču na poziciji.
+
+        Args:
+            seat (int): Pozicija igrača (0-3)
+
+        Returns:
+            tuple: Osam indeksa karata
+        """
+        start = seat * CARDS_PER_PLAYER
+        return self.order[start:start + CARDS_PER_PLAYER]
+
+    def hand(self, seat):
+        """
+        Vraća kodove karata podijeljenih igraču na poziciji.
+
+        Args:
+            seat (int): Pozicija igrača (0-3)
+
+        Returns:
+            list: Kodovi karata redom dijeljenja
+        """
+        return [card_mask.CARD_CODES[index] for index in self.hand_indices(seat)]
+
+    def hand_mask(self, seat):
+        """
+        Vraća masku (card_mask) karata podijeljenih igraču na poziciji.
+
+        Args:
+            seat (int): Pozicija igrača (0-3)
+
+        Returns:
+            int: Maska ruke
+        """
+        bits = 0
+        for index in self.hand_indices(seat):
+            bits |= card_mask.CARD_BITS[index]
+        return bits
+
+    def hand_masks(self):
+        """
+        Vraća maske ruku svih igrača.
+
+        Returns:
+            list: Maska ruke po poziciji igrača
+        """
+        return [self.hand_mask(seat) for seat in range(SEATS)]
+
+    def seat_of(self, player_id):
+        """
+        Vraća poziciju igrača u dijeljenju.
+
+        Args:
+            player_id: Identifikator igrača
+
+        Returns:
+            int: Pozicija igrača ili None ako igrač nije u dijeljenju
+        """
+        return self._seats.get(player_id)
+
+    def hand_for(self, player_id):
+        """
+        Vraća kodove karata podijeljenih igraču.
+
+        Args:
+            player_id: Identifikator igrača
+
+        Returns:
+            list: Kodovi karata ili prazna lista ako igrač nije u dijeljenju
+        """
+        seat = self.seat_of(player_id)
+        return self.hand(seat) if seat is not None else []
+
+    def hands(self):
+        """
+        Vraća ruke svih igrača.
+
+        Returns:
+            list: Kodovi karata po poziciji igrača
+        """
+        return [self.hand(seat) for seat in range(SEATS)]
+
+    def to_dict(self):
+        """
+        Vraća dijeljenje za spremanje u JSON.
+
+        Returns:
+            dict: Seed, permutacija (heksadecimalno, bajt po karti) i igrači
+        """
+        return {
+            'seed': self.seed,
+            'order': bytes(self.order).hex(),
+            'players': list(self.player_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Obnavlja dijeljenje iz spremljenih podataka.
+
+        Ako permutacija nije spremljena, računa se iz seeda.
+
+        Args:
+            data (dict): Podaci iz to_dict
+
+        Returns:
+            Deal: Obnovljeno dijeljenje
+
+        Raises:
+            ValueError: Ako podaci nisu valjani
+        """
+        order = data.get('order')
+        return cls(
+            data['seed'],
+            tuple(bytes.fromhex(order)) if order else None,
+            data.get('players') or (),
+        )
@@ -9,7 +9,7 @@ import random
 import logging
 from functools import lru_cache
 from game.game_logic.card import Card
-from utils.decorators import track_execution_time
+from game.utils.profiling import sampled_timer
 
 # Konfiguracija loggera
 logger = logging.getLogger(__name__)
@@ -37,7 +37,7 @@ class Deck:
         "gradual": [1, 2, 3, 2]  # Postupno: 1 karta, pa 2, pa 3, pa 2
     }
     
-    @track_execution_time
+    @sampled_timer
     def __init__(self, use_cached_cards=True):
         """
         Inicijalizira standardni špil karata za Belot.
@@ -95,23 +95,27 @@ class Deck:
                 deck.append(Card(value, suit))
         return deck
     
-    @track_execution_time
-    def shuffle(self):
+    @sampled_timer
+    def shuffle(self, rng=None):
         """
         Miješa špil karata.
         
+        Args:
+            rng (random.Random, optional): Generator slučajnih brojeva; bez
+                njega se koristi globalni modul random
+        
         Returns:
             Deck: Instanca špila za ulančavanje metoda
         """
         try:
-            random.shuffle(self.cards)
+            (rng or random).shuffle(self.cards)
             logger.debug("Špil uspješno promiješan")
             return self
         except Exception as e:
             logger.error(f"Greška pri miješanju špila: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def draw(self):
         """
         Vuče kartu s vrha špila.
@@ -135,7 +139,7 @@ class Deck:
             logger.error(f"Greška pri izvlačenju karte: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def deal(self, num_players, cards_per_player=None, pattern=None):
         """
         Dijeli karte iz špila određenom broju igrača.
@@ -213,7 +217,7 @@ class Deck:
                 for _ in range(num_cards):
                     hands[i].append(self.draw())
     
-    @track_execution_time
+    @sampled_timer
     def return_cards(self, cards):
         """
         Vraća karte u špil.
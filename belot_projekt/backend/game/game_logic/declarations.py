@@ -0,0 +1,210 @@
+"""
+Modul koji pronalazi zvanja u ruci nad bitmask prikazom karata.
+
+Nizovi se traže po boji: osam bitova maske ruke jedne boje je raspored
+karata te boje, a za svih 256 rasporeda unaprijed su izračunati nizovi
+od barem tri uzastopne karte (prirodnim redom 7, 8, 9, 10, J, Q, K, A).
+Četiri iste karte prepoznaju se usporedbom s unaprijed izračunatim
+maskama. Jedna karta ne može biti dio dvaju zvanja, pa detect_declarations
+vraća skup zvanja bez preklapanja s najvećim ukupnim bodovima.
+
+Rules, CallValidator i SimulationEngine koriste ovaj modul.
+"""
+
+from collections import namedtuple
+
+from game.game_logic import card_mask
+from game.game_logic.scoring import Scoring
+
+# Bodovne vrijednosti zvanja
+DECLARATION_POINTS = Scoring.DECLARATION_POINTS
+
+# Minimalna duljina niza po tipu zvanja
+SEQUENCE_MIN_LENGTH = {'sequence_3': 3, 'sequence_4': 4, 'sequence_5_plus': 5, 'belot': 8}
+
+# Pronađeno zvanje: tip, bodovi, maska karata i ključ jačine (veći je jači)
+Declaration = namedtuple('Declaration', ('type', 'value', 'mask', 'key'))
+
+# Skup zvanja ruke bez preklapanja, njihov zbroj bodova i maska bele (0 ako je nema)
+DeclarationSet = namedtuple('DeclarationSet', ('declarations', 'value', 'bela'))
+
+# Maske četiri iste karte, tip zvanja i rang vrijednosti
+FOUR_OF_KIND = tuple(
+    (
+        sum(card_mask.card_bit(value + suit) for suit in card_mask.SUITS),
+        declaration_type,
+        card_mask.NON_TRUMP_RANKING.index(value),
+    )
+    for value, declaration_type in (
+        ('J', 'four_jacks'),
+        ('9', 'four_nines'),
+        ('A', 'four_aces'),
+        ('10', 'four_tens'),
+        ('K', 'four_kings'),
+        ('Q', 'four_queens'),
+    )
+)
+
+
+def sequence_type(length):
+    """
+    Vraća tip zvanja za niz zadane duljine.
+
+    Args:
+        length (int): Duljina niza (3-8)
+
+    Returns:
+        str: Tip zvanja
+    """
+    if length == 8:
+        return 'belot'
+    if length >= 5:
+        return 'sequence_5_plus'
+    return f'sequence_{length}'
+
+
+def _build_sequence_table():
+    """
+    Gradi tablicu nizova za svaki raspored karata jedne boje.
+
+    Bit i rasporeda odgovara vrijednosti VALUES[i]. Za svaki raspored
+    bilježe se najdulji nizovi od barem tri karte kao trojke (duljina,
+    indeks najviše vrijednosti, maska unutar boje).
+
+    Returns:
+        tuple: 256 torki nizova
+    """
+    table = []
+    for pattern in range(256):
+        runs = []
+        length = 0
+        for value_index in range(len(card_mask.VALUES) + 1):
+            if value_index < len(card_mask.VALUES) and pattern & (1 << value_index):
+                length += 1
+                continue
+            if length >= 3:
+                top = value_index - 1
+                runs.append((length, top, ((1 << length) - 1) << (top - length + 1)))
+            length = 0
+        table.append(tuple(runs))
+    return tuple(table)
+
+
+# Nizovi (duljina, najviša karta, maska) za svaki raspored karata jedne boje
+SEQUENCES_BY_PATTERN = _build_sequence_table()
+
+
+def find_sequences(hand_bits):
+    """
+    Pronalazi sve najdulje nizove u ruci.
+
+    Args:
+        hand_bits (int): Maska ruke
+
+    Returns:
+        list: Zvanja (Declaration) za nizove, po bojama redom SUITS
+    """
+    sequences = []
+    for suit_index in range(len(card_mask.SUITS)):
+        shift = 8 * suit_index
+        for length, top, mask in SEQUENCES_BY_PATTERN[(hand_bits >> shift) & 0xFF]:
+            declaration_type = sequence_type(length)
+            sequences.append(Declaration(
+                declaration_type, DECLARATION_POINTS[declaration_type],
+                mask << shift, (DECLARATION_POINTS[declaration_type], 0, length, top)
+            ))
+    return sequences
+
+
+def find_four_of_kind(hand_bits):
+    """
+    Pronalazi sva zvanja četiri iste karte u ruci.
+
+    Args:
+        hand_bits (int): Maska ruke
+
+    Returns:
+        list: Zvanja (Declaration) za četiri iste karte
+    """
+    return [
+        Declaration(
+            declaration_type, DECLARATION_POINTS[declaration_type], mask,
+            (DECLARATION_POINTS[declaration_type], 1, 4, rank)
+        )
+        for mask, declaration_type, rank in FOUR_OF_KIND
+        if hand_bits & mask == mask
+    ]
+
+
+def bela_mask(hand_bits, trump_suit):
+    """
+    Vraća masku bele (kralj i dama u adutu) ako je ruka sadrži.
+
+    Args:
+        hand_bits (int): Maska ruke
+        trump_suit (str): Adutska boja (kod ili puno ime)
+
+    Returns:
+        int: Maska kralja i dame aduta ili 0
+    """
+    trump = card_mask.suit_code(trump_suit)
+    if trump is None:
+        return 0
+    mask = card_mask.CARD_BITS[card_mask.CARD_INDEX['K' + trump]] | \
+        card_mask.CARD_BITS[card_mask.CARD_INDEX['Q' + trump]]
+    return mask if hand_bits & mask == mask else 0
+
+
+def detect_declarations(hand, trump_suit=None):
+    """
+    Pronalazi skup zvanja ruke bez preklapanja s najvećim ukupnim bodovima.
+
+    Nizovi iste boje se ne preklapaju, pa se preklapanje može dogoditi
+    samo između niza i četiri iste karte. Zato se isprobava svaki podskup
+    zvanja četiri iste karte (u osam karata najviše dva), a od preostalih
+    karata uzimaju se najdulji nizovi. Bela se ne natječe s ostalim
+    zvanjima i vraća se zasebno.
+
+    Args:
+        hand (int, Player or list): Ruka igrača
+        trump_suit (str, optional): Adutska boja (potrebno za belu)
+
+    Returns:
+        DeclarationSet: Zvanja, poredana od najjačeg, njihov zbroj i maska bele
+
+    Raises:
+        ValueError: Ako ruka sadrži nevažeću kartu
+    """
+    hand_bits = card_mask.hand_mask(hand)
+    fours = find_four_of_kind(hand_bits)
+
+    best, best_rank = [], None
+    for subset in range(1 << len(fours)):
+        chosen = [fours[i] for i in range(len(fours)) if subset >> i & 1]
+        used = 0
+        for declaration in chosen:
+            used |= declaration.mask
+        chosen += find_sequences(hand_bits & ~used)
+        chosen.sort(key=lambda declaration: declaration.key, reverse=True)
+
+        # Kod jednakog zbroja prednost ima skup s jačim pojedinačnim zvanjem
+        rank = (sum(declaration.value for declaration in chosen),
+                chosen[0].key if chosen else ())
+        if best_rank is None or rank > best_rank:
+            best, best_rank = chosen, rank
+
+    return DeclarationSet(best, best_rank[0], bela_mask(hand_bits, trump_suit))
+
+
+def best_declaration(hand):
+    """
+    Vraća najjače pojedinačno zvanje ruke.
+
+    Args:
+        hand (int, Player or list): Ruka igrača
+
+    Returns:
+        Declaration: Najjače zvanje ili None ako ruka nema zvanja
+    """
+    declarations = detect_declarations(hand).declarations
+    return declarations[0] if declarations else None
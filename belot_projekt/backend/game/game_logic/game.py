@@ -8,16 +8,16 @@ bodovanjem i određivanjem pobjednika.
 
 import random
 import logging
-from functools import lru_cache
 
 from game.game_logic.card import Card
-from game.game_logic.deck import Deck
+from game.game_logic import dealing
 from game.game_logic.rules import Rules
 from game.game_logic.scoring import Scoring
+from game.game_logic.trick_tracker import TrickTracker
 from game.game_logic.player import Player
 from game.game_logic.validators.move_validator import MoveValidator
 from game.game_logic.validators.call_validator import CallValidator
-from utils.decorators import track_execution_time
+from game.utils.profiling import sampled_timer
 
 # Konfiguracija loggera
 logger = logging.getLogger(__name__)
@@ -57,18 +57,21 @@ class Game:
     STATUS_IN_PROGRESS = 'in_progress'
     STATUS_FINISHED = 'finished'
     
-    @track_execution_time
-    def __init__(self, points_to_win=POINTS_TO_WIN, game_id=None):
+    @sampled_timer
+    def __init__(self, points_to_win=POINTS_TO_WIN, game_id=None, seed=None):
         """
         Inicijalizira novu igru Belota.
         
         Args:
             points_to_win (int): Broj bodova potreban za pobjedu (zadano 1001)
             game_id (str, optional): Jedinstveni identifikator igre
+            seed (int, optional): Seed igre iz kojeg se izvode seedovi rundi;
+                bez njega svaka runda dobiva nasumični seed
         """
         try:
             self.points_to_win = points_to_win
             self.game_id = game_id
+            self.seed = seed
             self.players = []  # Lista igrača
             self.team_a = []  # Igrači u timu A
             self.team_b = []  # Igrači u timu B
@@ -100,7 +103,7 @@ class Game:
         import time
         self._cache_timestamp = time.time()
     
-    @track_execution_time
+    @sampled_timer
     def add_player(self, player):
         """
         Dodaje igrača u igru.
@@ -147,7 +150,7 @@ class Game:
             logger.error(f"Greška pri dodavanju igrača: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def assign_teams(self):
         """
         Dodjeljuje igrače u timove.
@@ -186,7 +189,7 @@ class Game:
             logger.error(f"Greška pri dodjeljivanju timova: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def start_game(self):
         """
         Započinje igru.
@@ -234,7 +237,7 @@ class Game:
             logger.error(f"Greška pri započinjanju igre: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def start_new_round(self):
         """
         Započinje novu rundu.
@@ -260,8 +263,11 @@ class Game:
             dealer_index = (self.round_number - 1) % 4
             dealer = self.players[dealer_index]
             
-            # Stvaranje nove runde
-            self.current_round = Round(self.round_number, dealer, self)
+            # Stvaranje nove runde (seed runde izveden iz seeda igre ako je zadan)
+            round_seed = None
+            if self.seed is not None:
+                round_seed = dealing.derive_seed(self.seed, self.round_number)
+            self.current_round = Round(self.round_number, dealer, self, seed=round_seed)
             
             # Dijeljenje karata
             self.current_round.deal_cards()
@@ -276,7 +282,7 @@ class Game:
             logger.error(f"Greška pri započinjanju nove runde: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def play_move(self, player, card):
         """
         Izvršava potez igrača (igranje karte).
@@ -335,7 +341,6 @@ class Game:
             logger.error(f"Greška pri igranju poteza: {str(e)}", exc_info=True)
             raise
     
-    @lru_cache(maxsize=32)
     def get_player_team(self, player):
         """
         Vraća tim kojem pripada igrač.
@@ -358,7 +363,7 @@ class Game:
             logger.error(f"Greška pri dohvaćanju tima igrača: {str(e)}", exc_info=True)
             return None
     
-    @track_execution_time
+    @sampled_timer
     def update_scores(self, team_a_points, team_b_points):
         """
         Ažurira ukupne bodove timova.
@@ -435,7 +440,7 @@ class Game:
             logger.error(f"Greška pri provjeri pobjednika igre: {str(e)}", exc_info=True)
             return None
     
-    @track_execution_time
+    @sampled_timer
     def get_game_state(self, include_hands=False):
         """
         Vraća trenutno stanje igre.
@@ -503,12 +508,16 @@ class Round:
         number (int): Redni broj runde
         dealer (Player): Igrač koji je djelitelj u ovoj rundi
         game (Game): Referenca na igru kojoj runda pripada
+        seed (int): Seed dijeljenja ove runde
+        deal (Deal): Dijeljenje karata (seed i permutacija) ili None prije dijeljenja
         trump_suit (str): Adutska boja ('S', 'H', 'D', 'C' ili None)
         calling_player (Player): Igrač koji je zvao aduta
         calling_team (str): Tim koji je zvao aduta ('a', 'b' ili None)
         player_hands (dict): Karte u rukama igrača
         tricks (list): Odigrani štihovi
         current_trick (list): Trenutni štih
+        trick_tracker (TrickTracker): Karta i igrač koji nose trenutni štih
+            te bodovi štiha do sada, ažurirani pri svakoj karti
         current_trick_index (int): Indeks trenutnog štiha
         tricks_completed (int): Broj dovršenih štihova
         team_a_tricks (list): Štihovi koje je osvojio tim A
@@ -519,8 +528,8 @@ class Round:
         current_player_index (int): Indeks trenutnog igrača
     """
     
-    @track_execution_time
-    def __init__(self, number, dealer, game):
+    @sampled_timer
+    def __init__(self, number, dealer, game, seed=None):
         """
         Inicijalizira novu rundu.
         
@@ -528,11 +537,14 @@ class Round:
             number (int): Redni broj runde
             dealer (Player): Igrač koji je djelitelj u ovoj rundi
             game (Game): Referenca na igru kojoj runda pripada
+            seed (int, optional): Seed dijeljenja; zadano nasumični seed
         """
         try:
             self.number = number
             self.dealer = dealer
             self.game = game
+            self.seed = dealing.new_seed() if seed is None else seed
+            self.deal = None  # Dijeljenje karata
             
             self.trump_suit = None  # Adutska boja
             self.calling_player = None  # Igrač koji je zvao aduta
@@ -541,6 +553,7 @@ class Round:
             self.player_hands = {}  # Karte u rukama igrača
             self.tricks = []  # Odigrani štihovi
             self.current_trick = []  # Trenutni štih
+            self.trick_tracker = TrickTracker()  # Vodeća karta trenutnog štiha
             self.current_trick_index = 0  # Indeks trenutnog štiha
             self.tricks_completed = 0  # Broj dovršenih štihova
             
@@ -568,7 +581,7 @@ class Round:
             logger.error(f"Greška pri inicijalizaciji runde: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def deal_cards(self):
         """
         Dijeli karte igračima.
@@ -580,63 +593,21 @@ class Round:
             RuntimeError: Ako dođe do greške pri dijeljenju
         """
         try:
-            # Korištenje CardService ako je dostupan, inače standardno dijeljenje
-            try:
-                from game.services.card_service import CardService
-                has_card_service = True
-            except ImportError:
-                has_card_service = False
-                logger.info("CardService nije dostupan, korištenje standardnog dijeljenja")
+            # Permutacija karata iz vlastitog generatora runde; igrači po
+            # redoslijedu sjedenja dobivaju po osam uzastopnih karata
+            self.deal = dealing.Deal(self.seed)
+            self.player_hands = {
+                player: [Card.from_code(code) for code in self.deal.hand(seat)]
+                for seat, player in enumerate(self.game.players)
+            }
             
-            if has_card_service:
-                try:
-                    # Korištenje CardService za dijeljenje
-                    logger.debug("Korištenje CardService za dijeljenje karata")
-                    
-                    # Simulacija runde za CardService
-                    round_data = {
-                        'number': self.number,
-                        'dealer': self.dealer
-                    }
-                    
-                    self.player_hands = CardService.deal_cards_to_players(round_data, self.game.players)
-                    logger.info(f"Karte podijeljene s CardService (runda: {self.number})")
-                    return self.player_hands
-                except Exception as e:
-                    logger.warning(f"Greška pri korištenju CardService: {str(e)}. Nastavak sa standardnim dijeljenjem.")
-            
-            # Standardno dijeljenje
-            # Stvaranje i miješanje špila
-            deck = Deck()
-            deck.shuffle()
-            
-            # Inicijalizacija ruku igrača
-            for player in self.game.players:
-                self.player_hands[player] = []
-            
-            # Dijeljenje karata - u Belotu se dijeli 3-3-2
-            # Prvi krug: 3 karte svakom igraču
-            for player in self.game.players:
-                for _ in range(3):
-                    self.player_hands[player].append(deck.draw())
-            
-            # Drugi krug: 3 karte svakom igraču
-            for player in self.game.players:
-                for _ in range(3):
-                    self.player_hands[player].append(deck.draw())
-            
-            # Treći krug: 2 karte svakom igraču
-            for player in self.game.players:
-                for _ in range(2):
-                    self.player_hands[player].append(deck.draw())
-            
-            logger.info(f"Karte podijeljene standardnim načinom (runda: {self.number})")
+            logger.info(f"Karte podijeljene (runda: {self.number}, seed: {self.seed})")
             return self.player_hands
         except Exception as e:
             logger.error(f"Greška pri dijeljenju karata: {str(e)}", exc_info=True)
             raise RuntimeError(f"Greška pri dijeljenju karata: {str(e)}")
     
-    @track_execution_time
+    @sampled_timer
     def call_trump(self, player, suit):
         """
         Postavlja adutsku boju na temelju zvanja igrača.
@@ -674,6 +645,7 @@ class Round:
             
             # Postavljanje aduta
             self.trump_suit = suit
+            self.trick_tracker = TrickTracker(suit, self.current_trick_index)
             self.calling_player = player
             self.calling_team = self.game.get_player_team(player)
             
@@ -686,7 +658,7 @@ class Round:
             logger.error(f"Greška pri zvanju aduta: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def play_move(self, player, card):
         """
         Izvršava potez igrača (igranje karte).
@@ -730,13 +702,13 @@ class Round:
                 logger.warning(error_msg)
                 raise ValueError(error_msg)
             
-            # Provjera valjanosti poteza
-            first_card_in_trick = self.current_trick[0][1] if self.current_trick else None
+            # Provjera valjanosti poteza (über se provjerava prema vodećoj karti štiha)
             is_valid, error_message = self.game.move_validator.validate_move(
                 card, 
                 player_cards, 
-                first_card_in_trick, 
-                self.trump_suit
+                [c for _, c in self.current_trick], 
+                self.trump_suit,
+                trick_state=self.trick_tracker.state()
             )
             
             if not is_valid:
@@ -749,6 +721,7 @@ class Round:
             
             # Dodavanje poteza u trenutni štih
             self.current_trick.append((player, card))
+            self.trick_tracker.add(card, player)
             
             logger.debug(f"Igrač {player} odigrao kartu {card} (runda: {self.number}, štih: {self.current_trick_index})")
             
@@ -790,8 +763,9 @@ class Round:
         try:
             trick = self.current_trick
             
-            # Određivanje pobjednika štiha
+            # Pobjednik i bodovi štiha već su poznati iz praćenja štiha
             winner, winning_card = self._determine_trick_winner(trick)
+            trick_points = self._calculate_trick_points(trick)
             winner_team = self.game.get_player_team(winner)
             
             # Spremanje završenog štiha
@@ -807,14 +781,12 @@ class Round:
             self.tricks_completed += 1
             self.current_trick_index += 1
             self.current_trick = []
+            self.trick_tracker.reset(self.current_trick_index)
             
             # Sljedeći igrač je pobjednik štiha
             winner_index = self.game.players.index(winner)
             self.current_player_index = winner_index
             
-            # Bodovi za štih
-            trick_points = self._calculate_trick_points(trick)
-            
             logger.debug(f"Štih {self.current_trick_index-1} završen - pobjednik: {winner}, tim: {winner_team}, bodovi: {trick_points}")
             
             return {
@@ -830,87 +802,39 @@ class Round:
             logger.error(f"Greška pri završavanju štiha: {str(e)}", exc_info=True)
             raise
     
-    def _determine_trick_winner(self, trick):
+    def _tracker_for(self, trick):
         """
-        Određuje pobjednika štiha.
+        Vraća praćenje štiha za zadani štih.
+        
+        Za trenutni štih vraća se stanje ažurirano pri igranju karata, a za
+        bilo koji drugi štih stanje se gradi jednim prolazom kroz karte.
         
         Args:
-            trick (list): Lista poteza u štihu
+            trick (list): Lista poteza (igrač, karta) u štihu
             
         Returns:
-            tuple: (pobjednik, pobjednička_karta)
+            TrickTracker: Stanje štiha
         """
-        try:
-            # Korištenje CardService ako je dostupan
-            try:
-                from game.services.card_service import CardService
-                has_card_service = True
-            except ImportError:
-                has_card_service = False
-            
-            if has_card_service:
-                try:
-                    trick_data = {
-                        'moves': [{'player': p, 'card': c.get_code() if hasattr(c, 'get_code') else str(c)} for p, c in trick],
-                        'trump_suit': self.trump_suit
-                    }
-                    result = CardService.calculate_trick_winner(trick_data)
-                    winner_index = result['winner_index']
-                    winner = trick[winner_index][0]
-                    winning_card = trick[winner_index][1]
-                    
-                    return winner, winning_card
-                except Exception as e:
-                    logger.warning(f"Greška pri korištenju CardService za određivanje pobjednika: {str(e)}. Nastavak sa standardnim određivanjem.")
-            
-            # Standardno određivanje pobjednika
-            first_player, first_card = trick[0]
-            lead_suit = first_card.suit
-            
-            highest_card_value = -1
-            winner = first_player
-            winning_card = first_card
-            
-            for player, card in trick:
-                card_value = self._get_card_value(card, lead_suit)
-                
-                if card_value > highest_card_value:
-                    highest_card_value = card_value
-                    winner = player
-                    winning_card = card
-            
-            return winner, winning_card
-        except Exception as e:
-            logger.error(f"Greška pri određivanju pobjednika štiha: {str(e)}", exc_info=True)
-            raise
+        if trick is self.current_trick and self.trick_tracker.size == len(trick):
+            return self.trick_tracker
+        return TrickTracker.from_trick(trick, self.trump_suit)
     
-    def _get_card_value(self, card, lead_suit):
+    def _determine_trick_winner(self, trick):
         """
-        Određuje vrijednost karte za usporedbu pri određivanju pobjednika štiha.
+        Određuje pobjednika štiha.
         
         Args:
-            card (Card): Karta koja se vrednuje
-            lead_suit (str): Boja koja je prva odigrana u štihu
+            trick (list): Lista poteza u štihu
             
         Returns:
-            int: Vrijednost karte za usporedbu
+            tuple: (pobjednik, pobjednička_karta)
         """
         try:
-            # Prioritet aduta nad drugim bojama
-            if card.suit == self.trump_suit:
-                # Vrijednosti adutskih karata
-                ranks = ['7', '8', 'Q', 'K', '10', 'A', '9', 'J']
-                return 100 + ranks.index(card.value)
-            elif card.suit == lead_suit:
-                # Vrijednosti karata u traženoj boji
-                ranks = ['7', '8', '9', 'J', 'Q', 'K', '10', 'A']
-                return ranks.index(card.value)
-            else:
-                # Karte druge boje nemaju vrijednost
-                return -1
+            tracker = self._tracker_for(trick)
+            return tracker.winning_player, trick[tracker.winning_position][1]
         except Exception as e:
-            logger.error(f"Greška pri određivanju vrijednosti karte: {str(e)}", exc_info=True)
-            return -1
+            logger.error(f"Greška pri određivanju pobjednika štiha: {str(e)}", exc_info=True)
+            raise
     
     def _calculate_trick_points(self, trick):
         """
@@ -923,60 +847,12 @@ class Round:
             int: Bodovi za štih
         """
         try:
-            # Korištenje CardService ako je dostupan
-            try:
-                from game.services.card_service import CardService
-                has_card_service = True
-            except ImportError:
-                has_card_service = False
-            
-            if has_card_service:
-                try:
-                    trick_data = {
-                        'moves': [{'player': p, 'card': c.get_code() if hasattr(c, 'get_code') else str(c)} for p, c in trick],
-                        'trump_suit': self.trump_suit
-                    }
-                    result = CardService.calculate_trick_points(trick_data)
-                    return result['points']
-                except Exception as e:
-                    logger.warning(f"Greška pri korištenju CardService za računanje bodova: {str(e)}. Nastavak sa standardnim računanjem.")
-            
-            # Standardno računanje bodova
-            total_points = 0
-            
-            for _, card in trick:
-                # Bodovanje ovisi o tome je li karta adut
-                if card.suit == self.trump_suit:
-                    if card.value == 'J':
-                        total_points += 20
-                    elif card.value == '9':
-                        total_points += 14
-                    elif card.value == 'A':
-                        total_points += 11
-                    elif card.value == '10':
-                        total_points += 10
-                    elif card.value == 'K':
-                        total_points += 4
-                    elif card.value == 'Q':
-                        total_points += 3
-                else:
-                    if card.value == 'A':
-                        total_points += 11
-                    elif card.value == '10':
-                        total_points += 10
-                    elif card.value == 'K':
-                        total_points += 4
-                    elif card.value == 'Q':
-                        total_points += 3
-                    elif card.value == 'J':
-                        total_points += 2
-            
-            return total_points
+            return self._tracker_for(trick).points
         except Exception as e:
             logger.error(f"Greška pri računanju bodova za štih: {str(e)}", exc_info=True)
             return 0
     
-    @track_execution_time
+    @sampled_timer
     def declare_combination(self, player, declaration_type, cards):
         """
         Prijavljuje zvanje (kombinaciju karata).
@@ -1103,7 +979,7 @@ class Round:
             logger.error(f"Greška pri računanju bodova za zvanje: {str(e)}", exc_info=True)
             return 0
     
-    @track_execution_time
+    @sampled_timer
     def declare_bela(self, player):
         """
         Prijavljuje belu (kralj i kraljica aduta).
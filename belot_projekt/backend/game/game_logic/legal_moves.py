@@ -0,0 +1,275 @@
+"""
+Modul koji određuje dozvoljene karte za potez u Belot igri.
+
+Pravila praćenja boje, obaveznog bacanja aduta i übera (igranja jače
+karte) ovdje su implementirana na jednom mjestu nad bitmask prikazom ruke
+iz modula card_mask. Stanje štiha sažima se u par (tražena boja, indeks
+karte koja trenutno nosi štih), a za svaki takav par i adut unaprijed je
+izračunata tablica maski zahtjeva. Skup dozvoljenih karata za bilo koju
+ruku tada se dobiva s nekoliko cjelobrojnih operacija.
+
+Rules, MoveValidator i CardService delegiraju provjeru poteza ovom modulu.
+"""
+
+from game.game_logic import card_mask
+
+# Razlozi zbog kojih karta nije dozvoljena
+REASON_NOT_IN_HAND = 'not_in_hand'
+REASON_FOLLOW_SUIT = 'follow_suit'
+REASON_PLAY_HIGHER = 'play_higher'
+REASON_PLAY_TRUMP = 'play_trump'
+REASON_OVERTRUMP = 'overtrump'
+
+
+def _build_requirements_table():
+    """
+    Gradi tablicu maski zahtjeva za sva moguća stanja štiha.
+
+    Ključ tablice je (tražena boja, indeks karte koja nosi štih, adut), a
+    vrijednost četvorka maski (karte tražene boje, jače karte tražene boje
+    koje se moraju igrati ako postoje, karte aduta, jači aduti koji se
+    moraju igrati ako postoje). Maska jačih karata je 0 kada obaveza
+    übera ne postoji.
+
+    Returns:
+        dict: Tablica zahtjeva po stanju štiha
+    """
+    table = {}
+    for trump in card_mask.SUITS + (None,):
+        trump_bits = card_mask.SUIT_MASKS[trump] if trump else 0
+        for lead in card_mask.SUITS:
+            follow_bits = card_mask.SUIT_MASKS[lead]
+            for winning in range(card_mask.NUM_CARDS):
+                winning_suit = card_mask.INDEX_SUIT[winning]
+                if winning_suit == trump:
+                    higher_trumps = card_mask.HIGHER_TRUMP[winning]
+                else:
+                    higher_trumps = 0
+
+                if lead == trump:
+                    higher_follow = higher_trumps
+                elif winning_suit == lead:
+                    higher_follow = card_mask.HIGHER_NON_TRUMP[winning]
+                else:
+                    # Štih je već presječen adutom, übati se ne mora
+                    higher_follow = 0
+
+                table[(lead, winning, trump)] = (
+                    follow_bits, higher_follow, trump_bits, higher_trumps
+                )
+    return table
+
+
+# Maske zahtjeva za sva stanja štiha (4 boje x 32 karte x 5 aduta)
+TRICK_REQUIREMENTS = _build_requirements_table()
+
+
+def _entry_code(entry):
+    """
+    Vraća kod karte iz stavke štiha.
+
+    Stavka može biti Card objekt, kod karte, Move objekt ili rječnik kakav
+    se sprema u Round.current_trick_cards (s ključem 'card' ili 'card_code').
+
+    Args:
+        entry (Card, str, Move or dict): Stavka štiha
+
+    Returns:
+        str: Kod karte
+    """
+    if isinstance(entry, dict):
+        return entry.get('card') or entry.get('card_code')
+    return getattr(entry, 'card_code', entry)
+
+
+def card_beats(index, winning, trump):
+    """
+    Provjerava je li karta jača od karte koja trenutno nosi štih.
+
+    Args:
+        index (int): Indeks karte koja se uspoređuje
+        winning (int): Indeks karte koja trenutno nosi štih
+        trump (str): Kod adutske boje ili None
+
+    Returns:
+        bool: True ako karta preuzima štih
+    """
+    winning_suit = card_mask.INDEX_SUIT[winning]
+    if winning_suit == trump:
+        return bool(card_mask.CARD_BITS[index] & card_mask.HIGHER_TRUMP[winning])
+    if card_mask.INDEX_SUIT[index] == trump:
+        return True
+    return bool(card_mask.CARD_BITS[index] & card_mask.HIGHER_NON_TRUMP[winning])
+
+
+def trick_state(trick, trump_suit=None):
+    """
+    Sažima štih u stanje potrebno za određivanje dozvoljenih karata.
+
+    Args:
+        trick (list): Karte već odigrane u štihu (Card, kodovi, Move ili rječnici)
+        trump_suit (str, optional): Adutska boja
+
+    Returns:
+        tuple: (tražena boja, indeks karte koja nosi štih) ili None za prazan štih
+
+    Raises:
+        ValueError: Ako štih sadrži nevažeću kartu
+    """
+    if not trick:
+        return None
+    trump = card_mask.suit_code(trump_suit)
+    winning = card_mask.card_index(_entry_code(trick[0]))
+    lead = card_mask.INDEX_SUIT[winning]
+    for entry in trick[1:]:
+        index = card_mask.card_index(_entry_code(entry))
+        if card_beats(index, winning, trump):
+            winning = index
+    return lead, winning
+
+
+def legal_mask_for_state(hand_bits, state, trump_suit=None):
+    """
+    Vraća masku dozvoljenih karata za već sažeto stanje štiha.
+
+    Args:
+        hand_bits (int): Maska ruke
+        state (tuple): Stanje štiha iz trick_state ili None za prazan štih
+        trump_suit (str, optional): Adutska boja
+
+    Returns:
+        int: Maska dozvoljenih karata
+    """
+    if state is None:
+        return hand_bits
+    lead, winning = state
+    follow_bits, higher_follow, trump_bits, higher_trumps = TRICK_REQUIREMENTS[
+        (lead, winning, card_mask.suit_code(trump_suit))
+    ]
+
+    # Igrač mora pratiti boju i übati ako može
+    cards = hand_bits & follow_bits
+    if cards:
+        return (cards & higher_follow) or cards
+
+    # Bez tražene boje mora baciti aduta, i to jačeg ako ga ima
+    cards = hand_bits & trump_bits
+    if cards:
+        return (cards & higher_trumps) or cards
+
+    # Bez tražene boje i aduta može baciti bilo koju kartu
+    return hand_bits
+
+
+def legal_moves_mask(hand, trick, trump_suit=None):
+    """
+    Vraća masku svih karata iz ruke koje se smiju odigrati.
+
+    Args:
+        hand (int, Player or list): Ruka igrača (maska, igrač ili lista karata)
+        trick (list): Karte već odigrane u štihu
+        trump_suit (str, optional): Adutska boja
+
+    Returns:
+        int: Maska dozvoljenih karata
+
+    Raises:
+        ValueError: Ako ruka ili štih sadrže nevažeću kartu
+    """
+    return legal_mask_for_state(
+        card_mask.hand_mask(hand), trick_state(trick, trump_suit), trump_suit
+    )
+
+
+def legal_cards(hand, trick, trump_suit=None):
+    """
+    Vraća karte iz ruke koje se smiju odigrati.
+
+    Čuva izvorne objekte iz ruke i njihov redoslijed.
+
+    Args:
+        hand (list): Karte u ruci igrača (Card objekti ili kodovi)
+        trick (list): Karte već odigrane u štihu
+        trump_suit (str, optional): Adutska boja
+
+    Returns:
+        list: Dozvoljene karte
+
+    Raises:
+        ValueError: Ako ruka ili štih sadrže nevažeću kartu
+    """
+    return card_mask.filter_cards(hand, legal_moves_mask(hand, trick, trump_suit))
+
+
+def must_play_higher(hand, trick, trump_suit=None, state=None):
+    """
+    Provjerava postoji li za ruku obaveza übanja (igranja jače karte).
+
+    Obaveza postoji kada igrač ima traženu boju i kartu jaču od one koja
+    nosi štih, a štih nije presječen adutom, odnosno kada nema traženu
+    boju, štih je presječen i igrač ima jačeg aduta.
+
+    Args:
+        hand (int, Player or list): Ruka igrača
+        trick (list): Karte već odigrane u štihu
+        trump_suit (str, optional): Adutska boja
+        state (tuple, optional): Već poznato stanje štiha (npr. iz
+            TrickTracker.state); tada se štih ne prolazi ponovno
+
+    Returns:
+        bool: True ako igrač mora igrati jaču kartu
+
+    Raises:
+        ValueError: Ako ruka ili štih sadrže nevažeću kartu
+    """
+    if state is None:
+        state = trick_state(trick, trump_suit)
+    if state is None:
+        return False
+    hand_bits = card_mask.hand_mask(hand)
+    lead, winning = state
+    follow_bits, higher_follow, trump_bits, higher_trumps = TRICK_REQUIREMENTS[
+        (lead, winning, card_mask.suit_code(trump_suit))
+    ]
+    if hand_bits & follow_bits:
+        return bool(hand_bits & higher_follow)
+    return bool(hand_bits & trump_bits & higher_trumps)
+
+
+def illegal_reason(card, hand, trick, trump_suit=None, state=None):
+    """
+    Vraća razlog zbog kojeg se karta ne smije odigrati.
+
+    Args:
+        card (Card or str): Karta koju igrač želi odigrati
+        hand (int, Player or list): Ruka igrača
+        trick (list): Karte već odigrane u štihu
+        trump_suit (str, optional): Adutska boja
+        state (tuple, optional): Već poznato stanje štiha (npr. iz
+            TrickTracker.state); tada se štih ne prolazi ponovno
+
+    Returns:
+        str: Jedna od REASON_* konstanti ili None ako je karta dozvoljena
+
+    Raises:
+        ValueError: Ako karta, ruka ili štih sadrže nevažeću kartu
+    """
+    bit = card_mask.card_bit(card)
+    hand_bits = card_mask.hand_mask(hand)
+    if not hand_bits & bit:
+        return REASON_NOT_IN_HAND
+
+    if state is None:
+        state = trick_state(trick, trump_suit)
+    if legal_mask_for_state(hand_bits, state, trump_suit) & bit:
+        return None
+
+    lead, winning = state
+    follow_bits, _, trump_bits, _ = TRICK_REQUIREMENTS[
+        (lead, winning, card_mask.suit_code(trump_suit))
+    ]
+    if hand_bits & follow_bits:
+        return REASON_PLAY_HIGHER if bit & follow_bits else REASON_FOLLOW_SUIT
+    if bit & trump_bits:
+        return REASON_OVERTRUMP
+    return REASON_PLAY_TRUMP
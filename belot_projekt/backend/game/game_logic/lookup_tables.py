@@ -0,0 +1,126 @@
+"""
+Modul s nepromjenjivim tablicama jačine i bodova karata.
+
+Tablice se grade jednom pri učitavanju modula i dijele ih svi objekti u
+procesu. Jačina karte u štihu indeksirana je s (adut, tražena boja,
+indeks karte), a bodovna vrijednost s (adut, indeks karte), gdje je
+indeks karte onaj iz modula card_mask. Rules i Scoring iz njih čitaju
+umjesto da rezultate pamte u lru_cache na metodama instance, koji drži
+svaku instancu živom i ne dijeli se među igrama.
+
+Vrijednosti su iste kao u Rules.get_card_value_in_trick i
+Scoring.get_card_point_value: adut ima jačinu 100 + rang aduta, karta
+tražene boje rang bez aduta, a ostale karte -1.
+"""
+
+from types import MappingProxyType
+
+from game.game_logic import card_mask
+
+# Ključevi boja za indeksiranje tablica; zadnji (None) znači "bez boje"
+SUIT_KEYS = card_mask.SUITS + (None,)
+NO_SUIT = len(card_mask.SUITS)
+
+# Oznaka jačine za karte koje ne prate traženu boju i nisu adut
+OFF_SUIT_STRENGTH = -1
+
+# Jačina aduta je uvijek veća od jačine karte bez aduta
+TRUMP_STRENGTH_BASE = 100
+
+# Indeks boje u tablicama za sve prihvaćene zapise boje
+SUIT_INDEX = MappingProxyType({
+    **{suit: index for index, suit in enumerate(card_mask.SUITS)},
+    **{name: card_mask.SUITS.index(code) for name, code in card_mask.SUIT_MAP.items()},
+    None: NO_SUIT,
+    '': NO_SUIT,
+})
+
+
+def _build_strength_table():
+    """
+    Gradi tablicu jačine karata u štihu.
+
+    Returns:
+        tuple: TRICK_STRENGTH[adut][tražena boja][indeks karte]
+    """
+    trump_rank = {value: rank for rank, value in enumerate(card_mask.TRUMP_RANKING)}
+    non_trump_rank = {value: rank for rank, value in enumerate(card_mask.NON_TRUMP_RANKING)}
+    table = []
+    for trump in SUIT_KEYS:
+        by_lead = []
+        for lead in SUIT_KEYS:
+            row = []
+            for index in range(card_mask.NUM_CARDS):
+                suit, value = card_mask.INDEX_SUIT[index], card_mask.INDEX_VALUE[index]
+                if suit == trump:
+                    row.append(TRUMP_STRENGTH_BASE + trump_rank[value])
+                elif suit == lead:
+                    row.append(non_trump_rank[value])
+                else:
+                    row.append(OFF_SUIT_STRENGTH)
+            by_lead.append(tuple(row))
+        table.append(tuple(by_lead))
+    return tuple(table)
+
+
+# Jačina karte po adutu, traženoj boji i indeksu karte
+TRICK_STRENGTH = _build_strength_table()
+
+# Bodovna vrijednost karte po adutu i indeksu karte (zadnji red: bez aduta)
+POINTS = tuple(card_mask.CARD_POINTS[suit] for suit in card_mask.SUITS) + (
+    tuple(
+        card_mask.NON_TRUMP_POINTS[card_mask.INDEX_VALUE[index]]
+        for index in range(card_mask.NUM_CARDS)
+    ),
+)
+
+
+def suit_index(suit):
+    """
+    Vraća indeks boje za tablice.
+
+    Args:
+        suit (str): Kod boje, puno ime ili None
+
+    Returns:
+        int: Indeks boje (NO_SUIT za None ili nepoznatu boju)
+    """
+    index = SUIT_INDEX.get(suit)
+    if index is None:
+        index = SUIT_INDEX.get(card_mask.suit_code(suit), NO_SUIT)
+    return index
+
+
+def trick_strength(card, lead_suit, trump_suit):
+    """
+    Vraća jačinu karte u štihu.
+
+    Args:
+        card (Card or str): Karta ili kod karte
+        lead_suit (str): Tražena boja
+        trump_suit (str): Adutska boja
+
+    Returns:
+        int: Jačina karte (veći broj je jača karta)
+
+    Raises:
+        ValueError: Ako karta nije valjana
+    """
+    return TRICK_STRENGTH[suit_index(trump_suit)][suit_index(lead_suit)][card_mask.card_index(card)]
+
+
+def card_points(card, trump_suit):
+    """
+    Vraća bodovnu vrijednost karte.
+
+    Args:
+        card (Card or str): Karta ili kod karte
+        trump_suit (str): Adutska boja
+
+    Returns:
+        int: Bodovna vrijednost karte
+
+    Raises:
+        ValueError: Ako karta nije valjana
+    """
+    return POINTS[suit_index(trump_suit)][card_mask.card_index(card)]
@@ -8,7 +8,8 @@ u igri Belot, s metodama za upravljanje kartama, potezima i stanjem igrača.
 import logging
 from functools import lru_cache
 from game.game_logic.card import Card
-from utils.decorators import track_execution_time
+from game.game_logic import card_mask
+from game.utils.profiling import sampled_timer
 
 # Konfiguracija loggera
 logger = logging.getLogger(__name__)
@@ -25,6 +26,7 @@ class Player:
         username (str): Korisničko ime igrača
         team (str): Tim kojem igrač pripada ('a' ili 'b', None ako nije dodijeljen)
         hand (list): Karte u ruci igrača
+        hand_mask (int): Bitmask prikaz ruke (jedan bit po karti, vidi card_mask)
         score (int): Osobna statistika bodova
         games_played (int): Broj odigranih igara
         games_won (int): Broj pobjeda
@@ -42,7 +44,7 @@ class Player:
     SUIT_ORDER = {'S': 0, 'H': 1, 'D': 2, 'C': 3}
     VALUE_ORDER = {'7': 0, '8': 1, '9': 2, '10': 3, 'J': 4, 'Q': 5, 'K': 6, 'A': 7}
     
-    @track_execution_time
+    @sampled_timer
     def __init__(self, id, username, team=None):
         """
         Inicijalizira novog igrača.
@@ -65,6 +67,7 @@ class Player:
             
             self.team = team
             self.hand = []  # Karte u ruci igrača
+            self.hand_mask = 0  # Bitmask prikaz ruke
             self.score = 0  # Osobna statistika bodova
             self.games_played = 0  # Broj odigranih igara
             self.games_won = 0  # Broj pobjeda
@@ -90,7 +93,7 @@ class Player:
         self._cache_timestamp = time.time()
         self._hand_by_suit = {}  # Poništi keš karata po bojama
     
-    @track_execution_time
+    @sampled_timer
     def add_card(self, card):
         """
         Dodaje kartu u ruku igrača.
@@ -115,11 +118,13 @@ class Player:
             
             # Provjeri da igrač nema već tu kartu
             card_code = card.get_code() if hasattr(card, 'get_code') else str(card)
-            if self.has_card(card_code):
+            bit = card_mask.card_bit(card_code)
+            if self.hand_mask & bit:
                 logger.debug(f"Igrač {self.username} već ima kartu {card_code}")
                 return False
             
             self.hand.append(card)
+            self.hand_mask |= bit
             
             # Invalidacija keša
             self._invalidate_cache()
@@ -133,7 +138,7 @@ class Player:
             logger.error(f"Greška pri dodavanju karte igraču {self.username}: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def remove_card(self, card):
         """
         Uklanja kartu iz ruke igrača.
@@ -158,6 +163,7 @@ class Player:
                     if c_code == card_code:
                         card_found = True
                         removed_card = self.hand.pop(i)
+                        self.hand_mask &= ~card_mask.card_bit(card_code)
                         
                         # Invalidacija keša
                         self._invalidate_cache()
@@ -172,6 +178,7 @@ class Player:
             # Ako je objekt Card
             if card in self.hand:
                 self.hand.remove(card)
+                self.hand_mask &= ~card_mask.card_bit(card)
                 
                 # Invalidacija keša
                 self._invalidate_cache()
@@ -186,7 +193,7 @@ class Player:
             logger.error(f"Greška pri uklanjanju karte od igrača {self.username}: {str(e)}", exc_info=True)
             return None
     
-    @track_execution_time
+    @sampled_timer
     def has_card(self, card):
         """
         Provjerava ima li igrač određenu kartu.
@@ -198,22 +205,16 @@ class Player:
             bool: True ako igrač ima kartu, False inače
         """
         try:
-            # Pretvori string u kod karte ako je potrebno
-            if isinstance(card, str):
-                card_code = card
-                for c in self.hand:
-                    c_code = c.get_code() if hasattr(c, 'get_code') else str(c)
-                    if c_code == card_code:
-                        return True
+            # Provjera jednim bitom umjesto prolaska kroz ruku
+            index = card_mask.CARD_INDEX.get(card if isinstance(card, str) else getattr(card, 'code', None))
+            if index is None:
                 return False
-            
-            # Ako je objekt Card
-            return card in self.hand
+            return bool(self.hand_mask & card_mask.CARD_BITS[index])
         except Exception as e:
             logger.error(f"Greška pri provjeri karte u ruci igrača {self.username}: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def get_cards_of_suit(self, suit):
         """
         Vraća sve karte određene boje iz ruke igrača.
@@ -238,8 +239,11 @@ class Player:
             if suit in self._hand_by_suit and self._hand_by_suit[suit]['timestamp'] == self._cache_timestamp:
                 return self._hand_by_suit[suit]['cards']
             
-            # Inače, filtriraj karte
-            cards_of_suit = [card for card in self.hand if card.suit == suit]
+            # Inače, filtriraj karte (bez prolaska kroz ruku ako boje nema)
+            if self.hand_mask & card_mask.SUIT_MASKS[suit]:
+                cards_of_suit = [card for card in self.hand if card.suit == suit]
+            else:
+                cards_of_suit = []
             
             # Spremi u keš
             self._hand_by_suit[suit] = {
@@ -255,7 +259,7 @@ class Player:
             logger.error(f"Greška pri dohvaćanju karata boje {suit} za igrača {self.username}: {str(e)}", exc_info=True)
             return []
     
-    @track_execution_time
+    @sampled_timer
     def has_suit(self, suit):
         """
         Provjerava ima li igrač karte određene boje.
@@ -276,8 +280,8 @@ class Player:
                 logger.warning(error_msg)
                 raise ValueError(error_msg)
             
-            # Koristi get_cards_of_suit jer već ima keširanje
-            return len(self.get_cards_of_suit(suit)) > 0
+            # Jedna cjelobrojna operacija nad maskom ruke
+            return bool(self.hand_mask & card_mask.SUIT_MASKS[suit])
         except ValueError as e:
             # Prosljeđivanje ValueError-a
             raise
@@ -285,7 +289,7 @@ class Player:
             logger.error(f"Greška pri provjeri ima li igrač {self.username} boju {suit}: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def can_play_card(self, card, trick, trump_suit):
         """
         Provjerava može li igrač odigrati određenu kartu prema pravilima igre.
@@ -324,7 +328,7 @@ class Player:
                     return False
             
             # Ako igrač nema kartu u ruci, ne može ju odigrati
-            if card not in self.hand:
+            if not self.has_card(card):
                 logger.debug(f"Igrač {self.username} nema kartu {card} u ruci")
                 return False
             
@@ -372,7 +376,7 @@ class Player:
             logger.error(f"Greška pri provjeri može li igrač {self.username} odigrati kartu {card}: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def play_card(self, card, trick, trump_suit):
         """
         Igra kartu iz ruke igrača.
@@ -428,7 +432,7 @@ class Player:
             logger.error(f"Greška pri igranju karte za igrača {self.username}: {str(e)}", exc_info=True)
             raise
     
-    @track_execution_time
+    @sampled_timer
     def clear_hand(self):
         """
         Uklanja sve karte iz ruke igrača.
@@ -439,6 +443,7 @@ class Player:
         try:
             cards = self.hand.copy()
             self.hand = []
+            self.hand_mask = 0
             
             # Invalidacija keša
             self._invalidate_cache()
@@ -449,7 +454,7 @@ class Player:
             logger.error(f"Greška pri čišćenju ruke igrača {self.username}: {str(e)}", exc_info=True)
             return []
     
-    @track_execution_time
+    @sampled_timer
     def set_team(self, team):
         """
         Postavlja tim kojem igrač pripada.
@@ -479,7 +484,7 @@ class Player:
             logger.error(f"Greška pri postavljanju tima za igrača {self.username}: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def sort_hand(self):
         """
         Sortira karte u ruci igrača.
@@ -507,7 +512,7 @@ class Player:
             # U slučaju greške, vrati trenutnu ruku bez sortiranja
             return self.hand
     
-    @track_execution_time
+    @sampled_timer
     def update_stats(self, game_won):
         """
         Ažurira statistiku igrača nakon igre.
@@ -0,0 +1,126 @@
+"""
+Modul koji zbraja bodove runde štih po štih.
+
+Umjesto da se na kraju runde ponovno dohvaćaju svi potezi, grupiraju po
+štihovima i za svaki štih traži pobjednik, RoundScore pri završetku
+svakog štiha bilježi pobjednika, njegov tim i bodove štiha te održava
+zbroj bodova i broj osvojenih štihova po timu. Bodovi za zadnji štih
+dodaju se pri osmom štihu, a štih-mač (štiglja) pri čitanju zbroja.
+Stanje se sprema u Round.round_data['score'], pa je rezultat runde na
+njenom kraju samo čitanje.
+
+Primjer:
+    score = RoundScore.from_dict(round_obj.round_data.get('score'))
+    score.add_trick(winner_id, 'a', tracker.points)
+    team_a, team_b = score.trick_totals()
+"""
+
+from game.game_logic.scoring import Scoring
+
+# Broj štihova u rundi
+TRICKS_PER_ROUND = 8
+
+# Ključ pod kojim se stanje sprema u Round.round_data
+SCORE_KEY = 'score'
+
+
+class RoundScore:
+    """
+    Bodovi runde iz završenih štihova.
+
+    Attributes:
+        tricks (list): Završeni štihovi kao [id pobjednika, tim, bodovi]
+        trick_points (dict): Zbroj bodova štihova po timu ('a', 'b')
+        tricks_won (dict): Broj osvojenih štihova po timu
+    """
+
+    __slots__ = ('tricks', 'trick_points', 'tricks_won')
+
+    def __init__(self):
+        """Inicijalizira praznu rundu."""
+        self.tricks = []
+        self.trick_points = {'a': 0, 'b': 0}
+        self.tricks_won = {'a': 0, 'b': 0}
+
+    @property
+    def tricks_completed(self):
+        """int: Broj završenih štihova."""
+        return len(self.tricks)
+
+    @property
+    def is_complete(self):
+        """bool: Jesu li završeni svi štihovi runde."""
+        return len(self.tricks) >= TRICKS_PER_ROUND
+
+    def add_trick(self, winner_id, team, points):
+        """
+        Bilježi završeni štih.
+
+        Args:
+            winner_id: Identifikator igrača koji je osvojio štih
+            team (str): Tim pobjednika ('a' ili 'b')
+            points (int): Bodovi karata u štihu
+
+        Returns:
+            int: Bodovi štiha, uključujući bodove za zadnji štih
+
+        Raises:
+            ValueError: Ako je runda već završena ili tim nije valjan
+        """
+        if self.is_complete:
+            raise ValueError("Svi štihovi runde su već zabilježeni")
+        if team not in self.trick_points:
+            raise ValueError(f"Nevažeći tim: {team}")
+
+        if len(self.tricks) == TRICKS_PER_ROUND - 1:
+            points += Scoring.LAST_TRICK_BONUS
+        self.tricks.append([winner_id, team, points])
+        self.trick_points[team] += points
+        self.tricks_won[team] += 1
+        return points
+
+    def trick_totals(self):
+        """
+        Vraća bodove iz štihova po timu, uključujući štih-mač.
+
+        Returns:
+            tuple: (bodovi tima A, bodovi tima B)
+        """
+        team_a, team_b = self.trick_points['a'], self.trick_points['b']
+        if self.is_complete:
+            if self.tricks_won['a'] == 0:
+                team_b += Scoring.CLEAN_SWEEP_BONUS
+            elif self.tricks_won['b'] == 0:
+                team_a += Scoring.CLEAN_SWEEP_BONUS
+        return team_a, team_b
+
+    def last_winner(self):
+        """Vraća identifikator igrača koji je osvojio zadnji štih ili None."""
+        return self.tricks[-1][0] if self.tricks else None
+
+    def to_dict(self):
+        """
+        Vraća stanje za spremanje u JSON.
+
+        Returns:
+            dict: Završeni štihovi
+        """
+        return {'tricks': [list(trick) for trick in self.tricks]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Obnavlja stanje iz spremljenih podataka.
+
+        Args:
+            data (dict): Podaci iz to_dict ili None
+
+        Returns:
+            RoundScore: Obnovljeno stanje (prazno ako nema podataka)
+        """
+        score = cls()
+        for winner_id, team, points in (data or {}).get('tricks', []):
+            score.tricks.append([winner_id, team, points])
+            score.trick_points[team] += points
+            score.tricks_won[team] += 1
+        return score
@@ -7,9 +7,12 @@ određivanje pobjednika štiha, i rangiranje karata.
 """
 
 import logging
-from functools import lru_cache
 from game.game_logic.card import Card
-from utils.decorators import track_execution_time
+from game.game_logic import card_mask
+from game.game_logic import legal_moves
+from game.game_logic import lookup_tables
+from game.game_logic.declarations import detect_declarations, find_sequences
+from game.utils.profiling import sampled_timer
 
 # Konfiguracija loggera
 logger = logging.getLogger(__name__)
@@ -57,7 +60,7 @@ class Rules:
         'clubs': 'C'
     }
     
-    @track_execution_time
+    @sampled_timer
     def __init__(self):
         """Inicijalizira objekt pravila igre."""
         self._cache_timestamp = 0.0
@@ -67,13 +70,11 @@ class Rules:
         """Invalidira sve kešove povezane s objektom pravila."""
         import time
         self._cache_timestamp = time.time()
-        # Briše sve keširane vrijednosti pozivanjem odgovarajućih clear metoda
-        self.get_card_value_in_trick.cache_clear()
-        self._normalize_suit.cache_clear()
+        # Tablice jačine i bodova su nepromjenjive i zajedničke svim
+        # instancama, pa nema keširanih vrijednosti koje treba brisati
         logger.debug("Keš pravila igre invalidiran")
     
-    @track_execution_time
-    @lru_cache(maxsize=128)
+    @sampled_timer
     def get_card_value_in_trick(self, card, lead_suit, trump_suit):
         """
         Određuje jačinu karte u štihu.
@@ -90,33 +91,21 @@ class Rules:
             ValueError: Ako je karta nevažeća
         """
         try:
-            # Normalizacija boja iz punih imena u kodove
-            trump_suit_code = self._normalize_suit(trump_suit)
-            lead_suit_code = self._normalize_suit(lead_suit)
-            
             # Validacija karte
             if not hasattr(card, 'suit') or not hasattr(card, 'value'):
                 error_msg = f"Nevažeća karta: {card}"
                 logger.warning(error_msg)
                 raise ValueError(error_msg)
             
-            # Ako je karta adut, određujemo njenu jačinu prema poretku aduta
-            if card.suit == trump_suit_code:
-                # Adut uvijek pobjedi ne-adut
-                return 100 + self.TRUMP_ORDER.get(card.value, 0)
-            
-            # Ako karta prati traženu boju, rangiramo je prema ne-adutskom poretku
-            if card.suit == lead_suit_code:
-                return self.NON_TRUMP_ORDER.get(card.value, 0)
-            
-            # Ako karta ne prati traženu boju i nije adut, ima najnižu vrijednost
-            return -1
+            # Adut ima jačinu 100 + rang aduta, karta tražene boje rang bez
+            # aduta, a karta koja ne prati boju i nije adut -1
+            return lookup_tables.trick_strength(card, lead_suit, trump_suit)
         except Exception as e:
             logger.error(f"Greška pri određivanju jačine karte: {str(e)}", exc_info=True)
             # U slučaju greške, vrati negativnu vrijednost
             return -100
     
-    @track_execution_time
+    @sampled_timer
     def is_card_playable(self, card, hand, trick, trump_suit):
         """
         Provjerava može li se karta odigrati prema pravilima igre.
@@ -139,69 +128,47 @@ class Rules:
                 logger.debug("Ruka je prazna, karta se ne može odigrati")
                 return False
             
-            if card not in hand:
-                logger.debug(f"Karta {card} nije u ruci, ne može se odigrati")
-                return False
-            
-            # Ako je prvi potez u štihu, može se odigrati bilo koja karta
-            if not trick:
-                return True
-            
-            # Prva karta u štihu određuje traženu boju
-            lead_card = trick[0]
-            if not hasattr(lead_card, 'suit'):
-                error_msg = f"Prva karta u štihu nema svojstvo 'suit': {lead_card}"
-                logger.warning(error_msg)
-                raise ValueError(error_msg)
-                
-            lead_suit = lead_card.suit
-            
-            # Normalizacija adutske boje
-            trump_suit_code = self._normalize_suit(trump_suit)
-            
-            # Praćenje boje - ako igrač ima kartu tražene boje, mora je igrati
-            has_lead_suit = any(c.suit == lead_suit for c in hand)
-            if has_lead_suit:
-                # Provjera mora li igrati jaču kartu (übati) ako može
-                if card.suit == lead_suit and self.must_play_higher_card(card, hand, trick, trump_suit):
-                    higher_cards = [c for c in hand if c.suit == lead_suit and 
-                                self.get_card_value_in_trick(c, lead_suit, trump_suit) >
-                                self.get_card_value_in_trick(lead_card, lead_suit, trump_suit)]
-                    valid_move = len(higher_cards) == 0 or card in higher_cards
-                    if not valid_move:
-                        logger.debug(f"Igrač mora odigrati jaču kartu od {lead_card} ako može")
-                    return valid_move
-                
-                # Inače, može igrati bilo koju kartu tražene boje
-                valid_move = card.suit == lead_suit
-                if not valid_move:
-                    logger.debug(f"Igrač mora pratiti boju {lead_suit}, ali je pokušao odigrati kartu boje {card.suit}")
-                return valid_move
-            
-            # Ako nema traženu boju, provjeri je li netko već bacio aduta
-            adut_played = any(c.suit == trump_suit_code for c in trick)
-            
-            # Ako adut nije igran i igrač ima aduta, mora ga baciti
-            has_trump = any(c.suit == trump_suit_code for c in hand)
-            if not adut_played and has_trump:
-                valid_move = card.suit == trump_suit_code
-                if not valid_move:
-                    logger.debug(f"Igrač mora odigrati aduta {trump_suit_code}, ali je pokušao odigrati kartu boje {card.suit}")
-                return valid_move
-            
-            # Ako igrač nema ni traženu boju ni aduta, može igrati bilo koju kartu
-            return True
+            # Praćenje boje, bacanje aduta i über određuje generator dozvoljenih poteza
+            reason = legal_moves.illegal_reason(card, hand, trick, trump_suit)
+            if reason:
+                logger.debug(f"Karta {card} se ne može odigrati: {reason}")
+            return reason is None
         except Exception as e:
             logger.error(f"Greška pri provjeri može li se karta odigrati: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
+    def get_playable_cards(self, hand, trick, trump_suit):
+        """
+        Vraća sve karte iz ruke koje se mogu odigrati u trenutnom štihu.
+        
+        Args:
+            hand (list): Lista karata u ruci igrača
+            trick (list): Lista već odigranih karata u trenutnom štihu
+            trump_suit (str): Adutska boja
+            
+        Returns:
+            list: Karte koje se mogu odigrati
+            
+        Raises:
+            ValueError: Ako su parametri nevažeći
+        """
+        try:
+            if not hand:
+                return []
+            return legal_moves.legal_cards(hand, trick, trump_suit)
+        except Exception as e:
+            logger.error(f"Greška pri određivanju karata koje se mogu odigrati: {str(e)}", exc_info=True)
+            return []
+    
+    @sampled_timer
     def must_play_higher_card(self, card, hand, trick, trump_suit):
         """
         Provjerava mora li igrač igrati višu kartu (übati) ako može.
         
         Prema pravilima Belota, igrač mora igrati višu kartu od najviše 
         karte u štihu ako ima traženu boju, osim ako je adut već igran.
+        Ako nema traženu boju, a štih je presječen, mora igrati jačeg aduta.
         
         Args:
             card (Card): Karta koju igrač želi odigrati
@@ -216,50 +183,12 @@ class Rules:
             ValueError: Ako su parametri nevažeći
         """
         try:
-            # Ako je prvi potez u štihu, nema potrebe za übati
-            if not trick:
-                return False
-            
-            # Prva karta u štihu određuje traženu boju
-            lead_card = trick[0]
-            lead_suit = lead_card.suit
-            
-            # Normalizacija adutske boje
-            trump_suit_code = self._normalize_suit(trump_suit)
-            
-            # Provjeri je li adut već igran
-            adut_played = any(c.suit == trump_suit_code for c in trick)
-            if adut_played:
-                return False  # Ako je adut već igran, ne mora übati
-            
-            # Pronađi najvišu kartu tražene boje u štihu
-            same_suit_cards = [c for c in trick if c.suit == lead_suit]
-            if not same_suit_cards:
-                return False  # Ako nema karata tražene boje, ne mora übati
-            
-            highest_card = max(same_suit_cards, 
-                            key=lambda c: self.get_card_value_in_trick(c, lead_suit, trump_suit))
-            
-            # Ako je karta koju igrač želi odigrati tražene boje ali slabija od najviše,
-            # igrač mora igrati jaču kartu ako je ima
-            if (card.suit == lead_suit and 
-                self.get_card_value_in_trick(card, lead_suit, trump_suit) < 
-                self.get_card_value_in_trick(highest_card, lead_suit, trump_suit)):
-                
-                # Provjeri ima li igrač jaču kartu od najviše u štihu
-                has_higher_card = any(c.suit == lead_suit and 
-                                    self.get_card_value_in_trick(c, lead_suit, trump_suit) > 
-                                    self.get_card_value_in_trick(highest_card, lead_suit, trump_suit) 
-                                    for c in hand)
-                
-                return has_higher_card
-            
-            return False
+            return legal_moves.must_play_higher(hand, trick, trump_suit)
         except Exception as e:
             logger.error(f"Greška pri provjeri mora li igrač igrati višu kartu: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def determine_trick_winner(self, trick, trump_suit):
         """
         Određuje indeks pobjednika štiha.
@@ -306,7 +235,7 @@ class Rules:
             logger.error(f"Greška pri određivanju pobjednika štiha: {str(e)}", exc_info=True)
             return -1  # U slučaju greške, vrati nevažeći indeks
     
-    @track_execution_time
+    @sampled_timer
     def check_belot(self, hand, trump_suit):
         """
         Provjerava ima li igrač belot (kralj i dama u adutu).
@@ -350,7 +279,7 @@ class Rules:
             logger.error(f"Greška pri provjeri belota: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def check_declarations(self, hand, trump_suit=None):
         """
         Provjerava sva moguća zvanja u ruci igrača.
@@ -373,89 +302,31 @@ class Rules:
                 logger.debug("Ruka je prazna, nema zvanja")
                 return declarations
             
-            # Provjera bele (kralj i dama u adutu)
-            if trump_suit and self.check_belot(hand, trump_suit):
-                trump_suit_code = self._normalize_suit(trump_suit)
+            # Sva zvanja bez preklapanja i bela iz maske ruke u jednom prolazu
+            detected = detect_declarations(hand, trump_suit)
+            
+            if trump_suit and detected.bela:
                 declarations.append({
                     'type': 'bela',
                     'value': self.DECLARATIONS['bela'],
-                    'cards': [card for card in hand if card.suit == trump_suit_code 
-                            and card.value in ['K', 'Q']]
+                    'cards': card_mask.filter_cards(hand, detected.bela)
                 })
-                logger.debug(f"Pronađen belot u boji {trump_suit}")
-            
-            # Provjera četiri iste karte
-            value_groups = {}
-            for card in hand:
-                if card.value not in value_groups:
-                    value_groups[card.value] = []
-                value_groups[card.value].append(card)
-            
-            four_of_kind_map = {
-                'J': 'four_jacks',
-                '9': 'four_nines',
-                'A': 'four_aces',
-                '10': 'four_tens',
-                'K': 'four_kings',
-                'Q': 'four_queens'
-            }
-            
-            for value, cards in value_groups.items():
-                if len(cards) == 4 and value in four_of_kind_map:
-                    declaration_type = four_of_kind_map[value]
-                    declarations.append({
-                        'type': declaration_type,
-                        'value': self.DECLARATIONS[declaration_type],
-                        'cards': cards
-                    })
-                    logger.debug(f"Pronađeno četiri {value}")
-            
-            # Provjera nizova u istoj boji
-            suit_groups = {}
-            for card in hand:
-                if card.suit not in suit_groups:
-                    suit_groups[card.suit] = []
-                suit_groups[card.suit].append(card)
-            
-            for suit, cards in suit_groups.items():
-                # Sortiraj karte prema redoslijedu u špilu
-                sorted_cards = sorted(cards, key=lambda c: self.NON_TRUMP_ORDER.get(c.value, 0))
-                
-                # Traži najduže nizove
-                longest_sequence = self._find_longest_sequence(sorted_cards)
-                if longest_sequence:
-                    if len(longest_sequence) >= 5:
-                        declaration_type = 'sequence_5_plus'
-                    elif len(longest_sequence) == 4:
-                        declaration_type = 'sequence_4'
-                    elif len(longest_sequence) == 3:
-                        declaration_type = 'sequence_3'
-                    else:
-                        continue  # Prekratki niz
-                    
-                    declarations.append({
-                        'type': declaration_type,
-                        'value': self.DECLARATIONS[declaration_type],
-                        'cards': longest_sequence
-                    })
-                    logger.debug(f"Pronađen niz od {len(longest_sequence)} karata u boji {suit}")
-            
-            # Provjera belota (svih 8 karata iste boje)
-            for suit, cards in suit_groups.items():
-                if len(cards) == 8:
-                    declarations.append({
-                        'type': 'belot',
-                        'value': self.DECLARATIONS['belot'],
-                        'cards': cards
-                    })
-                    logger.debug(f"Pronađen belot (8 karata) u boji {suit}")
+                logger.debug(f"Pronađena bela u boji {trump_suit}")
+            
+            for declaration in detected.declarations:
+                declarations.append({
+                    'type': declaration.type,
+                    'value': self.DECLARATIONS[declaration.type],
+                    'cards': card_mask.filter_cards(hand, declaration.mask)
+                })
+                logger.debug(f"Pronađeno zvanje {declaration.type}")
             
             return declarations
         except Exception as e:
             logger.error(f"Greška pri provjeri zvanja: {str(e)}", exc_info=True)
             return []
     
-    @track_execution_time
+    @sampled_timer
     def must_follow_suit(self, hand, lead_suit, trump_suit):
         """
         Vraća listu karata koje igrač može igrati poštujući boju.
@@ -480,30 +351,31 @@ class Rules:
             lead_suit_code = self._normalize_suit(lead_suit)
             trump_suit_code = self._normalize_suit(trump_suit)
             
-            # Karte tražene boje
-            lead_suit_cards = [card for card in hand if card.suit == lead_suit_code]
+            # Karte tražene boje (jedna operacija nad maskom ruke)
+            hand_bits = card_mask.hand_mask(hand)
+            lead_suit_bits = hand_bits & card_mask.suit_mask(lead_suit_code)
             
             # Ako igrač ima karte tražene boje, mora ih igrati
-            if lead_suit_cards:
-                logger.debug(f"Igrač mora pratiti boju {lead_suit_code}, pronađeno {len(lead_suit_cards)} odgovarajućih karata")
-                return lead_suit_cards
+            if lead_suit_bits:
+                logger.debug(f"Igrač mora pratiti boju {lead_suit_code}")
+                return self._cards_in_mask(hand, lead_suit_bits)
             
             # Ako nema karte tražene boje, provjeri adutske karte
-            trump_cards = [card for card in hand if card.suit == trump_suit_code]
+            trump_bits = hand_bits & card_mask.suit_mask(trump_suit_code)
             
             # Ako ima adute, mora igrati adute
-            if trump_cards:
-                logger.debug(f"Igrač nema boju {lead_suit_code}, ali ima {len(trump_cards)} aduta {trump_suit_code}")
-                return trump_cards
+            if trump_bits:
+                logger.debug(f"Igrač nema boju {lead_suit_code}, ali ima aduta {trump_suit_code}")
+                return self._cards_in_mask(hand, trump_bits)
             
             # Ako nema ni traženu boju ni aduta, može igrati bilo koju kartu
             logger.debug(f"Igrač nema ni boju {lead_suit_code} ni aduta {trump_suit_code}, može igrati bilo koju kartu")
-            return hand
+            return self._cards_in_mask(hand, hand_bits)
         except Exception as e:
             logger.error(f"Greška pri određivanju karata koje igrač može odigrati: {str(e)}", exc_info=True)
             return hand  # U slučaju greške, vrati sve karte kao opciju
     
-    @track_execution_time
+    @sampled_timer
     def can_trump(self, hand, lead_suit, trump_suit, trick):
         """
         Provjerava može li igrač rezati adutom.
@@ -529,14 +401,13 @@ class Rules:
             trump_suit_code = self._normalize_suit(trump_suit)
             
             # Igrač mora imati aduta da bi mogao rezati
-            has_trump = any(card.suit == trump_suit_code for card in hand)
-            if not has_trump:
+            hand_bits = card_mask.hand_mask(hand)
+            if not card_mask.has_suit(hand_bits, trump_suit_code):
                 logger.debug("Igrač nema aduta, ne može rezati")
                 return False
             
             # Igrač ne smije imati traženu boju
-            has_lead_suit = any(card.suit == lead_suit_code for card in hand)
-            if has_lead_suit:
+            if card_mask.has_suit(hand_bits, lead_suit_code):
                 logger.debug("Igrač ima traženu boju, ne može rezati")
                 return False
             
@@ -555,7 +426,7 @@ class Rules:
             logger.error(f"Greška pri provjeri može li igrač rezati adutom: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def validate_move(self, card, hand, trick, trump_suit):
         """
         Provjerava je li potez valjan prema pravilima igre.
@@ -583,7 +454,7 @@ class Rules:
             logger.error(f"Greška pri validaciji poteza: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def validate_bid(self, player_index, trick_number, suit):
         """
         Provjerava je li zvanje aduta valjano.
@@ -631,6 +502,23 @@ class Rules:
             logger.error(f"Greška pri validaciji zvanja aduta: {str(e)}", exc_info=True)
             return False
     
+    def _cards_in_mask(self, hand, mask):
+        """
+        Vraća karte iz ruke koje su u zadanoj maski.
+        
+        Ako je ruka zadana kao maska, karte se grade iz maske.
+        
+        Args:
+            hand (list or int): Lista karata u ruci igrača ili maska ruke
+            mask (int): Maska karata koje se zadržavaju
+            
+        Returns:
+            list: Karte iz ruke koje su u maski
+        """
+        if isinstance(hand, int):
+            return card_mask.cards_from_mask(mask)
+        return card_mask.filter_cards(hand, mask)
+    
     def _find_longest_sequence(self, sorted_cards):
         """
         Pronalazi najdulji niz u sortiranoj listi karata.
@@ -648,31 +536,17 @@ class Rules:
             if not sorted_cards:
                 return None
             
-            # Pretvori vrijednosti karata u indekse prema standardnom redoslijedu
-            value_indices = [self.NON_TRUMP_ORDER.get(card.value, 0) for card in sorted_cards]
-            
-            # Traži najdulji uzastopni niz
-            longest_sequence = []
-            current_sequence = [sorted_cards[0]]
-            
-            for i in range(1, len(sorted_cards)):
-                if value_indices[i] == value_indices[i-1] + 1:
-                    current_sequence.append(sorted_cards[i])
-                else:
-                    if len(current_sequence) >= 3 and len(current_sequence) > len(longest_sequence):
-                        longest_sequence = current_sequence.copy()
-                    current_sequence = [sorted_cards[i]]
-            
-            # Provjeri zadnju sekvencu
-            if len(current_sequence) >= 3 and len(current_sequence) > len(longest_sequence):
-                longest_sequence = current_sequence
+            sequences = find_sequences(card_mask.mask_from_cards(sorted_cards))
+            if not sequences:
+                return None
             
-            return longest_sequence if len(longest_sequence) >= 3 else None
+            # Najdulji niz; kod jednake duljine prvi pronađeni
+            longest = max(sequences, key=lambda declaration: card_mask.count_cards(declaration.mask))
+            return card_mask.filter_cards(sorted_cards, longest.mask)
         except Exception as e:
             logger.error(f"Greška pri traženju najduljeg niza karata: {str(e)}", exc_info=True)
             return None
     
-    @lru_cache(maxsize=64)
     def _normalize_suit(self, suit):
         """
         Pretvara puno ime boje u kod boje.
@@ -6,9 +6,9 @@ izračun bodova u igri Belot, uključujući bodovanje karata, zvanja i štihova.
 """
 
 import logging
-from functools import lru_cache
 from game.game_logic.card import Card
-from utils.decorators import track_execution_time
+from game.game_logic import lookup_tables
+from game.utils.profiling import sampled_timer
 
 # Konfiguracija loggera
 logger = logging.getLogger(__name__)
@@ -68,7 +68,7 @@ class Scoring:
         'clubs': 'C'
     }
     
-    @track_execution_time
+    @sampled_timer
     def __init__(self):
         """Inicijalizira objekt bodovanja igre."""
         self._cache_timestamp = 0.0
@@ -78,13 +78,11 @@ class Scoring:
         """Invalidira sve kešove povezane s objektom bodovanja."""
         import time
         self._cache_timestamp = time.time()
-        # Briše sve keširane vrijednosti pozivanjem odgovarajućih clear metoda
-        self.get_card_point_value.cache_clear()
-        self._normalize_suit.cache_clear()
+        # Tablice bodova su nepromjenjive i zajedničke svim instancama,
+        # pa nema keširanih vrijednosti koje treba brisati
         logger.debug("Keš bodovanja igre invalidiran")
     
-    @track_execution_time
-    @lru_cache(maxsize=128)
+    @sampled_timer
     def get_card_point_value(self, card, trump_suit):
         """
         Vraća bodovnu vrijednost karte.
@@ -106,24 +104,13 @@ class Scoring:
                 logger.warning(error_msg)
                 raise ValueError(error_msg)
             
-            # Normalizacija trump_suit iz punog imena u kod
-            trump_suit_code = self._normalize_suit(trump_suit)
-            
-            # Određivanje je li karta adut
-            is_trump = (card.suit == trump_suit_code)
-            
-            # Odabir odgovarajućeg rječnika bodova
-            points_dict = self.TRUMP_POINTS if is_trump else self.NON_TRUMP_POINTS
-            
-            # Dohvaćanje bodovne vrijednosti
-            points = points_dict.get(card.value, 0)
-            
-            return points
+            # Bodovi iz zajedničke tablice po adutu i indeksu karte
+            return lookup_tables.card_points(card, trump_suit)
         except Exception as e:
             logger.error(f"Greška pri dohvatu bodovne vrijednosti karte: {str(e)}", exc_info=True)
             return 0  # U slučaju greške, vraćamo 0 bodova
     
-    @track_execution_time
+    @sampled_timer
     def calculate_trick_points(self, trick, trump_suit, is_last_trick=False):
         """
         Izračunava ukupne bodove za štih.
@@ -162,7 +149,7 @@ class Scoring:
             logger.error(f"Greška pri izračunu bodova za štih: {str(e)}", exc_info=True)
             return 0  # U slučaju greške, vraćamo 0 bodova
     
-    @track_execution_time
+    @sampled_timer
     def calculate_declaration_points(self, declarations):
         """
         Izračunava ukupne bodove za zvanja.
@@ -196,7 +183,7 @@ class Scoring:
             logger.error(f"Greška pri izračunu bodova za zvanja: {str(e)}", exc_info=True)
             return 0  # U slučaju greške, vraćamo 0 bodova
     
-    @track_execution_time
+    @sampled_timer
     def add_last_trick_bonus(self, points):
         """
         Dodaje bonus bodove za zadnji štih.
@@ -223,7 +210,7 @@ class Scoring:
             logger.error(f"Greška pri dodavanju bonusa za zadnji štih: {str(e)}", exc_info=True)
             return points  # U slučaju greške, vraćamo originalni broj bodova
     
-    @track_execution_time
+    @sampled_timer
     def check_belot_bonus(self, hand, trump_suit):
         """
         Provjerava i vraća bodove za belot (kralj i dama u adutu).
@@ -268,7 +255,7 @@ class Scoring:
             logger.error(f"Greška pri provjeri belot bonusa: {str(e)}", exc_info=True)
             return 0  # U slučaju greške, vraćamo 0 bodova
     
-    @track_execution_time
+    @sampled_timer
     def check_declarations_priority(self, team_a_declarations, team_b_declarations):
         """
         Određuje koji tim ima prioritet kod zvanja.
@@ -321,7 +308,7 @@ class Scoring:
             logger.error(f"Greška pri određivanju prioriteta zvanja: {str(e)}", exc_info=True)
             return None  # U slučaju greške, vraćamo None
     
-    @track_execution_time
+    @sampled_timer
     def calculate_round_score(self, team_a_tricks, team_b_tricks, team_a_declarations, team_b_declarations, calling_team):
         """
         Izračunava ukupne bodove za rundu.
@@ -413,8 +400,7 @@ class Scoring:
             # U slučaju greške, vraćamo nulu za oba tima i None za pobjednika
             return 0, 0, None
     
-    @track_execution_time
-    @lru_cache(maxsize=32)
+    @sampled_timer
     def get_declaration_value(self, declaration_type, cards=None):
         """
         Vraća bodovnu vrijednost zvanja.
@@ -442,7 +428,6 @@ class Scoring:
             logger.error(f"Greška pri dohvatu vrijednosti zvanja: {str(e)}", exc_info=True)
             return 0  # U slučaju greške, vraćamo 0 bodova
     
-    @lru_cache(maxsize=64)
     def _normalize_suit(self, suit):
         """
         Pretvara puno ime boje u kod boje.
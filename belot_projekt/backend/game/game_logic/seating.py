@@ -0,0 +1,169 @@
+"""
+Modul s rasporedom igrača za stolom.
+
+Igrači sjede na pozicijama 0-3 redom igranja, a partneri sjede jedan
+nasuprot drugome: tim A na parnim, tim B na neparnim pozicijama. Sljedeći
+igrač, partner, protivnici i sljedeći djelitelj tada se dobivaju
+aritmetikom nad brojem pozicije, bez oslanjanja na redoslijed kojim baza
+vraća igrače (ManyToMany veza nema zajamčen poredak) i bez dodatnih upita.
+
+Raspored se sprema kao lista ID-eva igrača u Game.game_data['seats'].
+
+Primjer:
+    seats = SeatMap.from_teams([3, 8], [5, 13])  # -> pozicije [3, 5, 8, 13]
+    seats.next_player(13)   # -> 3
+    seats.partner(5)        # -> 13
+"""
+
+# Broj pozicija za stolom
+SEATS = 4
+
+# Ključ pod kojim se raspored sprema u Game.game_data
+SEATS_KEY = 'seats'
+
+
+def next_seat(seat, step=1):
+    """
+    Vraća poziciju koja je step mjesta nakon zadane, redom igranja.
+
+    Args:
+        seat (int): Pozicija (0-3)
+        step (int): Broj mjesta
+
+    Returns:
+        int: Pozicija (0-3)
+    """
+    return (seat + step) % SEATS
+
+
+def partner_seat(seat):
+    """Vraća poziciju partnera (igrač nasuprot)."""
+    return (seat + 2) % SEATS
+
+
+def opponent_seats(seat):
+    """Vraća pozicije protivnika (lijevo i desno od igrača)."""
+    return (seat + 1) % SEATS, (seat + 3) % SEATS
+
+
+def seat_team(seat):
+    """Vraća tim pozicije: 'a' za parne, 'b' za neparne pozicije."""
+    return 'a' if seat % 2 == 0 else 'b'
+
+
+class SeatMap:
+    """
+    Raspored igrača po pozicijama za stolom.
+
+    Attributes:
+        player_ids (tuple): ID igrača po poziciji
+    """
+
+    __slots__ = ('player_ids', '_seats')
+
+    def __init__(self, player_ids):
+        """
+        Inicijalizira raspored.
+
+        Args:
+            player_ids (list): ID igrača redom igranja
+
+        Raises:
+            ValueError: Ako raspored nema točno četiri različita igrača
+        """
+        self.player_ids = tuple(player_ids)
+        if len(self.player_ids) != SEATS or len(set(self.player_ids)) != SEATS:
+            raise ValueError(f"Raspored mora imati točno {SEATS} različita igrača")
+        self._seats = {player_id: seat for seat, player_id in enumerate(self.player_ids)}
+
+    @classmethod
+    def from_teams(cls, team_a, team_b):
+        """
+        Gradi raspored u kojem partneri sjede nasuprot.
+
+        Args:
+            team_a (list): ID dva igrača tima A
+            team_b (list): ID dva igrača tima B
+
+        Returns:
+            SeatMap: Raspored [A1, B1, A2, B2]
+
+        Raises:
+            ValueError: Ako tim nema točno dva igrača
+        """
+        team_a, team_b = list(team_a), list(team_b)
+        if len(team_a) != 2 or len(team_b) != 2:
+            raise ValueError("Svaki tim mora imati točno dva igrača")
+        return cls([team_a[0], team_b[0], team_a[1], team_b[1]])
+
+    def __len__(self):
+        return SEATS
+
+    def __iter__(self):
+        return iter(self.player_ids)
+
+    def __contains__(self, player_id):
+        return player_id in self._seats
+
+    def seat_of(self, player_id):
+        """
+        Vraća poziciju igrača.
+
+        Args:
+            player_id: ID igrača
+
+        Returns:
+            int: Pozicija (0-3) ili None ako igrač nije za stolom
+        """
+        return self._seats.get(player_id)
+
+    def player_at(self, seat):
+        """Vraća ID igrača na poziciji (pozicija se uzima modulo 4)."""
+        return self.player_ids[seat % SEATS]
+
+    def next_player(self, player_id, step=1):
+        """
+        Vraća igrača koji igra step mjesta nakon zadanog.
+
+        Args:
+            player_id: ID igrača
+            step (int): Broj mjesta
+
+        Returns:
+            ID igrača ili None ako igrač nije za stolom
+        """
+        seat = self._seats.get(player_id)
+        return None if seat is None else self.player_ids[(seat + step) % SEATS]
+
+    def partner(self, player_id):
+        """Vraća ID partnera ili None ako igrač nije za stolom."""
+        return self.next_player(player_id, 2)
+
+    def opponents(self, player_id):
+        """Vraća ID-eve protivnika ili praznu torku ako igrač nije za stolom."""
+        seat = self._seats.get(player_id)
+        if seat is None:
+            return ()
+        return tuple(self.player_ids[other] for other in opponent_seats(seat))
+
+    def team(self, player_id):
+        """Vraća tim igrača ('a' ili 'b') ili None ako igrač nije za stolom."""
+        seat = self._seats.get(player_id)
+        return None if seat is None else seat_team(seat)
+
+    def team_players(self, team):
+        """Vraća ID-eve igrača tima ('a' ili 'b')."""
+        first = 0 if team == 'a' else 1
+        return self.player_ids[first], self.player_ids[first + 2]
+
+    def first_to_act(self, dealer_id):
+        """Vraća igrača koji prvi zove i igra u rundi (prvi nakon djelitelja)."""
+        return self.next_player(dealer_id)
+
+    def next_dealer(self, dealer_id):
+        """Vraća djelitelja sljedeće runde (prvi nakon trenutnog djelitelja)."""
+        return self.next_player(dealer_id)
+
+    def to_list(self):
+        """Vraća raspored za spremanje u JSON."""
+        return list(self.player_ids)
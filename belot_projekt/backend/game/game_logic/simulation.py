@@ -0,0 +1,551 @@
+"""
+Modul koji pruža brzi simulacijski pogon za Belot igru.
+
+Klase Game i Round vezane su uz logiranje, dekoratore za mjerenje vremena
+i servisni sloj, što je prikladno za igru s ljudima, ali presporo za
+botove, fuzzing pravila i analizu balansa. SimulationEngine odigrava
+cijele partije između zamjenjivih strategija bez logiranja i bez
+dekoratora, nad bitmask prikazom ruku iz modula card_mask.
+
+Semantika pravila i bodovanja je ista kao u ostatku paketa: dozvoljene
+karte određuje modul legal_moves (koji koriste i Rules i MoveValidator),
+a bodovne vrijednosti karata, zvanja i bonusa preuzimaju se iz klase
+Scoring.
+
+Sjedala su označena brojevima 0-3; sjedala 0 i 2 čine tim 'a', a
+sjedala 1 i 3 tim 'b'. Nakon djelitelja na redu je sjedalo (djelitelj + 1).
+"""
+
+import random
+
+from game.game_logic import card_mask
+from game.game_logic import legal_moves
+from game.game_logic.declarations import detect_declarations
+from game.game_logic.scoring import Scoring
+
+# Broj igrača i štihova
+SEATS = 4
+TRICKS_PER_ROUND = 8
+CARDS_PER_PLAYER = 8
+
+# Oznake timova po indeksu tima (indeks tima sjedala je sjedalo % 2)
+TEAMS = ('a', 'b')
+
+# Bodovne vrijednosti karata po adutu i indeksu karte
+CARD_POINTS = card_mask.CARD_POINTS
+
+
+def _lowest(mask, key):
+    """Vraća indeks karte iz maske s najmanjim ključem."""
+    return min(card_mask.iter_indices(mask), key=key)
+
+
+def _highest(mask, key):
+    """Vraća indeks karte iz maske s najvećim ključem."""
+    return max(card_mask.iter_indices(mask), key=key)
+
+
+class RoundState:
+    """
+    Stanje runde u simulaciji, dostupno strategijama za čitanje.
+
+    Attributes:
+        dealer (int): Sjedalo djelitelja
+        trump (str): Adutska boja ili None tijekom zvanja aduta
+        calling_seat (int): Sjedalo igrača koji je zvao aduta
+        hands (list): Maske ruku po sjedalu
+        trick (list): Parovi (sjedalo, indeks karte) u trenutnom štihu
+        lead_suit (str): Tražena boja trenutnog štiha
+        winning_index (int): Indeks karte koja trenutno nosi štih
+        winning_seat (int): Sjedalo igrača koji trenutno nosi štih
+        played_mask (int): Maska svih karata odigranih u rundi
+        trick_number (int): Redni broj trenutnog štiha (0-7)
+        scores (list): Ukupni bodovi timova u partiji prije ove runde
+    """
+
+    __slots__ = (
+        'dealer', 'trump', 'calling_seat', 'hands', 'trick', 'lead_suit',
+        'winning_index', 'winning_seat', 'played_mask', 'trick_number', 'scores',
+    )
+
+    def __init__(self, dealer, hands, scores):
+        """
+        Inicijalizira stanje runde.
+
+        Args:
+            dealer (int): Sjedalo djelitelja
+            hands (list): Maske ruku po sjedalu
+            scores (list): Ukupni bodovi timova u partiji
+        """
+        self.dealer = dealer
+        self.trump = None
+        self.calling_seat = None
+        self.hands = hands
+        self.trick = []
+        self.lead_suit = None
+        self.winning_index = -1
+        self.winning_seat = -1
+        self.played_mask = 0
+        self.trick_number = 0
+        self.scores = scores
+
+    def trick_state(self):
+        """
+        Vraća stanje štiha u obliku koji koristi modul legal_moves.
+
+        Returns:
+            tuple: (tražena boja, indeks karte koja nosi štih) ili None
+        """
+        if not self.trick:
+            return None
+        return self.lead_suit, self.winning_index
+
+
+class Strategy:
+    """
+    Osnovna klasa strategije za simulaciju.
+
+    Strategija odlučuje o zvanju aduta i o karti koju igra. Dobiva stanje
+    runde samo za čitanje i generator slučajnih brojeva simulacije, tako
+    da je odigrana partija ponovljiva za isti seed.
+
+    Attributes:
+        name (str): Naziv strategije
+    """
+
+    name = 'base'
+
+    def choose_trump(self, state, seat, forced, rng):
+        """
+        Odlučuje o zvanju aduta.
+
+        Args:
+            state (RoundState): Stanje runde
+            seat (int): Sjedalo igrača koji odlučuje
+            forced (bool): True ako djelitelj mora zvati (mus)
+            rng (random.Random): Generator slučajnih brojeva
+
+        Returns:
+            str: Kod adutske boje ili None za "dalje"
+        """
+        raise NotImplementedError
+
+    def play_card(self, state, seat, legal_bits, rng):
+        """
+        Odabire kartu za igranje.
+
+        Args:
+            state (RoundState): Stanje runde
+            seat (int): Sjedalo igrača koji igra
+            legal_bits (int): Maska dozvoljenih karata (nikad prazna)
+            rng (random.Random): Generator slučajnih brojeva
+
+        Returns:
+            int: Indeks odabrane karte
+        """
+        raise NotImplementedError
+
+
+class RandomStrategy(Strategy):
+    """
+    Strategija koja igra nasumične dozvoljene karte.
+
+    Korisna za fuzzing pravila jer pokriva i rijetke situacije.
+
+    Attributes:
+        call_probability (float): Vjerojatnost zvanja aduta kada nije mus
+    """
+
+    name = 'random'
+
+    def __init__(self, call_probability=0.25):
+        """
+        Inicijalizira nasumičnu strategiju.
+
+        Args:
+            call_probability (float): Vjerojatnost zvanja aduta kada nije mus
+        """
+        self.call_probability = call_probability
+
+    def choose_trump(self, state, seat, forced, rng):
+        if forced or rng.random() < self.call_probability:
+            return rng.choice(card_mask.SUITS)
+        return None
+
+    def play_card(self, state, seat, legal_bits, rng):
+        return rng.choice(list(card_mask.iter_indices(legal_bits)))
+
+
+class GreedyStrategy(Strategy):
+    """
+    Jednostavna heuristička strategija.
+
+    Zove boju u kojoj ruka ima najviše adutskih bodova ako prelazi prag.
+    U igri uzima štih najslabijom kartom koja ga osvaja, dodaje bodove kad
+    štih nosi suigrač, a inače baca kartu s najmanje bodova.
+
+    Attributes:
+        call_threshold (int): Minimalni adutski bodovi u boji za zvanje aduta
+    """
+
+    name = 'greedy'
+
+    def __init__(self, call_threshold=35):
+        """
+        Inicijalizira heurističku strategiju.
+
+        Args:
+            call_threshold (int): Minimalni adutski bodovi u boji za zvanje aduta
+        """
+        self.call_threshold = call_threshold
+
+    def choose_trump(self, state, seat, forced, rng):
+        hand_bits = state.hands[seat]
+        best_suit, best_points = None, -1
+        for suit in card_mask.SUITS:
+            points = CARD_POINTS[suit]
+            suit_points = sum(
+                points[index] + 5
+                for index in card_mask.iter_indices(hand_bits & card_mask.SUIT_MASKS[suit])
+            )
+            if suit_points > best_points:
+                best_suit, best_points = suit, suit_points
+        if forced or best_points >= self.call_threshold:
+            return best_suit
+        return None
+
+    def play_card(self, state, seat, legal_bits, rng):
+        points = CARD_POINTS[state.trump]
+        if not state.trick:
+            return _highest(legal_bits, points.__getitem__)
+
+        # Suigrač nosi štih - dodaj bodove
+        if state.winning_seat == (seat + 2) % SEATS:
+            return _highest(legal_bits, points.__getitem__)
+
+        winning, trump = state.winning_index, state.trump
+        winners = 0
+        for index in card_mask.iter_indices(legal_bits):
+            if legal_moves.card_beats(index, winning, trump):
+                winners |= card_mask.CARD_BITS[index]
+        if winners:
+            return _lowest(winners, points.__getitem__)
+        return _lowest(legal_bits, points.__getitem__)
+
+
+# Dostupne strategije po nazivu
+STRATEGIES = {
+    RandomStrategy.name: RandomStrategy,
+    GreedyStrategy.name: GreedyStrategy,
+}
+
+
+def get_strategy(strategy):
+    """
+    Vraća instancu strategije.
+
+    Args:
+        strategy (Strategy or str): Instanca strategije ili naziv iz STRATEGIES
+
+    Returns:
+        Strategy: Instanca strategije
+
+    Raises:
+        ValueError: Ako strategija s tim nazivom ne postoji
+    """
+    if isinstance(strategy, Strategy):
+        return strategy
+    strategy_class = STRATEGIES.get(strategy)
+    if strategy_class is None:
+        raise ValueError(f"Nepoznata strategija: {strategy}")
+    return strategy_class()
+
+
+class SimulationEngine:
+    """
+    Brzi simulacijski pogon za cijele partije Belota.
+
+    Ne koristi logiranje, dekoratore ni Django modele; stanje runde drži
+    se u maskama ruku. Za isti seed i iste strategije partije su
+    ponovljive.
+
+    Attributes:
+        strategies (list): Strategija za svako od četiri sjedala
+        points_to_win (int): Broj bodova potreban za pobjedu
+        max_rounds (int): Najveći broj rundi po partiji (zaštita od beskonačne igre)
+        rng (random.Random): Generator slučajnih brojeva simulacije
+    """
+
+    POINTS_TO_WIN = 1001
+    MAX_ROUNDS = 200
+
+    def __init__(self, strategies=None, points_to_win=POINTS_TO_WIN, seed=None, max_rounds=MAX_ROUNDS):
+        """
+        Inicijalizira simulacijski pogon.
+
+        Args:
+            strategies (list, optional): Četiri strategije (instance ili nazivi),
+                ili jedna strategija za sva sjedala; zadano 'random'
+            points_to_win (int): Broj bodova potreban za pobjedu
+            seed (int, optional): Seed generatora slučajnih brojeva
+            max_rounds (int): Najveći broj rundi po partiji
+
+        Raises:
+            ValueError: Ako broj strategija nije 1 ili 4
+        """
+        if strategies is None:
+            strategies = RandomStrategy.name
+        if isinstance(strategies, (str, Strategy)):
+            strategies = [strategies] * SEATS
+        if len(strategies) != SEATS:
+            raise ValueError(f"Potrebne su {SEATS} strategije, a dobiveno je {len(strategies)}")
+
+        self.strategies = [get_strategy(strategy) for strategy in strategies]
+        self.points_to_win = points_to_win
+        self.max_rounds = max_rounds
+        self.rng = random.Random(seed)
+
+    def deal(self):
+        """
+        Miješa špil i dijeli po osam karata na svako sjedalo.
+
+        Returns:
+            list: Maske ruku po sjedalu
+        """
+        deck = list(range(card_mask.NUM_CARDS))
+        self.rng.shuffle(deck)
+        bits = card_mask.CARD_BITS
+        hands = []
+        for seat in range(SEATS):
+            mask = 0
+            for index in deck[seat * CARDS_PER_PLAYER:(seat + 1) * CARDS_PER_PLAYER]:
+                mask |= bits[index]
+            hands.append(mask)
+        return hands
+
+    def _call_trump(self, state):
+        """
+        Provodi zvanje aduta; djelitelj mora zvati ako svi kažu "dalje".
+
+        Args:
+            state (RoundState): Stanje runde
+
+        Raises:
+            ValueError: Ako strategija vrati nevažeću boju ili ne zove na musu
+        """
+        for offset in range(1, SEATS + 1):
+            seat = (state.dealer + offset) % SEATS
+            forced = offset == SEATS
+            suit = self.strategies[seat].choose_trump(state, seat, forced, self.rng)
+            if suit is None and not forced:
+                continue
+            if suit not in card_mask.SUIT_MASKS:
+                raise ValueError(f"Strategija sjedala {seat} vratila je nevažeću boju: {suit}")
+            state.trump = suit
+            state.calling_seat = seat
+            return
+
+    def _resolve_declarations(self, state):
+        """
+        Određuje zvanja koja se boduju.
+
+        Boduju se sva zvanja tima s najjačim pojedinačnim zvanjem; kod
+        jednako jakih zvanja prednost ima igrač koji ranije zove.
+
+        Args:
+            state (RoundState): Stanje runde
+
+        Returns:
+            tuple: (indeks tima ili None, lista tipova zvanja, bodovi)
+        """
+        best_key, best_team = None, None
+        per_team = ([], [])
+        for offset in range(1, SEATS + 1):
+            seat = (state.dealer + offset) % SEATS
+            for declaration in detect_declarations(state.hands[seat]).declarations:
+                per_team[seat % 2].append(declaration.type)
+                if best_key is None or declaration.key > best_key:
+                    best_key, best_team = declaration.key, seat % 2
+
+        if best_team is None:
+            return None, [], 0
+        types = per_team[best_team]
+        points = sum(Scoring.DECLARATION_POINTS[declaration_type] for declaration_type in types)
+        return best_team, types, points
+
+    def _bela_team(self, state):
+        """
+        Vraća indeks tima igrača koji ima belu (kralj i dama u adutu).
+
+        Args:
+            state (RoundState): Stanje runde
+
+        Returns:
+            int: Indeks tima ili None
+        """
+        bela = card_mask.card_bit('K' + state.trump) | card_mask.card_bit('Q' + state.trump)
+        for seat in range(SEATS):
+            if state.hands[seat] & bela == bela:
+                return seat % 2
+        return None
+
+    def _play_tricks(self, state):
+        """
+        Odigrava svih osam štihova runde.
+
+        Args:
+            state (RoundState): Stanje runde
+
+        Returns:
+            tuple: (bodovi iz štihova po timu, broj štihova po timu)
+
+        Raises:
+            ValueError: Ako strategija odigra nedozvoljenu kartu
+        """
+        trump = state.trump
+        points = CARD_POINTS[trump]
+        bits = card_mask.CARD_BITS
+        trick_points = [0, 0]
+        tricks_won = [0, 0]
+        leader = (state.dealer + 1) % SEATS
+
+        for trick_number in range(TRICKS_PER_ROUND):
+            state.trick_number = trick_number
+            state.trick = []
+            total = 0
+            for offset in range(SEATS):
+                seat = (leader + offset) % SEATS
+                hand_bits = state.hands[seat]
+                legal_bits = legal_moves.legal_mask_for_state(hand_bits, state.trick_state(), trump)
+                index = self.strategies[seat].play_card(state, seat, legal_bits, self.rng)
+                if not legal_bits & bits[index]:
+                    raise ValueError(
+                        f"Strategija sjedala {seat} odigrala je nedozvoljenu kartu "
+                        f"{card_mask.CARD_CODES[index]}"
+                    )
+
+                state.hands[seat] = hand_bits ^ bits[index]
+                state.played_mask |= bits[index]
+                state.trick.append((seat, index))
+                total += points[index]
+
+                if offset == 0:
+                    state.lead_suit = card_mask.INDEX_SUIT[index]
+                    state.winning_index, state.winning_seat = index, seat
+                elif legal_moves.card_beats(index, state.winning_index, trump):
+                    state.winning_index, state.winning_seat = index, seat
+
+            leader = state.winning_seat
+            team = leader % 2
+            if trick_number == TRICKS_PER_ROUND - 1:
+                total += Scoring.LAST_TRICK_BONUS
+            trick_points[team] += total
+            tricks_won[team] += 1
+
+        return trick_points, tricks_won
+
+    def play_round(self, dealer, scores=(0, 0)):
+        """
+        Odigrava jednu rundu: dijeljenje, zvanje aduta, zvanja i osam štihova.
+
+        Args:
+            dealer (int): Sjedalo djelitelja
+            scores (tuple): Ukupni bodovi timova u partiji prije runde
+
+        Returns:
+            dict: Rezultat runde (adut, tim koji je zvao, bodovi po timu,
+                  je li tim koji je zvao prošao, štiglja, zvanja)
+        """
+        state = RoundState(dealer, self.deal(), list(scores))
+        self._call_trump(state)
+        declaration_team, declarations, declaration_points = self._resolve_declarations(state)
+        bela_team = self._bela_team(state)
+
+        trick_points, tricks_won = self._play_tricks(state)
+
+        points = list(trick_points)
+        sweep_team = None
+        for team in (0, 1):
+            if tricks_won[1 - team] == 0:
+                sweep_team = team
+                points[team] += Scoring.CLEAN_SWEEP_BONUS
+
+        # Zvanja vrijede samo ako tim osvoji barem jedan štih
+        if declaration_team is not None and tricks_won[declaration_team]:
+            points[declaration_team] += declaration_points
+        else:
+            declaration_points = 0
+        if bela_team is not None:
+            points[bela_team] += Scoring.DECLARATION_POINTS['bela']
+
+        calling_team = state.calling_seat % 2
+        passed = points[calling_team] > points[1 - calling_team]
+        if not passed:
+            points[1 - calling_team] += points[calling_team]
+            points[calling_team] = 0
+
+        return {
+            'dealer': dealer,
+            'trump_suit': state.trump,
+            'calling_seat': state.calling_seat,
+            'calling_team': TEAMS[calling_team],
+            'passed': passed,
+            'trick_points': tuple(trick_points),
+            'tricks_won': tuple(tricks_won),
+            'points': tuple(points),
+            'sweep_team': TEAMS[sweep_team] if sweep_team is not None else None,
+            'declaration_team': TEAMS[declaration_team] if declaration_team is not None else None,
+            'declarations': declarations,
+            'declaration_points': declaration_points,
+            'bela_team': TEAMS[bela_team] if bela_team is not None else None,
+            'belot': 'belot' in declarations,
+        }
+
+    def play_game(self):
+        """
+        Odigrava cijelu partiju do zadanog broja bodova.
+
+        Partija završava kada tim dosegne points_to_win (pobjeđuje tim s
+        više bodova), kada tim prijavi belot (osam karata u nizu) ili kada
+        se dosegne max_rounds.
+
+        Returns:
+            dict: Rezultat partije (pobjednički tim, bodovi, rezultati rundi)
+        """
+        scores = [0, 0]
+        rounds = []
+        dealer = self.rng.randrange(SEATS)
+        winner = None
+
+        while winner is None and len(rounds) < self.max_rounds:
+            result = self.play_round(dealer, scores)
+            rounds.append(result)
+            scores[0] += result['points'][0]
+            scores[1] += result['points'][1]
+
+            if result['belot'] and result['declaration_points']:
+                winner = result['declaration_team']
+            elif max(scores) >= self.points_to_win and scores[0] != scores[1]:
+                winner = TEAMS[0] if scores[0] > scores[1] else TEAMS[1]
+            dealer = (dealer + 1) % SEATS
+
+        return {
+            'winner_team': winner,
+            'team_a_score': scores[0],
+            'team_b_score': scores[1],
+            'rounds': rounds,
+            'strategies': tuple(strategy.name for strategy in self.strategies),
+        }
+
+    def play_games(self, count):
+        """
+        Odigrava više partija zaredom.
+
+        Args:
+            count (int): Broj partija
+
+        Yields:
+            dict: Rezultat svake partije
+        """
+        for _ in range(count):
+            yield self.play_game()
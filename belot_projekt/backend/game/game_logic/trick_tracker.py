@@ -0,0 +1,193 @@
+"""
+Modul koji prati trenutni štih dok se karte igraju.
+
+Umjesto da se pri završetku štiha ili pri provjeri übanja svaki put
+prolazi cijeli štih, TrickTracker pri svakoj odigranoj karti u O(1)
+ažurira traženu boju, kartu koja trenutno nosi štih, njezinu poziciju i
+igrača te zbroj bodova štiha do tog trenutka. Stanje se može spremiti u
+rječnik (npr. u Round.round_data) i iz njega obnoviti, pa ga i sloj
+modela i repozitorija čitaju bez ponovnog dohvaćanja poteza iz baze.
+
+Jačina karata određuje se kao u modulu legal_moves, a bodovi iz tablica
+modula lookup_tables.
+"""
+
+from game.game_logic import card_mask
+from game.game_logic import legal_moves
+from game.game_logic import lookup_tables
+
+# Broj karata u štihu
+CARDS_PER_TRICK = 4
+
+
+class TrickTracker:
+    """
+    Stanje trenutnog štiha koje se ažurira pri svakoj odigranoj karti.
+
+    Attributes:
+        trump_suit (str): Adutska boja kako je zadana (kod ili puno ime)
+        number (int): Redni broj štiha u rundi (0-bazirano)
+        lead_suit (str): Tražena boja ili None za prazan štih
+        winning_index (int): Indeks (card_mask) karte koja nosi štih ili -1
+        winning_position (int): Pozicija te karte u štihu (0-3) ili -1
+        winning_player: Igrač koji trenutno nosi štih
+        points (int): Zbroj bodova karata odigranih u štihu
+        size (int): Broj karata odigranih u štihu
+    """
+
+    __slots__ = (
+        'trump_suit', '_trump', '_points', 'number', 'lead_suit', 'winning_index',
+        'winning_position', 'winning_player', 'points', 'size'
+    )
+
+    def __init__(self, trump_suit=None, number=0):
+        """
+        Inicijalizira praćenje praznog štiha.
+
+        Args:
+            trump_suit (str, optional): Adutska boja
+            number (int): Redni broj štiha u rundi
+        """
+        self.trump_suit = trump_suit
+        self._trump = card_mask.suit_code(trump_suit)
+        self._points = lookup_tables.POINTS[lookup_tables.suit_index(trump_suit)]
+        self.reset(number)
+
+    def reset(self, number=None):
+        """
+        Priprema praćenje za novi štih.
+
+        Args:
+            number (int, optional): Redni broj novog štiha; zadano sljedeći
+        """
+        self.number = self.number + 1 if number is None else number
+        self.lead_suit = None
+        self.winning_index = -1
+        self.winning_position = -1
+        self.winning_player = None
+        self.points = 0
+        self.size = 0
+
+    @property
+    def is_complete(self):
+        """bool: Jesu li odigrane sve četiri karte štiha."""
+        return self.size >= CARDS_PER_TRICK
+
+    @property
+    def winning_card(self):
+        """str: Kod karte koja nosi štih ili None za prazan štih."""
+        return card_mask.CARD_CODES[self.winning_index] if self.size else None
+
+    def add(self, card, player=None):
+        """
+        Dodaje odigranu kartu u štih.
+
+        Args:
+            card (Card or str): Odigrana karta
+            player: Igrač koji je odigrao kartu
+
+        Returns:
+            bool: True ako karta preuzima štih
+
+        Raises:
+            ValueError: Ako je karta nevažeća ili je štih već pun
+        """
+        if self.size >= CARDS_PER_TRICK:
+            raise ValueError(f"Štih {self.number} već ima {CARDS_PER_TRICK} karte")
+        index = card_mask.card_index(card)
+
+        takes = not self.size or legal_moves.card_beats(index, self.winning_index, self._trump)
+        if not self.size:
+            self.lead_suit = card_mask.INDEX_SUIT[index]
+        if takes:
+            self.winning_index = index
+            self.winning_position = self.size
+            self.winning_player = player
+
+        self.points += self._points[index]
+        self.size += 1
+        return takes
+
+    def state(self):
+        """
+        Vraća stanje štiha u obliku koji koristi modul legal_moves.
+
+        Returns:
+            tuple: (tražena boja, indeks karte koja nosi štih) ili None za prazan štih
+        """
+        if not self.size:
+            return None
+        return self.lead_suit, self.winning_index
+
+    def to_dict(self):
+        """
+        Vraća stanje za spremanje u JSON.
+
+        Igrač se sprema kao njegov id ako ga ima, inače kao zadana vrijednost.
+
+        Returns:
+            dict: Stanje štiha
+        """
+        return {
+            'number': self.number,
+            'lead_suit': self.lead_suit,
+            'winning_card': self.winning_card,
+            'winning_position': self.winning_position,
+            'winning_player': getattr(self.winning_player, 'id', self.winning_player),
+            'points': self.points,
+            'size': self.size,
+        }
+
+    @classmethod
+    def from_dict(cls, data, trump_suit=None):
+        """
+        Obnavlja praćenje iz spremljenog stanja.
+
+        Args:
+            data (dict): Stanje iz to_dict ili None
+            trump_suit (str, optional): Adutska boja
+
+        Returns:
+            TrickTracker: Obnovljeno stanje (prazan prvi štih ako podataka nema)
+        """
+        tracker = cls(trump_suit)
+        if not data:
+            return tracker
+        tracker.number = data.get('number', 0)
+        tracker.size = data.get('size', 0)
+        if tracker.size:
+            tracker.lead_suit = data['lead_suit']
+            tracker.winning_index = card_mask.card_index(data['winning_card'])
+            tracker.winning_position = data['winning_position']
+            tracker.winning_player = data.get('winning_player')
+            tracker.points = data.get('points', 0)
+        return tracker
+
+    @classmethod
+    def from_trick(cls, trick, trump_suit=None, number=0):
+        """
+        Gradi praćenje iz već odigranih karata štiha.
+
+        Args:
+            trick (list): Parovi (igrač, karta) ili samo karte (Card, kodovi,
+                Move objekti ili rječnici s ključem 'card')
+            trump_suit (str, optional): Adutska boja
+            number (int): Redni broj štiha u rundi
+
+        Returns:
+            TrickTracker: Stanje nakon svih karata štiha
+
+        Raises:
+            ValueError: Ako štih sadrži nevažeću kartu
+        """
+        tracker = cls(trump_suit, number)
+        for entry in trick:
+            if isinstance(entry, tuple):
+                player, card = entry
+            elif isinstance(entry, dict):
+                player, card = entry.get('player'), legal_moves._entry_code(entry)
+            else:
+                player = getattr(entry, 'player', None)
+                card = getattr(entry, 'card', entry)
+            tracker.add(card, player)
+        return tracker
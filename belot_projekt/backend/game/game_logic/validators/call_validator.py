@@ -8,9 +8,12 @@ samo zvanja koja su valjana i koja posjeduju u svojim rukama.
 """
 
 import logging
-from functools import lru_cache
 from game.game_logic.card import Card
-from game.utils.decorators import track_execution_time
+from game.game_logic import card_mask
+from game.game_logic.declarations import (
+    FOUR_OF_KIND, SEQUENCE_MIN_LENGTH, bela_mask, find_sequences
+)
+from game.utils.profiling import sampled_timer
 
 # Postavljanje loggera za praćenje aktivnosti
 logger = logging.getLogger(__name__)
@@ -27,6 +30,7 @@ class CallValidator:
         VALID_TRUMP_SUITS (list): Valjane boje za aduta.
         VALID_SEQUENCES (list): Sekvence karata za provjeru nizova.
         DECLARATION_PRIORITIES (dict): Prioriteti zvanja (od najvišeg prema najnižem).
+        FOUR_OF_KIND_MASKS (dict): Maske četiri iste karte po tipu zvanja.
         _cache_enabled (bool): Označava je li keširanje omogućeno.
     """
     
@@ -50,6 +54,9 @@ class CallValidator:
         'bela': 20            # Kralj i dama iste boje u adutu
     }
     
+    # Maske četiri iste karte po tipu zvanja
+    FOUR_OF_KIND_MASKS = {declaration_type: mask for mask, declaration_type, _ in FOUR_OF_KIND}
+    
     def __init__(self):
         """
         Inicijalizira validator zvanja.
@@ -65,13 +72,10 @@ class CallValidator:
         
         Ova metoda se poziva kad se promijeni stanje koje bi moglo utjecati na rezultate keširanih metoda.
         """
-        if hasattr(self._normalize_suit, 'cache_clear'):
-            self._normalize_suit.cache_clear()
-        if hasattr(self._suit_name, 'cache_clear'):
-            self._suit_name.cache_clear()
+        # Pomoćne metode ne keširaju rezultate po instanci, pa nema što brisati
         logger.debug("Keš memorija CallValidator-a je poništena")
     
-    @track_execution_time
+    @sampled_timer
     def validate(self, declaration_type, cards, trump_suit=None):
         """
         Glavna metoda za validaciju zvanja (alias za validate_declaration).
@@ -95,7 +99,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije zvanja: {str(e)}")
             return False, f"Interna greška prilikom validacije zvanja: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def can_declare(self, player_hand, declaration_type, trump_suit=None):
         """
         Provjerava može li igrač proglasiti određeno zvanje s kartama koje ima.
@@ -122,6 +126,8 @@ class CallValidator:
                 
             logger.info(f"Provjera mogućnosti zvanja: {declaration_type} za igrača s {len(player_hand)} karata")
             
+            hand_bits = card_mask.hand_mask(player_hand)
+            
             # Za belu (kralj i dama u adutu)
             if declaration_type == 'bela':
                 if not trump_suit:
@@ -129,93 +135,45 @@ class CallValidator:
                     return False, []
                     
                 trump_suit_code = self._normalize_suit(trump_suit)
-                trump_cards = [card for card in player_hand if card.suit == trump_suit_code]
-                
-                king = next((card for card in trump_cards if card.value == 'K'), None)
-                queen = next((card for card in trump_cards if card.value == 'Q'), None)
-                
-                if king and queen:
+                mask = bela_mask(hand_bits, trump_suit_code)
+                if mask:
                     logger.info(f"Pronađena bela u {self._suit_name(trump_suit_code)}")
-                    return True, [king, queen]
+                    cards = card_mask.filter_cards(player_hand, mask)
+                    return True, sorted(cards, key=lambda c: c.value != 'K')
                 logger.debug(f"Bela nije pronađena u {self._suit_name(trump_suit_code)}")
                 return False, []
             
             # Za četiri iste karte
             if declaration_type.startswith('four_'):
-                expected_value = None
-                if declaration_type == 'four_jacks':
-                    expected_value = 'J'
-                elif declaration_type == 'four_nines':
-                    expected_value = '9'
-                elif declaration_type == 'four_aces':
-                    expected_value = 'A'
-                elif declaration_type == 'four_tens':
-                    expected_value = '10'
-                elif declaration_type == 'four_kings':
-                    expected_value = 'K'
-                elif declaration_type == 'four_queens':
-                    expected_value = 'Q'
-                else:
+                mask = self.FOUR_OF_KIND_MASKS.get(declaration_type)
+                if mask is None:
                     logger.warning(f"Nepoznat tip zvanja: {declaration_type}")
                     return False, []
                     
-                matching_cards = [card for card in player_hand if card.value == expected_value]
-                if len(matching_cards) == 4:
+                if hand_bits & mask == mask:
                     logger.info(f"Pronađeno zvanje: {declaration_type}")
-                    return True, matching_cards
-                logger.debug(f"Zvanje {declaration_type} nije pronađeno, pronađeno {len(matching_cards)} od 4 karte")
+                    return True, card_mask.filter_cards(player_hand, mask)
+                logger.debug(f"Zvanje {declaration_type} nije pronađeno, pronađeno "
+                             f"{card_mask.count_cards(hand_bits & mask)} od 4 karte")
                 return False, []
             
-            # Za sekvence
-            if declaration_type.startswith('sequence_'):
-                min_length = 0
-                if declaration_type == 'sequence_3':
-                    min_length = 3
-                elif declaration_type == 'sequence_4':
-                    min_length = 4
-                elif declaration_type == 'sequence_5_plus':
-                    min_length = 5
-                else:
+            # Za sekvence i belot (8 karata iste boje u nizu)
+            if declaration_type.startswith('sequence_') or declaration_type == 'belot':
+                min_length = SEQUENCE_MIN_LENGTH.get(declaration_type)
+                if min_length is None:
                     logger.warning(f"Nepoznat tip sekvence: {declaration_type}")
                     return False, []
-                    
-                # Grupiraj karte po bojama
-                suit_groups = {}
-                for card in player_hand:
-                    if card.suit not in suit_groups:
-                        suit_groups[card.suit] = []
-                    suit_groups[card.suit].append(card)
                 
-                # Provjeri svaku grupu za sekvence
-                for suit, cards in suit_groups.items():
-                    # Sortiranje karata po vrijednosti
-                    cards.sort(key=lambda c: self.VALID_SEQUENCES.index(c.value))
-                    
-                    # Traži najdulji niz
-                    sequences = self._find_sequences(cards)
-                    for sequence in sequences:
-                        if len(sequence) >= min_length:
-                            logger.info(f"Pronađena sekvenca duljine {len(sequence)} u {self._suit_name(suit)}")
-                            return True, sequence
+                for sequence in find_sequences(hand_bits):
+                    length = card_mask.count_cards(sequence.mask)
+                    if length >= min_length:
+                        suit = card_mask.INDEX_SUIT[sequence.mask.bit_length() - 1]
+                        logger.info(f"Pronađena sekvenca duljine {length} u {self._suit_name(suit)}")
+                        cards = card_mask.filter_cards(player_hand, sequence.mask)
+                        return True, sorted(cards, key=lambda c: self.VALID_SEQUENCES.index(c.value))
                 
                 logger.debug(f"Sekvenca tipa {declaration_type} nije pronađena")
                 return False, []
-            
-            # Za belot (8 karata iste boje)
-            if declaration_type == 'belot':
-                suit_groups = {}
-                for card in player_hand:
-                    if card.suit not in suit_groups:
-                        suit_groups[card.suit] = []
-                    suit_groups[card.suit].append(card)
-                
-                for suit, cards in suit_groups.items():
-                    if len(cards) == 8:
-                        logger.info(f"Pronađen belot u {self._suit_name(suit)}")
-                        return True, cards
-                
-                logger.debug("Belot nije pronađen")
-                return False, []
                 
             logger.warning(f"Nepoznat tip zvanja: {declaration_type}")
             return False, []
@@ -224,7 +182,7 @@ class CallValidator:
             logger.error(f"Greška prilikom provjere mogućnosti zvanja: {str(e)}")
             return False, []
     
-    @track_execution_time
+    @sampled_timer
     def check_priority(self, declarations_list):
         """
         Određuje koje zvanje ima najveći prioritet.
@@ -264,7 +222,7 @@ class CallValidator:
             logger.error(f"Greška prilikom određivanja prioriteta zvanja: {str(e)}")
             return -1
     
-    @track_execution_time
+    @sampled_timer
     def validate_trump_call(self, suit):
         """
         Provjerava valjanost zvanja aduta.
@@ -293,7 +251,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije aduta: {str(e)}")
             return False, f"Interna greška prilikom validacije aduta: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def validate_bela(self, cards, trump_suit):
         """
         Provjerava valjanost zvanja bele (kralj i dama u adutu).
@@ -350,7 +308,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije bele: {str(e)}")
             return False, f"Interna greška prilikom validacije bele: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def validate_declaration(self, declaration_type, cards, trump_suit=None):
         """
         Provjerava valjanost zvanja (sekvence, četiri iste karte, belot).
@@ -399,7 +357,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije zvanja: {str(e)}")
             return False, f"Interna greška prilikom validacije zvanja: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def validate_sequence(self, card_codes, declaration_type):
         """
         Provjerava valjanost zvanja sekvence (terca, kvarta, kvinta, itd.).
@@ -463,7 +421,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije sekvence: {str(e)}")
             return False, f"Interna greška prilikom validacije sekvence: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def validate_four_of_kind(self, card_codes, declaration_type):
         """
         Provjerava valjanost zvanja četiri iste karte.
@@ -522,7 +480,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije četiri iste karte: {str(e)}")
             return False, f"Interna greška prilikom validacije zvanja četiri iste karte: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def validate_belot(self, card_codes):
         """
         Provjerava valjanost zvanja belot (osam karata u nizu iste boje).
@@ -566,7 +524,7 @@ class CallValidator:
             logger.error(f"Greška prilikom validacije belota: {str(e)}")
             return False, f"Interna greška prilikom validacije belota: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def _find_sequences(self, sorted_cards):
         """
         Pronalazi sve sekvence u listi sortiranih karata.
@@ -581,30 +539,11 @@ class CallValidator:
             if not sorted_cards:
                 logger.debug("Prazna lista karata za traženje sekvenci")
                 return []
-                
-            sequences = []
-            current_sequence = [sorted_cards[0]]
             
-            for i in range(1, len(sorted_cards)):
-                # Ako je trenutna karta za 1 veća od prethodne, dodaj u sekvencu
-                prev_idx = self.VALID_SEQUENCES.index(sorted_cards[i-1].value)
-                curr_idx = self.VALID_SEQUENCES.index(sorted_cards[i].value)
-                
-                if curr_idx == prev_idx + 1:
-                    current_sequence.append(sorted_cards[i])
-                else:
-                    # Završi sekvencu ako je dovoljno duga
-                    if len(current_sequence) >= 3:
-                        sequences.append(current_sequence.copy())
-                        logger.debug(f"Pronađena sekvenca duljine {len(current_sequence)}")
-                    # Započni novu sekvencu
-                    current_sequence = [sorted_cards[i]]
-            
-            # Dodaj posljednju sekvencu ako je dovoljno duga
-            if len(current_sequence) >= 3:
-                sequences.append(current_sequence)
-                logger.debug(f"Pronađena posljednja sekvenca duljine {len(current_sequence)}")
-                
+            sequences = [
+                card_mask.filter_cards(sorted_cards, sequence.mask)
+                for sequence in find_sequences(card_mask.mask_from_cards(sorted_cards))
+            ]
             logger.info(f"Ukupno pronađeno {len(sequences)} sekvenci")
             return sequences
             
@@ -612,7 +551,6 @@ class CallValidator:
             logger.error(f"Greška prilikom traženja sekvenci: {str(e)}")
             return []
     
-    @lru_cache(maxsize=32)
     def _normalize_suit(self, suit):
         """
         Pretvara puno ime boje u kod boje.
@@ -646,7 +584,6 @@ class CallValidator:
             # Vraćamo izvornu vrijednost kao fallback
             return suit
     
-    @lru_cache(maxsize=32)
     def _suit_name(self, suit_code):
         """
         Vraća čitljivo ime boje na hrvatskom.
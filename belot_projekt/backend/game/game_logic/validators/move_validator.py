@@ -8,10 +8,11 @@ i igranju jačih karata kada je to potrebno.
 """
 
 import logging
-from functools import lru_cache
 from game.game_logic.card import Card
+from game.game_logic import card_mask
+from game.game_logic import legal_moves
 from game.game_logic.rules import Rules
-from utils.decorators import track_execution_time
+from game.utils.profiling import sampled_timer
 
 # Konfiguracija loggera
 logger = logging.getLogger(__name__)
@@ -46,7 +47,7 @@ class MoveValidator:
         'C': 'tref'
     }
     
-    @track_execution_time
+    @sampled_timer
     def __init__(self):
         """Inicijalizira validator poteza."""
         self.rules = Rules()  # Koristimo Rules klasu za provjeru pravila
@@ -57,12 +58,10 @@ class MoveValidator:
         """Invalidira sve kešove povezane s validatorom poteza."""
         import time
         self._cache_timestamp = time.time()
-        # Briše sve keširane vrijednosti pozivanjem odgovarajućih clear metoda
-        self._normalize_suit.cache_clear()
-        self._suit_name.cache_clear()
+        # Pomoćne metode ne keširaju rezultate po instanci, pa nema što brisati
         logger.debug("Keš validatora poteza invalidiran")
     
-    @track_execution_time
+    @sampled_timer
     def validate(self, card, hand, trick, trump_suit):
         """
         Glavna metoda validacije poteza (alias za validate_move).
@@ -99,7 +98,7 @@ class MoveValidator:
             logger.error(f"Greška pri validaciji poteza: {str(e)}", exc_info=True)
             return False, f"Greška pri validaciji: {str(e)}"
     
-    @track_execution_time
+    @sampled_timer
     def can_play_card(self, card, hand, trick, trump_suit):
         """
         Provjerava može li se karta odigrati prema pravilima.
@@ -125,7 +124,7 @@ class MoveValidator:
             logger.error(f"Greška pri provjeri može li se karta odigrati: {str(e)}", exc_info=True)
             return False
     
-    @track_execution_time
+    @sampled_timer
     def must_follow_suit(self, hand, lead_suit, trump_suit):
         """
         Vraća karte koje igrač može igrati poštujući pravilo praćenja boje.
@@ -157,16 +156,17 @@ class MoveValidator:
             trump_suit_code = self._normalize_suit(trump_suit)
             
             # Provjeri ima li igrač karte tražene boje
-            lead_suit_cards = [card for card in hand if card.suit == lead_suit_code]
-            if lead_suit_cards:
-                logger.debug(f"Igrač mora igrati boju {lead_suit_code}, pronađeno {len(lead_suit_cards)} odgovarajućih karata")
-                return lead_suit_cards
+            hand_bits = card_mask.hand_mask(hand)
+            lead_suit_bits = hand_bits & card_mask.suit_mask(lead_suit_code)
+            if lead_suit_bits:
+                logger.debug(f"Igrač mora igrati boju {lead_suit_code}")
+                return card_mask.filter_cards(hand, lead_suit_bits)
             
             # Ako nema karte tražene boje, treba igrati aduta ako ga ima
-            trump_cards = [card for card in hand if card.suit == trump_suit_code]
-            if trump_cards:
-                logger.debug(f"Igrač nema boju {lead_suit_code}, ali mora igrati aduta {trump_suit_code}, pronađeno {len(trump_cards)} aduta")
-                return trump_cards
+            trump_bits = hand_bits & card_mask.suit_mask(trump_suit_code)
+            if trump_bits:
+                logger.debug(f"Igrač nema boju {lead_suit_code}, ali mora igrati aduta {trump_suit_code}")
+                return card_mask.filter_cards(hand, trump_bits)
             
             # Ako nema ni traženu boju ni aduta, može baciti bilo koju kartu
             logger.debug(f"Igrač nema ni boju {lead_suit_code} ni aduta {trump_suit_code}, može igrati bilo koju kartu")
@@ -175,7 +175,7 @@ class MoveValidator:
             logger.error(f"Greška pri određivanju karata koje igrač može odigrati: {str(e)}", exc_info=True)
             return hand  # U slučaju greške, vrati sve karte
     
-    @track_execution_time
+    @sampled_timer
     def can_trump(self, hand, lead_suit, trump_suit, trick=None):
         """
         Provjerava može li i mora li igrač igrati aduta.
@@ -208,16 +208,15 @@ class MoveValidator:
             trump_suit_code = self._normalize_suit(trump_suit)
             
             # Provjeri ima li igrač karte tražene boje
-            has_lead_suit = any(card.suit == lead_suit_code for card in hand)
+            hand_bits = card_mask.hand_mask(hand)
             
             # Ako ima traženu boju, ne smije rezati
-            if has_lead_suit:
+            if card_mask.has_suit(hand_bits, lead_suit_code):
                 logger.debug(f"Igrač ima boju {lead_suit_code}, ne smije rezati")
                 return False, False
                 
             # Provjeri ima li aduta
-            has_trump = any(card.suit == trump_suit_code for card in hand)
-            if not has_trump:
+            if not card_mask.has_suit(hand_bits, trump_suit_code):
                 logger.debug(f"Igrač nema aduta {trump_suit_code}, ne može rezati")
                 return False, False
                 
@@ -237,8 +236,8 @@ class MoveValidator:
             logger.error(f"Greška pri provjeri može li i mora li igrač rezati: {str(e)}", exc_info=True)
             return False, False  # U slučaju greške, pretpostavljamo da ne može i ne mora
     
-    @track_execution_time
-    def validate_move(self, card, hand, trick, trump_suit):
+    @sampled_timer
+    def validate_move(self, card, hand, trick, trump_suit, trick_state=None):
         """
         Provjerava je li potez valjan prema pravilima igre.
         
@@ -247,6 +246,8 @@ class MoveValidator:
             hand (list): Lista karata u ruci igrača
             trick (list): Lista već odigranih karata u trenutnom štihu
             trump_suit (str): Adutska boja
+            trick_state (tuple, optional): Stanje štiha iz TrickTracker.state;
+                ako je zadano, karta koja nosi štih se ne traži ponovno
             
         Returns:
             tuple: (bool, str) - (je li potez valjan, razlog ako nije)
@@ -260,74 +261,14 @@ class MoveValidator:
                 error_msg = "Ruka je prazna"
                 logger.warning(error_msg)
                 return False, error_msg
-                
-            # Provjera je li karta u ruci igrača
-            if card not in hand:
-                error_msg = "Karta nije u ruci igrača"
-                logger.debug(error_msg)
-                return False, error_msg
             
-            # Ako je prvi potez u štihu, bilo koja karta je dozvoljena
-            if not trick:
-                logger.debug(f"Prvi potez u štihu, karta {card} je valjana")
-                return True, ""
-            
-            # Dohvati boju prve karte (tražena boja)
-            lead_card = trick[0]
-            if not hasattr(lead_card, 'suit'):
-                error_msg = f"Prva karta u štihu nema svojstvo 'suit': {lead_card}"
-                logger.warning(error_msg)
-                raise ValueError(error_msg)
-                
-            lead_suit = lead_card.suit
-            
-            # Provjeri ima li igrač traženu boju
-            has_lead_suit = any(c.suit == lead_suit for c in hand)
-            
-            # Ako igrač ima traženu boju, mora ju igrati
-            if has_lead_suit and card.suit != lead_suit:
-                error_msg = f"Moraš igrati kartu boje {self._suit_name(lead_suit)}"
+            # Posjedovanje karte, praćenje boje, bacanje aduta i über određuje generator dozvoljenih poteza
+            reason = legal_moves.illegal_reason(card, hand, trick, trump_suit, state=trick_state)
+            if reason:
+                error_msg = self._reason_message(reason, trick, trump_suit, trick_state)
                 logger.debug(error_msg)
                 return False, error_msg
             
-            # Provjeri mora li igrač igrati jaču kartu (über)
-            if has_lead_suit and card.suit == lead_suit:
-                # Provjera pravila übera korištenjem Rules klase
-                if self.rules.must_play_higher_card(card, hand, trick, trump_suit):
-                    try:
-                        # Provjera je li karta dovoljno jaka
-                        highest_card = max(
-                            [c for c in trick if c.suit == lead_suit],
-                            key=lambda c: self.rules.get_card_value_in_trick(c, lead_suit, trump_suit)
-                        )
-                        
-                        card_value = self.rules.get_card_value_in_trick(card, lead_suit, trump_suit)
-                        highest_value = self.rules.get_card_value_in_trick(highest_card, lead_suit, trump_suit)
-                        
-                        if card_value < highest_value:
-                            error_msg = f"Moraš igrati viši {self._suit_name(lead_suit)} ako ga imaš"
-                            logger.debug(error_msg)
-                            return False, error_msg
-                    except Exception as e:
-                        logger.error(f"Greška pri provjeri übera: {str(e)}", exc_info=True)
-            
-            # Provjeri adutsko pravilo ako igrač nema traženu boju
-            if not has_lead_suit:
-                # Normalizacija adutske boje
-                trump_suit_code = self._normalize_suit(trump_suit)
-                
-                # Provjeri je li adut već igran
-                adut_played = any(c.suit == trump_suit_code for c in trick)
-                
-                # Provjeri ima li igrač aduta
-                has_trump = any(c.suit == trump_suit_code for c in hand)
-                
-                # Ako adut nije igran i igrač ima aduta, mora ga igrati
-                if not adut_played and has_trump and card.suit != trump_suit_code:
-                    error_msg = f"Moraš igrati aduta ({self._suit_name(trump_suit_code)}) ako nemaš traženu boju"
-                    logger.debug(error_msg)
-                    return False, error_msg
-            
             # Potez je valjan
             logger.debug(f"Potez s kartom {card} je valjan")
             return True, ""
@@ -335,7 +276,34 @@ class MoveValidator:
             logger.error(f"Greška pri validaciji poteza: {str(e)}", exc_info=True)
             return False, f"Greška pri validaciji: {str(e)}"
     
-    @track_execution_time
+    def _reason_message(self, reason, trick, trump_suit, trick_state=None):
+        """
+        Pretvara razlog nedozvoljenog poteza u poruku za igrača.
+        
+        Args:
+            reason (str): Razlog iz modula legal_moves (REASON_* konstanta)
+            trick (list): Lista već odigranih karata u trenutnom štihu
+            trump_suit (str): Adutska boja
+            trick_state (tuple, optional): Već poznato stanje štiha
+            
+        Returns:
+            str: Poruka na hrvatskom
+        """
+        if reason == legal_moves.REASON_NOT_IN_HAND:
+            return "Karta nije u ruci igrača"
+        
+        trump_name = self._suit_name(self._normalize_suit(trump_suit))
+        if reason == legal_moves.REASON_PLAY_TRUMP:
+            return f"Moraš igrati aduta ({trump_name}) ako nemaš traženu boju"
+        if reason == legal_moves.REASON_OVERTRUMP:
+            return f"Moraš igrati višeg aduta ({trump_name}) ako ga imaš"
+        
+        lead_suit, _ = trick_state or legal_moves.trick_state(trick, trump_suit)
+        if reason == legal_moves.REASON_PLAY_HIGHER:
+            return f"Moraš igrati viši {self._suit_name(lead_suit)} ako ga imaš"
+        return f"Moraš igrati kartu boje {self._suit_name(lead_suit)}"
+    
+    @sampled_timer
     def validate_first_card(self, card, hand):
         """
         Provjerava valjanost prve karte u štihu.
@@ -374,7 +342,6 @@ class MoveValidator:
             logger.error(f"Greška pri validaciji prve karte: {str(e)}", exc_info=True)
             return False, f"Greška pri validaciji: {str(e)}"
     
-    @lru_cache(maxsize=64)
     def _normalize_suit(self, suit):
         """
         Pretvara puno ime boje u kod boje.
@@ -408,7 +375,6 @@ class MoveValidator:
             logger.error(f"Greška pri normalizaciji boje: {str(e)}", exc_info=True)
             return suit  # U slučaju greške, vraćamo izvornu vrijednost
     
-    @lru_cache(maxsize=16)
     def _suit_name(self, suit_code):
         """
         Vraća čitljivo ime boje.
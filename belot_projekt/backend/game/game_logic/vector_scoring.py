@@ -0,0 +1,258 @@
+"""
+Modul za skupno (vektorizirano) bodovanje završenih rundi Belot igre.
+
+Scoring.calculate_trick_points i ScoringService boduju kartu po kartu
+preko rječnika i uz logiranje, što je prikladno za jednu rundu u igri,
+ali presporo za preračun statistika i velike serije simulacija. Ovdje se
+serija rundi zadaje kao niz indeksa karata po štihu (indeksi iz modula
+card_mask), adut svake runde i tim koji je osvojio svaki štih, a bodovi
+štihova, bonus za zadnji štih, štiglja i ukupni bodovi timova računaju
+se odjednom za cijelu seriju.
+
+NumPy se instalira iz requirements/base.txt. Ako ipak nije dostupan,
+koristi se ekvivalentna implementacija u čistom Pythonu nad istom
+tablicom bodova, s istim rezultatom.
+
+Timovi su označeni indeksima 0 (tim 'a') i 1 (tim 'b'), kao u modulu
+simulation.
+"""
+
+from game.game_logic import card_mask
+from game.game_logic.scoring import Scoring
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Broj štihova u rundi i karata u štihu
+TRICKS_PER_ROUND = 8
+CARDS_PER_TRICK = 4
+
+# Redovi tablice bodova: četiri adutske boje, "sve adut" i "bez aduta"
+TRUMP_KEYS = card_mask.SUITS + ('all_trump', 'no_trump')
+
+# Bodovi karata po redu tablice i indeksu karte
+POINTS_TABLE = tuple(card_mask.CARD_POINTS[suit] for suit in card_mask.SUITS) + (
+    tuple(Scoring.TRUMP_POINTS[card_mask.INDEX_VALUE[index]] for index in range(card_mask.NUM_CARDS)),
+    tuple(Scoring.NON_TRUMP_POINTS[card_mask.INDEX_VALUE[index]] for index in range(card_mask.NUM_CARDS)),
+)
+
+# Ista tablica kao NumPy polje oblika (6, 32)
+POINTS_ARRAY = np.array(POINTS_TABLE, dtype=np.int32) if HAS_NUMPY else None
+
+
+def trump_row(trump_suit):
+    """
+    Vraća red tablice bodova za adut.
+
+    Args:
+        trump_suit (str or int): Adut (kod boje, puno ime, 'all_trump',
+            'no_trump') ili već izračunati red tablice
+
+    Returns:
+        int: Red tablice bodova
+
+    Raises:
+        ValueError: Ako adut nije prepoznat
+    """
+    if isinstance(trump_suit, int):
+        if 0 <= trump_suit < len(TRUMP_KEYS):
+            return trump_suit
+        raise ValueError(f"Nevažeći red tablice bodova: {trump_suit}")
+    if trump_suit in ('all_trump', 'no_trump'):
+        return TRUMP_KEYS.index(trump_suit)
+    suit = card_mask.suit_code(trump_suit)
+    if suit not in card_mask.SUITS:
+        raise ValueError(f"Nevažeći adut: {trump_suit}")
+    return card_mask.SUITS.index(suit)
+
+
+def _check_shapes(tricks, winners):
+    """
+    Provjerava oblik ulaznih podataka za bodovanje.
+
+    Args:
+        tricks (list): Indeksi karata po rundi i štihu
+        winners (list): Tim koji je osvojio štih po rundi i štihu
+
+    Raises:
+        ValueError: Ako runda nema osam štihova od po četiri karte
+    """
+    if len(tricks) != len(winners):
+        raise ValueError("Broj rundi u štihovima i pobjednicima štihova se razlikuje")
+    for round_tricks, round_winners in zip(tricks, winners):
+        if len(round_tricks) != TRICKS_PER_ROUND or len(round_winners) != TRICKS_PER_ROUND:
+            raise ValueError(f"Runda mora imati točno {TRICKS_PER_ROUND} štihova")
+        for trick in round_tricks:
+            if len(trick) != CARDS_PER_TRICK:
+                raise ValueError(f"Štih mora imati točno {CARDS_PER_TRICK} karte")
+
+
+def _score_python(tricks, rows, winners, calling_teams, declaration_points, bela_points):
+    """Boduje runde u čistom Pythonu; rezultat je isti kao u _score_numpy."""
+    result = {'trick_points': [], 'tricks_won': [], 'sweep_team': [], 'points': [], 'passed': []}
+    last = TRICKS_PER_ROUND - 1
+
+    for number, (round_tricks, row, round_winners) in enumerate(zip(tricks, rows, winners)):
+        points_row = POINTS_TABLE[row]
+        trick_points = [0, 0]
+        tricks_won = [0, 0]
+        for trick_number, (trick, team) in enumerate(zip(round_tricks, round_winners)):
+            total = sum(points_row[index] for index in trick)
+            if trick_number == last:
+                total += Scoring.LAST_TRICK_BONUS
+            trick_points[team] += total
+            tricks_won[team] += 1
+
+        points = list(trick_points)
+        sweep_team = -1
+        for team in (0, 1):
+            if tricks_won[1 - team] == 0:
+                sweep_team = team
+                points[team] += Scoring.CLEAN_SWEEP_BONUS
+
+        if declaration_points is not None:
+            for team in (0, 1):
+                # Zvanja vrijede samo ako tim osvoji barem jedan štih
+                if tricks_won[team]:
+                    points[team] += declaration_points[number][team]
+        if bela_points is not None:
+            points[0] += bela_points[number][0]
+            points[1] += bela_points[number][1]
+
+        passed = True
+        if calling_teams is not None:
+            calling = calling_teams[number]
+            passed = points[calling] > points[1 - calling]
+            if not passed:
+                points[1 - calling] += points[calling]
+                points[calling] = 0
+
+        result['trick_points'].append(trick_points)
+        result['tricks_won'].append(tricks_won)
+        result['sweep_team'].append(sweep_team)
+        result['points'].append(points)
+        result['passed'].append(passed)
+    return result
+
+
+def _score_numpy(tricks, rows, winners, calling_teams, declaration_points, bela_points):
+    """Boduje runde NumPy operacijama nad cijelom serijom odjednom."""
+    tricks = np.asarray(tricks, dtype=np.intp)
+    rows = np.asarray(rows, dtype=np.intp)
+    winners = np.asarray(winners, dtype=np.intp)
+
+    # Bodovi svakog štiha: (R, 8)
+    per_trick = POINTS_ARRAY[rows[:, None, None], tricks].sum(axis=2)
+    per_trick[:, -1] += Scoring.LAST_TRICK_BONUS
+
+    # Maska štihova po timu: (R, 8, 2)
+    team_mask = winners[:, :, None] == np.arange(2)
+    trick_points = (per_trick[:, :, None] * team_mask).sum(axis=1)
+    tricks_won = team_mask.sum(axis=1)
+
+    points = trick_points.copy()
+    swept = tricks_won[:, ::-1] == 0
+    points += swept * Scoring.CLEAN_SWEEP_BONUS
+    sweep_team = np.where(swept[:, 0], 0, np.where(swept[:, 1], 1, -1))
+
+    if declaration_points is not None:
+        points += np.asarray(declaration_points, dtype=points.dtype) * (tricks_won > 0)
+    if bela_points is not None:
+        points += np.asarray(bela_points, dtype=points.dtype)
+
+    passed = np.ones(len(rows), dtype=bool)
+    if calling_teams is not None:
+        calling = np.asarray(calling_teams, dtype=np.intp)
+        order = np.arange(len(rows))
+        caller_points = points[order, calling]
+        passed = caller_points > points[order, 1 - calling]
+        failed = ~passed
+        points[order[failed], 1 - calling[failed]] += caller_points[failed]
+        points[order[failed], calling[failed]] = 0
+
+    return {
+        'trick_points': trick_points.tolist(),
+        'tricks_won': tricks_won.tolist(),
+        'sweep_team': sweep_team.tolist(),
+        'points': points.tolist(),
+        'passed': passed.tolist(),
+    }
+
+
+def score_rounds(tricks, trumps, winners, calling_teams=None,
+                 declaration_points=None, bela_points=None, use_numpy=None):
+    """
+    Boduje seriju završenih rundi odjednom.
+
+    Pravila su ista kao u simulaciji i servisu bodovanja: zadnji štih nosi
+    LAST_TRICK_BONUS, tim koji osvoji sve štihove dobiva CLEAN_SWEEP_BONUS,
+    zvanja vrijede samo timu koji je osvojio barem jedan štih, a tim koji
+    je zvao aduta i nije osvojio više bodova od protivnika pada.
+
+    Args:
+        tricks (list): Indeksi karata, oblik (R, 8, 4)
+        trumps (list): Adut svake runde (vidi trump_row), duljina R
+        winners (list): Indeks tima (0 ili 1) koji je osvojio štih, oblik (R, 8)
+        calling_teams (list, optional): Indeks tima koji je zvao aduta po
+            rundi; bez njega se pravilo pada ne primjenjuje
+        declaration_points (list, optional): Bodovi zvanja po rundi i timu, oblik (R, 2)
+        bela_points (list, optional): Bodovi bele po rundi i timu, oblik (R, 2)
+        use_numpy (bool, optional): Prisilno uključuje ili isključuje NumPy;
+            zadano se koristi ako je instaliran
+
+    Returns:
+        dict: Liste po rundi: 'trick_points' i 'tricks_won' ([tim a, tim b]),
+              'sweep_team' (indeks tima ili -1), 'points' (ukupni bodovi
+              timova) i 'passed' (je li tim koji je zvao prošao)
+
+    Raises:
+        ValueError: Ako su ulazni podaci nevažećeg oblika ili adut nije prepoznat
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    elif use_numpy and not HAS_NUMPY:
+        raise ValueError("NumPy nije instaliran")
+
+    if len(trumps) != len(tricks):
+        raise ValueError("Broj aduta i broj rundi se razlikuje")
+    rows = [trump_row(trump) for trump in trumps]
+
+    if not use_numpy:
+        _check_shapes(tricks, winners)
+        return _score_python(tricks, rows, winners, calling_teams, declaration_points, bela_points)
+
+    if not rows:
+        return {'trick_points': [], 'tricks_won': [], 'sweep_team': [], 'points': [], 'passed': []}
+    if np.shape(tricks)[1:] != (TRICKS_PER_ROUND, CARDS_PER_TRICK) or \
+            np.shape(winners) != (len(rows), TRICKS_PER_ROUND):
+        raise ValueError(
+            f"Runda mora imati točno {TRICKS_PER_ROUND} štihova od po {CARDS_PER_TRICK} karte"
+        )
+    return _score_numpy(tricks, rows, winners, calling_teams, declaration_points, bela_points)
+
+
+def round_from_codes(tricks, trump_suit, winner_teams):
+    """
+    Pretvara štihove zadane kodovima karata u ulaz za score_rounds.
+
+    Args:
+        tricks (list): Osam štihova, svaki lista od četiri koda karte
+            ili Card objekta
+        trump_suit (str): Adut runde
+        winner_teams (list): Indeks tima koji je osvojio svaki štih
+
+    Returns:
+        tuple: (indeksi karata po štihu, red tablice bodova, pobjednici štihova)
+
+    Raises:
+        ValueError: Ako karta ili adut nisu valjani
+    """
+    indices = [
+        [card_mask.card_index(card) for card in trick]
+        for trick in tricks
+    ]
+    return indices, trump_row(trump_suit), list(winner_teams)
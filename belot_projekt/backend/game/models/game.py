@@ -12,6 +12,8 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from game.game_logic.seating import SEATS, SEATS_KEY, SeatMap
+
 User = settings.AUTH_USER_MODEL
 
 class Game(models.Model):
@@ -196,6 +198,9 @@ class Game(models.Model):
         elif user in self.team_b_players.all():
             self.team_b_players.remove(user)
         
+        # Raspored za stolom više ne vrijedi
+        self.clear_seat_map()
+        
         # Ako je igra u tijeku, označi je kao napuštenu
         if self.status == 'in_progress':
             self.abandon_game()
@@ -230,6 +235,12 @@ class Game(models.Model):
         self.team_a_players.add(all_players[0], all_players[1])
         self.team_b_players.add(all_players[2], all_players[3])
         
+        # Partneri sjede nasuprot
+        self.set_seat_map(SeatMap.from_teams(
+            [all_players[0].id, all_players[1].id],
+            [all_players[2].id, all_players[3].id]
+        ), save=False)
+        
         self.save()
         return True
     
@@ -241,6 +252,104 @@ class Game(models.Model):
         """Vraća queryset igrača iz tima B."""
         return self.team_b_players.all()
     
+    def get_seat_map(self):
+        """
+        Vraća raspored igrača za stolom (pozicije 0-3).
+        
+        Raspored se čita iz game_data. Ako nije spremljen, a igra ima četiri
+        igrača, gradi se iz timova (partneri nasuprot) ili, ako timovi nisu
+        određeni, prema redoslijedu pridruživanja, te se sprema. Rezultat se
+        pamti na instanci, pa ponovni pozivi ne rade upite.
+        
+        Returns:
+            SeatMap: Raspored ili None ako igra nema četiri igrača
+        """
+        seat_map = getattr(self, '_seat_map', None)
+        if seat_map is not None:
+            return seat_map
+        
+        seat_ids = (self.game_data or {}).get(SEATS_KEY)
+        if seat_ids:
+            self._seat_map = SeatMap(seat_ids)
+            return self._seat_map
+        
+        if not self.pk:
+            return None
+        team_a = sorted(self.team_a_players.values_list('id', flat=True))
+        team_b = sorted(self.team_b_players.values_list('id', flat=True))
+        if len(team_a) == 2 and len(team_b) == 2:
+            seat_map = SeatMap.from_teams(team_a, team_b)
+        else:
+            # Redoslijed pridruživanja (redoslijed zapisa u vezi igra-igrač)
+            joined = list(Game.players.through.objects.filter(game_id=self.pk)
+                          .order_by('id').values_list('user_id', flat=True))
+            if len(joined) != SEATS:
+                return None
+            seat_map = SeatMap(joined)
+        
+        self.set_seat_map(seat_map)
+        return seat_map
+    
+    def set_seat_map(self, seat_map, save=True):
+        """
+        Sprema raspored igrača za stolom u game_data.
+        
+        Args:
+            seat_map (SeatMap): Raspored
+            save (bool): Sprema li se igra odmah
+        """
+        if self.game_data is None:
+            self.game_data = {}
+        self.game_data[SEATS_KEY] = seat_map.to_list()
+        self._seat_map = seat_map
+        if save and self.pk:
+            self.save(update_fields=['game_data'])
+    
+    def clear_seat_map(self):
+        """Briše spremljeni raspored (npr. kad igrač napusti igru)."""
+        self._seat_map = None
+        if (self.game_data or {}).pop(SEATS_KEY, None) is not None and self.pk:
+            self.save(update_fields=['game_data'])
+    
+    def get_seated_players(self):
+        """
+        Vraća igrače poredane po pozicijama za stolom.
+        
+        Returns:
+            list: Igrači (User) po pozicijama ili igrači iz baze ako raspored
+                  još ne postoji
+        """
+        players = list(self.players.all())
+        seat_map = self.get_seat_map()
+        if seat_map is None:
+            return players
+        by_id = {player.id: player for player in players}
+        return [by_id[player_id] for player_id in seat_map if player_id in by_id]
+    
+    def get_player_after(self, user, step=1):
+        """
+        Vraća igrača koji sjedi step mjesta nakon zadanog igrača.
+        
+        Args:
+            user: Igrač (User) ili njegov ID
+            step (int): Broj mjesta redom igranja
+            
+        Returns:
+            User: Igrač ili None ako raspored ne postoji ili igrač nije za stolom
+        """
+        seat_map = self.get_seat_map()
+        if seat_map is None:
+            return None
+        player_id = seat_map.next_player(getattr(user, 'id', user), step)
+        if player_id is None:
+            return None
+        
+        # Igrači dohvaćeni s prefetch_related ne traže novi upit
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('players')
+        if prefetched is not None:
+            return next((player for player in prefetched if player.id == player_id), None)
+        return self.players.model._default_manager.filter(id=player_id).first()
+    
     def get_team_for_player(self, user):
         """
         Vraća oznaku tima ('a' ili 'b') kojem pripada igrač,
@@ -256,15 +365,23 @@ class Game(models.Model):
         """Provjerava je li igrač trenutno aktivan u igri."""
         return self.active_players.filter(id=user.id).exists()
     
-    def update_scores(self, team_a_points=0, team_b_points=0):
+    def update_scores(self, team_a_points=0, team_b_points=0, round_summary=None):
         """
         Ažurira rezultate timova dodavanjem novih bodova.
         Također provjerava je li neki tim dostigao broj bodova za pobjedu.
+        
+        Ako je zadan sažetak runde, dodaje se u game_data['round_scores'],
+        pa se konačni rezultat igre čita bez ponovnog bodovanja rundi.
         """
         # Dodavanje bodova
         self.team_a_score += team_a_points
         self.team_b_score += team_b_points
         
+        if round_summary is not None:
+            if self.game_data is None:
+                self.game_data = {}
+            self.game_data.setdefault('round_scores', []).append(round_summary)
+        
         # Provjera uvjeta za pobjedu
         winner = None
         if self.team_a_score >= self.points_to_win:
@@ -282,6 +399,15 @@ class Game(models.Model):
         
         return None
     
+    def get_round_scores(self):
+        """
+        Vraća sažetke završenih rundi spremljene pri ažuriranju rezultata.
+        
+        Returns:
+            list: Sažeci rundi redom završavanja ili None za igre bez sažetaka
+        """
+        return (self.game_data or {}).get('round_scores')
+    
     def get_current_round(self):
         """Vraća trenutnu (posljednju) rundu igre."""
         return self.rounds.order_by('-number').first()
@@ -299,20 +425,14 @@ class Game(models.Model):
             all_players = list(self.players.all())
             return random.choice(all_players)
         
-        # Dohvati prethodnog djelitelja
-        previous_dealer = current_round.dealer
+        # Sljedeći djelitelj je igrač nakon prethodnog djelitelja za stolom
+        next_dealer = self.get_player_after(current_round.dealer_id)
+        if next_dealer is not None:
+            return next_dealer
         
-        # Poredak igrača u igri (u smjeru suprotnom od kazaljke na satu)
-        # Ovo pretpostavlja da su igrači poredani u smjeru igre
-        all_players = list(self.players.all())
-        try:
-            current_index = all_players.index(previous_dealer)
-            next_index = (current_index + 1) % 4  # Sljedeći u nizu
-            return all_players[next_index]
-        except (ValueError, IndexError):
-            # Ako iz nekog razloga ne možemo odrediti sljedećeg djelitelja,
-            # odaberi nasumičnog igrača
-            return random.choice(all_players)
+        # Ako iz nekog razloga ne možemo odrediti sljedećeg djelitelja,
+        # odaberi nasumičnog igrača
+        return random.choice(list(self.players.all()))
     
     def can_player_start_game(self, user):
         """
@@ -332,6 +452,11 @@ class Game(models.Model):
     
     def get_partner(self, user):
         """Vraća suigrača (partnera) za danog igrača."""
+        # Partner sjedi nasuprot igrača
+        partner = self.get_player_after(user, 2)
+        if partner is not None:
+            return partner
+        
         team = self.get_team_for_player(user)
         if not team:
             return None
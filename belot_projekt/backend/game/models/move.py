@@ -254,74 +254,18 @@ class Move(models.Model):
         if len(trick_moves) < 4:
             return None  # Štih nije gotov
         
-        # Dohvaćanje adutske boje
-        trump_suit_code = self.round.trump_suit
-        if trump_suit_code == 'spades':
-            trump_suit = 'S'
-        elif trump_suit_code == 'hearts':
-            trump_suit = 'H'
-        elif trump_suit_code == 'diamonds':
-            trump_suit = 'D'
-        elif trump_suit_code == 'clubs':
-            trump_suit = 'C'
-        else:
-            trump_suit = None  # No trump ili all trump
-        
-        # Dohvaćanje početne boje
-        first_move = trick_moves[0]
-        lead_suit = first_move.get_card_suit()
-        
-        # Poredak jačine karata u adutskoj i ne-adutskoj boji
-        non_trump_order = {'7': 0, '8': 1, '9': 2, 'J': 3, 'Q': 4, 'K': 5, '10': 6, 'A': 7}
-        trump_order = {'7': 0, '8': 1, 'Q': 2, 'K': 3, '10': 4, 'A': 5, '9': 6, 'J': 7}
+        # Vodeća karta čita se iz praćenja štiha spremljenog u rundi, a
+        # računa se iz poteza samo ako praćenje ne odgovara ovom štihu
+        from game.game_logic.trick_tracker import TrickTracker
         
-        winning_move = first_move
-        highest_value = 0
-        is_trump_played = False
-        
-        # Prolazak kroz sve poteze u štihu
-        for move in trick_moves:
-            move_suit = move.get_card_suit()
-            move_value = move.get_card_value()
-            
-            # Provjeri je li potez adut
-            is_move_trump = False
-            if trump_suit and move_suit == trump_suit:
-                is_move_trump = True
-            elif trump_suit_code == 'all_trump':
-                is_move_trump = True
-            
-            # Ako je već igran adut, samo drugi adut može pobijediti
-            if is_trump_played and not is_move_trump:
-                continue
-            
-            # Ako je ovo prvi adut u štihu, on postaje pobjednički
-            if is_move_trump and not is_trump_played:
-                winning_move = move
-                highest_value = trump_order.get(move_value, 0)
-                is_trump_played = True
-                continue
-            
-            # Ako su oba adut, usporedi vrijednosti
-            if is_move_trump and is_trump_played:
-                move_rank = trump_order.get(move_value, 0)
-                if move_rank > highest_value:
-                    winning_move = move
-                    highest_value = move_rank
-                continue
-            
-            # Ako nema aduta, usporedi s početnom bojom
-            if not is_trump_played:
-                # Samo karte početne boje mogu pobijediti
-                if move_suit == lead_suit:
-                    move_rank = non_trump_order.get(move_value, 0)
-                    if move == first_move or move_rank > highest_value:
-                        winning_move = move
-                        highest_value = move_rank
+        tracker = self.round.get_trick_tracker()
+        if tracker.number != self.get_trick_number() or not tracker.is_complete:
+            tracker = TrickTracker.from_trick(trick_moves, self.round.trump_suit)
+        winning_move = trick_moves[tracker.winning_position]
         
         # Označavanje pobjedničkog poteza
         for move in trick_moves:
             move.is_winning = (move.id == winning_move.id)
-            move.save()
+        Move.objects.bulk_update(trick_moves, ['is_winning'])
         
         return winning_move
\ No newline at end of file
@@ -151,7 +151,13 @@ class Round(models.Model):
         self.save()
         
         # Ažuriranje rezultata igre
-        self.game.update_scores(self.team_a_score, self.team_b_score)
+        self.game.update_scores(self.team_a_score, self.team_b_score, round_summary={
+            'number': self.number,
+            'team_a_score': self.team_a_score,
+            'team_b_score': self.team_b_score,
+            'winner_team': self.winner_team,
+            'calling_team': self.calling_team,
+        })
         
         return self.winner_team
     
@@ -244,6 +250,13 @@ class Round(models.Model):
         team_a_declaration_points = self.get_points_for_declarations('a')
         team_b_declaration_points = self.get_points_for_declarations('b')
         
+        # Bodovi za štihove zbrojeni tijekom igre, bez ponovnog čitanja poteza
+        score = self.get_round_score()
+        if score.is_complete:
+            team_a_trick_points, team_b_trick_points = score.trick_totals()
+            return (team_a_trick_points + team_a_declaration_points,
+                    team_b_trick_points + team_b_declaration_points)
+        
         # Bodovi za štihove iz poteza
         for trick in self.get_tricks():
             if len(trick) == 4:  # Samo dovršeni štihovi
@@ -279,12 +292,8 @@ class Round(models.Model):
         """
         # Ako runda još nije započela, vraća igrača nakon djelitelja
         if not self.moves.exists():
-            # U Belotu, prvi potez ima igrač lijevo od djelitelja
-            all_players = list(self.game.players.all())
-            dealer_index = all_players.index(self.dealer)
-            # Prvi potez ima igrač nakon djelitelja (u smjeru suprotnom od kazaljke na satu)
-            first_player_index = (dealer_index + 1) % 4
-            return all_players[first_player_index]
+            # U Belotu, prvi potez ima igrač nakon djelitelja
+            return self.game.get_player_after(self.dealer_id)
         
         # Ako je runda u tijeku, sljedeći na potezu je igrač nakon
         # onog koji je osvojio posljednji štih
@@ -305,56 +314,242 @@ class Round(models.Model):
                     return winning_move.player
             else:
                 # Štih u tijeku - sljedeći igrač po redu
-                last_player = all_moves.last().player
-                all_players = list(self.game.players.all())
-                last_player_index = all_players.index(last_player)
-                next_player_index = (last_player_index + 1) % 4
-                return all_players[next_player_index]
+                return self.game.get_player_after(all_moves.last().player_id)
         
         # Ako iz nekog razloga ne možemo odrediti sljedećeg igrača,
         # vraćamo None
         return None
     
+    def get_bidding(self, players=None):
+        """
+        Vraća stanje zvanja aduta (Bidding) spremljeno u round_data.
+        
+        Redoslijed zvanja sprema se pri dijeljenju, pa provjera tko je na
+        redu ne dohvaća igrače igre. Za runde bez spremljenog zvanja stanje
+        se gradi iz dijeljenja i starog popisa igrača koji su rekli "dalje".
+        
+        Args:
+            players: Opcionalno, igrači po poziciji (vidi get_deal)
+            
+        Returns:
+            Bidding: Stanje zvanja
+        """
+        from game.game_logic.bidding import Bidding, BIDDING_KEY
+        
+        data = (self.round_data or {}).get(BIDDING_KEY)
+        if data:
+            return Bidding.from_dict(data)
+        
+        bidding = Bidding.for_deal(self.get_deal(players).player_ids, self.dealer_id)
+        for player_id in (self.round_data or {}).get('trump_calling_order', []):
+            if bidding.is_turn(player_id) and not bidding.must_call:
+                bidding.pass_turn(player_id)
+        if self.trump_suit and self.trump_caller_id is not None and bidding.is_turn(self.trump_caller_id):
+            bidding.contract = [bidding.current_bidder, self.trump_suit]
+        self.round_data[BIDDING_KEY] = bidding.to_dict()
+        return bidding
+    
     def get_next_calling_player(self):
         """
         Određuje koji je igrač sljedeći na redu za zvanje aduta.
         Ovo se koristi tijekom faze određivanja aduta.
         """
-        # U Belotu, prvi priliku za zvati aduta ima igrač lijevo od djelitelja
-        all_players = list(self.game.players.all())
-        dealer_index = all_players.index(self.dealer)
+        bidder = self.get_bidding().current_bidder
+        if bidder is None:
+            return None
+        if bidder == self.dealer_id:
+            return self.dealer
+        return self.game.players.filter(id=bidder).first()
+    
+    def add_to_calling_order(self, user):
+        """
+        Dodaje igrača u listu onih koji su rekli "dalje" prilikom zvanja aduta.
+        """
+        from game.game_logic.bidding import BIDDING_KEY
         
-        # Prva prilika za zvanje aduta - igrač nakon djelitelja
-        if not hasattr(self, 'trump_calling_order'):
-            self.trump_calling_order = []
+        bidding = self.get_bidding()
+        bidding.pass_turn(getattr(user, 'id', user))
+        self.round_data[BIDDING_KEY] = bidding.to_dict()
+        self.save(update_fields=['round_data'])
+    
+    def get_trick_tracker(self):
+        """
+        Vraća praćenje trenutnog štiha spremljeno u round_data.
         
-        if not self.trump_calling_order:
-            first_caller_index = (dealer_index + 1) % 4
-            return all_players[first_caller_index]
+        Stanje sadrži traženu boju, kartu i igrača koji trenutno nose štih
+        te bodove štiha do sada, pa za pobjednika štiha i provjeru übanja
+        nije potrebno ponovno dohvaćati poteze iz baze.
+        """
+        from game.game_logic.trick_tracker import TrickTracker
         
-        # Ako su svi već imali priliku, posljednji igrač (djelitelj) mora zvati aduta
-        if len(self.trump_calling_order) == 3:
-            return self.dealer
+        data = (self.round_data or {}).get('trick_leader')
+        return TrickTracker.from_dict(data, self.trump_suit)
+    
+    def track_trick_move(self, move, save=True):
+        """
+        Ažurira praćenje trenutnog štiha odigranim potezom.
+        
+        Args:
+            move: Odigrani potez (Move)
+            save: Sprema li se round_data odmah
+            
+        Returns:
+            TrickTracker: Stanje štiha nakon poteza
+        """
+        tracker = self.get_trick_tracker()
+        trick_number = move.get_trick_number()
+        if tracker.number != trick_number or tracker.is_complete:
+            tracker.reset(trick_number)
+        tracker.add(move.card, move.player_id)
         
-        # Inače, sljedeći igrač nakon posljednjeg koji je rekao "dalje"
-        last_caller = self.trump_calling_order[-1]
-        last_caller_index = all_players.index(last_caller)
-        next_caller_index = (last_caller_index + 1) % 4
-        return all_players[next_caller_index]
+        if self.round_data is None:
+            self.round_data = {}
+        self.round_data['trick_leader'] = tracker.to_dict()
+        self.remove_card_from_hand(move.card, save=False)
+        if tracker.is_complete:
+            self.record_trick(tracker.winning_player, tracker.points)
+        if save:
+            self.save(update_fields=['round_data'])
+        return tracker
     
-    def add_to_calling_order(self, user):
+    def get_round_score(self):
         """
-        Dodaje igrača u listu onih koji su rekli "dalje" prilikom zvanja aduta.
+        Vraća bodove runde zbrojene iz završenih štihova (round_data['score']).
+        
+        Returns:
+            RoundScore: Završeni štihovi i bodovi po timu
+        """
+        from game.game_logic.round_score import RoundScore, SCORE_KEY
+        
+        return RoundScore.from_dict((self.round_data or {}).get(SCORE_KEY))
+    
+    def record_trick(self, winner_id, points):
+        """
+        Bilježi završeni štih u bodove runde (bez spremanja).
+        
+        Args:
+            winner_id: ID igrača koji je osvojio štih
+            points: Bodovi karata u štihu
+            
+        Returns:
+            RoundScore: Bodovi runde nakon štiha
+        """
+        from game.game_logic.round_score import SCORE_KEY
+        
+        score = self.get_round_score()
+        if score.is_complete:
+            return score
+        seat_map = self.game.get_seat_map()
+        team = seat_map.team(winner_id) if seat_map is not None else None
+        if team is None:
+            team = 'a' if self.game.team_a_players.filter(id=winner_id).exists() else 'b'
+        score.add_trick(winner_id, team, points)
+        if self.round_data is None:
+            self.round_data = {}
+        self.round_data[SCORE_KEY] = score.to_dict()
+        return score
+    
+    def get_deal(self, players=None):
+        """
+        Vraća dijeljenje karata runde spremljeno u round_data.
+        
+        Ako runda još nema dijeljenje, stvara se novo s nasumičnim seedom i
+        redoslijedom igrača iz igre te se sprema u round_data. Ruka bilo kojeg
+        igrača tada se čita izravno iz spremljene permutacije.
+        
+        Args:
+            players: Opcionalno, igrači po poziciji za novo dijeljenje
+            
+        Returns:
+            Deal: Dijeljenje runde
         """
-        if not hasattr(self, 'trump_calling_order'):
-            self.trump_calling_order = []
+        from game.game_logic.bidding import Bidding, BIDDING_KEY
+        from game.game_logic.dealing import Deal
         
-        if user not in self.trump_calling_order:
-            self.trump_calling_order.append(user)
+        data = (self.round_data or {}).get('deal')
+        if data:
+            return Deal.from_dict(data)
         
-        # Ažuriranje podataka o rundi
+        if players is None:
+            players = self.game.get_seated_players()
+        deal = Deal.new(player_ids=[player.id for player in players])
         if self.round_data is None:
             self.round_data = {}
+        self.round_data['deal'] = deal.to_dict()
+        self.round_data['hands'] = deal.hand_masks()
+        self.round_data[BIDDING_KEY] = Bidding.for_deal(deal.player_ids, self.dealer_id).to_dict()
+        if self.pk:
+            self.save(update_fields=['round_data'])
+        return deal
+    
+    def get_hand_masks(self):
+        """
+        Vraća maske (card_mask) karata u rukama igrača po poziciji.
+        
+        Ruke se spremaju u round_data['hands'] pri dijeljenju i ažuriraju pri
+        svakom odigranom potezu, pa se čitaju bez upita nad potezima. Za
+        runde podijeljene prije uvođenja spremljenih ruku maske se jednom
+        izračunaju iz dijeljenja i odigranih poteza te spreme.
+        
+        Returns:
+            list: Maska ruke po poziciji igrača u dijeljenju
+        """
+        from game.game_logic import card_mask
+        
+        hands = (self.round_data or {}).get('hands')
+        if hands:
+            return list(hands)
+        
+        hands = self.get_deal().hand_masks()
+        if self.pk:
+            played = card_mask.mask_from_cards(
+                self.moves.filter(is_valid=True).values_list('card', flat=True)
+            )
+            hands = [mask & ~played for mask in hands]
+        self.round_data['hands'] = hands
+        if self.pk:
+            self.save(update_fields=['round_data'])
+        return hands
+    
+    def get_hand(self, player_id):
+        """
+        Vraća karte u ruci igrača.
+        
+        Args:
+            player_id: ID igrača
+            
+        Returns:
+            list: Kodovi karata poredani po boji i vrijednosti ili prazna
+                lista ako igrač nije u dijeljenju
+        """
+        from game.game_logic import card_mask
+        
+        hands = self.get_hand_masks()
+        players = self.round_data['deal'].get('players') or []
+        if player_id not in players:
+            return []
+        hand = card_mask.codes_from_mask(hands[players.index(player_id)])
+        hand.sort(key=lambda c: (c[-1], c[:-1]))
+        return hand
+    
+    def remove_card_from_hand(self, card, save=True):
+        """
+        Uklanja odigranu kartu iz spremljenih ruku.
+        
+        Svaka karta je u točno jednoj ruci, pa se njen bit briše iz svih
+        maski bez traženja pozicije igrača. Ako runda još nema spremljene
+        ruke, ne radi ništa (izračunat će se pri prvom čitanju).
         
-        self.round_data['trump_calling_order'] = [player.id for player in self.trump_calling_order]
-        self.save()
\ No newline at end of file
+        Args:
+            card (str): Kod karte
+            save: Sprema li se round_data odmah
+        """
+        from game.game_logic import card_mask
+        
+        hands = (self.round_data or {}).get('hands')
+        if not hands:
+            return
+        keep = ~card_mask.card_bit(card)
+        self.round_data['hands'] = [mask & keep for mask in hands]
+        if save:
+            self.save(update_fields=['round_data'])
@@ -15,6 +15,7 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from game.models import Game, Round, Move
+from game.repositories.move_repository import MoveRepository
 
 User = get_user_model()
 logger = logging.getLogger('game.repositories')
@@ -348,7 +349,12 @@ class GameRepository:
         Returns:
             bool: True ako je igra uspješno završena, False inače
         """
+        from game.services.game_actor import game_actors
+        
         try:
+            # Stanje igre u memoriji se sprema i izbacuje prije završetka
+            game_actors.evict(game.id)
+            
             # Ako pobjednik nije naveden, odredi ga prema bodovima
             if winner_team is None:
                 if game.team_a_score >= game.points_to_win:
@@ -381,7 +387,12 @@ class GameRepository:
         Returns:
             bool: True ako je igra uspješno označena kao napuštena, False inače
         """
+        from game.services.game_actor import game_actors
+        
         try:
+            # Stanje igre u memoriji se sprema i izbacuje prije napuštanja
+            game_actors.evict(game.id)
+            
             # Koristi metodu modela za napuštanje igre
             result = game.abandon_game()
             
@@ -562,47 +573,10 @@ class GameRepository:
                     })
                 game_state['history'] = history
                 
-                # Dohvaćanje karata igrača
-                from game.models import Move
-                
-                # Uzimamo samo poteze gdje je karta izašla iz ruke igrača
-                played_cards = set(Move.objects.filter(
-                    round=current_round,
-                    player=user,
-                    is_valid=True
-                ).values_list('card', flat=True))
-                
-                # Jednostavna simulacija karata u ruci igrača za demo svrhe
-                try:
-                    from game.game_logic.card import Card
-                    from game.game_logic.deck import Deck
-                    import random
-                    
-                    # Ako postoji aktivna runda koja nije završena
-                    if not current_round.is_completed:
-                        # Simuliraj dijeljenje karata (u stvarnoj implementaciji, to bi bilo u bazi)
-                        # Fiksni seed za konzistentnost u demo svrhe
-                        random.seed(hash(f"{user.id}_{game.id}_{current_round.number}"))
-                        
-                        # Kreiraj špil
-                        deck = Deck()
-                        all_cards = [card.code for card in deck.cards]
-                        random.shuffle(all_cards)
-                        
-                        # Simuliraj karte dodijeljene ovom igraču
-                        player_cards = all_cards[:8]
-                        
-                        # Ukloni karte koje su već odigrane
-                        player_hand = [card for card in player_cards if card not in played_cards]
-                        
-                        # Sortiraj karte za bolji prikaz
-                        player_hand.sort(key=lambda c: (c[-1], c[:-1]))
-                        
-                        game_state['your_cards'] = player_hand
-                    else:
-                        game_state['your_cards'] = []
-                except Exception as e:
-                    logger.error(f"Greška pri simulaciji karata igrača: {str(e)}", exc_info=True)
+                # Dohvaćanje karata igrača iz dijeljenja spremljenog uz rundu
+                if not current_round.is_completed:
+                    game_state['your_cards'] = MoveRepository.get_player_cards(current_round, user)
+                else:
                     game_state['your_cards'] = []
             
             return game_state
@@ -13,8 +13,9 @@ from django.db.models import F, Q, Count, Max, Prefetch
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from game.models import Game, Round, Move, Declaration
+from game.models import Game, GameHistory, Round, Move, Declaration
 from game.game_logic.card import Card
+from game.game_logic.trick_tracker import TrickTracker
 
 User = get_user_model()
 logger = logging.getLogger('game.repositories')
@@ -127,12 +128,7 @@ class MoveRepository:
         
         if moves_count == 0:
             # U Belotu, prvi potez ima igrač nakon djelitelja
-            game = round_obj.game
-            all_players = list(game.players.all())
-            dealer_index = all_players.index(round_obj.dealer)
-            # Prvi potez ima igrač nakon djelitelja (u smjeru suprotnom od kazaljke na satu)
-            first_player_index = (dealer_index + 1) % 4
-            return all_players[first_player_index]
+            return round_obj.game.get_player_after(round_obj.dealer_id)
         
         # Ako je dovršen kompletan štih (4 poteza), sljedeći potez ima pobjednik štiha
         if moves_count > 0 and moves_count % 4 == 0:
@@ -155,11 +151,7 @@ class MoveRepository:
         last_move = Move.objects.filter(round=round_obj).order_by('-order').first()
         
         if last_move:
-            game = round_obj.game
-            all_players = list(game.players.all())
-            last_player_index = all_players.index(last_move.player)
-            next_player_index = (last_player_index + 1) % 4
-            return all_players[next_player_index]
+            return round_obj.game.get_player_after(last_move.player_id)
         
         # Ako iz nekog razloga ne možemo odrediti, vraćamo None
         logger.error(f"Nije moguće odrediti sljedećeg igrača za rundu {round_obj.id}")
@@ -198,10 +190,10 @@ class MoveRepository:
             # Validacija poteza i određivanje pobjednika štiha ako je potrebno
             move.validate_move()
             
-            # Ako je ovaj potez kompletan štih, odredi pobjednika
-            moves_count = Move.objects.filter(round=round_obj).count()
-            if moves_count % 4 == 0:
-                MoveRepository.determine_trick_winner(round_obj, moves_count // 4 - 1)
+            # Ažuriranje vodeće karte štiha; kad je štih kompletan, odredi pobjednika
+            tracker = round_obj.track_trick_move(move)
+            if tracker.is_complete:
+                MoveRepository.determine_trick_winner(round_obj, tracker.number)
             
             return move
         except Exception as e:
@@ -224,91 +216,27 @@ class MoveRepository:
             # Izračunaj redne brojeve poteza u štihu
             start_order = trick_number * 4
             end_order = start_order + 3
-            
-            # Dohvati poteze štiha
-            trick_moves = list(Move.objects.filter(
+            trick_moves = Move.objects.filter(
                 round=round_obj,
                 order__gte=start_order,
                 order__lte=end_order
-            ).order_by('order'))
-            
-            if len(trick_moves) != 4:
-                logger.error(f"Nepotpun štih {trick_number} u rundi {round_obj.id}")
-                return None
-            
-            # Prvo resetiraj pobjednički status svih poteza u štihu
-            for move in trick_moves:
-                move.is_winning = False
-                move.save()
-            
-            # Dohvati adutsku boju
-            trump_suit_code = round_obj.trump_suit
-            if trump_suit_code == 'spades':
-                trump_suit = 'S'
-            elif trump_suit_code == 'hearts':
-                trump_suit = 'H'
-            elif trump_suit_code == 'diamonds':
-                trump_suit = 'D'
-            elif trump_suit_code == 'clubs':
-                trump_suit = 'C'
-            else:
-                trump_suit = None  # No trump ili all trump
-            
-            # Dohvati početnu boju
-            first_move = trick_moves[0]
-            lead_suit = first_move.get_card_suit()
-            
-            # Poredak jačine karata u adutskoj i ne-adutskoj boji
-            non_trump_order = {'7': 0, '8': 1, '9': 2, 'J': 3, 'Q': 4, 'K': 5, '10': 6, 'A': 7}
-            trump_order = {'7': 0, '8': 1, 'Q': 2, 'K': 3, '10': 4, 'A': 5, '9': 6, 'J': 7}
+            )
             
-            winning_move = first_move
-            highest_value = 0
-            is_trump_played = False
-            
-            # Prolazak kroz sve poteze u štihu
-            for move in trick_moves:
-                move_suit = move.get_card_suit()
-                move_value = move.get_card_value()
-                
-                # Provjeri je li potez adut
-                is_move_trump = False
-                if trump_suit and move_suit == trump_suit:
-                    is_move_trump = True
-                elif trump_suit_code == 'all_trump':
-                    is_move_trump = True
-                
-                # Ako je već igran adut, samo drugi adut može pobijediti
-                if is_trump_played and not is_move_trump:
-                    continue
-                
-                # Ako je ovo prvi adut u štihu, on postaje pobjednički
-                if is_move_trump and not is_trump_played:
-                    winning_move = move
-                    highest_value = trump_order.get(move_value, 0)
-                    is_trump_played = True
-                    continue
-                
-                # Ako su oba adut, usporedi vrijednosti
-                if is_move_trump and is_trump_played:
-                    move_rank = trump_order.get(move_value, 0)
-                    if move_rank > highest_value:
-                        winning_move = move
-                        highest_value = move_rank
-                    continue
-                
-                # Ako nema aduta, usporedi s početnom bojom
-                if not is_trump_played:
-                    # Samo karte početne boje mogu pobijediti
-                    if move_suit == lead_suit:
-                        move_rank = non_trump_order.get(move_value, 0)
-                        if move == first_move or move_rank > highest_value:
-                            winning_move = move
-                            highest_value = move_rank
-            
-            # Označi pobjednički potez
-            winning_move.is_winning = True
-            winning_move.save()
+            # Pobjednik se čita iz vodeće karte spremljene u rundi, a poteze
+            # se dohvaća samo ako praćenje ne odgovara traženom štihu
+            tracker = round_obj.get_trick_tracker()
+            if tracker.number != trick_number or not tracker.is_complete:
+                moves = list(trick_moves.order_by('order'))
+                if len(moves) != 4:
+                    logger.error(f"Nepotpun štih {trick_number} u rundi {round_obj.id}")
+                    return None
+                tracker = TrickTracker.from_trick(moves, round_obj.trump_suit, trick_number)
+            
+            # Označi pobjednički potez i resetiraj ostale
+            winning_order = start_order + tracker.winning_position
+            trick_moves.exclude(order=winning_order).update(is_winning=False)
+            trick_moves.filter(order=winning_order).update(is_winning=True)
+            winning_move = trick_moves.select_related('player').get(order=winning_order)
             
             # Ako je ovo posljednji štih u rundi, dodaj 10 bodova
             if trick_number == 7:  # 8 štihova po rundi, 0-bazirani indeks
@@ -322,6 +250,96 @@ class MoveRepository:
             logger.error(f"Greška pri određivanju pobjednika štiha: {str(e)}", exc_info=True)
             raise
     
+    @staticmethod
+    def save_played_moves(entries):
+        """
+        Sprema poteze odigrane izvan baze (npr. u GameActor) jednim skupnim upisom.
+        
+        Svaki unos je rječnik s ključevima 'round_id', 'player_id', 'card',
+        'order', 'trick_leader' (stanje štiha nakon poteza) i 'winning_order'
+        (redni broj pobjedničkog poteza ako je potez završio štih, inače None),
+        opcionalno 'round_score' (bodovi runde nakon završenog štiha, vidi
+        RoundScore.to_dict) te 'game_id' i 'played_at' za zapis u povijest igre.
+        
+        Potezi koji su već spremljeni (ista runda i redni broj) se preskaču,
+        pa se isti unosi mogu sigurno spremiti ponovno (npr. pri obnovi iz
+        dnevnika poteza).
+        
+        Args:
+            entries: Lista unosa redom kojim su potezi odigrani
+            
+        Returns:
+            int: Broj novo spremljenih poteza
+        """
+        if not entries:
+            return 0
+        
+        try:
+            with transaction.atomic():
+                existing = set(Move.objects.filter(
+                    round_id__in={entry['round_id'] for entry in entries},
+                    order__in={entry['order'] for entry in entries}
+                ).values_list('round_id', 'order'))
+                new_entries = [entry for entry in entries
+                               if (entry['round_id'], entry['order']) not in existing]
+                
+                Move.objects.bulk_create([
+                    Move(
+                        round_id=entry['round_id'],
+                        player_id=entry['player_id'],
+                        card=entry['card'],
+                        order=entry['order']
+                    )
+                    for entry in new_entries
+                ])
+                
+                # Označavanje pobjedničkih poteza završenih štihova
+                winning = [(entry['round_id'], entry['winning_order']) for entry in entries
+                           if entry.get('winning_order') is not None]
+                if winning:
+                    condition = Q()
+                    for round_id, order in winning:
+                        condition |= Q(round_id=round_id, order=order)
+                    Move.objects.filter(condition).update(is_winning=True)
+                
+                # Stanje štiha nakon zadnjeg poteza, bodovi završenih štihova
+                # i ruke bez novo odigranih karata
+                leaders = {entry['round_id']: entry['trick_leader'] for entry in entries}
+                scores = {entry['round_id']: entry['round_score'] for entry in entries
+                          if entry.get('round_score') is not None}
+                for round_obj in Round.objects.filter(id__in=leaders).only('id', 'round_data'):
+                    round_data = round_obj.round_data or {}
+                    round_data['trick_leader'] = leaders[round_obj.id]
+                    if round_obj.id in scores:
+                        round_data['score'] = scores[round_obj.id]
+                    round_obj.round_data = round_data
+                    for entry in new_entries:
+                        if entry['round_id'] == round_obj.id:
+                            round_obj.remove_card_from_hand(entry['card'], save=False)
+                    round_obj.save(update_fields=['round_data'])
+                
+                # Zapisi povijesti igre za nove poteze
+                GameHistory.objects.bulk_create([
+                    GameHistory(
+                        game_id=entry['game_id'],
+                        data={
+                            'event_type': 'move',
+                            'round_id': entry['round_id'],
+                            'player_id': entry['player_id'],
+                            'card': entry['card'],
+                            'order': entry['order'],
+                            'played_at': entry.get('played_at'),
+                        }
+                    )
+                    for entry in new_entries if entry.get('game_id') is not None
+                ])
+            
+            logger.debug(f"Skupno spremljeno {len(new_entries)} poteza (preskočeno: {len(entries) - len(new_entries)})")
+            return len(new_entries)
+        except Exception as e:
+            logger.error(f"Greška pri skupnom spremanju poteza: {str(e)}", exc_info=True)
+            raise
+    
     @staticmethod
     def validate_card_playable(round_obj, player, card_code):
         """
@@ -421,8 +439,8 @@ class MoveRepository:
         """
         Dohvaća karte igrača u trenutnoj rundi.
         
-        U stvarnoj implementaciji, ovo bi dohvaćalo podatke iz baze.
-        Za demo svrhe, simuliramo karte na temelju seediranog random generatora.
+        Ruka se čita iz maske spremljene uz rundu (round_data['hands']),
+        koja se ažurira pri svakom odigranom potezu, bez upita nad potezima.
         
         Args:
             round_obj: Objekt runde
@@ -432,37 +450,7 @@ class MoveRepository:
             list: Lista karata u ruci igrača
         """
         try:
-            game = round_obj.game
-            
-            # Dohvaćanje odigranih karata
-            played_cards = set(Move.objects.filter(
-                round=round_obj,
-                player=player,
-                is_valid=True
-            ).values_list('card', flat=True))
-            
-            # Simulacija karata u ruci igrača (kao u get_game_state_for_player)
-            import random
-            from game.game_logic.deck import Deck
-            
-            # Fiksni seed za konzistentnost
-            random.seed(hash(f"{player.id}_{game.id}_{round_obj.number}"))
-            
-            # Kreiraj špil
-            deck = Deck()
-            all_cards = [card.code for card in deck.cards]
-            random.shuffle(all_cards)
-            
-            # Simuliraj karte dodijeljene ovom igraču
-            player_cards = all_cards[:8]
-            
-            # Ukloni karte koje su već odigrane
-            player_hand = [card for card in player_cards if card not in played_cards]
-            
-            # Sortiraj karte za bolji prikaz
-            player_hand.sort(key=lambda c: (c[-1], c[:-1]))
-            
-            return player_hand
+            return round_obj.get_hand(player.id)
         except Exception as e:
             logger.error(f"Greška pri dohvaćanju karata igrača: {str(e)}", exc_info=True)
             return []
@@ -501,48 +489,53 @@ class MoveRepository:
         team_a_trick_points = 0
         team_b_trick_points = 0
         
-        # Bodovi za štihove
-        for trick_number in range(8):  # 8 štihova po rundi
-            start_order = trick_number * 4
-            end_order = start_order + 3
-            
-            trick_moves = list(Move.objects.filter(
-                round=round_obj,
-                order__gte=start_order,
-                order__lte=end_order
-            ).order_by('order'))
-            
-            if len(trick_moves) != 4:
-                continue  # Preskočimo nepotpune štihove
-            
-            # Nađi pobjednički potez
-            winning_move = next((move for move in trick_moves if move.is_winning), None)
-            if not winning_move:
-                continue
+        # Bodovi za štihove zbrojeni tijekom igre (Round.record_trick)
+        score = round_obj.get_round_score()
+        if score.is_complete:
+            team_a_trick_points, team_b_trick_points = score.trick_totals()
+        else:
+            # Bodovi za štihove iz poteza (runde bez zbrojenih štihova)
+            for trick_number in range(8):  # 8 štihova po rundi
+                start_order = trick_number * 4
+                end_order = start_order + 3
+            
+                trick_moves = list(Move.objects.filter(
+                    round=round_obj,
+                    order__gte=start_order,
+                    order__lte=end_order
+                ).order_by('order'))
+            
+                if len(trick_moves) != 4:
+                    continue  # Preskočimo nepotpune štihove
+            
+                # Nađi pobjednički potez
+                winning_move = next((move for move in trick_moves if move.is_winning), None)
+                if not winning_move:
+                    continue
             
-            # Odredi tim pobjednika
-            winner_team = game.get_team_for_player(winning_move.player)
-            if not winner_team:
-                continue
+                # Odredi tim pobjednika
+                winner_team = game.get_team_for_player(winning_move.player)
+                if not winner_team:
+                    continue
             
-            # Izračunaj bodove za štih
-            trick_points = MoveRepository.count_trick_points(trick_moves, round_obj.trump_suit)
+                # Izračunaj bodove za štih
+                trick_points = MoveRepository.count_trick_points(trick_moves, round_obj.trump_suit)
             
-            # Dodatnih 10 bodova za posljednji štih
-            if trick_number == 7:
-                trick_points += 10
+                # Dodatnih 10 bodova za posljednji štih
+                if trick_number == 7:
+                    trick_points += 10
             
-            # Dodaj bodove odgovarajućem timu
-            if winner_team == 'a':
-                team_a_trick_points += trick_points
-            else:
-                team_b_trick_points += trick_points
+                # Dodaj bodove odgovarajućem timu
+                if winner_team == 'a':
+                    team_a_trick_points += trick_points
+                else:
+                    team_b_trick_points += trick_points
         
-        # Provjera štih-mača (štiglje)
-        if team_a_trick_points == 0:
-            team_b_trick_points += 90  # Dodatnih 90 bodova za štih-mač
-        elif team_b_trick_points == 0:
-            team_a_trick_points += 90  # Dodatnih 90 bodova za štih-mač
+            # Provjera štih-mača (štiglje)
+            if team_a_trick_points == 0:
+                team_b_trick_points += 90  # Dodatnih 90 bodova za štih-mač
+            elif team_b_trick_points == 0:
+                team_a_trick_points += 90  # Dodatnih 90 bodova za štih-mač
         
         # Bodovi za zvanja
         team_a_declarations = Declaration.objects.filter(
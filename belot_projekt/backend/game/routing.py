@@ -10,7 +10,7 @@ putem chata.
 
 from django.urls import re_path
 
-from game.consumers import GameConsumer
+from game.consumers import GameConsumer, SpectatorConsumer
 
 # Definicija WebSocket URL obrazaca
 # Ovi obrasci se koriste u asgi.py datoteci za usmjeravanje WebSocket zahtjeva
@@ -26,4 +26,9 @@ websocket_urlpatterns = [
     # Primjer URL-a: ws://domena/ws/game/id/550e8400-e29b-41d4-a716-446655440000/
     # Koristan za scenarije gdje znamo UUID igre
     re_path(r'ws/game/id/(?P<game_id>[\w-]+)/$', GameConsumer.as_asgi()),
+    
+    # Ruta za gledatelje igre (samo javno stanje i promjene, bez karata igrača)
+    # Primjer URL-a: ws://domena/ws/spectate/550e8400-e29b-41d4-a716-446655440000/
+    # Može se posluživati iz zasebnih procesa, odvojeno od procesa igrača
+    re_path(r'ws/spectate/(?P<game_id>[\w-]+)/$', SpectatorConsumer.as_asgi()),
 ]
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Modul s optimističnim zaključavanjem za istovremene akcije u istoj igri.
+
+Više ASGI procesa može istodobno obrađivati poruke iste sobe. GameService
+čita stanje igre (GameContext), provjerava akciju izvan transakcije i tek
+tada piše, pa bi se dvije akcije mogle preklopiti. Umjesto globalnog
+zaključavanja svaka igra ima brojač verzije u Game.game_data['version']:
+kontekst pamti verziju koju je pročitao, a na početku transakcije za
+upis claim_version kratko zaključava redak igre (select_for_update sa
+skip_locked) i povećava verziju samo ako je i dalje ista (compare-and-swap).
+Ako se verzija promijenila ili redak upravo zaključava drugi proces,
+transakcija se poništava, a run_with_retry ponovno učitava stanje i
+ponavlja akciju. Broj pokušaja i sukoba po akciji bilježi se u
+conflict_stats.
+
+Primjer:
+    def _process(self):
+        context = self.get_context(user_id)
+        ...
+        with transaction.atomic():
+            claim_version(context.game, context.version)
+            ...
+
+    result = run_with_retry(self._process, 'process_move', on_conflict=self._invalidate_context)
+"""
+
+import logging
+import random
+import threading
+import time
+
+from django.db import transaction
+
+logger = logging.getLogger('game.services')
+
+# Ključ brojača verzije u Game.game_data
+VERSION_KEY = 'version'
+
+# Broj ponavljanja akcije nakon sukoba i osnovno čekanje između pokušaja (sekunde)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.005
+
+
+class VersionConflict(Exception):
+    """Iznimka kada je igru u međuvremenu izmijenila druga akcija."""
+
+
+def game_version(game):
+    """
+    Vraća verziju igre kako je učitana.
+
+    Args:
+        game (Game): Igra
+
+    Returns:
+        int: Verzija (0 za igru bez spremljene verzije)
+    """
+    return (game.game_data or {}).get(VERSION_KEY, 0)
+
+
+def claim_version(game, expected_version):
+    """
+    Povećava verziju igre ako je jednaka pročitanoj (compare-and-swap).
+
+    Poziva se unutar transakcije za upis, prije svih upisa akcije. Redak
+    igre ostaje zaključan do kraja transakcije, pa se upisi iste igre ne
+    preklapaju, a ostale igre se ne čekaju.
+
+    Args:
+        game (Game): Igra iz konteksta akcije
+        expected_version (int): Verzija pročitana pri učitavanju konteksta
+
+    Returns:
+        int: Nova verzija igre
+
+    Raises:
+        VersionConflict: Ako je verzija promijenjena ili redak drži drugi proces
+    """
+    from game.models import Game
+
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError("claim_version se mora pozvati unutar transaction.atomic()")
+
+    row = Game.objects.select_for_update(skip_locked=True).filter(id=game.id).values_list(
+        'game_data', flat=True
+    ).first()
+    if row is None:
+        raise VersionConflict(f"Igra {game.id} je zaključana u drugom procesu")
+
+    game_data = row or {}
+    current_version = game_data.get(VERSION_KEY, 0)
+    if current_version != expected_version:
+        raise VersionConflict(
+            f"Igra {game.id} je izmijenjena (verzija {current_version}, očekivana {expected_version})"
+        )
+
+    game_data[VERSION_KEY] = current_version + 1
+    Game.objects.filter(id=game.id).update(game_data=game_data)
+    game.game_data = game_data
+    return current_version + 1
+
+
+class ConflictStats:
+    """
+    Broj pokušaja, sukoba i odustajanja po akciji, u memoriji procesa.
+
+    Attributes:
+        counters (dict): Po imenu akcije rječnik s ključevima 'attempts',
+            'conflicts' i 'exhausted'
+    """
+
+    def __init__(self):
+        """Inicijalizira prazne brojače."""
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, conflict=False, exhausted=False):
+        """
+        Bilježi jedan pokušaj akcije.
+
+        Args:
+            name (str): Ime akcije
+            conflict (bool): Je li pokušaj završio sukobom
+            exhausted (bool): Je li nakon sukoba odustano od akcije
+        """
+        with self._lock:
+            counter = self.counters.setdefault(name, {'attempts': 0, 'conflicts': 0, 'exhausted': 0})
+            counter['attempts'] += 1
+            if conflict:
+                counter['conflicts'] += 1
+            if exhausted:
+                counter['exhausted'] += 1
+
+    def conflict_rate(self, name):
+        """
+        Vraća udio pokušaja akcije koji su završili sukobom.
+
+        Args:
+            name (str): Ime akcije
+
+        Returns:
+            float: Udio sukoba (0.0 ako akcija nije pokušana)
+        """
+        with self._lock:
+            counter = self.counters.get(name)
+            if not counter or not counter['attempts']:
+                return 0.0
+            return counter['conflicts'] / counter['attempts']
+
+    def snapshot(self):
+        """
+        Vraća brojače i udio sukoba po akciji.
+
+        Returns:
+            dict: Kopija brojača s dodanim ključem 'conflict_rate'
+        """
+        with self._lock:
+            return {
+                name: dict(counter, conflict_rate=(
+                    counter['conflicts'] / counter['attempts'] if counter['attempts'] else 0.0
+                ))
+                for name, counter in self.counters.items()
+            }
+
+    def reset(self):
+        """Briše sve brojače."""
+        with self._lock:
+            self.counters.clear()
+
+
+# Zajednički brojači procesa
+conflict_stats = ConflictStats()
+
+
+def run_with_retry(operation, name, retries=MAX_RETRIES, on_conflict=None):
+    """
+    Izvodi akciju i ponavlja je nakon sukoba verzija.
+
+    Args:
+        operation (callable): Akcija bez argumenata; baca VersionConflict pri sukobu
+        name (str): Ime akcije za brojače
+        retries (int): Najveći broj ponavljanja
+        on_conflict (callable, optional): Poziva se nakon sukoba, prije
+            ponavljanja (npr. za odbacivanje učitanog stanja)
+
+    Returns:
+        Rezultat akcije
+
+    Raises:
+        VersionConflict: Ako akcija ni nakon svih ponavljanja ne uspije
+    """
+    for attempt in range(retries + 1):
+        try:
+            result = operation()
+        except VersionConflict as e:
+            exhausted = attempt == retries
+            conflict_stats.record(name, conflict=True, exhausted=exhausted)
+            if exhausted:
+                logger.warning(f"Akcija {name} nije uspjela nakon {retries + 1} pokušaja: {str(e)}")
+                raise
+            logger.info(f"Sukob pri akciji {name} (pokušaj {attempt + 1}): {str(e)}")
+            if on_conflict is not None:
+                on_conflict()
+            time.sleep(RETRY_BACKOFF * (attempt + 1) * random.uniform(0.5, 1.5))
+            continue
+        conflict_stats.record(name)
+        return result
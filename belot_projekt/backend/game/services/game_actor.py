@@ -0,0 +1,716 @@
+"""
+Modul s autoritativnim stanjem igara u tijeku u memoriji procesa.
+
+GameService.process_move za svaku kartu radi desetak upita prema bazi
+(korisnik, članstvo u igri, trenutna runda, upis poteza, pobjednički
+potez, redoslijed igrača, spremanje runde...). Za igru u fazi igranja
+karata ovdje jedan proces (vlasnik igre) drži stanje u memoriji: pozicije
+i timove igrača, ruke kao bitmaske, trenutni štih i bodove runde. Potez se
+provjerava i primjenjuje u memoriji, zapisuje u dnevnik poteza
+(move_journal.MoveJournal), a u bazu se sprema naknadno skupnim upisom
+iz pozadinske dretve.
+
+Vlasništvo nad igrom dodjeljuje se zakupom u Django kešu: proces koji
+prvi postavi ključ zakupa drži igru dok je koristi. Dok zakup drži drugi
+proces, ovaj proces ne smije obraditi potez preko baze jer vlasnik u
+memoriji ima poteze koji možda još nisu spremljeni. play_card tada baca
+GameOwnedElsewhere, a GameConsumer prosljeđuje potez na kanal procesa
+vlasnika (owner_channel), gdje ga prima ActorInbox i obrađuje kao da je
+stigao izravno.
+
+Primjer:
+    from game.services.game_actor import game_actors
+
+    try:
+        result = game_actors.play_card(game_id, user_id, 'AS')
+    except GameOwnedElsewhere as e:
+        ...  # potez se prosljeđuje na owner_channel(e.owner)
+    if result is None:
+        ...  # igra nije u fazi igranja karata, obrada preko baze
+"""
+
+import asyncio
+import logging
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+
+from game.game_logic import card_mask
+from game.game_logic import legal_moves
+from game.game_logic.round_score import RoundScore
+from game.game_logic.trick_tracker import TrickTracker
+from game.services.card_service import CardService
+from game.services.move_journal import MoveJournal
+
+logger = logging.getLogger('game.services')
+
+# Broj igrača za stolom
+SEATS = 4
+
+# Ključ zakupa igre u kešu
+ACTOR_LEASE_KEY = 'belot:actor:owner:{game_id}'
+
+# Kanal channel layera na kojem proces prima poteze igara koje posjeduje
+ACTOR_CHANNEL = 'belot-actor.{worker}'
+
+
+class GameOwnedElsewhere(Exception):
+    """Iznimka kada igru u memoriji drži drugi proces."""
+
+    def __init__(self, game_id, owner):
+        super().__init__(f"Igru {game_id} obrađuje proces {owner}")
+        self.game_id = game_id
+        self.owner = owner
+
+
+class MovesNotSaved(Exception):
+    """Iznimka kada potezi igre iz memorije još nisu spremljeni u bazu."""
+
+    def __init__(self, game_id, pending):
+        super().__init__(f"Igra {game_id} ima {pending} poteza koji nisu spremljeni u bazu")
+        self.game_id = game_id
+        self.pending = pending
+
+
+def owner_channel(worker_id):
+    """
+    Vraća kanal na kojem proces prima proslijeđene poteze.
+
+    Args:
+        worker_id (str): Oznaka procesa iz zakupa igre
+
+    Returns:
+        str: Ime kanala (dozvoljeni znakovi channel layera)
+    """
+    return ACTOR_CHANNEL.format(worker=re.sub(r'[^\w.-]', '-', str(worker_id)))[:100]
+
+
+def save_journal_moves(entries):
+    """
+    Sprema poteze iz dnevnika i poništava keširano stanje njihovih igara.
+
+    Javno stanje igre gradi se iz baze, pa ga drugi procesi (i gledatelji)
+    vide tek kad su potezi spremljeni; nova generacija stanja tada
+    zamjenjuje snimku keširanu prije spremanja.
+
+    Args:
+        entries (list): Unosi poteza (vidi MoveRepository.save_played_moves)
+
+    Returns:
+        int: Broj spremljenih poteza
+    """
+    from game.repositories.move_repository import MoveRepository
+    from game.services.game_service import invalidate_game_cache
+
+    saved = MoveRepository.save_played_moves(entries)
+    for game_id in {entry.get('game_id') for entry in entries} - {None}:
+        invalidate_game_cache(game_id)
+    return saved
+
+
+class GameActor:
+    """
+    Stanje jedne runde igre u tijeku, u memoriji procesa.
+
+    Attributes:
+        game_id: Identifikator igre
+        round_id: Identifikator runde (model Round)
+        seats (tuple): Identifikatori igrača po poziciji (0-3)
+        teams (tuple): Tim ('a' ili 'b') igrača po poziciji
+        hands (list): Maska (card_mask) ruke po poziciji
+        trump_suit (str): Adutska boja runde
+        tracker (TrickTracker): Trenutni štih
+        trick_cards (list): Karte trenutnog štiha kao rječnici s ključevima
+            'player' i 'card' redom igranja (kao GameContext.current_trick)
+        current_seat (int): Pozicija igrača na potezu
+        next_order (int): Redni broj sljedećeg poteza u rundi
+        score (RoundScore): Završeni štihovi i bodovi po timu
+        is_completed (bool): Je li odigran i zadnji štih runde
+        version (int): Broj primijenjenih poteza od učitavanja
+    """
+
+    def __init__(self, game_id, round_id, seats, teams, hands, trump_suit,
+                 dealer_seat=0, moves=(), on_move=None):
+        """
+        Inicijalizira stanje runde i primjenjuje već odigrane poteze.
+
+        Args:
+            game_id: Identifikator igre
+            round_id: Identifikator runde
+            seats (list): Identifikatori igrača po poziciji
+            teams (list): Tim igrača po poziciji
+            hands (list): Maske podijeljenih ruku po poziciji
+            trump_suit (str): Adutska boja
+            dealer_seat (int): Pozicija djelitelja
+            moves (list): Već odigrani potezi kao parovi (id igrača, kod karte)
+            on_move (callable, optional): Prima unos za spremanje svakog
+                novog poteza (vidi MoveRepository.save_played_moves)
+
+        Raises:
+            ValueError: Ako broj igrača nije valjan ili odigrani potezi nisu valjani
+        """
+        if len(seats) != SEATS or len(teams) != SEATS or len(hands) != SEATS:
+            raise ValueError(f"Igra zahtijeva točno {SEATS} igrača")
+
+        self.game_id = game_id
+        self.round_id = round_id
+        self.seats = tuple(seats)
+        self.teams = tuple(teams)
+        self.hands = list(hands)
+        self.trump_suit = trump_suit
+        self.tracker = TrickTracker(trump_suit)
+        self.trick_cards = []
+        self.current_seat = (dealer_seat + 1) % SEATS
+        self.next_order = 0
+        self.score = RoundScore()
+        self.is_completed = False
+        self.version = 0
+        self.on_move = None
+        self._seat_of = {player_id: seat for seat, player_id in enumerate(self.seats)}
+        self._lock = threading.Lock()
+
+        for player_id, card in moves:
+            seat = self._seat_of.get(player_id)
+            if seat is None:
+                raise ValueError(f"Igrač {player_id} nije dio igre {game_id}")
+            self._apply(seat, card_mask.card_index(card))
+        self.on_move = on_move
+
+    @classmethod
+    def load(cls, game_id, on_move=None):
+        """
+        Učitava stanje runde u fazi igranja karata iz baze.
+
+        Args:
+            game_id: Identifikator igre
+            on_move (callable, optional): Prima unose novih poteza za spremanje
+
+        Returns:
+            GameActor: Stanje runde ili None ako igra nije u fazi igranja karata
+        """
+        from game.models import Game
+
+        game = Game.objects.filter(id=game_id, status='in_progress').first()
+        if game is None:
+            return None
+        round_obj = game.rounds.filter(is_completed=False).order_by('-number').first()
+        if round_obj is None or not round_obj.trump_suit:
+            return None
+
+        players = game.get_seated_players()
+        deal = round_obj.get_deal(players)
+        seats = list(deal.player_ids) or [player.id for player in players]
+        team_a = set(game.team_a_players.values_list('id', flat=True))
+        moves = list(round_obj.moves.filter(is_valid=True).order_by('order').values_list('player_id', 'card'))
+
+        return cls(
+            game_id=game.id,
+            round_id=round_obj.id,
+            seats=seats,
+            teams=['a' if player_id in team_a else 'b' for player_id in seats],
+            hands=[deal.hand_mask(seat) for seat in range(SEATS)],
+            trump_suit=round_obj.trump_suit,
+            dealer_seat=seats.index(round_obj.dealer_id) if round_obj.dealer_id in seats else 0,
+            moves=moves,
+            on_move=on_move,
+        )
+
+    @property
+    def tricks_completed(self):
+        """int: Broj završenih štihova."""
+        return self.score.tricks_completed
+
+    def seat_of(self, user_id):
+        """
+        Vraća poziciju igrača.
+
+        Args:
+            user_id: Identifikator igrača (broj ili string)
+
+        Returns:
+            int: Pozicija igrača ili None ako igrač nije u igri
+        """
+        seat = self._seat_of.get(user_id)
+        if seat is None and isinstance(user_id, str) and user_id.isdigit():
+            seat = self._seat_of.get(int(user_id))
+        return seat
+
+    def is_turn(self, user_id):
+        """
+        Provjerava je li igrač na potezu.
+
+        Args:
+            user_id: Identifikator igrača
+
+        Returns:
+            bool: True ako je igrač na potezu
+        """
+        seat = self.seat_of(user_id)
+        return seat is not None and seat == self.current_seat and not self.is_completed
+
+    def hand(self, user_id):
+        """
+        Vraća karte u ruci igrača.
+
+        Args:
+            user_id: Identifikator igrača
+
+        Returns:
+            list: Kodovi karata poredani po boji i vrijednosti (kao
+                Round.get_hand) ili prazna lista ako igrač nije u igri
+        """
+        seat = self.seat_of(user_id)
+        if seat is None:
+            return []
+        hand = card_mask.codes_from_mask(self.hands[seat])
+        hand.sort(key=lambda c: (c[-1], c[:-1]))
+        return hand
+
+    def play_card(self, user_id, card):
+        """
+        Provjerava i primjenjuje potez igrača.
+
+        Args:
+            user_id: Identifikator igrača
+            card (Card or str): Karta koju igrač igra
+
+        Returns:
+            dict: Rezultat poteza u obliku kao GameService.process_move
+        """
+        with self._lock:
+            if self.is_completed:
+                return {'valid': False, 'message': 'Runda je završena'}
+
+            seat = self.seat_of(user_id)
+            if seat is None:
+                return {'valid': False, 'message': 'Korisnik nije dio ove igre'}
+            if seat != self.current_seat:
+                return {'valid': False, 'message': 'Nije tvoj red za igranje'}
+
+            try:
+                index = card_mask.card_index(card)
+            except ValueError:
+                return {'valid': False, 'message': 'Nevažeća karta'}
+
+            reason = legal_moves.illegal_reason(
+                card_mask.CARD_CODES[index], self.hands[seat], None, self.trump_suit,
+                state=self.tracker.state()
+            )
+            if reason:
+                return {'valid': False, 'message': CardService.MOVE_ERROR_MESSAGES[reason]}
+
+            entry, result = self._apply(seat, index)
+
+        if self.on_move is not None:
+            self.on_move(entry)
+        return result
+
+    def _apply(self, seat, index):
+        """
+        Primjenjuje već provjereni potez na stanje.
+
+        Args:
+            seat (int): Pozicija igrača
+            index (int): Indeks odigrane karte
+
+        Returns:
+            tuple: (unos za spremanje poteza, rezultat poteza)
+        """
+        player_id = self.seats[seat]
+        code = card_mask.CARD_CODES[index]
+        self.hands[seat] &= ~card_mask.CARD_BITS[index]
+        self.tracker.add(code, player_id)
+        self.trick_cards.append({'player': str(player_id), 'card': code})
+
+        entry = {
+            'game_id': self.game_id,
+            'round_id': self.round_id,
+            'player_id': player_id,
+            'card': code,
+            'order': self.next_order,
+            'winning_order': None,
+            'played_at': time.time(),
+        }
+        result = {
+            'valid': True,
+            'card': code,
+            'trick_number': self.tricks_completed,
+            'trick_completed': False,
+            'round_completed': False,
+            'game_completed': False,
+        }
+        self.next_order += 1
+        self.version += 1
+
+        if self.tracker.is_complete:
+            winner_seat = self._seat_of[self.tracker.winning_player]
+            points = self.score.add_trick(
+                self.seats[winner_seat], self.teams[winner_seat], self.tracker.points
+            )
+
+            entry['winning_order'] = self.next_order - SEATS + self.tracker.winning_position
+            entry['round_score'] = self.score.to_dict()
+            self.current_seat = winner_seat
+            self.tracker.reset(self.tricks_completed)
+            self.trick_cards = []
+
+            result.update({
+                'trick_completed': True,
+                'trick_winner': str(self.seats[winner_seat]),
+                'trick_points': points,
+            })
+            if self.score.is_complete:
+                self.is_completed = True
+                result['round_completed'] = True
+        else:
+            self.current_seat = (seat + 1) % SEATS
+
+        entry['trick_leader'] = self.tracker.to_dict()
+        result['next_player'] = str(self.seats[self.current_seat])
+        return entry, result
+
+    def get_state(self):
+        """
+        Vraća sažetak stanja runde (bez ruku igrača).
+
+        Returns:
+            dict: Stanje runde
+        """
+        with self._lock:
+            return {
+                'game_id': self.game_id,
+                'round_id': self.round_id,
+                'version': self.version,
+                'current_player': str(self.seats[self.current_seat]),
+                'trick_number': self.tricks_completed,
+                'current_trick': self.tracker.to_dict(),
+                'trick_cards': list(self.trick_cards),
+                'trick_points': dict(self.score.trick_points),
+                'tricks_won': dict(self.score.tricks_won),
+                'cards_left': {
+                    str(player_id): card_mask.count_cards(self.hands[seat])
+                    for seat, player_id in enumerate(self.seats)
+                },
+                'is_completed': self.is_completed,
+            }
+
+
+class GameActorRegistry:
+    """
+    Stanja igara u tijeku koje posjeduje ovaj proces, po identifikatoru igre.
+
+    Attributes:
+        enabled (bool): Koristi li se stanje u memoriji
+        lease_timeout (int): Trajanje zakupa igre u kešu (sekunde)
+        worker_id (str): Oznaka ovog procesa u zakupu
+        journal (MoveJournal): Dnevnik i pozadinsko spremanje poteza
+    """
+
+    # Zadane postavke, mogu se nadjačati s BELOT_GAME_ACTORS u postavkama
+    DEFAULTS = {
+        'ENABLED': True,
+        'LEASE_TIMEOUT': 300,
+        'FLUSH_INTERVAL': 0.05,
+        'JOURNAL_DIR': os.path.join(tempfile.gettempdir(), 'belot-journal'),
+        'JOURNAL_FSYNC': False,
+    }
+
+    def __init__(self, **options):
+        """
+        Inicijalizira registar s postavkama iz Django postavki.
+
+        Args:
+            **options: Postavke koje nadjačavaju zadane i Django postavke
+                (enabled, lease_timeout, flush_interval, journal_dir, journal_fsync)
+        """
+        config = dict(self.DEFAULTS)
+        config.update(self._django_settings())
+        config.update({key.upper(): value for key, value in options.items()})
+
+        self.enabled = bool(config['ENABLED'])
+        self.lease_timeout = int(config['LEASE_TIMEOUT'])
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.channel = owner_channel(self.worker_id)
+        self.journal = MoveJournal(
+            config['JOURNAL_DIR'],
+            flush_interval=float(config['FLUSH_INTERVAL']),
+            fsync=bool(config['JOURNAL_FSYNC']),
+            save=save_journal_moves,
+        )
+        self._actors = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _django_settings():
+        """Vraća BELOT_GAME_ACTORS iz Django postavki ili prazan rječnik izvan Djanga."""
+        try:
+            from django.conf import settings
+            return dict(getattr(settings, 'BELOT_GAME_ACTORS', {}))
+        except Exception:
+            return {}
+
+    def start(self):
+        """
+        Priprema dnevnik poteza pri pokretanju procesa.
+
+        Potezi koje je pali proces zapisao u dnevnik, ali nije spremio,
+        spremaju se u bazu prije nego što ovaj proces učita ijednu igru
+        ili zapiše novi potez.
+
+        Returns:
+            int: Broj ponovno spremljenih poteza
+        """
+        if not self.enabled:
+            return 0
+        try:
+            return self.journal.open()
+        except Exception as e:
+            logger.error(f"Greška pri obnovi dnevnika poteza: {str(e)}", exc_info=True)
+            return 0
+
+    def _lease_key(self, game_id):
+        return ACTOR_LEASE_KEY.format(game_id=game_id)
+
+    def _acquire(self, game_id):
+        """
+        Preuzima ili produljuje zakup igre za ovaj proces.
+
+        Returns:
+            tuple: (oznaka procesa koji posjeduje igru ili None ako keš nije
+                dostupan, je li ovaj proces upravo preuzeo novi zakup)
+        """
+        try:
+            from django.core.cache import cache
+            key = self._lease_key(game_id)
+            if cache.add(key, self.worker_id, self.lease_timeout):
+                return self.worker_id, True
+            owner = cache.get(key)
+            if owner == self.worker_id:
+                cache.touch(key, self.lease_timeout)
+                return owner, False
+            if owner is None:
+                # Zakup je istekao između add i get
+                if cache.add(key, self.worker_id, self.lease_timeout):
+                    return self.worker_id, True
+                return cache.get(key), False
+            return owner, False
+        except Exception as e:
+            logger.warning(f"Zakup igre {game_id} nije moguć: {str(e)}")
+            return None, False
+
+    def _release(self, game_id):
+        """Otpušta zakup igre ako ga drži ovaj proces."""
+        try:
+            from django.core.cache import cache
+            key = self._lease_key(game_id)
+            if cache.get(key) == self.worker_id:
+                cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Greška pri otpuštanju zakupa igre {game_id}: {str(e)}")
+
+    def peek(self, game_id):
+        """
+        Vraća već učitano stanje igre bez učitavanja iz baze.
+
+        Args:
+            game_id: Identifikator igre
+
+        Returns:
+            GameActor: Stanje igre ili None
+        """
+        return self._actors.get(str(game_id))
+
+    def get(self, game_id):
+        """
+        Vraća stanje igre, po potrebi ga učitava i preuzima zakup.
+
+        Args:
+            game_id: Identifikator igre
+
+        Stanje iz memorije koristi se samo dok ovaj proces neprekidno drži
+        zakup. Nakon novog zakupa (npr. kad je stari istekao) igru je u
+        međuvremenu mogao igrati drugi proces, pa se stanje ponovno učitava
+        iz baze.
+
+        Returns:
+            GameActor: Stanje igre ili None ako igra nije u fazi igranja
+                karata, keš sa zakupima nije dostupan ili je stanje u
+                memoriji isključeno
+
+        Raises:
+            GameOwnedElsewhere: Ako zakup igre drži drugi proces
+            MovesNotSaved: Ako ovaj proces ima nespremljene poteze igre
+                čije stanje više nije u memoriji
+        """
+        if not self.enabled or game_id is None:
+            return None
+        key = str(game_id)
+        with self._lock:
+            owner, acquired = self._acquire(key)
+            if owner != self.worker_id:
+                self._actors.pop(key, None)
+                if owner is not None:
+                    raise GameOwnedElsewhere(game_id, owner)
+                return None
+            if acquired and self._actors.pop(key, None) is not None:
+                logger.info(f"Zakup igre {game_id} ponovno preuzet, stanje se učitava iz baze")
+            actor = self._actors.get(key)
+            if actor is None:
+                # Stanje iz baze vrijedi tek kad su spremljeni svi potezi igre
+                if self.journal.pending_count(key):
+                    self.journal.flush()
+                    pending = self.journal.pending_count(key)
+                    if pending:
+                        self._release(key)
+                        raise MovesNotSaved(game_id, pending)
+                try:
+                    # Dnevnik se obnavlja pri pokretanju (start); ovdje samo za
+                    # procese pokrenute bez ASGI ulaza, prije čitanja stanja iz baze
+                    self.journal.open()
+                    actor = GameActor.load(game_id, on_move=self.journal.append)
+                except Exception as e:
+                    logger.error(f"Greška pri učitavanju stanja igre {game_id}: {str(e)}", exc_info=True)
+                    actor = None
+                if actor is None:
+                    self._release(key)
+                    return None
+                self._actors[key] = actor
+                logger.info(f"Stanje igre {game_id} učitano u memoriju (proces: {self.worker_id})")
+            return actor
+
+    def play_card(self, game_id, user_id, card):
+        """
+        Obrađuje potez u memoriji ako ovaj proces posjeduje igru.
+
+        Nakon zadnjeg štiha runde potezi se odmah spremaju i stanje igre
+        se izbacuje iz memorije; rundu zatim završava GameService istim
+        kodom kao i potez preko baze. Ako spremanje ne uspije, rezultat
+        nema 'round_completed' i igra ostaje u memoriji; sljedeći potez u
+        igri ponovno pokušava spremanje i, ako uspije, vraća rezultat bez
+        odigrane karte ('round_deferred') s 'round_completed' kako bi se
+        runda završila.
+
+        Args:
+            game_id: Identifikator igre
+            user_id: Identifikator igrača
+            card (Card or str): Karta koju igrač igra
+
+        Returns:
+            dict: Rezultat poteza ili None ako igru treba obraditi preko baze
+
+        Raises:
+            GameOwnedElsewhere: Ako igru posjeduje drugi proces
+        """
+        actor = self.get(game_id)
+        if actor is None:
+            return None
+
+        if actor.is_completed:
+            # Zadnji štih je odigran, ali potezi runde još nisu bili spremljeni
+            if not self._evict_completed(actor):
+                return {'valid': False, 'message': 'Potezi runde se još spremaju, pokušaj ponovno'}
+            return {
+                'valid': True,
+                'round_deferred': True,
+                'trick_completed': False,
+                'round_completed': True,
+                'game_completed': False,
+            }
+
+        result = actor.play_card(user_id, card)
+        if result.get('round_completed') and not self._evict_completed(actor):
+            result['round_completed'] = False
+        return result
+
+    def _evict_completed(self, actor):
+        """
+        Izbacuje igru odigrane runde iz memorije.
+
+        Returns:
+            bool: True ako su potezi runde spremljeni i igra izbačena
+        """
+        try:
+            self.evict(actor.game_id)
+            return True
+        except MovesNotSaved as e:
+            logger.error(f"Runda igre {actor.game_id} se ne završava: {str(e)}")
+            return False
+
+    def evict(self, game_id):
+        """
+        Sprema poteze i uklanja stanje igre iz memorije.
+
+        Ako potezi igre nisu spremljeni, stanje ostaje u memoriji i ovaj
+        proces zadržava zakup; pozadinska dretva dnevnika nastavlja
+        pokušavati spremanje.
+
+        Args:
+            game_id: Identifikator igre
+
+        Raises:
+            MovesNotSaved: Ako spremanje poteza igre nije uspjelo
+        """
+        key = str(game_id)
+        with self._lock:
+            self.journal.flush()
+            pending = self.journal.pending_count(key)
+            if pending:
+                raise MovesNotSaved(game_id, pending)
+            self._actors.pop(key, None)
+            self._release(key)
+
+
+class ActorInbox:
+    """
+    Prima poteze koje su drugi procesi proslijedili ovom procesu.
+
+    Proces koji drži zakup igre jedini smije obraditi njen potez. Veza
+    igrača spojena na drugi proces šalje potez na kanal vlasnika
+    (GameActorRegistry.channel), a jedan zadatak po event loopu ga prima i
+    predaje obradi (handler) kao da je stigao izravno od igrača.
+
+    Attributes:
+        registry (GameActorRegistry): Registar čiji se kanal sluša
+    """
+
+    def __init__(self, registry):
+        """Inicijalizira primanje bez pokrenutog zadatka."""
+        self.registry = registry
+        self._task = None
+        self._loop = None
+
+    def ensure_running(self, channel_layer, handler):
+        """
+        Pokreće primanje na kanalu procesa ako već ne radi.
+
+        Args:
+            channel_layer: Channel layer veze
+            handler (callable): Korutinska funkcija (channel_layer, poruka)
+                koja obrađuje proslijeđeni potez
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._task = loop.create_task(self._listen(channel_layer, handler))
+
+    async def _listen(self, channel_layer, handler):
+        """Prima proslijeđene poteze i predaje ih obradi."""
+        while True:
+            try:
+                message = await channel_layer.receive(self.registry.channel)
+                await handler(channel_layer, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Greška pri obradi proslijeđenog poteza: {str(e)}", exc_info=True)
+                await asyncio.sleep(1)
+
+
+# Zajednički registar procesa
+game_actors = GameActorRegistry()
+
+# Proslijeđeni potezi igara koje posjeduje ovaj proces
+actor_inbox = ActorInbox(game_actors)
@@ -0,0 +1,275 @@
+"""
+Modul s kontekstom igre koji se učitava jednom po akciji igrača.
+
+Metode GameService (process_move, process_trump_call, is_player_turn,
+get_game_state...) svaka za sebe dohvaćaju igru, korisnika, trenutnu
+rundu i popis igrača, a GameConsumer za jednu poruku poziva dvije do
+četiri takve metode. GameContext sve to učitava jednim planom upita
+(select_related/prefetch_related): igru, igrače po pozicijama, aktivne
+igrače, članove timova i trenutnu rundu, a odigrane poteze runde tek
+kad zatrebaju, jednim upitom iz kojeg se računa trenutni štih; ruke
+igrača čitaju se iz maski spremljenih uz rundu. Provjere članstva,
+aktivnosti i tima zatim su pretraživanja skupova u memoriji.
+
+Primjer:
+    context = GameContext.load(game_id, user_id=user_id)
+    if not context.is_active(user_id):
+        ...
+    hand = context.hand(user_id)
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+
+from game.models import Game, Round
+from game.services.concurrency import game_version
+
+User = get_user_model()
+
+logger = logging.getLogger('game.services')
+
+
+class GameContext:
+    """
+    Igra, igrači i trenutna runda učitani za jednu akciju igrača.
+
+    Attributes:
+        game (Game): Igra s prethodno dohvaćenim igračima i timovima
+        user_id: Identifikator korisnika koji izvodi akciju
+        user (User): Korisnik koji izvodi akciju ili None ako ne postoji
+        players (list): Igrači poredani po pozicijama za stolom
+        current_round (Round): Posljednja runda igre ili None
+        version (int): Verzija igre pri učitavanju (vidi concurrency.claim_version)
+    """
+
+    def __init__(self, game, user_id=None, user=None):
+        """
+        Inicijalizira kontekst iz igre s prethodno dohvaćenim relacijama.
+
+        Args:
+            game (Game): Igra učitana preko GameContext.queryset
+            user_id: Identifikator korisnika koji izvodi akciju
+            user (User, optional): Korisnik ako je već dohvaćen
+        """
+        self.game = game
+        self.version = game_version(game)
+        rounds = getattr(game, 'latest_rounds', None)
+        if rounds is None:
+            rounds = [game.get_current_round()]
+        self.current_round = rounds[0] if rounds else None
+
+        players = list(game.players.all())
+        self._players_by_id = {player.id: player for player in players}
+        self.players = self._seat_order(players)
+        self._seats = {player.id: seat for seat, player in enumerate(self.players)}
+        self._active_ids = {player.id for player in game.active_players.all()}
+        self._teams = {player.id: 'a' for player in game.team_a_players.all()}
+        self._teams.update({player.id: 'b' for player in game.team_b_players.all()})
+
+        self.user_id = self._normalize_id(user_id)
+        if user is None and self.user_id is not None:
+            user = self._players_by_id.get(self.user_id)
+            if user is None:
+                user = User.objects.filter(id=self.user_id).first()
+        self.user = user
+
+        self._moves = None
+        self._trick_tracker = None
+        self._bidding = None
+
+    @staticmethod
+    def queryset():
+        """
+        Vraća upit za igru sa svim relacijama koje kontekst koristi.
+
+        Returns:
+            QuerySet: Upit nad modelom Game
+        """
+        return Game.objects.select_related('creator').prefetch_related(
+            'players',
+            'active_players',
+            'team_a_players',
+            'team_b_players',
+            Prefetch(
+                'rounds',
+                queryset=Round.objects.select_related('dealer', 'trump_caller').order_by('-number')[:1],
+                to_attr='latest_rounds'
+            ),
+        )
+
+    @classmethod
+    def load(cls, game_id=None, room_code=None, user_id=None):
+        """
+        Učitava kontekst igre prema ID-u ili kodu sobe.
+
+        Args:
+            game_id: ID igre
+            room_code: Kod sobe ako ID nije poznat
+            user_id: ID korisnika koji izvodi akciju
+
+        Returns:
+            GameContext: Kontekst ili None ako igra ne postoji
+
+        Raises:
+            ValueError: Ako nije zadan ni game_id ni room_code
+        """
+        if game_id is not None:
+            game = cls.queryset().filter(id=game_id).first()
+        elif room_code:
+            game = cls.queryset().filter(room_code=room_code).first()
+        else:
+            raise ValueError("Mora biti specificiran ili game_id ili room_code")
+
+        if game is None:
+            logger.warning(f"Igra nije pronađena: game_id={game_id}, room_code={room_code}")
+            return None
+        return cls(game, user_id=user_id)
+
+    @staticmethod
+    def _normalize_id(user_id):
+        """Vraća ID korisnika kao broj ako je zadan kao string znamenki."""
+        if isinstance(user_id, str) and user_id.isdigit():
+            return int(user_id)
+        return user_id
+
+    def _seat_order(self, players):
+        """Poreda igrače prema rasporedu za stolom (Game.get_seat_map), ako postoji."""
+        seat_map = self.game.get_seat_map()
+        if seat_map is None or set(seat_map) != set(self._players_by_id):
+            return players
+        return [self._players_by_id[player_id] for player_id in seat_map]
+
+    def is_user(self, user_id):
+        """Vraća True ako je kontekst učitan za zadanog korisnika."""
+        return self._normalize_id(user_id) == self.user_id
+
+    def player(self, user_id):
+        """
+        Vraća igrača iz igre.
+
+        Args:
+            user_id: ID igrača
+
+        Returns:
+            User: Igrač ili None ako nije član igre
+        """
+        return self._players_by_id.get(self._normalize_id(user_id))
+
+    def is_member(self, user_id):
+        """Vraća True ako je korisnik član igre."""
+        return self._normalize_id(user_id) in self._players_by_id
+
+    def is_active(self, user_id):
+        """Vraća True ako je korisnik aktivan igrač u igri."""
+        return self._normalize_id(user_id) in self._active_ids
+
+    def team_of(self, user_id):
+        """
+        Vraća tim igrača.
+
+        Args:
+            user_id: ID igrača
+
+        Returns:
+            str: 'a', 'b' ili None ako igrač nije u timu
+        """
+        return self._teams.get(self._normalize_id(user_id))
+
+    def team_ids(self, team):
+        """
+        Vraća ID-eve igrača u timu.
+
+        Args:
+            team (str): 'a' ili 'b'
+
+        Returns:
+            set: ID-evi igrača
+        """
+        return {player_id for player_id, player_team in self._teams.items() if player_team == team}
+
+    def seat_of(self, user_id):
+        """
+        Vraća poziciju igrača za stolom.
+
+        Args:
+            user_id: ID igrača
+
+        Returns:
+            int: Pozicija (0-3) ili None ako igrač nije član igre
+        """
+        return self._seats.get(self._normalize_id(user_id))
+
+    def next_player(self, user_id):
+        """
+        Vraća igrača koji sjedi nakon zadanog igrača.
+
+        Args:
+            user_id: ID igrača
+
+        Returns:
+            User: Sljedeći igrač ili None ako igrač nije član igre
+        """
+        seat = self.seat_of(user_id)
+        if seat is None:
+            return None
+        return self.players[(seat + 1) % len(self.players)]
+
+    @property
+    def moves(self):
+        """list: Valjani potezi trenutne runde kao (player_id, karta, redni broj), učitani jednom."""
+        if self._moves is None:
+            if self.current_round is None:
+                self._moves = []
+            else:
+                self._moves = list(
+                    self.current_round.moves.filter(is_valid=True)
+                    .order_by('order')
+                    .values_list('player_id', 'card', 'order')
+                )
+        return self._moves
+
+    @property
+    def trick_tracker(self):
+        """TrickTracker: Stanje trenutnog štiha iz round_data trenutne runde."""
+        if self._trick_tracker is None and self.current_round is not None:
+            self._trick_tracker = self.current_round.get_trick_tracker()
+        return self._trick_tracker
+
+    @property
+    def bidding(self):
+        """Bidding: Stanje zvanja aduta trenutne runde iz round_data."""
+        if self._bidding is None and self.current_round is not None:
+            self._bidding = self.current_round.get_bidding(self.players)
+        return self._bidding
+
+    def current_trick(self):
+        """
+        Vraća karte trenutnog (nedovršenog) štiha.
+
+        Returns:
+            list: Rječnici s ključevima 'player' i 'card' redom igranja
+        """
+        moves = self.moves
+        played = len(moves) % 4
+        return [
+            {'player': str(player_id), 'card': card}
+            for player_id, card, _ in (moves[-played:] if played else [])
+        ]
+
+    def hand(self, user_id):
+        """
+        Vraća karte u ruci igrača u trenutnoj rundi.
+
+        Args:
+            user_id: ID igrača
+
+        Returns:
+            list: Kodovi karata poredani po boji i vrijednosti
+        """
+        player_id = self._normalize_id(user_id)
+        if self.current_round is None or player_id not in self._players_by_id:
+            return []
+        self.current_round.get_deal(self.players)
+        return self.current_round.get_hand(player_id)
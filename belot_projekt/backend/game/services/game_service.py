@@ -7,9 +7,9 @@ jedinstveno sučelje za repository i API/consumer komponente.
 """
 
 import logging
+import random
 import uuid
 import time
-import functools
 import json
 from copy import deepcopy
 from datetime import datetime, timedelta
@@ -20,13 +20,19 @@ from django.db import transaction
 from django.core.cache import cache
 from django.conf import settings
 
-from game.models import Game, Round, Move, Declaration, GameHistory
+from game.models import Round, Move, Declaration, GameHistory
 from game.repositories.game_repository import GameRepository
 from game.repositories.move_repository import MoveRepository
+from game.services.concurrency import VersionConflict, claim_version, game_version, run_with_retry
+from game.services.game_actor import GameOwnedElsewhere, MovesNotSaved, game_actors
+from game.services.game_context import GameContext
+from game.game_logic.bidding import BIDDING_KEY, TRUMP_SUITS
 from game.game_logic.card import Card
 from game.game_logic.deck import Deck
 from game.game_logic.rules import Rules
 from game.game_logic.scoring import Scoring
+from game.game_logic.seating import SeatMap
+from game.game_logic.trick_tracker import TrickTracker
 from utils.decorators import track_execution_time
 
 # Inicijalizacija loggera
@@ -36,58 +42,52 @@ User = get_user_model()
 # Konstante za keširanja
 GAME_CACHE_PREFIX = 'game_service:game:'
 GAME_STATE_CACHE_PREFIX = 'game_service:state:'
+GAME_STATE_GENERATION_PREFIX = 'game_service:state_generation:'
 GAME_CACHE_TIMEOUT = 60 * 30  # 30 minuta
+GAME_STATE_CACHE_TIMEOUT = 60
 
 
-def game_state_cache(timeout=300):
+def _state_generation(game_id):
     """
-    Dekorator za keširanje stanja igre.
+    Vraća generaciju stanja igre iz keša.
     
-    Kešira rezultate metoda koje dohvaćaju stanje igre kako bi se
-    smanjio broj upita prema bazi podataka.
+    Generacija se povećava pri svakom poništavanju keša igre; ako je ključ
+    izbačen iz keša, nova generacija počinje od trenutnog vremena kako se
+    ne bi ponovno upotrijebila projekcija stare generacije.
+    """
+    key = f"{GAME_STATE_GENERATION_PREFIX}{game_id}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def game_state_cache_key(game):
+    """
+    Vraća ključ keša javnog dijela stanja igre.
+    
+    Ključ sadrži verziju igre (concurrency.game_version), koja se povećava
+    pri svakom potezu i zvanju preko baze, i generaciju stanja, koju
+    povećava invalidate_game_cache. Izmjena igre tako samo mijenja ključ,
+    a stare projekcije istječu same.
     
     Args:
-        timeout: Vrijeme trajanja keša u sekundama (zadano: 5 minuta)
+        game: Instanca igre
         
     Returns:
-        Dekorirana funkcija
+        str: Ključ keša
     """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(self, *args, **kwargs):
-            # Generiraj ključ za keš
-            game = self.get_game(check_exists=True)
-            if not game:
-                return func(self, *args, **kwargs)
-                
-            # Ako je igra završena, ne keširamo rezultate
-            if game.status in ['finished', 'abandoned']:
-                return func(self, *args, **kwargs)
-                
-            # Za različite korisnike imamo različite poglede na igru
-            user_id = args[0] if args else kwargs.get('user_id')
-            cache_key = f"{GAME_STATE_CACHE_PREFIX}{game.id}:{user_id}"
-            
-            # Provjeri postoji li rezultat u kešu
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-                
-            # Dohvati rezultat iz funkcije
-            result = func(self, *args, **kwargs)
-            
-            # Spremi rezultat u keš
-            cache.set(cache_key, result, timeout)
-            
-            return result
-        return wrapper
-    return decorator
+    return f"{GAME_STATE_CACHE_PREFIX}{game.id}:{game_version(game)}:{_state_generation(game.id)}"
 
 
 def invalidate_game_cache(game_id):
     """
     Poništava keš vezan uz igru.
     
+    Javni dio stanja igre ne briše se po uzorku ključa, već se povećava
+    generacija stanja pa postojeće projekcije više nisu dohvatljive.
+    
     Args:
         game_id: ID igre
         
@@ -98,10 +98,12 @@ def invalidate_game_cache(game_id):
     cache_key = f"{GAME_CACHE_PREFIX}{game_id}"
     cache.delete(cache_key)
     
-    # Poništi keš za stanje igre
-    # Budući da ne znamo točno koji korisnici imaju keširane podatke,
-    # koristi wildcard za sve ključeve koji se odnose na igru
-    cache.delete_pattern(f"{GAME_STATE_CACHE_PREFIX}{game_id}:*")
+    # Nova generacija stanja igre
+    generation_key = f"{GAME_STATE_GENERATION_PREFIX}{game_id}"
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        cache.set(generation_key, int(time.time() * 1000), None)
 
 
 class GameService:
@@ -119,20 +121,70 @@ class GameService:
     - Praćenje stanja igre
     """
     
-    def __init__(self, game_id=None, room_code=None):
+    def __init__(self, game_id=None, room_code=None, context=None):
         """
         Inicijalizira GameService za određenu igru.
         
         Args:
             game_id: ID igre ako je poznato
             room_code: Kod sobe ako se igra dohvaća prema kodu
+            context: Opcionalno, već učitani GameContext za trenutnu akciju
         """
-        self.game_id = game_id
+        self.game_id = game_id if game_id is not None or context is None else context.game.id
         self.room_code = room_code
         self.rules = Rules()
         self.scoring = Scoring()
         self._game_cache = None
         self._cache_timestamp = None
+        self._context = context
+    
+    def get_context(self, user_id=None, refresh=False):
+        """
+        Vraća kontekst igre za trenutnu akciju.
+        
+        Kontekst se učitava jednom po instanci servisa, pa provjere i obrada
+        iste akcije (npr. is_player_turn pa process_move) dijele iste podatke.
+        Metode koje mijenjaju igru nakon izmjena odbacuju kontekst.
+        
+        Args:
+            user_id: ID korisnika koji izvodi akciju
+            refresh: Ponovno učitava kontekst iz baze
+            
+        Returns:
+            GameContext: Kontekst ili None ako igra ne postoji
+        """
+        if refresh or self._context is None:
+            self._context = GameContext.load(self.game_id, self.room_code, user_id)
+            if self._context is not None:
+                self.game_id = self._context.game.id
+        elif user_id is not None and not self._context.is_user(user_id):
+            self._context = GameContext(self._context.game, user_id=user_id)
+        return self._context
+    
+    def _invalidate_context(self):
+        """Odbacuje kontekst nakon izmjene igre."""
+        self._context = None
+    
+    def _run_optimistic(self, name, operation, *args):
+        """
+        Izvodi akciju koja mijenja igru i ponavlja je nakon sukoba verzija.
+        
+        Akcija unutar svoje transakcije poziva claim_version; nakon sukoba
+        kontekst se odbacuje pa ponovljena akcija čita svježe stanje.
+        
+        Args:
+            name: Ime akcije za brojače sukoba
+            operation: Metoda akcije
+            *args: Argumenti akcije
+            
+        Returns:
+            dict: Rezultat akcije
+        """
+        try:
+            return run_with_retry(lambda: operation(*args), name, on_conflict=self._invalidate_context)
+        except VersionConflict:
+            self._invalidate_context()
+            return {'valid': False, 'message': 'Igra je istovremeno izmijenjena, pokušaj ponovno'}
     
     @track_execution_time
     def get_game(self, check_exists=True, use_cache=True):
@@ -474,6 +526,11 @@ class GameService:
         game.team_a_players.set(team_a)
         game.team_b_players.set(team_b)
         
+        # Partneri sjede nasuprot
+        game.set_seat_map(SeatMap.from_teams(
+            [player.id for player in team_a], [player.id for player in team_b]
+        ))
+        
         # Ažuriraj podatke o dealeru i prvom igraču
         game.current_dealer = players[0]
         game.first_player = players[0]
@@ -519,6 +576,10 @@ class GameService:
                     'valid': False,
                     'message': 'Niste član ove igre'
                 }
+            
+            # Predaja završava igru; stanje runde u memoriji se sprema i izbacuje
+            if game.status == 'in_progress':
+                game_actors.evict(game.id)
                 
             # Započni transakciju za konzistentnost podataka
             with transaction.atomic():
@@ -621,6 +682,9 @@ class GameService:
                 'message': 'Uspješno ste napustili igru'
             }
             
+        except MovesNotSaved as e:
+            logger.error(f"Igra {self.game_id} se ne završava predajom: {str(e)}")
+            return {'valid': False, 'message': 'Potezi igre se još spremaju, pokušaj ponovno'}
         except Exception as e:
             logger.error(f"Greška pri napuštanju igre: {str(e)}", exc_info=True)
             return {'valid': False, 'message': f"Greška pri napuštanju igre: {str(e)}"}
@@ -731,19 +795,18 @@ class GameService:
                 # Podijeli karte
                 cards_by_player = self._deal_cards(current_round)
                 
+                # Igrači po pozicijama za stolom (za djelitelja i karte igrača)
+                players = game.get_seated_players()
+                
                 # Dohvati djelitelja
                 dealer = current_round.dealer
                 if not dealer:
                     # Postavi dealer-a ako nije postavljen
-                    players = list(game.players.all())
                     dealer = random.choice(players)
                     current_round.dealer = dealer
                 
                 # Odredi prvog igrača za zvanje aduta (nakon djelitelja)
-                players = list(game.players.all())
-                dealer_index = players.index(dealer)
-                first_bidder_index = (dealer_index + 1) % 4
-                first_bidder = players[first_bidder_index]
+                first_bidder = game.get_player_after(dealer)
                 
                 # Ažuriraj rundu
                 current_round.current_player = first_bidder
@@ -829,9 +892,9 @@ class GameService:
             dict: Karte podijeljene po igračima (id_igrača -> lista karti)
         """
         try:
-            # Dohvati igru i igrače
+            # Dohvati igru i igrače po pozicijama za stolom
             game = game_round.game
-            players = list(game.players.all())
+            players = game.get_seated_players()
             
             # Provjeri je li dealer postavljen, ako nije postavi nasumičnog igrača
             if not game_round.dealer:
@@ -959,6 +1022,13 @@ class GameService:
         """
         Obrađuje potez igrača.
         
+        Igra u fazi igranja karata obrađuje se u memoriji procesa koji je
+        posjeduje (game_actors). Ako je posjeduje drugi proces, potez se
+        ne obrađuje preko baze jer vlasnik ima poteze koji još nisu
+        spremljeni; rezultat tada sadrži 'owner' (proces kojem treba
+        proslijediti potez) i 'retry'. Inače se potez obrađuje preko baze
+        uz optimističko zaključavanje igre i ponavljanje nakon sukoba.
+        
         Args:
             user_id: ID korisnika koji igra potez
             card: Karta koju igrač igra (string ili Card objekt)
@@ -966,20 +1036,148 @@ class GameService:
         Returns:
             dict: Rezultat poteza sa statusom i porukom
         """
+        # Igra u fazi igranja karata obrađuje se u memoriji ako je posjeduje ovaj proces
         try:
-            # Dohvati igru
-            game = self.get_game()
-            if not game:
+            result = game_actors.play_card(self.game_id, user_id, card)
+        except GameOwnedElsewhere as e:
+            logger.info(f"Potez korisnika {user_id} u igri {self.game_id} pripada procesu {e.owner}")
+            return {
+                'valid': False,
+                'retry': True,
+                'owner': e.owner,
+                'message': 'Igru trenutno obrađuje drugi poslužitelj, pokušaj ponovno'
+            }
+        except MovesNotSaved as e:
+            logger.error(f"Potez korisnika {user_id} u igri {self.game_id} odbijen: {str(e)}")
+            return {
+                'valid': False,
+                'retry': True,
+                'message': 'Potezi igre se još spremaju, pokušaj ponovno'
+            }
+        except Exception as e:
+            logger.error(f"Greška pri obradi poteza korisnika {user_id} u memoriji: {str(e)}", exc_info=True)
+            return {'valid': False, 'message': f'Greška pri obradi poteza: {str(e)}'}
+        if result is not None:
+            if result.get('round_completed'):
+                result.update(self._complete_actor_round(user_id))
+            return result
+        return self._run_optimistic('process_move', self._process_move, user_id, card)
+    
+    def _complete_actor_round(self, user_id):
+        """
+        Završava rundu čiji je zadnji štih odigran u memoriji.
+        
+        Potezi su već spremljeni (game_actors izbacuje igru nakon zadnjeg
+        štiha), pa se runda završava istim kodom kao na putu preko baze
+        (_finish_round), uz provjeru verzije igre.
+        
+        Args:
+            user_id: ID korisnika koji je odigrao zadnju kartu
+            
+        Returns:
+            dict: Dopuna rezultata poteza iz _finish_round (prazna ako
+                runda nije završena)
+        """
+        def complete():
+            context = self.get_context(user_id, refresh=True)
+            current_round = context.current_round if context else None
+            if current_round is None or current_round.is_completed:
+                return {}
+            with transaction.atomic():
+                claim_version(context.game, context.version)
+                outcome = self._finish_round(context.game, current_round, user_id)
+            self._invalidate_context()
+            return outcome
+        
+        try:
+            return run_with_retry(complete, 'complete_round', on_conflict=self._invalidate_context)
+        except Exception as e:
+            logger.error(f"Greška pri završavanju runde igre {self.game_id}: {str(e)}", exc_info=True)
+            return {}
+    
+    def _finish_round(self, game, current_round, user_id):
+        """
+        Završava rundu nakon zadnjeg štiha i započinje sljedeću ili završava igru.
+        
+        Zajednička je za potez preko baze i potez u memoriji, pa rezultat
+        poteza na oba puta ima isti oblik. Poziva se unutar transakcije
+        akcije.
+        
+        Args:
+            game: Igra (Game instanca)
+            current_round: Runda u kojoj je odigran zadnji štih
+            user_id: ID korisnika koji je odigrao zadnju kartu
+            
+        Returns:
+            dict: Ključevi 'round_completed', 'round_result' i 'game_completed'
+                te 'final_score' (kraj igre) ili 'new_round' (sljedeća runda)
+        """
+        round_result = self._calculate_round_result(current_round)
+        
+        # Rezultat runde i ukupni rezultat igre (Game.update_scores završava igru ako je dosegnut cilj)
+        current_round.game = game
+        current_round.complete_round(round_result.get('team_a_points', 0), round_result.get('team_b_points', 0))
+        
+        outcome = {
+            'round_completed': True,
+            'round_result': round_result,
+            'game_completed': False
+        }
+        
+        if game.status == 'finished':
+            from game.services.scoring_service import ScoringService
+            
+            # Ažuriraj statistiku igrača
+            self._update_player_statistics(game)
+            
+            outcome['game_completed'] = True
+            outcome['final_score'] = ScoringService.calculate_final_score(game)
+            return outcome
+        
+        # Započni novu rundu i podijeli karte
+        next_dealer = self._get_next_dealer(current_round.dealer, game)
+        new_round = Round.objects.create(
+            game=game,
+            number=current_round.number + 1,
+            dealer=next_dealer
+        )
+        player_cards = self._deal_cards(new_round)
+        
+        outcome['new_round'] = {
+            'round_number': new_round.number,
+            'dealer': {
+                'id': str(next_dealer.id),
+                'username': next_dealer.username
+            },
+            'player_cards': player_cards
+        }
+        return outcome
+    
+    def _process_move(self, user_id, card):
+        """
+        Obrađuje potez igrača.
+        
+        Args:
+            user_id: ID korisnika koji igra potez
+            card: Karta koju igrač igra (string ili Card objekt)
+            
+        Returns:
+            dict: Rezultat poteza sa statusom i porukom
+        """
+        try:
+            # Dohvati igru, igrače i trenutnu rundu jednim planom upita
+            context = self.get_context(user_id)
+            if not context:
                 logger.error(f"Igra ne postoji za potez korisnika {user_id}")
                 return {
                     'valid': False,
                     'message': 'Igra nije pronađena'
                 }
+            game = context.game
             
             # Provjeri postoji li korisnik
-            try:
-                user = User.objects.get(id=user_id)
-            except User.DoesNotExist:
+            user = context.user
+            if user is None:
                 logger.error(f"Korisnik {user_id} ne postoji")
                 return {
                     'valid': False,
@@ -987,7 +1185,7 @@ class GameService:
                 }
             
             # Provjeri je li korisnik dio igre
-            if not game.players.filter(id=user_id).exists():
+            if not context.is_member(user_id):
                 logger.warning(f"Korisnik {user_id} nije dio igre {game.id}")
                 return {
                     'valid': False,
@@ -995,7 +1193,7 @@ class GameService:
                 }
             
             # Provjeri je li igrač aktivan
-            if not game.is_player_active(user_id):
+            if not context.is_active(user_id):
                 logger.warning(f"Korisnik {user_id} nije aktivan igrač u igri {game.id}")
                 return {
                     'valid': False,
@@ -1010,11 +1208,8 @@ class GameService:
                     'message': 'Igra nije u tijeku'
                 }
             
-            # Dohvati trenutnu rundu
-            current_round = Round.objects.filter(
-                game=game, 
-                status__in=['in_progress', 'bidding']
-            ).order_by('-number').first()
+            # Trenutna runda iz konteksta
+            current_round = context.current_round
             
             if not current_round:
                 logger.error(f"Nema aktivne runde za igru {game.id}")
@@ -1040,7 +1235,7 @@ class GameService:
                 }
             
             # Provjeri ima li igrač tu kartu u ruci
-            player_cards = MoveRepository.get_player_cards(current_round, user)
+            player_cards = context.hand(user_id)
             
             # Pretvori karte u objekte za lakšu usporedbu
             if isinstance(card, str):
@@ -1050,12 +1245,18 @@ class GameService:
                     logger.error(f"Nevažeći kod karte: {str(e)}")
                     return {'valid': False, 'message': 'Nevažeća karta'}
             
-            # Dohvati trenutni štih
-            current_trick_cards = current_round.current_trick_cards or []
+            # Dohvati trenutni štih i njegovu vodeću kartu
+            current_trick_cards = context.current_trick()
+            tracker = context.trick_tracker
+            if tracker.size != len(current_trick_cards):
+                tracker = TrickTracker.from_trick(current_trick_cards, current_round.trump_suit)
             
             # Provjeri je li potez valjan prema pravilima
             from game.services.card_service import CardService
-            is_valid, error_message = CardService.is_valid_move(card, player_cards, current_trick_cards, current_round.trump_suit)
+            is_valid, error_message = CardService.is_valid_move(
+                card, player_cards, current_trick_cards, current_round.trump_suit,
+                trick_state=tracker.state()
+            )
             
             if not is_valid:
                 logger.info(f"Nevažeći potez igrača {user_id}: karta {card.get_code()}, adut: {current_round.trump_suit}, razlog: {error_message}")
@@ -1066,6 +1267,9 @@ class GameService:
             
             # Započni transakciju za očuvanje konzistentnosti podataka
             with transaction.atomic():
+                # Igra se ne smije promijeniti od učitavanja konteksta
+                claim_version(game, context.version)
+                
                 # Izračunaj trenutni broj štiha i redoslijed poteza unutar štiha
                 trick_number = current_round.trick_number or 0
                 trick_move_count = len(current_trick_cards)
@@ -1094,8 +1298,11 @@ class GameService:
                     'username': user.username
                 })
                 
+                tracker.add(card, str(user.id))
+                
                 # Ažuriraj rundu s novim štihom
                 current_round.current_trick_cards = current_trick_cards
+                current_round.round_data['trick_leader'] = tracker.to_dict()
                 current_round.trick_number = trick_number
                 
                 # Rezultat poteza
@@ -1111,7 +1318,9 @@ class GameService:
                 # Ako je štih kompletan (4 karte), odredi pobjednika štiha
                 if len(current_trick_cards) == 4:
                     # Izračunaj pobjednika štiha
-                    winner_info = CardService.calculate_trick_winner(current_trick_cards, current_round.trump_suit)
+                    winner_info = CardService.calculate_trick_winner(
+                        current_trick_cards, current_round.trump_suit, tracker=tracker
+                    )
                     
                     if winner_info:
                         winning_player_id = winner_info.get('player')
@@ -1138,6 +1347,9 @@ class GameService:
                         
                         # Postavi da je štih završen i počni novi
                         current_round.current_trick_cards = []
+                        current_round.round_data['trick_leader'] = TrickTracker(
+                            current_round.trump_suit, trick_number
+                        ).to_dict()
                         
                         result['trick_completed'] = True
                         result['next_player'] = winning_player_id
@@ -1154,81 +1366,9 @@ class GameService:
                             move.is_winning_card = True
                             move.save(update_fields=['is_winning_card'])
                             
-                            # Završi rundu
-                            current_round.status = 'completed'
-                            current_round.end_time = timezone.now()
-                            
-                            # Izračunaj rezultat runde
-                            round_result = self._calculate_round_result(current_round)
-                            
-                            # Spremi rezultat runde
-                            current_round.team_a_points = round_result.get('team_a_points', 0)
-                            current_round.team_b_points = round_result.get('team_b_points', 0)
-                            current_round.team_a_declaration_points = round_result.get('team_a_declaration_points', 0)
-                            current_round.team_b_declaration_points = round_result.get('team_b_declaration_points', 0)
-                            current_round.team_a_trick_points = round_result.get('team_a_trick_points', 0)
-                            current_round.team_b_trick_points = round_result.get('team_b_trick_points', 0)
-                            
-                            # Označi je li tim koji je zvao adut prošao
-                            current_round.calling_team_passed = round_result.get('passed', False)
-                            
-                            # Spremi izmjene
+                            # Završi rundu i započni sljedeću ili završi igru
                             current_round.save()
-                            
-                            # Ažuriraj rezultat poteza
-                            result['round_completed'] = True
-                            result['round_result'] = round_result
-                            
-                            # Provjeri je li igra završena (dosegnut potreban broj bodova)
-                            from game.services.scoring_service import ScoringService
-                            winner = ScoringService.check_game_winner(game)
-                            
-                            if winner:
-                                # Završi igru
-                                game.status = 'completed'
-                                game.end_time = timezone.now()
-                                game.winner = winner
-                                
-                                # Izračunaj konačni rezultat
-                                final_score = ScoringService.calculate_final_score(game)
-                                
-                                # Spremi konačni rezultat
-                                game.team_a_score = final_score.get('team_a_score', 0)
-                                game.team_b_score = final_score.get('team_b_score', 0)
-                                game.save()
-                                
-                                # Ažuriraj statistiku igrača
-                                self._update_player_statistics(game)
-                                
-                                # Ažuriraj rezultat poteza
-                                result['game_completed'] = True
-                                result['final_score'] = final_score
-                            else:
-                                # Započni novu rundu
-                                next_dealer = self._get_next_dealer(current_round.dealer, game)
-                                
-                                new_round = Round.objects.create(
-                                    game=game,
-                                    number=current_round.number + 1,
-                                    dealer=next_dealer,
-                                    current_player=next_dealer,  # Prvi na potezu je igrač koji sjedi nakon djelitelja
-                                    status='waiting',
-                                    trump_suit=None,
-                                    calling_team=None
-                                )
-                                
-                                # Podijeli karte za novu rundu
-                                player_cards = self._deal_cards(new_round)
-                                
-                                # Ažuriraj rezultat poteza s novom rundom
-                                result['new_round'] = {
-                                    'round_number': new_round.number,
-                                    'dealer': {
-                                        'id': str(next_dealer.id),
-                                        'username': next_dealer.username
-                                    },
-                                    'player_cards': player_cards.get(str(user_id), [])
-                                }
+                            result.update(self._finish_round(game, current_round, user_id))
                     else:
                         logger.error(f"Nije moguće odrediti pobjednika štiha u rundi {current_round.id}")
                         return {
@@ -1237,11 +1377,7 @@ class GameService:
                         }
                 else:
                     # Ako štih nije kompletan, postavi sljedećeg igrača
-                    # Dohvati redoslijed igrača
-                    player_order = list(game.players.all())
-                    current_index = player_order.index(user)
-                    next_index = (current_index + 1) % len(player_order)
-                    next_player = player_order[next_index]
+                    next_player = context.next_player(user_id)
                     
                     # Postavi sljedećeg igrača
                     current_round.current_player = next_player
@@ -1250,12 +1386,15 @@ class GameService:
                 
                 # Spremi izmjene na rundi
                 current_round.save()
+                self._invalidate_context()
                 
                 # Ažuriraj povijest igre
                 self._update_game_history(game, f"Igrač {user.username} je odigrao kartu {card.get_code()}")
                 
                 return result
                 
+        except VersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Greška pri obradi poteza korisnika {user_id}: {str(e)}", exc_info=True)
             return {
@@ -1265,6 +1404,19 @@ class GameService:
     
     @track_execution_time
     def process_trump_call(self, user_id, suit):
+        """
+        Obrađuje zvanje aduta uz optimističko zaključavanje igre.
+        
+        Args:
+            user_id: ID korisnika koji zove aduta
+            suit: Boja aduta ('S', 'H', 'D', 'C')
+            
+        Returns:
+            dict: Rezultat zvanja (vidi _process_trump_call)
+        """
+        return self._run_optimistic('process_trump_call', self._process_trump_call, user_id, suit)
+    
+    def _process_trump_call(self, user_id, suit):
         """
         Obrađuje zvanje aduta.
         
@@ -1285,16 +1437,16 @@ class GameService:
                        uvjeti za zvanje aduta
         """
         try:
-            # Dohvati igru s provjerom postojanja
-            game = self.get_game(check_exists=True)
-            if not game:
+            # Dohvati igru, igrače i trenutnu rundu jednim planom upita
+            context = self.get_context(user_id)
+            if not context:
                 logger.warning(f"Igra nije pronađena pri zvanju aduta")
                 return {'valid': False, 'message': 'Igra nije pronađena'}
+            game = context.game
             
-            # Dohvati korisnika s optimizacijom
-            try:
-                user = User.objects.select_related('profile').get(id=user_id)
-            except User.DoesNotExist:
+            # Korisnik iz konteksta (igrači igre su već dohvaćeni)
+            user = context.user
+            if user is None:
                 logger.warning(f"Pokušaj zvanja aduta od strane nepostojećeg korisnika: {user_id}")
                 return {'valid': False, 'message': 'Korisnik ne postoji'}
             
@@ -1304,17 +1456,17 @@ class GameService:
                 return {'valid': False, 'message': 'Korisnički račun nije aktivan'}
             
             # Provjeri je li korisnik član igre
-            if not game.players.filter(id=user_id).exists():
+            if not context.is_member(user_id):
                 logger.info(f"Korisnik {user_id} pokušava zvati adut u igri {game.id} u kojoj nije član")
                 return {'valid': False, 'message': 'Niste član ove igre'}
             
             # Provjeri je li korisnik aktivan u igri
-            if not game.active_players.filter(id=user_id).exists():
+            if not context.is_active(user_id):
                 logger.info(f"Korisnik {user_id} pokušava zvati adut, ali nije aktivan u igri {game.id}")
                 return {'valid': False, 'message': 'Morate biti aktivni u igri da biste zvali adut'}
             
-            # Dohvati trenutnu rundu
-            current_round = GameRepository.get_current_round(game)
+            # Trenutna runda iz konteksta
+            current_round = context.current_round
             if not current_round:
                 logger.warning(f"Nema aktivne runde za igru {game.id}")
                 return {
@@ -1322,50 +1474,50 @@ class GameService:
                     'message': 'Nema aktivne runde'
                 }
             
-            # Provjeri je li igrač na potezu
-            if current_round.current_player != user:
-                logger.info(f"Korisnik {user_id} pokušava zvati adut, ali nije na redu (trenutni igrač: {current_round.current_player.id})")
+            # Stanje zvanja iz round_data (redoslijed je određen pri dijeljenju)
+            bidding = context.bidding
+            
+            # Provjeri je li zvanje aduta još u tijeku
+            if bidding.is_finished:
+                logger.info(f"Korisnik {user_id} pokušava zvati adut, ali je adut u rundi {current_round.id} već zvan")
                 return {
                     'valid': False,
-                    'message': 'Nije tvoj red za zvanje aduta'
+                    'message': 'Adut je već zvan'
                 }
             
-            # Provjeri je li status runde 'bidding'
-            if current_round.status != 'bidding':
-                logger.info(f"Korisnik {user_id} pokušava zvati adut, ali runda {current_round.id} nije u fazi zvanja aduta (trenutni status: {current_round.status})")
+            # Provjeri je li igrač na redu za zvanje
+            if not bidding.is_turn(user.id):
+                logger.info(f"Korisnik {user_id} pokušava zvati adut, ali nije na redu (na redu je: {bidding.current_bidder})")
                 return {
                     'valid': False,
-                    'message': f'Runda nije u fazi zvanja aduta (trenutni status: {current_round.status})'
+                    'message': 'Nije tvoj red za zvanje aduta'
                 }
             
             # Provjeri je li boja aduta valjana
-            valid_suits = ['S', 'H', 'D', 'C']
-            if suit not in valid_suits:
+            if suit not in TRUMP_SUITS:
                 logger.warning(f"Korisnik {user_id} pokušava zvati nevažeću boju aduta: {suit}")
                 return {
                     'valid': False,
-                    'message': f'Nevažeća boja aduta. Dozvoljena samo: {", ".join(valid_suits)}'
+                    'message': f'Nevažeća boja aduta. Dozvoljena samo: {", ".join(TRUMP_SUITS)}'
                 }
             
             # Započni transakciju za očuvanje konzistentnosti podataka
             with transaction.atomic():
-                # Postavi adut i status
-                current_round.trump_suit = suit
-                current_round.caller = user
-                current_round.status = 'playing'
+                # Igra se ne smije promijeniti od učitavanja konteksta
+                claim_version(game, context.version)
                 
-                # Odredi tim koji je zvao adut
-                calling_team = 'a' if user in game.team_a_players.all() else 'b'
+                # Zabilježi ugovor; sprema se adut, tim i niz "dalje" jednim upisom
+                bidding.call(user.id, suit)
+                calling_team = 'a' if context.team_of(user_id) == 'a' else 'b'
+                current_round.trump_suit = suit
+                current_round.trump_caller = user
                 current_round.calling_team = calling_team
+                current_round.round_data[BIDDING_KEY] = bidding.to_dict()
+                current_round.save(update_fields=['trump_suit', 'trump_caller', 'calling_team', 'round_data'])
                 
                 # Prvi igrač nakon djelitelja započinje igru
-                players = list(game.players.all())
-                dealer_index = players.index(current_round.dealer)
-                first_player_index = (dealer_index + 1) % 4
-                first_player = players[first_player_index]
-                
-                current_round.current_player = first_player
-                current_round.save(update_fields=['trump_suit', 'caller', 'status', 'calling_team', 'current_player'])
+                players = context.players
+                first_player = context.next_player(current_round.dealer_id)
                 
                 # Dodaj zapis u povijest igre
                 self._update_game_history(
@@ -1376,8 +1528,7 @@ class GameService:
                 # Pripremi karte za svakog igrača (možda ima novih)
                 player_cards = {}
                 for player in players:
-                    cards = MoveRepository.get_player_cards(current_round, player)
-                    player_cards[str(player.id)] = [card.get_code() for card in cards]
+                    player_cards[str(player.id)] = context.hand(player.id)
                 
                 # Prijevodi boja za lakše čitanje
                 suit_translations = {
@@ -1390,9 +1541,10 @@ class GameService:
                 # Poništi keš
                 invalidate_game_cache(game.id)
                 self._game_cache = None
+                self._invalidate_context()
                 
                 # Logiraj uspješno zvanje aduta
-                logger.info(f"Igrač {user_id} zvao adut {suit} ({suit_translations.get(suit, suit)}) u igri {game.id}, runda {current_round.round_number}")
+                logger.info(f"Igrač {user_id} zvao adut {suit} ({suit_translations.get(suit, suit)}) u igri {game.id}, runda {current_round.number}")
                 
                 return {
                     'valid': True,
@@ -1403,7 +1555,7 @@ class GameService:
                         'id': str(user.id),
                         'username': user.username
                     },
-                    'round_number': current_round.round_number,
+                    'round_number': current_round.number,
                     'next_player': {
                         'id': str(first_player.id),
                         'username': first_player.username
@@ -1414,41 +1566,55 @@ class GameService:
         except User.DoesNotExist:
             logger.warning(f"Pokušaj zvanja aduta od strane nepostojećeg korisnika: {user_id}")
             return {'valid': False, 'message': 'Korisnik ne postoji'}
+        except VersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Greška pri zvanju aduta: {str(e)}", exc_info=True)
             return {'valid': False, 'message': f"Greška pri zvanju aduta: {str(e)}"}
     
     @track_execution_time
     def process_trump_pass(self, user_id):
+        """
+        Obrađuje propuštanje zvanja aduta uz optimističko zaključavanje igre.
+        
+        Args:
+            user_id: ID korisnika koji propušta zvanje
+            
+        Returns:
+            dict: Rezultat propuštanja (vidi _process_trump_pass)
+        """
+        return self._run_optimistic('process_trump_pass', self._process_trump_pass, user_id)
+    
+    def _process_trump_pass(self, user_id):
         """
         Obrađuje propuštanje zvanja aduta.
         
         Ova metoda se poziva kada igrač odluči propustiti zvanje aduta.
         Nakon propuštanja, sljedeći igrač dobiva priliku zvati adut.
-        Ako svi igrači propuste, automatski se određuje adut.
+        Djelitelj nakon tri "dalje" ne može propustiti, nego mora zvati.
         
         Args:
             user_id: ID korisnika koji propušta zvanje
             
         Returns:
-            dict: Rezultat s podacima o sljedećem igraču za zvanje ili
-                 automatski određenom adutu ako su svi propustili
+            dict: Rezultat s podacima o sljedećem igraču za zvanje i
+                 oznakom 'must_call' ako je on djelitelj koji mora zvati
                  
         Raises:
             ValueError: Ako korisnik ili igra ne postoje ili nisu zadovoljeni
                        uvjeti za propuštanje zvanja aduta
         """
         try:
-            # Dohvati igru s provjerom postojanja
-            game = self.get_game(check_exists=True)
-            if not game:
+            # Dohvati igru, igrače i trenutnu rundu jednim planom upita
+            context = self.get_context(user_id)
+            if not context:
                 logger.warning(f"Igra nije pronađena pri propuštanju zvanja aduta")
                 return {'valid': False, 'message': 'Igra nije pronađena'}
+            game = context.game
             
-            # Dohvati korisnika s optimizacijom
-            try:
-                user = User.objects.select_related('profile').get(id=user_id)
-            except User.DoesNotExist:
+            # Korisnik iz konteksta (igrači igre su već dohvaćeni)
+            user = context.user
+            if user is None:
                 logger.warning(f"Pokušaj propuštanja zvanja aduta od strane nepostojećeg korisnika: {user_id}")
                 return {'valid': False, 'message': 'Korisnik ne postoji'}
             
@@ -1458,17 +1624,17 @@ class GameService:
                 return {'valid': False, 'message': 'Korisnički račun nije aktivan'}
             
             # Provjeri je li korisnik član igre
-            if not game.players.filter(id=user_id).exists():
+            if not context.is_member(user_id):
                 logger.info(f"Korisnik {user_id} pokušava propustiti zvanje aduta u igri {game.id} u kojoj nije član")
                 return {'valid': False, 'message': 'Niste član ove igre'}
             
             # Provjeri je li korisnik aktivan u igri
-            if not game.active_players.filter(id=user_id).exists():
+            if not context.is_active(user_id):
                 logger.info(f"Korisnik {user_id} pokušava propustiti zvanje aduta, ali nije aktivan u igri {game.id}")
                 return {'valid': False, 'message': 'Morate biti aktivni u igri da biste propustili zvanje aduta'}
             
-            # Dohvati trenutnu rundu
-            current_round = GameRepository.get_current_round(game)
+            # Trenutna runda iz konteksta
+            current_round = context.current_round
             if not current_round:
                 logger.warning(f"Nema aktivne runde za igru {game.id}")
                 return {
@@ -1476,39 +1642,42 @@ class GameService:
                     'message': 'Nema aktivne runde'
                 }
             
-            # Provjeri je li igrač na potezu
-            if current_round.current_player != user:
-                logger.info(f"Korisnik {user_id} pokušava propustiti zvanje aduta, ali nije na redu (trenutni igrač: {current_round.current_player.id})")
+            # Stanje zvanja iz round_data (redoslijed je određen pri dijeljenju)
+            bidding = context.bidding
+            
+            # Provjeri je li zvanje aduta još u tijeku
+            if bidding.is_finished:
+                logger.info(f"Korisnik {user_id} pokušava propustiti zvanje aduta, ali je adut u rundi {current_round.id} već zvan")
+                return {
+                    'valid': False,
+                    'message': 'Adut je već zvan'
+                }
+            
+            # Provjeri je li igrač na redu za zvanje
+            if not bidding.is_turn(user.id):
+                logger.info(f"Korisnik {user_id} pokušava propustiti zvanje aduta, ali nije na redu (na redu je: {bidding.current_bidder})")
                 return {
                     'valid': False,
                     'message': 'Nije tvoj red za zvanje aduta'
                 }
             
-            # Provjeri je li status runde 'bidding'
-            if current_round.status != 'bidding':
-                logger.info(f"Korisnik {user_id} pokušava propustiti zvanje aduta, ali runda {current_round.id} nije u fazi zvanja aduta (trenutni status: {current_round.status})")
+            # Djelitelj nakon tri "dalje" mora zvati aduta
+            if bidding.must_call:
+                logger.info(f"Djelitelj {user_id} pokušava propustiti zvanje aduta u rundi {current_round.id}")
                 return {
                     'valid': False,
-                    'message': f'Runda nije u fazi zvanja aduta (trenutni status: {current_round.status})'
+                    'message': 'Djelitelj mora zvati aduta'
                 }
             
             # Započni transakciju za očuvanje konzistentnosti podataka
             with transaction.atomic():
-                # Odredi sljedećeg igrača
-                players = list(game.players.all())
-                current_index = players.index(user)
-                next_index = (current_index + 1) % 4
-                next_player = players[next_index]
-                
-                # Označi da je korisnik propustio zvanje
-                if not hasattr(current_round, 'passed_players'):
-                    current_round.passed_players = []
+                # Igra se ne smije promijeniti od učitavanja konteksta
+                claim_version(game, context.version)
                 
-                # Dodaj korisnika u listu onih koji su propustili
-                passed_players = current_round.passed_players
-                if str(user.id) not in passed_players:
-                    passed_players.append(str(user.id))
-                current_round.passed_players = passed_players
+                # Zabilježi "dalje"; sprema se samo niz "dalje" u round_data
+                next_player = context.player(bidding.pass_turn(user.id))
+                current_round.round_data[BIDDING_KEY] = bidding.to_dict()
+                current_round.save(update_fields=['round_data'])
                 
                 # Dodaj zapis u povijest igre
                 self._update_game_history(
@@ -1516,113 +1685,55 @@ class GameService:
                     f"Igrač {user.username} propustio zvanje aduta"
                 )
                 
-                # Provjeri jesu li svi propustili
-                if len(passed_players) == 4:
-                    # Automatski odredi adut (npr. prva karta djelitelja)
-                    dealer_cards = MoveRepository.get_player_cards(current_round, current_round.dealer)
-                    if dealer_cards:
-                        auto_trump_suit = dealer_cards[0].suit
-                    else:
-                        # Ako nema karata, odaberi nasumično
-                        auto_trump_suit = random.choice(['S', 'H', 'D', 'C'])
-                    
-                    # Postavi adut i status
-                    current_round.trump_suit = auto_trump_suit
-                    current_round.caller = current_round.dealer  # Djelitelj je "zvao" adut
-                    current_round.status = 'playing'
-                    
-                    # Odredi tim koji je "zvao" adut
-                    calling_team = 'a' if current_round.dealer in game.team_a_players.all() else 'b'
-                    current_round.calling_team = calling_team
-                    
-                    # Prvi igrač nakon djelitelja započinje igru
-                    dealer_index = players.index(current_round.dealer)
-                    first_player_index = (dealer_index + 1) % 4
-                    first_player = players[first_player_index]
-                    
-                    current_round.current_player = first_player
-                    current_round.save(update_fields=['trump_suit', 'caller', 'status', 'calling_team', 'current_player', 'passed_players'])
-                    
-                    # Pripremi karte za svakog igrača
-                    player_cards = {}
-                    for player in players:
-                        cards = MoveRepository.get_player_cards(current_round, player)
-                        player_cards[str(player.id)] = [card.get_code() for card in cards]
-                    
-                    # Prijevodi boja za lakše čitanje
-                    suit_translations = {
-                        'S': 'pik',
-                        'H': 'srce',
-                        'D': 'karo', 
-                        'C': 'tref'
-                    }
-                    
-                    # Logiraj automatsko određivanje aduta
-                    logger.info(f"Automatski određen adut {auto_trump_suit} ({suit_translations.get(auto_trump_suit, auto_trump_suit)}) u igri {game.id}, runda {current_round.round_number}")
-                    
-                    # Dodaj zapis u povijest igre
-                    self._update_game_history(
-                        game, 
-                        f"Automatski određen adut: {auto_trump_suit} ({suit_translations.get(auto_trump_suit, auto_trump_suit)})"
-                    )
-                    
-                    # Poništi keš
-                    invalidate_game_cache(game.id)
-                    self._game_cache = None
-                    
-                    return {
-                        'valid': True,
-                        'all_passed': True,
-                        'auto_trump': True,
-                        'suit': auto_trump_suit,
-                        'suit_name': suit_translations.get(auto_trump_suit, auto_trump_suit),
-                        'calling_team': calling_team,
-                        'caller': {
-                            'id': str(current_round.dealer.id),
-                            'username': current_round.dealer.username
-                        },
-                        'round_number': current_round.round_number,
-                        'next_player': {
-                            'id': str(first_player.id),
-                            'username': first_player.username
-                        },
-                        'player_cards': player_cards
-                    }
-                else:
-                    # Postavi sljedećeg igrača
-                    current_round.current_player = next_player
-                    current_round.save(update_fields=['current_player', 'passed_players'])
-                    
-                    # Logiraj propuštanje zvanja aduta
-                    logger.info(f"Igrač {user_id} propustio zvanje aduta u igri {game.id}, runda {current_round.round_number}. Sljedeći igrač: {next_player.id}")
-                    
-                    # Poništi keš
-                    invalidate_game_cache(game.id)
-                    self._game_cache = None
-                    
-                    return {
-                        'valid': True,
-                        'all_passed': False,
-                        'passed_player': {
-                            'id': str(user.id),
-                            'username': user.username
-                        },
-                        'next_player': {
-                            'id': str(next_player.id),
-                            'username': next_player.username
-                        },
-                        'passed_count': len(passed_players)
-                    }
+                # Logiraj propuštanje zvanja aduta
+                logger.info(f"Igrač {user_id} propustio zvanje aduta u igri {game.id}, runda {current_round.number}. Sljedeći igrač: {next_player.id}")
+                
+                # Poništi keš
+                invalidate_game_cache(game.id)
+                self._game_cache = None
+                self._invalidate_context()
+                
+                return {
+                    'valid': True,
+                    'passed_player': {
+                        'id': str(user.id),
+                        'username': user.username
+                    },
+                    'next_player': {
+                        'id': str(next_player.id),
+                        'username': next_player.username
+                    },
+                    'must_call': bidding.must_call,
+                    'passed_count': len(bidding.passes)
+                }
                 
         except User.DoesNotExist:
             logger.warning(f"Pokušaj propuštanja zvanja aduta od strane nepostojećeg korisnika: {user_id}")
             return {'valid': False, 'message': 'Korisnik ne postoji'}
+        except VersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Greška pri propuštanju zvanja aduta: {str(e)}", exc_info=True)
             return {'valid': False, 'message': f"Greška pri propuštanju zvanja aduta: {str(e)}"}
     
     @track_execution_time
     def process_declaration(self, user_id, declaration_type, cards):
+        """
+        Obrađuje prijavu zvanja uz optimističko zaključavanje igre.
+        
+        Args:
+            user_id: ID korisnika koji prijavljuje zvanje
+            declaration_type: Tip zvanja ('four_jacks', 'sequence_3', itd.)
+            cards: Lista kodova karata za zvanje
+            
+        Returns:
+            dict: Rezultat zvanja (vidi _process_declaration)
+        """
+        return self._run_optimistic(
+            'process_declaration', self._process_declaration, user_id, declaration_type, cards
+        )
+    
+    def _process_declaration(self, user_id, declaration_type, cards):
         """
         Obrađuje prijavu zvanja u igri.
         
@@ -1635,26 +1746,26 @@ class GameService:
             dict: Rezultat sa statusom i detaljima zvanja
         """
         try:
-            # Dohvati igru
-            game = self.get_game()
-            if not game:
+            # Dohvati igru, igrače i trenutnu rundu jednim planom upita
+            context = self.get_context(user_id)
+            if not context:
                 logger.error(f"Igra ne postoji za zvanje korisnika {user_id}")
                 return {'valid': False, 'message': 'Igra nije pronađena'}
+            game = context.game
             
             # Provjeri postoji li korisnik
-            try:
-                user = User.objects.get(id=user_id)
-            except User.DoesNotExist:
+            user = context.user
+            if user is None:
                 logger.error(f"Korisnik {user_id} ne postoji")
                 return {'valid': False, 'message': 'Korisnik ne postoji'}
             
             # Provjeri je li korisnik dio igre
-            if not game.players.filter(id=user_id).exists():
+            if not context.is_member(user_id):
                 logger.warning(f"Korisnik {user_id} nije dio igre {game.id}")
                 return {'valid': False, 'message': 'Korisnik nije dio ove igre'}
             
             # Provjeri je li igrač aktivan
-            if not game.is_player_active(user_id):
+            if not context.is_active(user_id):
                 logger.warning(f"Korisnik {user_id} nije aktivan igrač u igri {game.id}")
                 return {'valid': False, 'message': 'Korisnik nije aktivan igrač u ovoj igri'}
             
@@ -1663,18 +1774,15 @@ class GameService:
                 logger.warning(f"Igra {game.id} nije u tijeku, trenutni status: {game.status}")
                 return {'valid': False, 'message': 'Igra nije u tijeku'}
             
-            # Dohvati trenutnu rundu
-            current_round = Round.objects.filter(
-                game=game, 
-                status='in_progress'
-            ).order_by('-number').first()
+            # Trenutna runda iz konteksta
+            current_round = context.current_round
             
             if not current_round:
                 logger.error(f"Nema aktivne runde za igru {game.id}")
                 return {'valid': False, 'message': 'Nema aktivne runde'}
             
             # Provjeri ima li igrač karte za zvanje
-            player_cards = MoveRepository.get_player_cards(current_round, user)
+            player_cards = context.hand(user_id)
             
             # Pretvori string kodove u objekte Card
             try:
@@ -1699,6 +1807,9 @@ class GameService:
             
             # Započni transakciju za očuvanje konzistentnosti podataka
             with transaction.atomic():
+                # Provjera verzije igre (sukob s istovremenom akcijom ponavlja zvanje)
+                claim_version(game, context.version)
+                
                 # Dohvati vrijednost zvanja
                 from game.services.scoring_service import ScoringService
                 declaration_value = ScoringService.get_declaration_value(declaration_type)
@@ -1712,6 +1823,8 @@ class GameService:
                     value=declaration_value
                 )
                 
+                self._invalidate_context()
+                
                 # Ažuriraj povijest igre
                 self._update_game_history(game, f"Igrač {user.username} je zvao {declaration_type} vrijednosti {declaration_value}")
                 
@@ -1725,12 +1838,26 @@ class GameService:
                     'message': 'Zvanje uspješno prijavljeno'
                 }
                 
+        except VersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Greška pri obradi zvanja korisnika {user_id}: {str(e)}", exc_info=True)
             return {'valid': False, 'message': f'Greška pri obradi zvanja: {str(e)}'}
     
     @track_execution_time
     def process_bela(self, user_id):
+        """
+        Obrađuje zvanje bele uz optimističko zaključavanje igre.
+        
+        Args:
+            user_id: ID korisnika koji zove belu
+            
+        Returns:
+            dict: Rezultat zvanja (vidi _process_bela)
+        """
+        return self._run_optimistic('process_bela', self._process_bela, user_id)
+    
+    def _process_bela(self, user_id):
         """
         Obrađuje zvanje bele (kralj i dama u adutu).
         
@@ -1741,26 +1868,26 @@ class GameService:
             dict: Rezultat zvanja s informacijama o uspjehu i vrijednosti zvanja
         """
         try:
-            # Dohvati igru i provjeri postojanje
-            game = self.get_game()
-            if not game:
+            # Dohvati igru, igrače i trenutnu rundu jednim planom upita
+            context = self.get_context(user_id)
+            if not context:
                 logger.error(f"Igra ne postoji za zvanje bele korisnika {user_id}")
                 return {'valid': False, 'message': 'Igra nije pronađena'}
+            game = context.game
             
             # Provjeri postoji li korisnik
-            try:
-                user = User.objects.get(id=user_id)
-            except User.DoesNotExist:
+            user = context.user
+            if user is None:
                 logger.error(f"Korisnik {user_id} ne postoji")
                 return {'valid': False, 'message': 'Korisnik ne postoji'}
             
             # Provjeri je li korisnik dio igre
-            if not game.players.filter(id=user_id).exists():
+            if not context.is_member(user_id):
                 logger.warning(f"Korisnik {user_id} nije dio igre {game.id}")
                 return {'valid': False, 'message': 'Korisnik nije dio ove igre'}
             
             # Provjeri je li igrač aktivan
-            if not game.is_player_active(user_id):
+            if not context.is_active(user_id):
                 logger.warning(f"Korisnik {user_id} nije aktivan igrač u igri {game.id}")
                 return {'valid': False, 'message': 'Korisnik nije aktivan igrač u ovoj igri'}
             
@@ -1769,11 +1896,8 @@ class GameService:
                 logger.warning(f"Igra {game.id} nije u tijeku, trenutni status: {game.status}")
                 return {'valid': False, 'message': 'Igra nije u tijeku'}
             
-            # Dohvati trenutnu rundu
-            current_round = Round.objects.filter(
-                game=game, 
-                status='in_progress'
-            ).order_by('-number').first()
+            # Trenutna runda iz konteksta
+            current_round = context.current_round
             
             if not current_round:
                 logger.error(f"Nema aktivne runde za igru {game.id}")
@@ -1785,7 +1909,7 @@ class GameService:
                 return {'valid': False, 'message': 'Adut mora biti određen za zvanje bele'}
             
             # Provjeri ima li igrač kralja i damu aduta
-            player_cards = MoveRepository.get_player_cards(current_round, user)
+            player_cards = context.hand(user_id)
             
             # Pretvori karte u objekte Card
             trump_cards = []
@@ -1823,6 +1947,9 @@ class GameService:
             
             # Započni transakciju za očuvanje konzistentnosti podataka
             with transaction.atomic():
+                # Provjera verzije igre (sukob s istovremenom akcijom ponavlja zvanje)
+                claim_version(game, context.version)
+                
                 # Dohvati vrijednost zvanja
                 from game.services.scoring_service import ScoringService
                 declaration_value = ScoringService.get_declaration_value('belot')
@@ -1836,6 +1963,8 @@ class GameService:
                     value=declaration_value
                 )
                 
+                self._invalidate_context()
+                
                 # Ažuriraj povijest igre
                 self._update_game_history(game, f"Igrač {user.username} je zvao belu")
                 
@@ -1844,11 +1973,14 @@ class GameService:
                     'valid': True,
                     'declaration_id': str(declaration.id),
                     'declaration_type': 'belot',
+                    'suit': current_round.trump_suit,
                     'value': declaration_value,
                     'cards': belot_cards,
                     'message': 'Bela uspješno zvana'
                 }
                 
+        except VersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Greška pri obradi zvanja bele korisnika {user_id}: {str(e)}", exc_info=True)
             return {'valid': False, 'message': f'Greška pri obradi zvanja bele: {str(e)}'}
@@ -1868,20 +2000,26 @@ class GameService:
             bool: True ako je igrač na potezu, inače False
         """
         try:
-            # Dohvati igru s kešom
-            game = self.get_game(check_exists=True, use_cache=True)
-            if not game:
+            # Stanje igre u memoriji ovog procesa, ako postoji, je autoritativno
+            actor = game_actors.peek(self.game_id)
+            if actor is not None:
+                return actor.is_turn(user_id)
+            
+            # Dohvati igru i trenutnu rundu iz konteksta akcije
+            context = self.get_context(user_id)
+            if not context:
                 logger.debug(f"Provjera is_player_turn: igra nije pronađena za korisnika {user_id}")
                 return False
+            game = context.game
             
             # Dohvati trenutnu rundu
-            current_round = GameRepository.get_current_round(game)
+            current_round = context.current_round
             if not current_round:
                 logger.debug(f"Provjera is_player_turn: nema aktivne runde za igru {game.id}")
                 return False
             
             # Provjeri je li korisnik aktivan u igri
-            if not game.active_players.filter(id=user_id).exists():
+            if not context.is_active(user_id):
                 logger.debug(f"Provjera is_player_turn: korisnik {user_id} nije aktivan u igri {game.id}")
                 return False
             
@@ -1909,30 +2047,26 @@ class GameService:
             bool: True ako igrač može zvati aduta, inače False
         """
         try:
-            # Dohvati igru s kešom
-            game = self.get_game(check_exists=True, use_cache=True)
-            if not game:
+            # Dohvati igru i trenutnu rundu iz konteksta akcije
+            context = self.get_context(user_id)
+            if not context:
                 logger.debug(f"Provjera can_call_trump: igra nije pronađena za korisnika {user_id}")
                 return False
+            game = context.game
             
             # Provjeri je li korisnik aktivan u igri
-            if not game.active_players.filter(id=user_id).exists():
+            if not context.is_active(user_id):
                 logger.debug(f"Provjera can_call_trump: korisnik {user_id} nije aktivan u igri {game.id}")
                 return False
             
             # Dohvati trenutnu rundu
-            current_round = GameRepository.get_current_round(game)
+            current_round = context.current_round
             if not current_round:
                 logger.debug(f"Provjera can_call_trump: nema aktivne runde za igru {game.id}")
                 return False
             
-            # Provjeri je li status runde 'bidding'
-            if current_round.status != 'bidding':
-                logger.debug(f"Provjera can_call_trump: runda {current_round.id} nije u fazi zvanja aduta (status: {current_round.status})")
-                return False
-            
-            # Provjeri je li igrač na potezu
-            can_call = current_round.current_player_id == user_id
+            # Provjeri je li igrač na redu u zvanju (stanje zvanja iz round_data)
+            can_call = context.bidding.is_turn(user_id)
             logger.debug(f"Provjera can_call_trump za korisnika {user_id} u igri {game.id}: {can_call}")
             return can_call
             
@@ -2010,7 +2144,6 @@ class GameService:
             return False
     
     @track_execution_time
-    @game_state_cache(timeout=60)  # Keširaj rezultat na 60 sekundi
     def get_game_state(self, user_id):
         """
         Dohvaća trenutno stanje igre za specifičnog igrača.
@@ -2019,6 +2152,11 @@ class GameService:
         uključujući podatke o igri, igračima, timovima, trenutnoj rundi, kartama
         igrača, trenutnom štihu, zvanjima i povijesti poteza.
         
+        Javni dio stanja (isti za sve igrače) gradi se jednom po verziji igre
+        i dijeli kroz keš (_get_public_state), a na njega se za svakog igrača
+        dodaju samo njegovi podaci: ruka, dozvoljene karte, je li na potezu
+        i njegov tim (_project_state).
+        
         Args:
             user_id: ID korisnika za kojeg se dohvaća stanje
             
@@ -2029,16 +2167,16 @@ class GameService:
             ValueError: Ako korisnik ili igra ne postoje
         """
         try:
-            # Dohvati igru s kešom
-            game = self.get_game(check_exists=True, use_cache=True)
-            if not game:
+            # Dohvati igru, igrače, timove i trenutnu rundu jednim planom upita
+            context = self.get_context(user_id)
+            if not context:
                 logger.warning(f"Igra nije pronađena pri dohvaćanju stanja za korisnika {user_id}")
                 return {'error': 'Igra nije pronađena'}
+            game = context.game
             
-            # Dohvati korisnika s optimizacijom
-            try:
-                user = User.objects.select_related('profile').get(id=user_id)
-            except User.DoesNotExist:
+            # Korisnik iz konteksta (igrači igre su već dohvaćeni)
+            user = context.user
+            if user is None:
                 logger.warning(f"Pokušaj dohvaćanja stanja igre od strane nepostojećeg korisnika: {user_id}")
                 return {'error': 'Korisnik ne postoji'}
             
@@ -2048,155 +2186,11 @@ class GameService:
                 return {'error': 'Korisnički račun nije aktivan'}
             
             # Provjeri je li korisnik član igre
-            if not game.players.filter(id=user_id).exists():
+            if not context.is_member(user_id):
                 logger.info(f"Korisnik {user_id} pokušava dohvatiti stanje igre {game.id} u kojoj nije član")
                 return {'error': 'Niste član ove igre'}
             
-            # Osnovni podaci o igri
-            game_state = {
-                'game_id': str(game.id),
-                'room_code': game.room_code,
-                'is_private': game.is_private,
-                'status': game.status,
-                'creator_id': str(game.creator_id) if game.creator_id else None,
-                'scores': {
-                    'team_a': game.team_a_score,
-                    'team_b': game.team_b_score
-                },
-                'points_to_win': game.points_to_win,
-                'created_at': game.created_at.isoformat() if game.created_at else None,
-                'started_at': game.started_at.isoformat() if game.started_at else None,
-                'ended_at': game.ended_at.isoformat() if game.ended_at else None,
-                'updated_at': game.updated_at.isoformat() if hasattr(game, 'updated_at') and game.updated_at else None
-            }
-            
-            # Podaci o igračima - optimiziraj s prefetch_related za aktivne i spremne igrače
-            game = Game.objects.prefetch_related(
-                'players', 'active_players', 'ready_players',
-                'team_a_players', 'team_b_players'
-            ).get(id=game.id)
-            
-            active_players = set(player.id for player in game.active_players.all())
-            ready_players = set(player.id for player in game.ready_players.all()) if hasattr(game, 'ready_players') else set()
-            
-            players_data = []
-            for player in game.players.all():
-                is_active = player.id in active_players
-                is_ready = player.id in ready_players
-                
-                player_data = {
-                    'id': str(player.id),
-                    'username': player.username,
-                    'is_active': is_active,
-                    'is_ready': is_ready,
-                    'is_you': player.id == user_id
-                }
-                players_data.append(player_data)
-            
-            game_state['players'] = players_data
-            
-            # Podaci o timovima
-            teams = {}
-            for player in game.team_a_players.all():
-                teams[str(player.id)] = 'a'
-            for player in game.team_b_players.all():
-                teams[str(player.id)] = 'b'
-            
-            game_state['teams'] = teams
-            game_state['your_team'] = teams.get(str(user_id))
-            
-            # Trenutna runda
-            current_round = GameRepository.get_current_round(game)
-            if current_round:
-                round_data = {
-                    'id': str(current_round.id),
-                    'number': current_round.round_number,
-                    'status': current_round.status,
-                    'trump_suit': current_round.trump_suit,
-                    'calling_team': current_round.calling_team,
-                    'current_player': str(current_round.current_player_id) if current_round.current_player else None,
-                    'created_at': current_round.created_at.isoformat() if current_round.created_at else None,
-                    'completed_at': current_round.completed_at.isoformat() if current_round.completed_at else None
-                }
-                
-                # Prijevodi boja za lakše čitanje
-                if current_round.trump_suit:
-                    suit_translations = {
-                        'S': 'pik',
-                        'H': 'srce',
-                        'D': 'karo', 
-                        'C': 'tref'
-                    }
-                    round_data['trump_suit_name'] = suit_translations.get(current_round.trump_suit, current_round.trump_suit)
-                
-                game_state['round'] = round_data
-                game_state['your_turn'] = current_round.current_player_id == user_id
-                
-                # Karte igrača - koristi keširanje
-                user_cards = MoveRepository.get_player_cards(current_round, user)
-                game_state['your_cards'] = [card.get_code() for card in user_cards]
-                
-                # Trenutni štih
-                game_state['current_trick'] = current_round.current_trick_cards or []
-                
-                # Zvanja u rundi - optimiziraj s prefetch_related
-                declarations = []
-                declaration_objs = Declaration.objects.select_related('player').filter(
-                    round=current_round
-                ).order_by('-created_at')
-                
-                for declaration in declaration_objs:
-                    declaration_data = {
-                        'id': str(declaration.id),
-                        'player_id': str(declaration.player_id),
-                        'player_username': declaration.player.username,
-                        'type': declaration.declaration_type,
-                        'value': declaration.value,
-                        'cards': declaration.cards_json,
-                        'created_at': declaration.created_at.isoformat() if declaration.created_at else None
-                    }
-                    declarations.append(declaration_data)
-                
-                game_state['declarations'] = declarations
-                
-                # Povijest poteza u rundi - optimiziraj s select_related
-                moves_history = []
-                move_objs = Move.objects.select_related('player').filter(
-                    round=current_round
-                ).order_by('trick_number', 'order')
-                
-                for move in move_objs:
-                    move_data = {
-                        'player_id': str(move.player_id),
-                        'player_username': move.player.username,
-                        'card': move.card_code,
-                        'trick_number': move.trick_number,
-                        'order': move.order,
-                        'is_winning': move.is_winning_card,
-                        'created_at': move.created_at.isoformat() if hasattr(move, 'created_at') and move.created_at else None
-                    }
-                    moves_history.append(move_data)
-                
-                game_state['history'] = moves_history
-                
-                # Grupa štihova po broju za lakšu obradu na frontendu
-                tricks = {}
-                for move in moves_history:
-                    trick_num = move['trick_number']
-                    if trick_num not in tricks:
-                        tricks[trick_num] = []
-                    tricks[trick_num].append(move)
-                
-                game_state['tricks'] = tricks
-                
-            else:
-                game_state['round'] = None
-                game_state['your_turn'] = False
-                game_state['your_cards'] = []
-                game_state['current_trick'] = []
-                game_state['declarations'] = []
-                game_state['history'] = []
-                game_state['tricks'] = {}
+            game_state = self._project_state(self._get_public_state(context), context, user_id)
             
             # Logiraj uspješno dohvaćanje stanja
             logger.debug(f"Stanje igre {game.id} uspješno dohvaćeno za korisnika {user_id}")
@@ -2210,6 +2204,289 @@ class GameService:
             logger.error(f"Greška pri dohvaćanju stanja igre: {str(e)}", exc_info=True)
             return {'error': f"Greška pri dohvaćanju stanja igre: {str(e)}"}
     
+    @track_execution_time
+    def get_spectator_state(self):
+        """
+        Dohvaća javno stanje igre za gledatelje, bez karata igrača.
+        
+        Returns:
+            dict: Javni dio stanja igre (_get_public_state), ili poruka o
+                grešci ako igra ne postoji ili je privatna
+        """
+        try:
+            context = self.get_context()
+            if not context:
+                logger.warning(f"Igra {self.game_id} nije pronađena pri dohvaćanju stanja za gledatelje")
+                return {'error': 'Igra nije pronađena'}
+            
+            if context.game.is_private:
+                logger.info(f"Pokušaj gledanja privatne igre {context.game.id}")
+                return {'error': 'Privatnu igru nije moguće gledati'}
+            
+            return self._get_public_state(context)
+            
+        except Exception as e:
+            logger.error(f"Greška pri dohvaćanju stanja igre za gledatelje: {str(e)}", exc_info=True)
+            return {'error': f"Greška pri dohvaćanju stanja igre: {str(e)}"}
+    
+    def _get_public_state(self, context):
+        """
+        Vraća javni dio stanja igre iz keša ili ga gradi i sprema.
+        
+        Ključ keša sadrži verziju igre i generaciju stanja (vidi
+        game_state_cache_key), pa ga svaka izmjena igre čini nevažećim bez
+        brisanja ključeva. Stanje završenih igara se ne kešira.
+        
+        Potezi igre koju ovaj proces drži u memoriji (game_actors) u bazu
+        stižu sa zakašnjenjem, pa se igrač na potezu i trenutni štih tada
+        uzimaju iz memorije (_overlay_actor_state).
+        
+        Args:
+            context: Kontekst igre (GameContext)
+            
+        Returns:
+            dict: Javni dio stanja igre
+        """
+        game = context.game
+        if game.status in ['finished', 'abandoned']:
+            return self._build_public_state(context)
+        
+        cache_key = game_state_cache_key(game)
+        public_state = cache.get(cache_key)
+        if public_state is None:
+            public_state = self._build_public_state(context)
+            cache.set(cache_key, public_state, GAME_STATE_CACHE_TIMEOUT)
+        return self._overlay_actor_state(public_state, self._live_actor(context))
+    
+    def _live_actor(self, context):
+        """
+        Vraća stanje trenutne runde iz memorije ovog procesa.
+        
+        Args:
+            context: Kontekst igre (GameContext)
+            
+        Returns:
+            GameActor: Stanje runde ili None ako ga ovaj proces ne drži
+        """
+        current_round = context.current_round
+        if current_round is None:
+            return None
+        actor = game_actors.peek(context.game.id)
+        if actor is None or str(actor.round_id) != str(current_round.id):
+            return None
+        return actor
+    
+    def _overlay_actor_state(self, public_state, actor):
+        """
+        Postavlja igrača na potezu i trenutni štih iz stanja u memoriji.
+        
+        Keširano stanje se ne mijenja, već se kopiraju samo promijenjeni
+        dijelovi.
+        
+        Args:
+            public_state: Javni dio stanja (_build_public_state)
+            actor: Stanje runde u memoriji (GameActor) ili None
+            
+        Returns:
+            dict: Javni dio stanja igre
+        """
+        if actor is None or not public_state.get('round'):
+            return public_state
+        live_state = actor.get_state()
+        public_state = dict(public_state)
+        public_state['round'] = dict(public_state['round'], current_player=live_state['current_player'])
+        public_state['current_trick'] = live_state['trick_cards']
+        return public_state
+    
+    def _build_public_state(self, context):
+        """
+        Gradi dio stanja igre koji je jednak za sve igrače.
+        
+        Args:
+            context: Kontekst igre (GameContext)
+            
+        Returns:
+            dict: Podaci o igri, igračima, timovima, rundi, štihu, zvanjima i povijesti
+        """
+        game = context.game
+        
+        # Osnovni podaci o igri
+        game_state = {
+            'game_id': str(game.id),
+            'room_code': game.room_code,
+            'is_private': game.is_private,
+            'status': game.status,
+            'creator_id': str(game.creator_id) if game.creator_id else None,
+            'scores': {
+                'team_a': game.team_a_score,
+                'team_b': game.team_b_score
+            },
+            'points_to_win': game.points_to_win,
+            'created_at': game.created_at.isoformat() if game.created_at else None,
+            'started_at': game.started_at.isoformat() if game.started_at else None,
+            'ended_at': game.ended_at.isoformat() if game.ended_at else None,
+            'updated_at': game.updated_at.isoformat() if hasattr(game, 'updated_at') and game.updated_at else None
+        }
+        
+        # Podaci o igračima po pozicijama za stolom
+        ready_players = set(player.id for player in game.ready_players.all()) if hasattr(game, 'ready_players') else set()
+        
+        players_data = []
+        for player in context.players:
+            player_data = {
+                'id': str(player.id),
+                'username': player.username,
+                'is_active': context.is_active(player.id),
+                'is_ready': player.id in ready_players
+            }
+            players_data.append(player_data)
+        
+        game_state['players'] = players_data
+        
+        # Podaci o timovima
+        teams = {}
+        for player in context.players:
+            team = context.team_of(player.id)
+            if team:
+                teams[str(player.id)] = team
+        
+        game_state['teams'] = teams
+        
+        # Trenutna runda
+        current_round = context.current_round
+        if current_round:
+            round_data = {
+                'id': str(current_round.id),
+                'number': current_round.round_number,
+                'status': current_round.status,
+                'trump_suit': current_round.trump_suit,
+                'calling_team': current_round.calling_team,
+                'current_player': str(current_round.current_player_id) if current_round.current_player else None,
+                'created_at': current_round.created_at.isoformat() if current_round.created_at else None,
+                'completed_at': current_round.completed_at.isoformat() if current_round.completed_at else None
+            }
+            
+            # Prijevodi boja za lakše čitanje
+            if current_round.trump_suit:
+                suit_translations = {
+                    'S': 'pik',
+                    'H': 'srce',
+                    'D': 'karo', 
+                    'C': 'tref'
+                }
+                round_data['trump_suit_name'] = suit_translations.get(current_round.trump_suit, current_round.trump_suit)
+            
+            game_state['round'] = round_data
+            
+            # Trenutni štih
+            game_state['current_trick'] = context.current_trick()
+            
+            # Zvanja u rundi - optimiziraj s prefetch_related
+            declarations = []
+            declaration_objs = Declaration.objects.select_related('player').filter(
+                round=current_round
+            ).order_by('-created_at')
+            
+            for declaration in declaration_objs:
+                declaration_data = {
+                    'id': str(declaration.id),
+                    'player_id': str(declaration.player_id),
+                    'player_username': declaration.player.username,
+                    'type': declaration.declaration_type,
+                    'value': declaration.value,
+                    'cards': declaration.cards_json,
+                    'created_at': declaration.created_at.isoformat() if declaration.created_at else None
+                }
+                declarations.append(declaration_data)
+            
+            game_state['declarations'] = declarations
+            
+            # Povijest poteza u rundi - optimiziraj s select_related
+            moves_history = []
+            move_objs = Move.objects.select_related('player').filter(
+                round=current_round
+            ).order_by('trick_number', 'order')
+            
+            for move in move_objs:
+                move_data = {
+                    'player_id': str(move.player_id),
+                    'player_username': move.player.username,
+                    'card': move.card_code,
+                    'trick_number': move.trick_number,
+                    'order': move.order,
+                    'is_winning': move.is_winning_card,
+                    'created_at': move.created_at.isoformat() if hasattr(move, 'created_at') and move.created_at else None
+                }
+                moves_history.append(move_data)
+            
+            game_state['history'] = moves_history
+            
+            # Grupa štihova po broju za lakšu obradu na frontendu
+            tricks = {}
+            for move in moves_history:
+                trick_num = move['trick_number']
+                if trick_num not in tricks:
+                    tricks[trick_num] = []
+                tricks[trick_num].append(move)
+            
+            game_state['tricks'] = tricks
+            
+        else:
+            game_state['round'] = None
+            game_state['current_trick'] = []
+            game_state['declarations'] = []
+            game_state['history'] = []
+            game_state['tricks'] = {}
+        
+        return game_state
+    
+    def _project_state(self, public_state, context, user_id):
+        """
+        Dodaje podatke igrača na javni dio stanja igre.
+        
+        Javno stanje se ne mijenja (dijeli se kroz keš), već se kopiraju
+        samo dijelovi koji se razlikuju po igraču.
+        
+        Args:
+            public_state: Javni dio stanja (_build_public_state)
+            context: Kontekst igre (GameContext)
+            user_id: ID igrača za kojeg se gradi stanje
+            
+        Returns:
+            dict: Stanje igre prilagođeno za igrača
+        """
+        game_state = dict(public_state)
+        game_state['players'] = [
+            dict(player, is_you=context.is_user(player['id'])) for player in public_state['players']
+        ]
+        game_state['your_team'] = public_state['teams'].get(str(user_id))
+        
+        round_data = public_state['round']
+        if not round_data:
+            game_state['your_turn'] = False
+            game_state['your_cards'] = []
+            game_state['playable_cards'] = []
+            return game_state
+        
+        game_state['your_turn'] = round_data['current_player'] == str(user_id)
+        
+        # Karte igrača iz memorije procesa vlasnika ili iz ruku spremljenih uz rundu
+        actor = self._live_actor(context)
+        user_cards = actor.hand(user_id) if actor is not None else context.hand(user_id)
+        game_state['your_cards'] = list(user_cards)
+        
+        # Dozvoljene karte - jedan prolaz kroz generator poteza umjesto validacije svake karte
+        if game_state['your_turn'] and round_data['status'] == 'in_progress':
+            from game.services.card_service import CardService
+            playable_cards = CardService.get_playable_cards(
+                user_cards, public_state['current_trick'], round_data['trump_suit']
+            )
+            game_state['playable_cards'] = list(playable_cards)
+        else:
+            game_state['playable_cards'] = []
+        
+        return game_state
+    
     # Pomoćne metode
     
     def _get_next_dealer(self, current_dealer, game):
@@ -2229,15 +2506,13 @@ class GameService:
         Raises:
             ValueError: Ako trenutni djelitelj nije član igre
         """
+        players = []
         try:
-            players = list(game.players.all())
-            if current_dealer not in players:
+            next_dealer = game.get_player_after(current_dealer)
+            if next_dealer is None:
+                players = list(game.players.all())
                 logger.error(f"Pokušaj određivanja sljedećeg djelitelja za igrača {current_dealer.id} koji nije član igre {game.id}")
                 raise ValueError(f"Djelitelj {current_dealer.id} nije član igre {game.id}")
-                
-            current_index = players.index(current_dealer)
-            next_index = (current_index + 1) % 4
-            next_dealer = players[next_index]
             
             logger.debug(f"Sljedeći djelitelj nakon {current_dealer.id} je {next_dealer.id} u igri {game.id}")
             return next_dealer
@@ -2270,61 +2545,69 @@ class GameService:
         try:
             game = round_obj.game
             
-            # Dohvati poteze i zvanja s optimizacijom
-            moves = Move.objects.select_related('player').filter(round=round_obj)
+            # Dohvati zvanja s optimizacijom
             declarations = Declaration.objects.select_related('player').filter(round=round_obj)
             
             if not round_obj.trump_suit:
                 logger.warning(f"Pokušaj izračuna rezultata runde {round_obj.id} bez određenog aduta")
             
-            # Grupiraj poteze po štihu za učinkovitiji izračun
-            tricks = {}
-            for move in moves:
-                trick_num = move.trick_number
-                if trick_num not in tricks:
-                    tricks[trick_num] = []
-                tricks[trick_num].append(move)
-            
-            # Izračunaj bodove za štihove
-            team_a_trick_points = 0
-            team_b_trick_points = 0
-            
             team_a_players = set(p.id for p in game.team_a_players.all())
             team_b_players = set(p.id for p in game.team_b_players.all())
             
-            winning_tricks_team_a = 0
-            winning_tricks_team_b = 0
+            # Bodovi za štihove zbrojeni tijekom igre (Round.record_trick)
+            score = round_obj.get_round_score()
+            if score.is_complete:
+                team_a_trick_points, team_b_trick_points = score.trick_totals()
+                winning_tricks_team_a = score.tricks_won['a']
+                winning_tricks_team_b = score.tricks_won['b']
+            else:
+                # Runda bez zbrojenih štihova: izračun iz poteza
+                moves = Move.objects.select_related('player').filter(round=round_obj)
+                
+                # Grupiraj poteze po štihu za učinkovitiji izračun
+                tricks = {}
+                for move in moves:
+                    trick_num = move.trick_number
+                    if trick_num not in tricks:
+                        tricks[trick_num] = []
+                    tricks[trick_num].append(move)
             
-            for trick_num, trick_moves in tricks.items():
-                # Odredi pobjednika štiha
-                winning_move = next((move for move in trick_moves if move.is_winning_card), None)
+                team_a_trick_points = 0
+                team_b_trick_points = 0
                 
-                if winning_move:
-                    winning_player = winning_move.player
-                    winning_player_id = winning_player.id
+                winning_tricks_team_a = 0
+                winning_tricks_team_b = 0
+            
+                for trick_num, trick_moves in tricks.items():
+                    # Odredi pobjednika štiha
+                    winning_move = next((move for move in trick_moves if move.is_winning_card), None)
+                
+                    if winning_move:
+                        winning_player = winning_move.player
+                        winning_player_id = winning_player.id
                     
-                    # Odredi pobjednički tim
-                    if winning_player_id in team_a_players:
-                        winning_team = 'a'
-                        winning_tricks_team_a += 1
-                    else:
-                        winning_team = 'b'
-                        winning_tricks_team_b += 1
+                        # Odredi pobjednički tim
+                        if winning_player_id in team_a_players:
+                            winning_team = 'a'
+                            winning_tricks_team_a += 1
+                        else:
+                            winning_team = 'b'
+                            winning_tricks_team_b += 1
                     
-                    # Izračunaj bodove za štih
-                    trick_points = sum(self._get_card_value(move.card_code, round_obj.trump_suit) for move in trick_moves)
+                        # Izračunaj bodove za štih
+                        trick_points = sum(self._get_card_value(move.card_code, round_obj.trump_suit) for move in trick_moves)
                     
-                    # Dodatni bodovi za zadnji štih
-                    if trick_num == 8:
-                        trick_points += 10
+                        # Dodatni bodovi za zadnji štih
+                        if trick_num == 8:
+                            trick_points += 10
                     
-                    # Dodaj bodove pobjedničkom timu
-                    if winning_team == 'a':
-                        team_a_trick_points += trick_points
-                    else:
-                        team_b_trick_points += trick_points
+                        # Dodaj bodove pobjedničkom timu
+                        if winning_team == 'a':
+                            team_a_trick_points += trick_points
+                        else:
+                            team_b_trick_points += trick_points
                     
-                    logger.debug(f"Štih {trick_num}: pobjednik tim {winning_team}, bodovi: {trick_points}")
+                        logger.debug(f"Štih {trick_num}: pobjednik tim {winning_team}, bodovi: {trick_points}")
             
             # Izračunaj bodove za zvanja
             team_a_declarations = [d for d in declarations if d.player_id in team_a_players]
@@ -2571,6 +2854,13 @@ class GameService:
                     'message': f'Runda nije završena, preostalo je još {remaining_cards} karata'
                 }
             
+            # Runda (a možda i igra) završava; stanje u memoriji se sprema i izbacuje
+            try:
+                game_actors.evict(game.id)
+            except MovesNotSaved as e:
+                logger.error(f"Runda {current_round.id} se ne završava: {str(e)}")
+                return {'success': False, 'message': 'Potezi runde se još spremaju, pokušaj ponovno'}
+            
             # Započni transakciju za očuvanje konzistentnosti podataka
             with transaction.atomic():
                 # Izračunaj rezultat runde
@@ -0,0 +1,252 @@
+"""
+Modul s dnevnikom poteza (write-ahead log) za odgođeno spremanje u bazu.
+
+Potez odigran u memoriji (GameActor) odmah se dopisuje kao jedan JSON
+redak u datoteku dnevnika ovog procesa, a pozadinska dretva poteze
+skupno sprema u bazu (MoveRepository.save_played_moves: potezi, oznake
+pobjedničkih poteza, stanje štiha i zapisi povijesti igre) nakon
+završenog štiha ili najkasnije nakon flush_interval sekundi. Igrač tako
+ne čeka na potvrdu transakcije, a umjesto desetak upita po potezu štih
+se sprema jednim skupnim upisom.
+
+Nakon uspješnog spremanja svih poteza datoteka se prazni. Ako proces
+padne prije spremanja, njegova datoteka ostaje na disku. Proces pri
+pokretanju, prije prvog zapisa, preuzima sve datoteke bez vlasnika
+(zaključavanjem, fcntl.flock) i ponovno sprema njihove poteze, uključujući
+datoteku s vlastitim imenom: ponovno pokrenut kontejner obično ima isto
+ime računala, a često i isti PID. Spremanje preskače poteze koji su već
+u bazi, pa je ponavljanje sigurno.
+
+Primjer:
+    journal = MoveJournal('/var/lib/belot/journal')
+    journal.open()  # pri pokretanju procesa
+    journal.append({'game_id': 1, 'round_id': 7, 'player_id': 11, 'card': 'AS', ...})
+"""
+
+import fcntl
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+
+logger = logging.getLogger('game.services')
+
+# Uzorak imena datoteka dnevnika u direktoriju
+JOURNAL_FILE_PATTERN = 'moves-*.wal'
+
+
+class MoveJournal:
+    """
+    Dnevnik poteza jednog procesa s pozadinskim skupnim spremanjem.
+
+    Attributes:
+        directory (str): Direktorij s datotekama dnevnika
+        path (str): Datoteka dnevnika ovog procesa
+        flush_interval (float): Najdulje čekanje prije spremanja (sekunde)
+        fsync (bool): Poziva li se os.fsync nakon svakog zapisa
+    """
+
+    def __init__(self, directory, flush_interval=0.05, fsync=False, save=None, name=None):
+        """
+        Inicijalizira dnevnik (datoteka se otvara pri prvom zapisu ili pozivu open).
+
+        Args:
+            directory (str): Direktorij s datotekama dnevnika
+            flush_interval (float): Najdulje čekanje prije spremanja
+            fsync (bool): Poziva li se os.fsync nakon svakog zapisa
+            save (callable, optional): Funkcija koja sprema listu unosa;
+                zadano MoveRepository.save_played_moves
+            name (str, optional): Ime datoteke; zadano prema računalu i procesu
+        """
+        self.directory = str(directory)
+        self.path = os.path.join(
+            self.directory, name or f"moves-{socket.gethostname()}-{os.getpid()}.wal"
+        )
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._save = save
+        self._file = None
+        self._seq = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def open(self):
+        """
+        Sprema poteze iz dnevnika palih procesa i otvara datoteku dnevnika.
+
+        Poziva se pri pokretanju procesa, prije učitavanja ijedne igre iz
+        baze, kako bi stanje uključivalo i poteze koje je pali proces
+        odigrao, ali nije spremio. Datoteka s imenom ovog procesa obnavlja
+        se prije nego što se otvori za nove zapise, pa je sljedeći zapis
+        ne može isprazniti. Ponovni pozivi nemaju učinka.
+
+        Returns:
+            int: Broj ponovno spremljenih poteza
+        """
+        with self._lock:
+            if self._file is not None:
+                return 0
+            os.makedirs(self.directory, exist_ok=True)
+            recovered = self.recover()
+            self._file = open(self.path, 'a', encoding='utf-8')
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return recovered
+
+    def close(self):
+        """Sprema poteze na čekanju i zatvara datoteku dnevnika."""
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                if not self._pending:
+                    os.remove(self.path)
+                self._file.close()
+                self._file = None
+
+    def append(self, entry):
+        """
+        Dopisuje potez u dnevnik i prepušta ga pozadinskom spremanju.
+
+        Args:
+            entry (dict): Unos poteza (vidi MoveRepository.save_played_moves)
+
+        Returns:
+            int: Redni broj zapisa u dnevniku
+        """
+        if self._file is None:
+            self.open()
+        with self._lock:
+            self._seq += 1
+            record = dict(entry, seq=self._seq)
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._pending.append(record)
+
+        # Završen štih sprema se odmah, ostali potezi nakon intervala
+        if entry.get('winning_order') is not None:
+            self._wake.set()
+        self._ensure_thread()
+        return record['seq']
+
+    def pending_count(self, game_id=None):
+        """
+        Vraća broj poteza koji još nisu spremljeni u bazu.
+
+        Args:
+            game_id (optional): Broji samo poteze ove igre
+
+        Returns:
+            int: Broj poteza na čekanju
+        """
+        with self._lock:
+            if game_id is None:
+                return len(self._pending)
+            return sum(1 for record in self._pending if str(record.get('game_id')) == str(game_id))
+
+    def flush(self):
+        """
+        Odmah sprema sve poteze na čekanju.
+
+        Ako spremanje ne uspije, potezi ostaju na čekanju i u dnevniku.
+
+        Returns:
+            int: Broj spremljenih poteza
+        """
+        with self._save_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                saved = self._save_entries(batch)
+            except Exception as e:
+                logger.error(f"Greška pri spremanju {len(batch)} poteza iz dnevnika: {str(e)}", exc_info=True)
+                with self._lock:
+                    self._pending[:0] = batch
+                return 0
+
+            # Kad su svi potezi spremljeni, dnevnik se prazni
+            with self._lock:
+                if not self._pending and self._file is not None:
+                    self._file.seek(0)
+                    self._file.truncate()
+            return saved
+
+    def recover(self):
+        """
+        Sprema poteze iz dnevnika procesa koji su pali prije spremanja.
+
+        Datoteka se preuzima samo ako je nitko ne drži zaključanu (ni ovaj
+        proces kroz otvoreni dnevnik), a nakon uspješnog spremanja briše
+        se. Nepotpun zadnji redak (pad tijekom zapisa) se preskače.
+
+        Returns:
+            int: Broj ponovno spremljenih poteza
+        """
+        recovered = 0
+        for path in sorted(glob.glob(os.path.join(self.directory, JOURNAL_FILE_PATTERN))):
+            try:
+                with open(path, 'r+', encoding='utf-8') as handle:
+                    try:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue
+                    entries = self._read_entries(handle, path)
+                    with self._save_lock:
+                        if entries:
+                            self._save_entries(entries)
+                    os.remove(path)
+                recovered += len(entries)
+                logger.info(f"Iz dnevnika {path} ponovno spremljeno {len(entries)} poteza")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Greška pri obnovi poteza iz dnevnika {path}: {str(e)}", exc_info=True)
+        return recovered
+
+    @staticmethod
+    def _read_entries(handle, path):
+        """Čita unose iz datoteke dnevnika redom zapisivanja."""
+        entries = []
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Preskočen neispravan redak {line_number} u dnevniku {path}")
+        entries.sort(key=lambda entry: entry.get('seq', 0))
+        return entries
+
+    def _save_entries(self, entries):
+        """Sprema unose zadanom funkcijom ili preko MoveRepository."""
+        save = self._save
+        if save is None:
+            from game.repositories.move_repository import MoveRepository
+            save = MoveRepository.save_played_moves
+        return save(entries)
+
+    def _ensure_thread(self):
+        """Pokreće pozadinsku dretvu ako ne radi."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='belot-move-journal', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Petlja pozadinske dretve: sprema nakon završenog štiha ili isteka intervala."""
+        from django.db import close_old_connections
+
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self.pending_count():
+                self.flush()
+                close_old_connections()
@@ -259,6 +259,11 @@ class ScoringService:
             if not round_obj:
                 logger.error("Pokušaj izračuna bodova za štihove bez runde")
                 return 0, 0
+            
+            # Bodovi zbrojeni tijekom igre (Round.record_trick), bez ponovnog čitanja poteza
+            score = round_obj.get_round_score()
+            if score.is_complete:
+                return score.trick_totals()
                 
             game = round_obj.game
             team1_points = 0
@@ -953,60 +958,9 @@ class ScoringService:
         Raises:
             ValueError: Ako su parametri nevaljani
         """
-        try:
-            # Provjeri je li potez karta koju igrač ima
-            if move not in player_cards:
-                return False, "Igrač nema tu kartu u ruci"
-                
-            # Ako je prvi potez u štih-u, sve karte su valjane
-            if not trick_moves:
-                return True, ""
-                
-            # Dohvati boju prvog poteza
-            first_card = trick_moves[0]
-            if isinstance(first_card, str):
-                try:
-                    first_card = Card.from_code(first_card)
-                except ValueError as e:
-                    logger.error(f"Nevažeći kod karte: {e}")
-                    return False, f"Nevažeći kod karte: {str(e)}"
-            
-            lead_suit = first_card.suit
-            
-            # Pretvori potez u objekt Card ako je string
-            if isinstance(move, str):
-                try:
-                    move_card = Card.from_code(move)
-                except ValueError as e:
-                    logger.error(f"Nevažeći kod karte: {e}")
-                    return False, f"Nevažeći kod karte: {str(e)}"
-            else:
-                move_card = move
-                
-            # Ako igrač prati boju, potez je valjan
-            if move_card.suit == lead_suit:
-                return True, ""
-                
-            # Ako igrač ne mora pratiti boju, potez je valjan
-            if not must_follow_suit:
-                return True, ""
-                
-            # Provjeri ima li igrač karte u boji prvog poteza
-            has_lead_suit = any(
-                (card.suit == lead_suit if isinstance(card, Card) else Card.from_code(card).suit == lead_suit)
-                for card in player_cards
-            )
-            
-            # Ako igrač ima karte u boji prvog poteza, mora ih igrati
-            if has_lead_suit:
-                return False, "Igrač mora pratiti boju prvog poteza"
-                
-            # Ako igrač nema karte u boji prvog poteza, može igrati bilo koju kartu
-            return True, ""
-            
-        except Exception as e:
-            logger.error(f"Greška pri provjeri valjanosti poteza: {e}", exc_info=True)
-            return False, f"Greška pri provjeri valjanosti poteza: {str(e)}"
+        # Pravila poteza su na jednom mjestu, u CardService i modulu legal_moves
+        from game.services.card_service import CardService
+        return CardService.is_valid_move(move, player_cards, trick_moves, trump_suit, must_follow_suit)
     
     @staticmethod
     @track_execution_time
@@ -1033,6 +987,11 @@ class ScoringService:
                     'winner': None,
                     'error': 'Igra nije pronađena'
                 }
+            
+            # Rezultat se vodi tijekom igre (Game.update_scores), pa se samo čita
+            round_scores = game_obj.get_round_scores()
+            if round_scores is not None:
+                return ScoringService._final_score_from_summaries(game_obj, round_scores)
                 
             # Dohvati sve runde u igri
             rounds = Round.objects.filter(game=game_obj).order_by('number')
@@ -1127,6 +1086,48 @@ class ScoringService:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _final_score_from_summaries(game_obj, round_scores):
+        """
+        Vraća konačni rezultat iz tekućeg rezultata igre i sažetaka rundi.
+        
+        Args:
+            game_obj: Objekt igre (Game)
+            round_scores: Sažeci rundi iz Game.get_round_scores
+            
+        Returns:
+            dict: Rezultat u obliku kao calculate_final_score
+        """
+        team_a_score = game_obj.team_a_score
+        team_b_score = game_obj.team_b_score
+        if team_a_score > team_b_score:
+            winner = 'a'
+        elif team_b_score > team_a_score:
+            winner = 'b'
+        else:
+            winner = 'tie'
+        
+        rounds_data = [
+            {
+                'round_number': summary.get('number'),
+                'calling_team': summary.get('calling_team'),
+                'calling_team_passed': summary.get('winner_team') == summary.get('calling_team'),
+                'winner_team': summary.get('winner_team'),
+                'team_a_game_points': summary.get('team_a_score', 0),
+                'team_b_game_points': summary.get('team_b_score', 0),
+            }
+            for summary in round_scores
+        ]
+        
+        logger.info(f"Konačni rezultat igre {game_obj.id}: Tim A {team_a_score} - Tim B {team_b_score}, pobjednik: {winner}")
+        
+        return {
+            'team_a_score': team_a_score,
+            'team_b_score': team_b_score,
+            'winner': winner,
+            'rounds': rounds_data
+        }
+    
     @staticmethod
     @track_execution_time
     @scoring_cache(timeout=600)  # Dulje keširanje jer se pravila bodovanja ne mijenjaju
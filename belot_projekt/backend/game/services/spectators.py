@@ -0,0 +1,275 @@
+"""
+Modul s prijenosom igre gledateljima.
+
+Gledatelji ne ulaze u grupu igrača ('game_<id>') i ne čitaju bazu po
+vezi. GameConsumer nakon svake akcije šalje javnu promjenu (već
+serijaliziranu, bez ruku igrača) i grupi gledatelja igre. Članovi te
+grupe nisu pojedinačne veze, nego po jedan kanal procesa koji poslužuje
+gledatelje te igre (SpectatorHub). Proces iz primljene promjene
+prosljeđuje isti okvir svim svojim gledateljima, pa se broj poruka
+kroz channel layer ne povećava s brojem gledatelja, a procesi s rutom
+gledatelja mogu se pokretati odvojeno od procesa koji obrađuju poteze.
+
+Proces čita javno stanje igre iz baze jednom, kad se spoji prvi
+gledatelj igre, i ponovno samo nakon propuštene promjene ili kad se
+nakupi previše promjena od zadnje snimke. Novi gledatelj dobiva tu
+snimku i promjene nakon nje.
+
+Primjer:
+    joined = await spectator_hub.join(game_id, consumer)
+    ...
+    await spectator_hub.leave(game_id, consumer)
+"""
+
+import asyncio
+import logging
+from collections import deque
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from game.services import state_sync
+from game.services import wire_protocol
+
+logger = logging.getLogger('game.services')
+
+# Grupa kanala procesa koji poslužuju gledatelje igre
+SPECTATOR_GROUP = 'spectate_{game_id}'
+
+# Najveći broj promjena od zadnje snimke koje se čuvaju za nove gledatelje
+MAX_BACKLOG = 64
+
+
+def spectator_group(game_id):
+    """Vraća ime grupe gledatelja igre."""
+    return SPECTATOR_GROUP.format(game_id=game_id)
+
+
+def spectator_event(event):
+    """
+    Gradi događaj za grupu gledatelja iz promjene igre.
+
+    Args:
+        event (dict): Događaj iz state_sync.delta_event
+
+    Returns:
+        dict: Događaj s javnim okvirima promjene
+    """
+    return {
+        'type': 'spectator.delta',
+        'seq': event['seq'],
+        'frames': event['frames'][state_sync.PUBLIC_FRAME],
+    }
+
+
+def load_spectator_state(game_id):
+    """
+    Učitava javno stanje igre i redni broj zadnje promjene uključene u njega.
+
+    Returns:
+        tuple: (redni broj, stanje iz GameService.get_spectator_state)
+    """
+    from game.services.game_service import GameService
+
+    seq = state_sync.current_sequence(game_id)
+    return seq, GameService(game_id).get_spectator_state()
+
+
+class GameFeed:
+    """
+    Gledatelji jedne igre u ovom procesu.
+
+    Attributes:
+        game_id: Identifikator igre
+        watchers (set): Veze gledatelja (imaju 'protocol', 'send_encoded'
+            i 'closed')
+        snapshot (dict): Serijalizirana snimka po formatu
+        backlog (deque): Okviri promjena nakon snimke
+        stream (DeltaStream): Redni brojevi primljenih promjena
+        channel (str): Kanal procesa u grupi gledatelja
+        stale (bool): Treba li novu snimku prije sljedećeg gledatelja
+        failed (bool): Je li prvo učitavanje igre nije uspjelo
+    """
+
+    def __init__(self, game_id):
+        """Inicijalizira praznu igru bez snimke."""
+        self.game_id = game_id
+        self.watchers = set()
+        self.snapshot = None
+        self.backlog = deque()
+        self.stream = state_sync.DeltaStream()
+        self.channel = None
+        self.task = None
+        self.stale = False
+        self.failed = False
+        self.lock = asyncio.Lock()
+
+
+class SpectatorHub:
+    """
+    Gledatelji svih igara u ovom procesu.
+
+    Attributes:
+        feeds (dict): GameFeed po ID-u igre
+    """
+
+    def __init__(self, channel_layer=None, load_state=None, max_backlog=None):
+        """
+        Inicijalizira prijenos bez gledatelja.
+
+        Args:
+            channel_layer: Channel layer (zadano get_channel_layer())
+            load_state (callable, optional): Sinkrona funkcija (game_id) ->
+                (seq, stanje); zadano load_spectator_state
+            max_backlog (int, optional): Najveći broj promjena nakon snimke
+        """
+        self._channel_layer = channel_layer
+        self.load_state = load_state or load_spectator_state
+        self.max_backlog = max_backlog or settings.BELOT_SPECTATORS.get('MAX_BACKLOG', MAX_BACKLOG)
+        self.feeds = {}
+
+    @property
+    def channel_layer(self):
+        if self._channel_layer is None:
+            self._channel_layer = get_channel_layer()
+        return self._channel_layer
+
+    async def join(self, game_id, watcher):
+        """
+        Dodaje gledatelja i šalje mu snimku i promjene nakon nje.
+
+        Gledatelj čija se veza zatvorila dok je čekao snimku (watcher.closed)
+        se ne dodaje. Ako je zadnji gledatelj otišao dok je ovaj čekao,
+        igra se otvara iznova.
+
+        Args:
+            game_id: Identifikator igre
+            watcher: Veza gledatelja
+
+        Returns:
+            bool: False ako igru nije moguće gledati ili je veza zatvorena
+        """
+        game_id = str(game_id)
+        while True:
+            feed = self.feeds.get(game_id)
+            if feed is None:
+                feed = GameFeed(game_id)
+                self.feeds[game_id] = feed
+
+            async with feed.lock:
+                if self.feeds.get(game_id) is not feed:
+                    if feed.failed:
+                        # Prvo učitavanje igre nije uspjelo
+                        return False
+                    continue
+                if feed.channel is None:
+                    feed.channel = await self.channel_layer.new_channel()
+                    await self.channel_layer.group_add(spectator_group(game_id), feed.channel)
+                    if not await self._refresh(feed):
+                        feed.failed = True
+                        await self._close(feed)
+                        return False
+                    feed.task = asyncio.create_task(self._listen(feed))
+                elif feed.stale and not await self._refresh(feed):
+                    return False
+
+                if watcher.closed:
+                    if not feed.watchers:
+                        await self._close(feed)
+                    return False
+
+                feed.watchers.add(watcher)
+                await watcher.send_encoded(feed.snapshot[watcher.protocol])
+                for frames in feed.backlog:
+                    await watcher.send_encoded(frames[watcher.protocol])
+            return True
+
+    async def leave(self, game_id, watcher):
+        """
+        Uklanja gledatelja; zadnji gledatelj igre odjavljuje proces iz grupe.
+
+        Uklanjanje čeka gledatelje koji se upravo dodaju (feed.lock), pa
+        ne zatvara igru ispod njih.
+
+        Args:
+            game_id: Identifikator igre
+            watcher: Veza gledatelja
+        """
+        feed = self.feeds.get(str(game_id))
+        if feed is None:
+            return
+        async with feed.lock:
+            feed.watchers.discard(watcher)
+            if not feed.watchers and self.feeds.get(feed.game_id) is feed:
+                await self._close(feed)
+
+    async def _close(self, feed):
+        if self.feeds.get(feed.game_id) is feed:
+            del self.feeds[feed.game_id]
+        if feed.task is not None:
+            feed.task.cancel()
+        if feed.channel is not None:
+            await self.channel_layer.group_discard(spectator_group(feed.game_id), feed.channel)
+
+    async def _refresh(self, feed):
+        """Učitava novu snimku igre (jedno čitanje baze za sve gledatelje procesa)."""
+        seq, state = await database_sync_to_async(self.load_state)(feed.game_id)
+        if not state or 'error' in state:
+            logger.info(f"Igru {feed.game_id} nije moguće gledati: {(state or {}).get('error')}")
+            return False
+        message = state_sync.snapshot_message(feed.game_id, seq, state)
+        message['spectator'] = True
+        feed.snapshot = wire_protocol.encode_frames(message)
+        feed.backlog.clear()
+        feed.stream.reset(seq)
+        feed.stale = False
+        return True
+
+    async def _listen(self, feed):
+        """Prima promjene igre iz grupe gledatelja i prosljeđuje ih."""
+        while True:
+            try:
+                message = await self.channel_layer.receive(feed.channel)
+                await self.dispatch(feed, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Greška pri prijenosu igre {feed.game_id} gledateljima: {str(e)}", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def dispatch(self, feed, message):
+        """
+        Prosljeđuje promjenu svim gledateljima igre u procesu.
+
+        Args:
+            feed (GameFeed): Gledatelji igre
+            message (dict): Događaj iz spectator_event
+        """
+        async with feed.lock:
+            action = feed.stream.accept(message['seq'])
+            if action == state_sync.DeltaStream.SKIP:
+                return
+            if action == state_sync.DeltaStream.RESYNC:
+                logger.info(f"Propuštena promjena igre {feed.game_id} za gledatelje, učitava se nova snimka")
+                if not await self._refresh(feed):
+                    return
+                frames_list = [feed.snapshot]
+            else:
+                frames = message['frames']
+                feed.backlog.append(frames)
+                if len(feed.backlog) > self.max_backlog:
+                    feed.backlog.popleft()
+                    feed.stale = True
+                frames_list = [frames]
+
+            for watcher in list(feed.watchers):
+                for frames in frames_list:
+                    try:
+                        await watcher.send_encoded(frames[watcher.protocol])
+                    except Exception as e:
+                        logger.warning(f"Slanje promjene gledatelju igre {feed.game_id} nije uspjelo: {str(e)}")
+
+
+# Gledatelji ovog procesa
+spectator_hub = SpectatorHub()
@@ -0,0 +1,364 @@
+"""
+Modul s protokolom stanja igre: početna snimka i zatim promjene (delte).
+
+GameConsumer je nakon svake akcije slao cijelo stanje igre (igrači,
+timovi, rezultat, runda, karte, štih, zvanja, povijest). Ovdje se stanje
+šalje cijelo samo pri spajanju i na zahtjev klijenta ('resync'), a nakon
+toga se šalju samo kratke promjene (odigrana karta, osvojen štih, novi
+rezultat...) kao lista operacija. Svaka promjena ima redni broj iz
+brojača igre u Django kešu, zajedničkog svim procesima, pa klijent (i
+DeltaStream na strani poslužitelja) prepoznaje propuštenu promjenu i
+traži novu snimku.
+
+Operacije su liste [vrsta, ...] i postavljaju vrijednosti (npr. rezultat,
+igrač na potezu) umjesto da ih povećavaju, pa ponovljena operacija nema
+učinka:
+    ['card', id igrača, karta]
+    ['trick', id pobjednika, bodovi]
+    ['turn', id igrača]
+    ['round', rezultat runde]
+    ['game', konačni rezultat]
+    ['trump', id igrača, boja, tim, broj runde]
+    ['pass', id igrača, mora li sljedeći zvati]
+    ['hand', id igrača, karte]              # šalje se samo tom igraču
+    ['declaration', id igrača, vrsta, karte, vrijednost]
+    ['bela', id igrača, boja, vrijednost]
+
+Sve operacije jedne akcije šalju se jednom porukom grupi, a poruka za
+klijenta serijalizira se jednom na strani pošiljatelja (delta_event):
+zajednička verzija bez privatnih operacija i posebna verzija samo za
+igrače koji imaju privatne operacije, svaka u svim formatima veze (vidi
+wire_protocol). GameConsumer prosljeđuje gotovu poruku (frame_for) bez
+ponovnog kodiranja.
+
+TurnGate iz tih operacija prati tko je na redu, pa GameConsumer odbija
+potez igrača koji nije na redu bez odlaska u bazu.
+
+Primjer:
+    seq = next_sequence(game_id)
+    await channel_layer.group_send(group, delta_event(seq, move_ops(user_id, 'AS', move_data)))
+"""
+
+import itertools
+import logging
+
+from django.core.cache import cache
+
+from game.services import wire_protocol
+
+logger = logging.getLogger('game.services')
+
+# Ključ brojača promjena igre u kešu
+SEQUENCE_KEY = 'belot:state:seq:{game_id}'
+
+# Vrste operacija koje se šalju samo igraču na kojeg se odnose
+PRIVATE_OPS = frozenset({'hand'})
+
+# Ključ zajedničke serijalizirane poruke u delta_event
+PUBLIC_FRAME = '*'
+
+# Rezervni brojač ako keš nije dostupan (redni brojevi tada vrijede samo unutar procesa)
+_local_sequence = itertools.count(1)
+
+
+def _sequence_key(game_id):
+    return SEQUENCE_KEY.format(game_id=game_id)
+
+
+def next_sequence(game_id):
+    """
+    Vraća sljedeći redni broj promjene igre.
+
+    Args:
+        game_id: Identifikator igre
+
+    Returns:
+        int: Redni broj (raste za svaku promjenu igre)
+    """
+    key = _sequence_key(game_id)
+    try:
+        cache.add(key, 0, None)
+        return cache.incr(key)
+    except ValueError:
+        # Ključ je izbačen iz keša između add i incr
+        cache.set(key, 1, None)
+        return 1
+    except Exception as e:
+        logger.warning(f"Brojač promjena igre {game_id} nije dostupan u kešu: {str(e)}")
+        return next(_local_sequence)
+
+
+def current_sequence(game_id):
+    """
+    Vraća redni broj zadnje promjene igre.
+
+    Args:
+        game_id: Identifikator igre
+
+    Returns:
+        int: Redni broj (0 ako igra još nema promjena)
+    """
+    try:
+        return cache.get(_sequence_key(game_id), 0)
+    except Exception as e:
+        logger.warning(f"Brojač promjena igre {game_id} nije dostupan u kešu: {str(e)}")
+        return 0
+
+
+def snapshot_message(game_id, seq, state):
+    """
+    Gradi poruku s cijelim stanjem igre.
+
+    Args:
+        game_id: Identifikator igre
+        seq (int): Redni broj zadnje promjene uključene u snimku
+        state (dict): Stanje iz GameService.get_game_state
+
+    Returns:
+        dict: Poruka za klijenta
+    """
+    return {
+        'type': 'game_state',
+        'seq': seq,
+        'game_id': game_id,
+        'status': state.get('status'),
+        'players': state.get('players', []),
+        'teams': state.get('teams', {}),
+        'scores': state.get('scores', {}),
+        'round': state.get('round', {}),
+        'your_turn': state.get('your_turn', False),
+        'your_cards': state.get('your_cards', []),
+        'current_trick': state.get('current_trick', []),
+        'declarations': state.get('declarations', []),
+        'history': state.get('history', []),
+        'your_team': state.get('your_team')
+    }
+
+
+def delta_event(seq, ops):
+    """
+    Gradi događaj za channel layer s promjenom igre.
+
+    Poruka za klijente serijalizira se ovdje, jednom za sve igrače bez
+    privatnih operacija i jednom za svakog igrača koji ih ima, u svakom
+    formatu iz wire_protocol.encode_frames.
+
+    Args:
+        seq (int): Redni broj promjene
+        ops (list): Operacije promjene
+
+    Returns:
+        dict: Događaj koji obrađuje GameConsumer.game_delta; 'ops' sadrži
+            samo javne operacije, a 'frames' serijalizirane poruke po ID-u
+            igrača (PUBLIC_FRAME za sve ostale) i formatu
+    """
+    public_ops = [op for op in ops if op[0] not in PRIVATE_OPS]
+    frames = {PUBLIC_FRAME: wire_protocol.encode_frames({'type': 'delta', 'seq': seq, 'ops': public_ops})}
+    for viewer in {str(op[1]) for op in ops if op[0] in PRIVATE_OPS}:
+        frames[viewer] = wire_protocol.encode_frames({'type': 'delta', 'seq': seq, 'ops': ops_for_viewer(ops, viewer)})
+    return {'type': 'game_delta', 'seq': seq, 'ops': public_ops, 'frames': frames}
+
+
+def frame_for(event, user_id, protocol=wire_protocol.JSON):
+    """
+    Vraća serijaliziranu poruku promjene za primatelja.
+
+    Args:
+        event (dict): Događaj iz delta_event
+        user_id: Identifikator primatelja
+        protocol (str): Format veze primatelja (wire_protocol.JSON ili MSGPACK)
+
+    Returns:
+        str ili bytes: Serijalizirana poruka
+    """
+    frames = event['frames']
+    return frames.get(str(user_id), frames[PUBLIC_FRAME])[protocol]
+
+
+def ops_for_viewer(ops, user_id):
+    """
+    Uklanja privatne operacije koje se ne odnose na primatelja.
+
+    Args:
+        ops (list): Operacije promjene
+        user_id: Identifikator primatelja
+
+    Returns:
+        list: Operacije koje primatelj smije vidjeti
+    """
+    user_id = str(user_id)
+    return [op for op in ops if op[0] not in PRIVATE_OPS or str(op[1]) == user_id]
+
+
+def _player_id(value):
+    """Vraća ID igrača kao string iz ID-a ili rječnika s ključem 'id'."""
+    if isinstance(value, dict):
+        value = value.get('id')
+    return None if value is None else str(value)
+
+
+def move_ops(user_id, card, move_data):
+    """
+    Vraća operacije za odigranu kartu, uključujući ruke igrača nove runde (privatno).
+
+    Odgođeni završetak runde ('round_deferred', vidi
+    GameActorRegistry.play_card) nema operaciju odigrane karte.
+
+    Args:
+        user_id: Igrač koji je odigrao kartu
+        card (str): Kod karte
+        move_data (dict): Rezultat GameService.process_move
+
+    Returns:
+        list: Operacije promjene
+    """
+    ops = [] if move_data.get('round_deferred') else [['card', str(user_id), card]]
+    if move_data.get('trick_completed'):
+        ops.append(['trick', _player_id(move_data.get('trick_winner')), move_data.get('trick_points')])
+    next_player = _player_id(move_data.get('next_player'))
+    if next_player is not None:
+        ops.append(['turn', next_player])
+    if move_data.get('round_completed'):
+        ops.append(['round', move_data.get('round_result', {})])
+    if move_data.get('game_completed'):
+        ops.append(['game', move_data.get('final_score', {})])
+    for player_id, cards in ((move_data.get('new_round') or {}).get('player_cards') or {}).items():
+        ops.append(['hand', str(player_id), cards])
+    return ops
+
+
+def trump_ops(user_id, suit, trump_data):
+    """
+    Vraća operacije za zvanje aduta, uključujući ruke igrača (privatno).
+
+    Args:
+        user_id: Igrač koji je zvao aduta
+        suit (str): Adutska boja
+        trump_data (dict): Rezultat GameService.process_trump_call
+
+    Returns:
+        list: Operacije promjene
+    """
+    ops = [['trump', str(user_id), suit, trump_data.get('calling_team'), trump_data.get('round_number')]]
+    next_player = _player_id(trump_data.get('next_player'))
+    if next_player is not None:
+        ops.append(['turn', next_player])
+    for player_id, cards in (trump_data.get('player_cards') or {}).items():
+        ops.append(['hand', str(player_id), cards])
+    return ops
+
+
+def pass_ops(user_id, pass_data):
+    """
+    Vraća operacije za "dalje" u zvanju aduta.
+
+    Args:
+        user_id: Igrač koji je rekao "dalje"
+        pass_data (dict): Rezultat GameService.process_trump_pass
+
+    Returns:
+        list: Operacije promjene
+    """
+    ops = [['pass', str(user_id), bool(pass_data.get('must_call'))]]
+    next_player = _player_id(pass_data.get('next_player'))
+    if next_player is not None:
+        ops.append(['turn', next_player])
+    return ops
+
+
+class TurnGate:
+    """
+    Igrač na redu prema snimci i promjenama poslanim jednoj vezi.
+
+    Klijent igra tek kad primi promjenu s igračem na redu, a ta promjena
+    prolazi kroz istu vezu, pa podatak u vezi nije stariji od onoga što
+    klijent zna. Kad igrač na redu nije poznat (npr. na početku runde),
+    odluku donosi GameService.
+
+    Attributes:
+        player_id (str): ID igrača na redu ili None ako nije poznat
+    """
+
+    def __init__(self):
+        """Inicijalizira praćenje bez poznatog igrača na redu."""
+        self.player_id = None
+
+    def reset(self, state):
+        """
+        Postavlja igrača na redu iz snimke stanja.
+
+        Args:
+            state (dict): Stanje iz GameService.get_game_state
+        """
+        self.player_id = _player_id((state.get('round') or {}).get('current_player'))
+
+    def update(self, ops):
+        """
+        Ažurira igrača na redu iz operacija promjene.
+
+        Args:
+            ops (list): Operacije promjene
+        """
+        for op in ops:
+            if op[0] == 'turn':
+                self.player_id = _player_id(op[1])
+            elif op[0] in ('round', 'game'):
+                self.player_id = None
+
+    def allows(self, user_id):
+        """
+        Provjerava smije li igrač povući potez.
+
+        Args:
+            user_id: Identifikator igrača
+
+        Returns:
+            bool: False samo ako je poznato da je na redu drugi igrač
+        """
+        return self.player_id is None or self.player_id == str(user_id)
+
+
+class DeltaStream:
+    """
+    Praćenje rednih brojeva promjena poslanih jednoj vezi.
+
+    Attributes:
+        last_seq (int): Redni broj zadnje poslane promjene ili snimke
+    """
+
+    SEND = 'send'
+    SKIP = 'skip'
+    RESYNC = 'resync'
+
+    def __init__(self):
+        """Inicijalizira praćenje prije prve snimke."""
+        self.last_seq = None
+
+    def reset(self, seq):
+        """
+        Postavlja redni broj nakon poslane snimke.
+
+        Args:
+            seq (int): Redni broj zadnje promjene uključene u snimku
+        """
+        self.last_seq = seq
+
+    def accept(self, seq):
+        """
+        Određuje što učiniti s pristiglom promjenom.
+
+        Args:
+            seq (int): Redni broj promjene
+
+        Returns:
+            str: SEND (sljedeća promjena), SKIP (već sadržana u snimci)
+                ili RESYNC (propuštena promjena, potrebna nova snimka)
+        """
+        if self.last_seq is None:
+            return self.RESYNC
+        if seq <= self.last_seq:
+            return self.SKIP
+        if seq != self.last_seq + 1:
+            return self.RESYNC
+        self.last_seq = seq
+        return self.SEND
@@ -0,0 +1,159 @@
+"""
+Modul sa zajedničkim rasporedom isteka vremena za WebSocket veze procesa.
+
+Umjesto asyncio zadatka po vezi koji se otkazuje i ponovno stvara pri
+svakoj poruci, svi rokovi (heartbeat, neaktivnost nakon odspajanja)
+upisuju se u jedan TimerWheel po event loopu. Rokovi se grupiraju u
+pretince širine TICK sekundi; jedan zadatak svakih TICK sekundi obrađuje
+istekle pretince i poziva sve istekle povratne funkcije zajedno.
+
+Pomicanje roka (schedule za postojeći ključ) samo mijenja vrijeme u
+rječniku. Ključ ostaje u starom pretincu i pri njegovoj obradi se
+premješta u pretinac novog roka, pa česte aktivnosti ne stvaraju ni
+zadatke ni otkazivanja.
+
+Primjer:
+    timer_wheel.schedule((channel_name, 'ping'), 30, consumer.send_heartbeat)
+    timer_wheel.cancel((channel_name, 'ping'))
+"""
+
+import asyncio
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger('game.services')
+
+# Širina pretinca i razmak obrade (sekunde)
+TICK = 1.0
+
+
+class TimerWheel:
+    """
+    Rokovi po ključu s jednim zadatkom za obradu po event loopu.
+
+    Attributes:
+        tick (float): Širina pretinca u sekundama
+        entries (dict): Po ključu [rok (time.monotonic), povratna funkcija]
+    """
+
+    def __init__(self, tick=TICK, clock=time.monotonic):
+        """
+        Inicijalizira prazan raspored.
+
+        Args:
+            tick (float): Širina pretinca u sekundama
+            clock (callable): Izvor vremena (za testove)
+        """
+        self.tick = tick
+        self.clock = clock
+        self.entries = {}
+        self._buckets = {}
+        self._next_slot = None
+        self._task = None
+        self._loop = None
+
+    def _slot(self, deadline):
+        return int(deadline // self.tick)
+
+    def _bucket(self, key, deadline):
+        slot = self._slot(deadline)
+        if self._next_slot is not None and slot < self._next_slot:
+            slot = self._next_slot
+        self._buckets.setdefault(slot, set()).add(key)
+
+    def schedule(self, key, delay, callback):
+        """
+        Postavlja ili pomiče rok za ključ.
+
+        Args:
+            key: Ključ roka (npr. (channel_name, 'ping'))
+            delay (float): Sekunde do isteka
+            callback (callable): Korutinska funkcija bez argumenata koja se
+                poziva pri isteku
+        """
+        deadline = self.clock() + delay
+        entry = self.entries.get(key)
+        if entry is None or self._slot(deadline) < self._slot(entry[0]):
+            self._bucket(key, deadline)
+        self.entries[key] = [deadline, callback]
+        self._ensure_running()
+
+    def cancel(self, key):
+        """Uklanja rok za ključ (ako postoji)."""
+        self.entries.pop(key, None)
+
+    def expire(self, now=None):
+        """
+        Uklanja i vraća istekle rokove.
+
+        Ključevi čiji je rok u međuvremenu pomaknut premještaju se u
+        pretinac novog roka.
+
+        Args:
+            now (float, optional): Trenutno vrijeme
+
+        Returns:
+            list: Povratne funkcije isteklih rokova
+        """
+        now = self.clock() if now is None else now
+        current = self._slot(now)
+        if self._next_slot is None:
+            self._next_slot = min(self._buckets, default=current)
+
+        expired = []
+        while self._next_slot <= current:
+            keys = self._buckets.pop(self._next_slot, ())
+            self._next_slot += 1
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self.entries[key]
+                    expired.append(entry[1])
+                else:
+                    self._bucket(key, entry[0])
+        return expired
+
+    async def run_expired(self, now=None):
+        """
+        Poziva povratne funkcije isteklih rokova zajedno.
+
+        Args:
+            now (float, optional): Trenutno vrijeme
+
+        Returns:
+            int: Broj isteklih rokova
+        """
+        expired = self.expire(now)
+        if expired:
+            results = await asyncio.gather(*(callback() for callback in expired), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Greška pri isteku roka: {str(result)}", exc_info=result)
+        return len(expired)
+
+    def _ensure_running(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while self.entries:
+            await asyncio.sleep(self.tick)
+            try:
+                await self.run_expired()
+            except Exception as e:
+                logger.error(f"Greška u obradi rokova: {str(e)}", exc_info=True)
+        self._buckets.clear()
+        self._next_slot = None
+
+
+# Zajednički raspored procesa
+timer_wheel = TimerWheel(settings.BELOT_GAME.get('TIMER_TICK', TICK))
@@ -0,0 +1,229 @@
+"""
+Modul s formatima poruka WebSocket veze igre.
+
+Klijent bira format zaglavljem Sec-WebSocket-Protocol. Bez njega (stari
+klijenti) poruke su JSON tekst s punim ključevima. Uz MSGPACK_SUBPROTOCOL
+poruke su binarni MessagePack okviri s kratkim ključevima (KEY_ALIASES),
+brojčanim vrstama operacija (OP_CODES) i kartama kao brojevima 0-31
+(indeks iz card_mask.CARD_CODES). Isto vrijedi i za poruke klijenta.
+
+Ako paket msgpack nije instaliran, binarni format se ne nudi.
+
+Primjer:
+    protocol = negotiate(scope.get('subprotocols', []))
+    frames = encode_frames({'type': 'delta', 'seq': 3, 'ops': ops})
+    payload = frames[protocol]
+"""
+
+import json
+
+from game.game_logic import card_mask
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    HAS_MSGPACK = False
+
+# Formati poruka
+JSON = 'json'
+MSGPACK = 'msgpack'
+
+# Naziv podprotokola za binarni format
+MSGPACK_SUBPROTOCOL = 'belot.msgpack.v1'
+
+# Kratki ključevi binarnog formata
+KEY_ALIASES = {
+    'type': 't',
+    'seq': 's',
+    'ops': 'o',
+    'game_id': 'g',
+    'status': 'st',
+    'players': 'p',
+    'teams': 'tm',
+    'scores': 'sc',
+    'round': 'r',
+    'your_turn': 'yt',
+    'your_team': 'ym',
+    'your_cards': 'yc',
+    'playable_cards': 'pc',
+    'current_trick': 'ct',
+    'declarations': 'd',
+    'history': 'h',
+    'message': 'm',
+    'action': 'a',
+    'card': 'c',
+    'cards': 'cs',
+    'suit': 'su',
+    'player': 'pl',
+    'id': 'i',
+    'username': 'u',
+    'event_type': 'et',
+    'data': 'da',
+}
+KEY_NAMES = {alias: key for key, alias in KEY_ALIASES.items()}
+
+# Ključevi čija je vrijednost karta ili lista karata
+CARD_KEYS = frozenset({'card'})
+CARD_LIST_KEYS = frozenset({'cards', 'your_cards', 'playable_cards'})
+
+# Brojčane vrste operacija (vidi state_sync) i položaj karata u operaciji
+OP_CODES = {
+    'card': 0,
+    'trick': 1,
+    'turn': 2,
+    'round': 3,
+    'game': 4,
+    'trump': 5,
+    'pass': 6,
+    'hand': 7,
+    'declaration': 8,
+    'bela': 9,
+}
+OP_CARD_FIELDS = {'card': (2, False), 'hand': (2, True), 'declaration': (3, True)}
+
+
+def negotiate(subprotocols):
+    """
+    Bira format poruka prema podprotokolima koje nudi klijent.
+
+    Args:
+        subprotocols (list): Podprotokoli iz zaglavlja Sec-WebSocket-Protocol
+
+    Returns:
+        tuple: (format, podprotokol za odgovor ili None)
+    """
+    if HAS_MSGPACK and MSGPACK_SUBPROTOCOL in (subprotocols or ()):
+        return MSGPACK, MSGPACK_SUBPROTOCOL
+    return JSON, None
+
+
+def _card_id(card):
+    """Vraća indeks karte ili kartu nepromijenjenu ako nije kod karte."""
+    return card_mask.CARD_INDEX.get(card, card) if isinstance(card, str) else card
+
+
+def _card_code(card):
+    """Vraća kod karte iz indeksa ili kartu nepromijenjenu."""
+    if isinstance(card, int) and 0 <= card < card_mask.NUM_CARDS:
+        return card_mask.CARD_CODES[card]
+    return card
+
+
+def _compact_op(op):
+    kind = op[0]
+    op = list(op)
+    field = OP_CARD_FIELDS.get(kind)
+    if field is not None and len(op) > field[0]:
+        index, is_list = field
+        op[index] = [_card_id(card) for card in op[index] or []] if is_list else _card_id(op[index])
+    op[0] = OP_CODES.get(kind, kind)
+    return [compact(value) for value in op]
+
+
+def compact(value, key=None):
+    """
+    Pretvara poruku u oblik binarnog formata.
+
+    Args:
+        value: Poruka ili njen dio
+        key (str, optional): Ključ pod kojim je vrijednost u poruci
+
+    Returns:
+        Poruka s kratkim ključevima, brojčanim operacijama i kartama
+    """
+    if key in CARD_KEYS:
+        return _card_id(value)
+    if key in CARD_LIST_KEYS and isinstance(value, list):
+        return [_card_id(card) for card in value]
+    if key == 'ops' and isinstance(value, list):
+        return [_compact_op(op) for op in value]
+    if isinstance(value, dict):
+        return {KEY_ALIASES.get(k, k): compact(v, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [compact(item) for item in value]
+    return value
+
+
+def expand(value, key=None):
+    """
+    Pretvara poruku klijenta iz binarnog formata u puni oblik.
+
+    Args:
+        value: Poruka ili njen dio
+        key (str, optional): Puni ključ pod kojim je vrijednost u poruci
+
+    Returns:
+        Poruka s punim ključevima i kodovima karata
+    """
+    if key in CARD_KEYS:
+        return _card_code(value)
+    if key in CARD_LIST_KEYS and isinstance(value, list):
+        return [_card_code(card) for card in value]
+    if isinstance(value, dict):
+        expanded = {}
+        for k, v in value.items():
+            name = KEY_NAMES.get(k, k)
+            expanded[name] = expand(v, name)
+        return expanded
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    return value
+
+
+def encode(message, protocol=JSON):
+    """
+    Serijalizira poruku za klijenta.
+
+    Args:
+        message (dict): Poruka
+        protocol (str): JSON ili MSGPACK
+
+    Returns:
+        str ili bytes: JSON tekst ili MessagePack okvir
+    """
+    if protocol == MSGPACK:
+        return msgpack.packb(compact(message), use_bin_type=True)
+    return json.dumps(message, separators=(',', ':'))
+
+
+def decode(payload, protocol=JSON):
+    """
+    Čita poruku klijenta.
+
+    Args:
+        payload (str ili bytes): Sadržaj okvira
+        protocol (str): JSON ili MSGPACK
+
+    Returns:
+        dict: Poruka s punim ključevima
+
+    Raises:
+        ValueError: Ako poruka nije valjana
+    """
+    if protocol == MSGPACK:
+        try:
+            message = msgpack.unpackb(payload, raw=False)
+        except Exception as e:
+            raise ValueError(f"Nevažeća MessagePack poruka: {str(e)}") from e
+        if not isinstance(message, dict):
+            raise ValueError("Poruka mora biti rječnik")
+        return expand(message)
+    return json.loads(payload)
+
+
+def encode_frames(message):
+    """
+    Serijalizira poruku u svim dostupnim formatima.
+
+    Args:
+        message (dict): Poruka
+
+    Returns:
+        dict: Serijalizirana poruka po formatu (JSON i, ako je dostupan, MSGPACK)
+    """
+    frames = {JSON: encode(message, JSON)}
+    if HAS_MSGPACK:
+        frames[MSGPACK] = encode(message, MSGPACK)
+    return frames
@@ -5,19 +5,48 @@ Ovaj modul sadrži Django testove koji provjeravaju funkcionalni dio optimizacij
 osiguravajući da optimizacije nisu narušile ispravnost rada sustava.
 """
 
+import asyncio
+import json
+import os
+import shutil
+import tempfile
 import unittest
-from django.test import TestCase
-from unittest.mock import patch
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from unittest.mock import Mock, patch
 
+from game.game_logic import bidding
 from game.game_logic.card import Card
+from game.game_logic import card_mask
+from game.game_logic import dealing
+from game.game_logic import declarations
+from game.game_logic import legal_moves
+from game.game_logic import lookup_tables
+from game.game_logic import round_score
+from game.game_logic import seating
+from game.game_logic import vector_scoring
+from game.game_logic.trick_tracker import TrickTracker
 from game.game_logic.deck import Deck
 from game.game_logic.player import Player
 from game.game_logic.game import Game, Round
+from game.models import Round as RoundModel
 from game.game_logic.rules import Rules
 from game.game_logic.scoring import Scoring
 from game.game_logic.validators.move_validator import MoveValidator
 from game.game_logic.validators.call_validator import CallValidator
 from game.utils.card_utils import normalize_suit, suit_name, get_display_name
+from game.utils.profiling import HotPathProfiler, TimerStats
+from game.services import concurrency
+from game.services import game_actor
+from game.services.game_actor import GameActor, GameActorRegistry, GameOwnedElsewhere
+from game.services.game_context import GameContext
+from game.services import game_service
+from game.services.move_journal import MoveJournal
+from game.services import spectators
+from game.services import state_sync
+from game.services.timer_wheel import TimerWheel
+from game.services import wire_protocol
 
 
 class CardOptimizationTest(TestCase):
@@ -246,7 +275,7 @@ class RulesOptimizationTest(TestCase):
         self.assertEqual(declarations[0]['type'], 'bela')
         
         # Ruka s tercom (sekvenca od 3)
-        sequence_hand = [Card.from_code('7S'), Card.from_code('8S'), Card.from_code('9S'), Card.from_code('JS')]
+        sequence_hand = [Card.from_code('7S'), Card.from_code('8S'), Card.from_code('9S'), Card.from_code('10S')]
         
         declarations = self.rules.check_declarations(sequence_hand, self.trump_suit)
         
@@ -426,4 +455,1447 @@ class CardUtilsOptimizationTest(TestCase):
         self.assertEqual(get_display_name('S'), '♠️ Pik')
         self.assertEqual(get_display_name('H'), '♥️ Herc')
         self.assertEqual(get_display_name('D'), '♦️ Karo')
-        self.assertEqual(get_display_name('C'), '♣️ Tref') 
\ No newline at end of file
+        self.assertEqual(get_display_name('C'), '♣️ Tref') 
+
+
+class CardMaskTest(TestCase):
+    """Testovi za bitmask prikaz karata i ruku."""
+    
+    def test_card_indices(self):
+        """Test jedinstvenosti indeksa i povratne pretvorbe maske u karte."""
+        self.assertEqual(len(card_mask.CARD_CODES), 32)
+        self.assertEqual(card_mask.mask_from_cards(card_mask.CARD_CODES), card_mask.FULL_MASK)
+        
+        cards = [Card.from_code('AS'), Card.from_code('7H'), Card.from_code('10C')]
+        mask = card_mask.mask_from_cards(cards)
+        self.assertEqual(card_mask.count_cards(mask), 3)
+        self.assertEqual(sorted(card_mask.codes_from_mask(mask)), ['10C', '7H', 'AS'])
+        self.assertIs(card_mask.cards_from_mask(card_mask.card_bit('AS'))[0], Card.from_code('AS'))
+        
+        with self.assertRaises(ValueError):
+            card_mask.card_bit('1X')
+    
+    def test_suit_masks(self):
+        """Test provjere boje nad maskom ruke."""
+        mask = card_mask.mask_from_cards(['7S', 'KH'])
+        self.assertTrue(card_mask.has_suit(mask, 'S'))
+        self.assertTrue(card_mask.has_suit(mask, 'hearts'))
+        self.assertFalse(card_mask.has_suit(mask, 'D'))
+        self.assertFalse(card_mask.has_suit(mask, None))
+    
+    def test_higher_cards(self):
+        """Test pronalaska jačih karata iste boje."""
+        mask = card_mask.mask_from_cards(['9H', 'AH', '10S', 'KS'])
+        
+        # Izvan aduta: 10 i kralj su jači od dečka
+        higher = card_mask.higher_cards(mask, 'JS', 'H')
+        self.assertEqual(sorted(card_mask.codes_from_mask(higher)), ['10S', 'KS'])
+        
+        # U adutu: samo devetka je jača od asa
+        higher = card_mask.higher_cards(mask, 'AH', 'H')
+        self.assertEqual(card_mask.codes_from_mask(higher), ['9H'])
+        self.assertEqual(card_mask.higher_cards(mask, 'JH', 'H'), 0)
+        
+        self.assertEqual(card_mask.CARD_CODES[card_mask.highest_card(mask, 'H', 'H')], '9H')
+        self.assertEqual(card_mask.CARD_CODES[card_mask.highest_card(mask, 'H', 'S')], 'AH')
+        self.assertEqual(card_mask.highest_card(mask, 'D', 'H'), -1)
+    
+    def test_player_hand_mask(self):
+        """Test održavanja maske ruke igrača."""
+        player = Player(id=2, username="Mask Player")
+        player.add_card('AS')
+        player.add_card(Card.from_code('7H'))
+        self.assertFalse(player.add_card('AS'))
+        self.assertEqual(player.hand_mask, card_mask.mask_from_cards(['AS', '7H']))
+        
+        player.remove_card('AS')
+        self.assertEqual(player.hand_mask, card_mask.card_bit('7H'))
+        self.assertFalse(player.has_card('AS'))
+        self.assertTrue(player.has_card('7H'))
+        
+        player.clear_hand()
+        self.assertEqual(player.hand_mask, 0)
+
+
+class LegalMovesTest(TestCase):
+    """Testovi za generator dozvoljenih poteza."""
+    
+    def setUp(self):
+        """Priprema ruke za testove."""
+        self.hand = ['AS', 'KS', '7S', '10H', 'JH', '9D', 'QD', '7C']
+    
+    def _legal(self, hand, trick, trump_suit):
+        """Vraća sortirane kodove dozvoljenih karata."""
+        return sorted(card_mask.codes_from_mask(
+            legal_moves.legal_moves_mask(hand, trick, trump_suit)
+        ))
+    
+    def test_follow_suit_and_over(self):
+        """Test praćenja boje i übanja."""
+        # Prazan štih - sve karte su dozvoljene
+        self.assertEqual(self._legal(self.hand, [], 'H'), sorted(self.hand))
+        
+        # Igrač mora igrati pik jači od dečka
+        self.assertEqual(self._legal(self.hand, ['JS'], 'H'), ['AS', 'KS'])
+        self.assertTrue(legal_moves.must_play_higher(self.hand, ['JS'], 'H'))
+        
+        # Nema jačeg pika od desetke - smije bilo koji pik
+        hand = ['KS', '7S', '10H']
+        self.assertEqual(self._legal(hand, ['JS', '10S'], 'H'), ['7S', 'KS'])
+        self.assertFalse(legal_moves.must_play_higher(hand, ['JS', '10S'], 'H'))
+        
+        # Štih je presječen adutom - pik bez obaveze übanja
+        self.assertEqual(self._legal(self.hand, ['JS', '7H'], 'H'), ['7S', 'AS', 'KS'])
+    
+    def test_trump_and_overtrump(self):
+        """Test obaveznog bacanja i nadbijanja aduta."""
+        # Nema karo, ima aduta - mora baciti aduta
+        self.assertEqual(self._legal(['10H', 'JH', '7C'], ['7D'], 'H'), ['10H', 'JH'])
+        
+        # Štih je presječen devetkom - mora nadbiti dečkom
+        self.assertEqual(self._legal(['10H', 'JH', '7C'], ['7D', '9H'], 'H'), ['JH'])
+        
+        # Nema jačeg aduta - smije bilo kojeg aduta
+        self.assertEqual(self._legal(['10H', '7C'], ['7D', '9H'], 'H'), ['10H'])
+        
+        # Adut je tražena boja - mora igrati jačeg aduta
+        self.assertEqual(self._legal(['10H', 'JH', '7C'], ['9H'], 'H'), ['JH'])
+        
+        # Nema ni boju ni aduta - bilo koja karta
+        self.assertEqual(self._legal(['7C', '8C'], ['7D'], 'H'), ['7C', '8C'])
+    
+    def test_illegal_reason(self):
+        """Test razloga nedozvoljenih poteza i stavki štiha iz baze."""
+        trick = [{'player': '1', 'card': '7D'}, {'player': '2', 'card': '9H'}]
+        hand = ['10H', 'JH', '7C']
+        self.assertIsNone(legal_moves.illegal_reason('JH', hand, trick, 'H'))
+        self.assertEqual(legal_moves.illegal_reason('10H', hand, trick, 'H'), legal_moves.REASON_OVERTRUMP)
+        self.assertEqual(legal_moves.illegal_reason('7C', hand, trick, 'H'), legal_moves.REASON_PLAY_TRUMP)
+        self.assertEqual(legal_moves.illegal_reason('AS', hand, trick, 'H'), legal_moves.REASON_NOT_IN_HAND)
+        self.assertEqual(legal_moves.illegal_reason('QD', self.hand, ['JS'], 'H'), legal_moves.REASON_FOLLOW_SUIT)
+        self.assertEqual(legal_moves.illegal_reason('7S', self.hand, ['JS'], 'H'), legal_moves.REASON_PLAY_HIGHER)
+    
+    def test_call_sites_agree(self):
+        """Test da Rules i MoveValidator daju isti rezultat kao generator."""
+        rules = Rules()
+        validator = MoveValidator()
+        hand = [Card.from_code(code) for code in self.hand]
+        trick = [Card.from_code('JS'), Card.from_code('QS')]
+        legal = legal_moves.legal_moves_mask(hand, trick, 'H')
+        
+        for card in hand:
+            expected = bool(legal & card_mask.card_bit(card))
+            self.assertEqual(rules.is_card_playable(card, hand, trick, 'H'), expected)
+            self.assertEqual(validator.validate_move(card, hand, trick, 'H')[0], expected)
+        
+        self.assertEqual(rules.get_playable_cards(hand, trick, 'H'), [Card.from_code('AS'), Card.from_code('KS')])
+
+
+class DeclarationsTest(TestCase):
+    """Testovi za pronalazak zvanja nad maskom ruke."""
+
+    def _types(self, codes, trump_suit=None):
+        """Vraća tipove zvanja i zbroj bodova za ruku zadanu kodovima."""
+        detected = declarations.detect_declarations(codes, trump_suit)
+        return [declaration.type for declaration in detected.declarations], detected.value
+
+    def test_sequences_use_natural_order(self):
+        """Test da nizovi idu prirodnim redom 7-A, a ne redom jačine."""
+        self.assertEqual(self._types(['7S', '8S', '9S', 'JS']), (['sequence_3'], 20))
+        self.assertEqual(self._types(['9H', '10H', 'JH', 'QH', 'KH']), (['sequence_5_plus'], 100))
+        self.assertEqual(self._types([code + 'D' for code in card_mask.VALUES]), (['belot'], 1001))
+        self.assertEqual(self._types(['7S', '8S', '10S', 'QS']), ([], 0))
+
+    def test_no_overlap(self):
+        """Test da karta ne može biti dio dvaju zvanja."""
+        # Četiri dečka (200) vrijede više od niza 9-K pik (100)
+        self.assertEqual(
+            self._types(['JS', 'JH', 'JD', 'JC', '9S', '10S', 'QS', 'KS']), (['four_jacks'], 200)
+        )
+        # Niz 7-10 (50) i četiri dame (100) se ne preklapaju
+        self.assertEqual(
+            self._types(['7S', '8S', '9S', '10S', 'QS', 'QH', 'QD', 'QC']),
+            (['four_queens', 'sequence_4'], 150)
+        )
+        # KH je i u nizu Q-A herc (20) i u četiri kralja (100), pa vrijedi jače
+        self.assertEqual(
+            self._types(['QH', 'KH', 'AH', 'KS', 'KD', 'KC', '7S', '8S']), (['four_kings'], 100)
+        )
+
+    def test_bela(self):
+        """Test pronalaska bele."""
+        detected = declarations.detect_declarations(['KH', 'QH', '7S'], 'hearts')
+        self.assertEqual(detected.bela, card_mask.mask_from_cards(['KH', 'QH']))
+        self.assertEqual(declarations.detect_declarations(['KH', 'QH'], 'S').bela, 0)
+
+    def test_call_sites_agree(self):
+        """Test da Rules i CallValidator koriste isti detektor."""
+        hand = [Card.from_code(code) for code in ['JS', 'JH', 'JD', 'JC', '9S', '10S', 'KH', 'QH']]
+        types = [declaration['type'] for declaration in Rules().check_declarations(hand, 'hearts')]
+        self.assertEqual(types, ['bela', 'four_jacks'])
+
+        validator = CallValidator()
+        self.assertEqual(validator.can_declare(hand, 'four_jacks')[0], True)
+        self.assertEqual(validator.can_declare(hand, 'sequence_4')[0], False)
+        self.assertEqual(
+            [card.code for card in validator.can_declare(hand, 'bela', 'hearts')[1]], ['KH', 'QH']
+        )
+
+
+class LookupTablesTest(TestCase):
+    """Testovi za zajedničke tablice jačine i bodova karata."""
+
+    def test_tables_match_rules_and_scoring(self):
+        """Test da tablice daju iste vrijednosti kao poredak u Rules i bodovi u Scoring."""
+        for code in card_mask.CARD_CODES:
+            card = Card.from_code(code)
+            for trump in card_mask.SUITS + (None,):
+                points = Scoring.TRUMP_POINTS if card.suit == trump else Scoring.NON_TRUMP_POINTS
+                self.assertEqual(lookup_tables.card_points(card, trump), points[card.value])
+                for lead in card_mask.SUITS:
+                    if card.suit == trump:
+                        expected = 100 + Rules.TRUMP_ORDER[card.value]
+                    elif card.suit == lead:
+                        expected = Rules.NON_TRUMP_ORDER[card.value]
+                    else:
+                        expected = -1
+                    self.assertEqual(lookup_tables.trick_strength(card, lead, trump), expected)
+
+    def test_full_suit_names(self):
+        """Test da tablice prihvaćaju puna imena boja i nepoznati adut."""
+        jack = Card.from_code('JH')
+        self.assertEqual(lookup_tables.card_points(jack, 'hearts'), 20)
+        self.assertEqual(lookup_tables.card_points(jack, 'no_trump'), 2)
+        self.assertEqual(lookup_tables.trick_strength(jack, 'spades', 'hearts'), 107)
+
+    def test_instances_are_not_retained(self):
+        """Test da pozivi metoda ne drže instance Rules i Scoring živima."""
+        import gc
+        import weakref
+
+        rules, scoring = Rules(), Scoring()
+        rules.get_card_value_in_trick(Card.from_code('AS'), 'S', 'H')
+        scoring.get_card_point_value(Card.from_code('AS'), 'H')
+        references = [weakref.ref(rules), weakref.ref(scoring)]
+        del rules, scoring
+        gc.collect()
+        self.assertEqual([reference() for reference in references], [None, None])
+
+
+class VectorScoringTest(TestCase):
+    """Testovi za skupno bodovanje rundi."""
+
+    def setUp(self):
+        """Priprema runde u kojoj štihove redom osvajaju timovi a i b."""
+        self.tricks = [list(range(start, start + 4)) for start in range(0, 32, 4)]
+        self.winners = [0, 1] * 4
+        self.scoring = Scoring()
+
+    def _expected_trick_points(self, trump_suit, winners):
+        """Zbraja bodove štihova preko klase Scoring, štih po štih."""
+        points = [0, 0]
+        for number, (trick, team) in enumerate(zip(self.tricks, winners)):
+            cards = [Card.from_code(card_mask.CARD_CODES[index]) for index in trick]
+            points[team] += self.scoring.calculate_trick_points(cards, trump_suit, number == 7)
+        return points
+
+    def test_matches_scoring(self):
+        """Test da skupno bodovanje daje iste bodove kao Scoring."""
+        result = vector_scoring.score_rounds(
+            [self.tricks] * 4, list(card_mask.SUITS), [self.winners] * 4, use_numpy=False
+        )
+        for suit, trick_points in zip(card_mask.SUITS, result['trick_points']):
+            self.assertEqual(trick_points, self._expected_trick_points(suit, self.winners))
+            self.assertEqual(sum(trick_points), 162)
+        self.assertEqual(result['tricks_won'], [[4, 4]] * 4)
+        self.assertEqual(result['sweep_team'], [-1] * 4)
+
+    def test_sweep_declarations_and_failed_contract(self):
+        """Test štiglje, zvanja bez štiha i pada tima koji je zvao."""
+        result = vector_scoring.score_rounds(
+            [self.tricks, self.tricks], ['hearts', 'H'], [[1] * 8, self.winners],
+            calling_teams=[0, 0],
+            declaration_points=[[50, 0], [0, 20]],
+            bela_points=[[20, 0], [0, 0]],
+            use_numpy=False
+        )
+        # Tim a nije osvojio štih: zvanje ne vrijedi, bela vrijedi, a tim pada
+        self.assertEqual(result['sweep_team'][0], 1)
+        self.assertFalse(result['passed'][0])
+        self.assertEqual(result['points'][0], [0, 162 + 90 + 20])
+
+        trick_points = result['trick_points'][1]
+        self.assertEqual(result['passed'][1], trick_points[0] > trick_points[1] + 20)
+
+    def test_invalid_input(self):
+        """Test provjere ulaznih podataka."""
+        with self.assertRaises(ValueError):
+            vector_scoring.score_rounds([self.tricks], ['X'], [self.winners], use_numpy=False)
+        with self.assertRaises(ValueError):
+            vector_scoring.score_rounds([self.tricks[:7]], ['S'], [self.winners], use_numpy=False)
+
+    @unittest.skipUnless(vector_scoring.HAS_NUMPY, "NumPy nije instaliran")
+    def test_numpy_matches_python(self):
+        """Test da NumPy i Python izvedba daju isti rezultat."""
+        args = (
+            [self.tricks] * 3, ['S', 'all_trump', 'no_trump'],
+            [self.winners, [0] * 8, [1] * 7 + [0]],
+        )
+        kwargs = {'calling_teams': [0, 1, 1], 'declaration_points': [[20, 0], [0, 50], [100, 0]]}
+        self.assertEqual(
+            vector_scoring.score_rounds(*args, use_numpy=True, **kwargs),
+            vector_scoring.score_rounds(*args, use_numpy=False, **kwargs)
+        )
+
+    def test_rescore_rounds_from_moves(self):
+        """Test da ponovno bodovanje rundi boduje samo zvanja tima s najjačim zvanjem."""
+        from stats import tasks
+
+        deal = dealing.Deal(2024, player_ids=[11, 12, 13, 14])
+        actor = GameActor(
+            game_id=1, round_id=1, seats=deal.player_ids, teams=['a', 'b', 'a', 'b'],
+            hands=[deal.hand_mask(seat) for seat in range(4)], trump_suit='hearts', dealer_seat=3
+        )
+        moves = []
+        while not actor.is_completed:
+            seat = actor.current_seat
+            card = card_mask.codes_from_mask(
+                legal_moves.legal_mask_for_state(actor.hands[seat], actor.tracker.state(), actor.trump_suit)
+            )[0]
+            moves.append((actor.seats[seat], card))
+            actor.play_card(actor.seats[seat], card)
+
+        # Runda 1: jači niz tima B; runda 2: jednaka zvanja, prednost ima tim B koji je zvao
+        move_rows = [(round_id, player_id, card) for round_id in (1, 2) for player_id, card in moves]
+        declaration_rows = [
+            (1, 11, 'sequence_3', 20), (1, 11, 'bela', 20), (1, 12, 'sequence_4', 50),
+            (2, 11, 'sequence_3', 20), (2, 12, 'sequence_3', 20),
+        ]
+
+        def rows(values):
+            queryset = Mock()
+            queryset.filter.return_value = queryset
+            queryset.order_by.return_value = queryset
+            queryset.values_list.return_value = values
+            return queryset
+
+        with patch.object(tasks.Round, 'objects', rows([(1, 1, 'hearts', 'a'), (2, 1, 'hearts', 'b')])), \
+                patch.object(tasks.Game.team_a_players.through, 'objects', rows([(1, 11), (1, 13)])), \
+                patch.object(tasks.Move, 'objects', rows(move_rows)), \
+                patch.object(tasks.Declaration, 'objects', rows(declaration_rows)):
+            scored = tasks._score_rounds_from_moves([1, 2])
+
+        tricks, winners = [], []
+        for start in range(0, 32, 4):
+            trick = moves[start:start + 4]
+            _, winning = legal_moves.trick_state([card for _, card in trick], 'hearts')
+            indices = [card_mask.card_index(card) for _, card in trick]
+            tricks.append(indices)
+            winners.append(0 if trick[indices.index(winning)][0] in (11, 13) else 1)
+        expected = vector_scoring.score_rounds(
+            [tricks, tricks], ['hearts', 'hearts'], [winners, winners],
+            calling_teams=[0, 1],
+            declaration_points=[[0, 50], [0, 20]],
+            bela_points=[[20, 0], [0, 0]],
+        )
+        self.assertEqual(scored, {1: tuple(expected['points'][0]), 2: tuple(expected['points'][1])})
+
+
+class ProfilingTest(TestCase):
+    """Testovi za uzorkovano mjerenje vremena vrućih metoda."""
+
+    def setUp(self):
+        """Priprema mjerač koji ne zapisuje sažetak sam od sebe."""
+        self.profiler = HotPathProfiler(enabled=True, sample_rate=4, flush_interval=3600)
+
+        @self.profiler.timer
+        def add(a, b):
+            return a + b
+
+        self.add = add
+
+    def test_sampling(self):
+        """Test da se mjeri samo svaki N-ti poziv, a rezultat ostaje isti."""
+        for _ in range(20):
+            self.assertEqual(self.add(2, 3), 5)
+        data = self.profiler.snapshot()[self.add.__qualname__]
+        self.assertEqual(data['calls'], 20)
+        self.assertEqual(data['samples'], 5)
+        self.assertEqual(sum(data['histogram']), 5)
+
+    def test_runtime_toggle(self):
+        """Test isključivanja i promjene stope uzorkovanja tijekom rada."""
+        self.profiler.configure(enabled=False)
+        for _ in range(8):
+            self.add(1, 1)
+        self.assertEqual(self.profiler.snapshot(), {})
+
+        self.profiler.configure(enabled=True, sample_rate=1)
+        for _ in range(3):
+            self.add(1, 1)
+        self.assertEqual(self.profiler.snapshot()[self.add.__qualname__]['samples'], 3)
+
+        with self.assertRaises(ValueError):
+            self.profiler.configure(sample_rate=0)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_published_config_toggle(self):
+        """Test da proces preuzima postavke objavljene u keš i nakon pražnjenja."""
+        from django.core.cache import cache
+        from game.utils import profiling
+        self.addCleanup(cache.delete, profiling.CONFIG_CACHE_KEY)
+        self.profiler.configure(sample_rate=1, config_refresh_interval=0)
+        publisher = HotPathProfiler(flush_interval=3600)
+
+        publisher.publish_config(enabled=False)
+        self.add(1, 1)
+        self.assertFalse(self.profiler.enabled)
+        self.assertEqual(self.profiler.snapshot(), {})
+
+        publisher.publish_config(enabled=True, sample_rate=1)
+        self.add(1, 1)
+        self.assertEqual(self.profiler.snapshot()[self.add.__qualname__]['samples'], 1)
+
+        self.profiler.flush()
+        publisher.publish_config(enabled=False)
+        self.add(1, 1)
+        self.assertFalse(self.profiler.enabled)
+        self.assertEqual(self.profiler.snapshot(), {})
+
+    def test_flush(self):
+        """Test da pražnjenje zapisuje jedan redak po funkciji i briše uzorke."""
+        self.profiler.configure(sample_rate=1)
+        self.add(1, 2)
+        with self.assertLogs('game.profiling', level='INFO') as logs:
+            summary = self.profiler.flush()
+        self.assertEqual(len(logs.output), 1)
+        self.assertEqual(summary[self.add.__qualname__]['samples'], 1)
+        self.assertEqual(self.profiler.snapshot(), {})
+
+    def test_histogram_percentiles(self):
+        """Test procjene percentila iz histograma."""
+        stats = TimerStats('test')
+        for duration in (0.5e-6, 3e-6, 3e-6, 150e-6):
+            stats.record(duration)
+        self.assertEqual(stats.percentile(0.5), 5.0)
+        self.assertEqual(stats.percentile(1.0), 200.0)
+        self.assertEqual(stats.to_dict()['samples'], 4)
+
+
+class TrickTrackerTest(TestCase):
+    """Testovi za praćenje vodeće karte štiha."""
+
+    def test_running_leader(self):
+        """Test da praćenje nakon svake karte odgovara prolazu kroz cijeli štih."""
+        trick = ['QH', 'AH', '7S', 'JS']
+        tracker = TrickTracker('S')
+        for count, code in enumerate(trick, start=1):
+            tracker.add(code, count)
+            self.assertEqual(tracker.state(), legal_moves.trick_state(trick[:count], 'S'))
+            self.assertEqual(tracker.points, sum(lookup_tables.card_points(c, 'S') for c in trick[:count]))
+        self.assertTrue(tracker.is_complete)
+        self.assertEqual((tracker.winning_card, tracker.winning_position, tracker.winning_player), ('JS', 3, 4))
+        with self.assertRaises(ValueError):
+            tracker.add('7H')
+
+    def test_dict_roundtrip(self):
+        """Test spremanja i obnavljanja stanja štiha."""
+        player = Player(id=7, username="Tracker Player")
+        tracker = TrickTracker.from_trick([(player, Card.from_code('10D')), (None, Card.from_code('KD'))], 'hearts', 2)
+        restored = TrickTracker.from_dict(tracker.to_dict(), 'hearts')
+        self.assertEqual(restored.state(), tracker.state())
+        self.assertEqual((restored.number, restored.points, restored.winning_player), (2, 14, 7))
+        self.assertIsNone(TrickTracker.from_dict(None).state())
+
+    def test_round_uses_tracker(self):
+        """Test da runda čita pobjednika i über iz praćenja štiha."""
+        game = Game()
+        players = [Player(id=i, username=f"P{i}") for i in range(1, 5)]
+        for player in players:
+            game.add_player(player)
+        game.assign_teams()
+        game_round = Round(1, players[3], game)
+        game_round.call_trump(players[0], 'spades')
+        hands = (['QH', '7D'], ['8S', '8D'], ['7S', '9S', '9D'], ['KH', '10D'])
+        for player, hand in zip(players, hands):
+            game_round.player_hands[player] = [Card.from_code(code) for code in hand]
+
+        game_round.play_move(players[0], Card.from_code('QH'))
+        game_round.play_move(players[1], Card.from_code('8S'))
+        self.assertEqual(game_round.trick_tracker.winning_player, players[1])
+
+        # Igrač bez tražene boje mora übati aduta koji nosi štih
+        with self.assertRaises(ValueError):
+            game_round.play_move(players[2], Card.from_code('7S'))
+        game_round.play_move(players[2], Card.from_code('9S'))
+        result = game_round.play_move(players[3], Card.from_code('KH'))
+
+        self.assertEqual(result['winner'], str(players[2]))
+        self.assertEqual(result['points'], 3 + 0 + 14 + 4)
+        self.assertEqual(game_round.trick_tracker.size, 0)
+        self.assertEqual(game_round.trick_tracker.number, 1)
+
+
+class DealingTest(TestCase):
+    """Testovi za ponovljivo dijeljenje karata."""
+
+    def test_deal_is_reproducible(self):
+        """Test da isti seed daje isto dijeljenje i da ruke čine cijeli špil."""
+        deal = dealing.Deal(12345, player_ids=[3, 5, 8, 13])
+        self.assertEqual(deal.order, dealing.Deal(12345).order)
+        self.assertNotEqual(deal.order, dealing.Deal(54321).order)
+
+        hands = deal.hands()
+        self.assertEqual(sorted(code for hand in hands for code in hand), sorted(card_mask.CARD_CODES))
+        self.assertEqual(deal.hand_for(8), hands[2])
+        self.assertEqual(deal.hand_mask(2), card_mask.hand_mask(hands[2]))
+        self.assertEqual(deal.hand_for(99), [])
+
+    def test_dict_roundtrip(self):
+        """Test spremanja i obnavljanja dijeljenja."""
+        deal = dealing.Deal.new(player_ids=[1, 2, 3, 4])
+        data = deal.to_dict()
+        self.assertEqual(len(data['order']), 2 * card_mask.NUM_CARDS)
+        restored = dealing.Deal.from_dict(data)
+        self.assertEqual(restored.hands(), deal.hands())
+        self.assertEqual(dealing.Deal.from_dict({'seed': deal.seed}).order, deal.order)
+        with self.assertRaises(ValueError):
+            dealing.Deal(1, order=[0] * card_mask.NUM_CARDS)
+
+    def test_derived_seeds(self):
+        """Test da su izvedeni seedovi stabilni i različiti po rundi."""
+        self.assertEqual(dealing.derive_seed(7, 1), dealing.derive_seed(7, 1))
+        self.assertNotEqual(dealing.derive_seed(7, 1), dealing.derive_seed(7, 2))
+        self.assertLess(dealing.derive_seed(7, 1), 1 << dealing.SEED_BITS)
+
+    def test_game_rounds_are_reproducible(self):
+        """Test da igra sa seedom uvijek dijeli iste ruke."""
+        def first_round_hands(seed):
+            game = Game(seed=seed)
+            players = [Player(id=i, username=f"P{i}") for i in range(1, 5)]
+            for player in players:
+                game.add_player(player)
+            game_round = Round(1, players[0], game, seed=dealing.derive_seed(seed, 1))
+            hands = game_round.deal_cards()
+            return [[card.code for card in hands[player]] for player in players]
+
+        self.assertEqual(first_round_hands(9), first_round_hands(9))
+        self.assertNotEqual(first_round_hands(9), first_round_hands(10))
+
+    def test_deck_shuffle_with_rng(self):
+        """Test miješanja špila vlastitim generatorom."""
+        import random
+        first = Deck().shuffle(random.Random(4)).cards
+        second = Deck().shuffle(random.Random(4)).cards
+        self.assertEqual([card.code for card in first], [card.code for card in second])
+
+
+class GameActorTest(TestCase):
+    """Testovi za stanje igre u memoriji procesa."""
+
+    def make_actor(self, moves=(), on_move=None):
+        deal = dealing.Deal(2024, player_ids=[11, 12, 13, 14])
+        return GameActor(
+            game_id=1, round_id=7, seats=deal.player_ids, teams=['a', 'b', 'a', 'b'],
+            hands=[deal.hand_mask(seat) for seat in range(4)], trump_suit='hearts',
+            dealer_seat=3, moves=moves, on_move=on_move
+        )
+
+    def play_round(self, actor):
+        results = []
+        while not actor.is_completed:
+            seat = actor.current_seat
+            card = card_mask.codes_from_mask(
+                legal_moves.legal_mask_for_state(actor.hands[seat], actor.tracker.state(), actor.trump_suit)
+            )
+            player_id = actor.seats[seat]
+            results.append(actor.play_card(player_id, card[0]))
+        return results
+
+    def test_rejects_invalid_moves(self):
+        """Test odbijanja poteza izvan reda, tuđe karte i nepoznatog igrača."""
+        actor = self.make_actor()
+        self.assertTrue(actor.is_turn(11))
+        self.assertTrue(actor.is_turn('11'))
+        self.assertFalse(actor.play_card(12, actor.hand(12)[0])['valid'])
+        self.assertFalse(actor.play_card(99, 'AS')['valid'])
+        self.assertFalse(actor.play_card(11, actor.hand(12)[0])['valid'])
+        self.assertFalse(actor.play_card(11, 'XX')['valid'])
+        self.assertEqual(actor.version, 0)
+
+    def test_full_round(self):
+        """Test odigravanja cijele runde i unosa za spremanje poteza."""
+        entries = []
+        actor = self.make_actor(on_move=entries.append)
+        results = self.play_round(actor)
+
+        self.assertTrue(all(result['valid'] for result in results))
+        self.assertEqual(len(entries), 32)
+        self.assertEqual([entry['order'] for entry in entries], list(range(32)))
+        self.assertEqual(sum(1 for entry in entries if entry['winning_order'] is not None), 8)
+        self.assertEqual(actor.score.trick_points['a'] + actor.score.trick_points['b'], 162)
+        self.assertTrue(results[-1]['round_completed'])
+        self.assertEqual(actor.hands, [0, 0, 0, 0])
+        self.assertFalse(actor.play_card(actor.seats[actor.current_seat], 'AS')['valid'])
+
+    def test_replay_moves(self):
+        """Test da obnova iz odigranih poteza daje isto stanje."""
+        entries = []
+        actor = self.make_actor(on_move=entries.append)
+        for _ in range(6):
+            seat = actor.current_seat
+            state = actor.tracker.state()
+            card = card_mask.codes_from_mask(
+                legal_moves.legal_mask_for_state(actor.hands[seat], state, actor.trump_suit)
+            )[0]
+            actor.play_card(actor.seats[seat], card)
+
+        replayed = self.make_actor(moves=[(entry['player_id'], entry['card']) for entry in entries])
+        self.assertEqual(replayed.hands, actor.hands)
+        self.assertEqual(replayed.current_seat, actor.current_seat)
+        self.assertEqual(replayed.tracker.to_dict(), actor.tracker.to_dict())
+        self.assertEqual(replayed.score.trick_points, actor.score.trick_points)
+
+    def test_round_completion_uses_service(self):
+        """Test da rundu odigranu u memoriji završava isti kod kao put preko baze."""
+        service = game_service.GameService(game_id=1)
+        current_round = SimpleNamespace(is_completed=False)
+        context = SimpleNamespace(game=SimpleNamespace(id=1), version=4, current_round=current_round)
+        outcome = {
+            'round_completed': True,
+            'round_result': {'team_a_points': 92, 'team_b_points': 70},
+            'game_completed': False,
+            'new_round': {'round_number': 2, 'player_cards': {'11': ['AS'], '12': ['KH']}},
+        }
+        played = {'valid': True, 'card': '7S', 'trick_completed': True, 'trick_winner': '11',
+                  'trick_points': 30, 'round_completed': True, 'game_completed': False, 'next_player': '11'}
+
+        with patch.object(game_service.game_actors, 'play_card', return_value=dict(played)), \
+                patch.object(service, 'get_context', return_value=context), \
+                patch.object(game_service, 'claim_version') as claim, \
+                patch.object(service, '_finish_round', return_value=outcome) as finish:
+            result = service.process_move(11, '7S')
+
+        claim.assert_called_once_with(context.game, 4)
+        finish.assert_called_once_with(context.game, current_round, 11)
+        ops = state_sync.move_ops(11, '7S', result)
+        self.assertIn(['round', {'team_a_points': 92, 'team_b_points': 70}], ops)
+        self.assertEqual(state_sync.ops_for_viewer(ops, 12)[-1], ['hand', '12', ['KH']])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_game_owned_by_other_process(self):
+        """Test da se igra koju drži drugi proces ne obrađuje ni u memoriji ni preko baze."""
+        from django.core.cache import cache
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        registry = GameActorRegistry(journal_dir=directory)
+        cache.set(game_actor.ACTOR_LEASE_KEY.format(game_id=5), 'drugi:1')
+
+        with self.assertRaises(GameOwnedElsewhere) as raised:
+            registry.play_card(5, 11, 'AS')
+        self.assertEqual(raised.exception.owner, 'drugi:1')
+        self.assertEqual(game_actor.owner_channel('drugi:1'), 'belot-actor.drugi-1')
+
+        service = game_service.GameService(game_id=5)
+        with patch.object(game_service.game_actors, 'play_card', side_effect=raised.exception), \
+                patch.object(service, '_run_optimistic') as run_optimistic:
+            result = service.process_move(11, 'AS')
+        run_optimistic.assert_not_called()
+        self.assertFalse(result['valid'])
+        self.assertTrue(result['retry'])
+        self.assertEqual(result['owner'], 'drugi:1')
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_new_lease_reloads_actor(self):
+        """Test da se nakon isteka zakupa stanje igre ponovno učitava iz baze."""
+        from django.core.cache import cache
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        registry = GameActorRegistry(journal_dir=directory)
+        self.addCleanup(registry.journal.close)
+
+        with patch.object(GameActor, 'load', side_effect=lambda game_id, on_move=None: self.make_actor()) as load:
+            first = registry.get(5)
+            self.assertIs(registry.get(5), first)
+            cache.delete(game_actor.ACTOR_LEASE_KEY.format(game_id=5))
+            second = registry.get(5)
+
+        self.assertEqual(load.call_count, 2)
+        self.assertIsNot(second, first)
+        self.assertIs(registry.peek(5), second)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_round_waits_for_saved_moves(self):
+        """Test da se runda ne završava i zakup ne otpušta dok potezi nisu spremljeni."""
+        from django.core.cache import cache
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        registry = GameActorRegistry(journal_dir=directory)
+        self.addCleanup(registry.journal.close)
+        lease_key = game_actor.ACTOR_LEASE_KEY.format(game_id=1)
+        fail = [True]
+
+        def save(entries):
+            if fail[0]:
+                raise RuntimeError("baza nedostupna")
+            return len(entries)
+
+        registry.journal._save = save
+        actor = self.make_actor()
+        with patch.object(GameActor, 'load', return_value=actor), \
+                patch.object(registry.journal, '_ensure_thread'):
+            with self.assertLogs('game.services', 'ERROR'):
+                while not actor.is_completed:
+                    seat = actor.current_seat
+                    card = card_mask.codes_from_mask(
+                        legal_moves.legal_mask_for_state(actor.hands[seat], actor.tracker.state(), actor.trump_suit)
+                    )[0]
+                    result = registry.play_card(1, actor.seats[seat], card)
+                self.assertFalse(registry.play_card(1, actor.seats[0], 'AS')['valid'])
+
+            self.assertTrue(result['valid'])
+            self.assertFalse(result['round_completed'])
+            self.assertIs(registry.peek(1), actor)
+            self.assertEqual(cache.get(lease_key), registry.worker_id)
+
+            fail[0] = False
+            result = registry.play_card(1, actor.seats[0], 'AS')
+
+        self.assertTrue(result['round_completed'])
+        self.assertEqual(state_sync.move_ops(11, 'AS', result), [['round', {}]])
+        self.assertIsNone(registry.peek(1))
+        self.assertIsNone(cache.get(lease_key))
+
+    def test_abandoned_game_is_evicted(self):
+        """Test da napuštanje igre izbacuje stanje iz memorije, a ne napušta igru s nespremljenim potezima."""
+        from game.repositories.game_repository import GameRepository
+
+        game = SimpleNamespace(id=3, abandon_game=Mock(return_value=True))
+        with patch.object(game_actor.game_actors, 'evict') as evict:
+            self.assertTrue(GameRepository.abandon_game(game))
+        evict.assert_called_once_with(3)
+
+        game.abandon_game.reset_mock()
+        with patch.object(game_actor.game_actors, 'evict', side_effect=game_actor.MovesNotSaved(3, 2)):
+            self.assertFalse(GameRepository.abandon_game(game))
+        game.abandon_game.assert_not_called()
+
+
+class MoveJournalTest(TestCase):
+    """Testovi za dnevnik poteza s odgođenim spremanjem."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def test_flush_retries_failed_batch(self):
+        """Test da potezi ostaju na čekanju dok spremanje ne uspije."""
+        batches = []
+        fail = [True]
+
+        def save(entries):
+            if fail[0]:
+                fail[0] = False
+                raise RuntimeError("baza nedostupna")
+            batches.append(list(entries))
+            return len(entries)
+
+        journal = MoveJournal(self.directory, flush_interval=60, save=save)
+        self.addCleanup(journal.close)
+        with patch.object(journal, '_ensure_thread'):
+            for order in range(3):
+                journal.append({'round_id': 1, 'order': order})
+
+        with self.assertLogs('game.services', 'ERROR'):
+            self.assertEqual(journal.flush(), 0)
+        self.assertEqual(journal.pending_count(), 3)
+        self.assertEqual(journal.flush(), 3)
+        self.assertEqual([entry['order'] for entry in batches[0]], [0, 1, 2])
+        self.assertEqual(os.path.getsize(journal.path), 0)
+
+    def test_recover_unflushed_entries(self):
+        """Test da novi proces ponovno sprema poteze iz dnevnika palog procesa."""
+        crashed = MoveJournal(self.directory, save=lambda entries: 0, name='moves-a.wal')
+        with patch.object(crashed, '_ensure_thread'):
+            crashed.append({'round_id': 1, 'order': 0})
+            crashed.append({'round_id': 1, 'order': 1})
+        with open(crashed.path, 'a') as handle:
+            handle.write('{"round_id": 1, "ord')
+        crashed._file.close()
+
+        recovered = []
+        journal = MoveJournal(self.directory, save=recovered.extend, name='moves-b.wal')
+        self.addCleanup(journal.close)
+        with self.assertLogs('game.services', 'WARNING'):
+            self.assertEqual(journal.open(), 2)
+        self.assertEqual([entry['order'] for entry in recovered], [0, 1])
+        self.assertFalse(os.path.exists(crashed.path))
+
+    def test_recover_own_file_after_restart(self):
+        """Test da proces s istim imenom dnevnika (isti računalo i PID) obnavlja svoje poteze."""
+        crashed = MoveJournal(self.directory, save=lambda entries: 0, name='moves-a.wal')
+        with patch.object(crashed, '_ensure_thread'):
+            crashed.append({'round_id': 1, 'order': 0})
+        crashed._file.close()
+
+        recovered = []
+        restarted = MoveJournal(self.directory, save=recovered.extend, name='moves-a.wal')
+        self.addCleanup(restarted.close)
+        self.assertEqual(restarted.open(), 1)
+        self.assertEqual([entry['order'] for entry in recovered], [0])
+        with patch.object(restarted, '_ensure_thread'):
+            restarted.append({'round_id': 1, 'order': 1})
+        with open(restarted.path) as handle:
+            self.assertEqual([json.loads(line)['order'] for line in handle], [1])
+
+    def test_live_journal_is_not_recovered(self):
+        """Test da se dnevnik procesa koji radi ne preuzima."""
+        live = MoveJournal(self.directory, save=lambda entries: 0, name='moves-a.wal')
+        live.open()
+        self.addCleanup(live._file.close)
+        with patch.object(live, '_ensure_thread'):
+            live.append({'round_id': 1, 'order': 0})
+
+        recovered = []
+        journal = MoveJournal(self.directory, save=recovered.extend, name='moves-b.wal')
+        self.addCleanup(journal.close)
+        self.assertEqual(journal.open(), 0)
+        self.assertEqual(recovered, [])
+
+
+class GameContextTest(TestCase):
+    """Testovi za kontekst igre učitan jednom po akciji."""
+
+    class Related:
+        def __init__(self, items):
+            self.items = list(items)
+
+        def all(self):
+            return self.items
+
+    def make_context(self, moves=()):
+        players = [SimpleNamespace(id=player_id, username=f"igrac{player_id}") for player_id in (4, 1, 3, 2)]
+        deal = dealing.Deal(99, player_ids=[1, 2, 3, 4])
+        current_round = RoundModel(round_data={'deal': deal.to_dict(), 'hands': deal.hand_masks()})
+        game = SimpleNamespace(
+            id=5,
+            players=self.Related(players),
+            active_players=self.Related(players[:3]),
+            team_a_players=self.Related([players[1], players[2]]),
+            team_b_players=self.Related([players[0], players[3]]),
+            latest_rounds=[current_round],
+            get_seat_map=lambda: seating.SeatMap([1, 2, 3, 4]),
+            game_data={'version': 6},
+        )
+        context = GameContext(game, user_id='2')
+        context._moves = list(moves)
+        return context, deal
+
+    def test_players_and_teams(self):
+        """Test pozicija, članstva, aktivnosti i timova bez upita."""
+        context, _ = self.make_context()
+        self.assertEqual([player.id for player in context.players], [1, 2, 3, 4])
+        self.assertEqual(context.user.id, 2)
+        self.assertTrue(context.is_user(2))
+        self.assertEqual(context.next_player(4).id, 1)
+        self.assertEqual(context.seat_of('3'), 2)
+        self.assertTrue(context.is_member(4))
+        self.assertFalse(context.is_member(9))
+        self.assertFalse(context.is_active(2))
+        self.assertEqual(context.team_of(3), 'a')
+        self.assertEqual(context.team_ids('b'), {2, 4})
+        self.assertEqual(context.version, 6)
+
+    def test_hand_and_current_trick(self):
+        """Test ruke i trenutnog štiha iz poteza runde."""
+        context, deal = self.make_context()
+        first, second = deal.hand_for(1)[0], deal.hand_for(2)[0]
+        context._moves = [(1, first, 0), (2, second, 1)]
+        context.current_round.remove_card_from_hand(first, save=False)
+        context.current_round.remove_card_from_hand(second, save=False)
+
+        self.assertNotIn(first, context.hand(1))
+        self.assertEqual(len(context.hand(1)), 7)
+        self.assertEqual(len(context.hand(3)), 8)
+        self.assertEqual(context.hand(9), [])
+        self.assertEqual(context.current_trick(), [
+            {'player': '1', 'card': first},
+            {'player': '2', 'card': second},
+        ])
+
+
+class RoundHandsTest(TestCase):
+    """Testovi za ruke igrača spremljene uz rundu."""
+
+    def test_hands_written_at_deal(self):
+        """Test da se maske ruku spremaju zajedno s dijeljenjem."""
+        round_obj = RoundModel(round_data={})
+        players = [SimpleNamespace(id=player_id) for player_id in (1, 2, 3, 4)]
+        deal = round_obj.get_deal(players)
+
+        self.assertEqual(round_obj.round_data['hands'], deal.hand_masks())
+        self.assertEqual(round_obj.get_hand(2), sorted(deal.hand_for(2), key=lambda c: (c[-1], c[:-1])))
+        self.assertEqual(round_obj.get_hand(9), [])
+
+    def test_remove_card_from_hand(self):
+        """Test uklanjanja odigrane karte iz ruke bez traženja igrača."""
+        deal = dealing.Deal(7, player_ids=[1, 2, 3, 4])
+        round_obj = RoundModel(round_data={'deal': deal.to_dict()})
+        self.assertEqual(round_obj.get_hand_masks(), deal.hand_masks())
+
+        card = deal.hand_for(3)[0]
+        round_obj.remove_card_from_hand(card, save=False)
+        self.assertNotIn(card, round_obj.get_hand(3))
+        self.assertEqual(len(round_obj.get_hand(3)), 7)
+        self.assertEqual(len(round_obj.get_hand(1)), 8)
+        self.assertEqual(sum(card_mask.count_cards(mask) for mask in round_obj.get_hand_masks()), 31)
+
+
+class ConcurrencyTest(TestCase):
+    """Testovi za optimističko zaključavanje igre."""
+
+    def setUp(self):
+        self.stats = concurrency.conflict_stats
+        self.stats.reset()
+
+    def test_retry_after_conflict(self):
+        """Test ponavljanja akcije nakon sukoba i brojača sukoba."""
+        attempts = []
+        conflicts = []
+
+        def operation():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise concurrency.VersionConflict("izmijenjeno")
+            return 'ok'
+
+        with patch.object(concurrency, 'RETRY_BACKOFF', 0):
+            result = concurrency.run_with_retry(operation, 'potez', on_conflict=lambda: conflicts.append(1))
+
+        self.assertEqual(result, 'ok')
+        self.assertEqual(len(conflicts), 2)
+        self.assertEqual(self.stats.snapshot()['potez']['attempts'], 3)
+        self.assertAlmostEqual(self.stats.conflict_rate('potez'), 2 / 3)
+
+    def test_retries_exhausted(self):
+        """Test odustajanja nakon svih ponavljanja."""
+        def operation():
+            raise concurrency.VersionConflict("izmijenjeno")
+
+        with patch.object(concurrency, 'RETRY_BACKOFF', 0):
+            with self.assertRaises(concurrency.VersionConflict):
+                concurrency.run_with_retry(operation, 'zvanje', retries=1)
+
+        self.assertEqual(self.stats.snapshot()['zvanje']['exhausted'], 1)
+        self.assertEqual(self.stats.conflict_rate('zvanje'), 1.0)
+        self.assertEqual(concurrency.game_version(SimpleNamespace(game_data={})), 0)
+
+
+class StateSyncTest(TestCase):
+    """Testovi za protokol snimke i promjena stanja igre."""
+
+    def test_move_ops(self):
+        """Test operacija za potez koji završava štih."""
+        ops = state_sync.move_ops(3, 'AS', {
+            'valid': True,
+            'trick_completed': True,
+            'trick_winner': '5',
+            'trick_points': 21,
+            'next_player': '5',
+        })
+        self.assertEqual(ops, [['card', '3', 'AS'], ['trick', '5', 21], ['turn', '5']])
+
+    def test_private_ops_filtered(self):
+        """Test da ruke igrača vidi samo vlasnik."""
+        ops = state_sync.trump_ops(1, 'H', {
+            'calling_team': 'a',
+            'round_number': 2,
+            'next_player': {'id': '2', 'username': 'igrac2'},
+            'player_cards': {'1': ['AS'], '2': ['KH']},
+        })
+        visible = state_sync.ops_for_viewer(ops, 2)
+        self.assertIn(['turn', '2'], visible)
+        self.assertIn(['hand', '2', ['KH']], visible)
+        self.assertNotIn(['hand', '1', ['AS']], visible)
+
+    def test_delta_frames_encoded_once(self):
+        """Test da se promjena serijalizira jednom, s privatnim operacijama samo za vlasnika."""
+        ops = [['trump', '1', 'H', 'a', 2], ['turn', '2'], ['hand', '1', ['AS']], ['hand', '2', ['KH']]]
+        event = state_sync.delta_event(7, ops)
+        self.assertEqual(event['ops'], ops[:2])
+        self.assertEqual(set(event['frames']), {state_sync.PUBLIC_FRAME, '1', '2'})
+
+        public = json.loads(state_sync.frame_for(event, 3))
+        self.assertEqual(public, {'type': 'delta', 'seq': 7, 'ops': ops[:2]})
+        own = json.loads(state_sync.frame_for(event, 2))
+        self.assertEqual(own['ops'], ops[:2] + [['hand', '2', ['KH']]])
+
+    def test_delta_stream_gaps(self):
+        """Test preskakanja starih promjena i traženja snimke nakon rupe."""
+        stream = state_sync.DeltaStream()
+        self.assertEqual(stream.accept(1), state_sync.DeltaStream.RESYNC)
+        stream.reset(4)
+        self.assertEqual(stream.accept(3), state_sync.DeltaStream.SKIP)
+        self.assertEqual(stream.accept(5), state_sync.DeltaStream.SEND)
+        self.assertEqual(stream.accept(7), state_sync.DeltaStream.RESYNC)
+        self.assertEqual(stream.last_seq, 5)
+
+    def test_turn_gate(self):
+        """Test praćenja igrača na redu iz snimke i promjena."""
+        gate = state_sync.TurnGate()
+        self.assertTrue(gate.allows(1))
+        gate.reset({'round': {'current_player': '2'}})
+        self.assertFalse(gate.allows(1))
+
+        gate.update(state_sync.pass_ops(2, {'next_player': {'id': 3}, 'must_call': False}))
+        self.assertTrue(gate.allows('3'))
+        self.assertFalse(gate.allows(2))
+        gate.update([['card', '3', 'AS'], ['turn', '4'], ['round', {}]])
+        self.assertIsNone(gate.player_id)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_sequence_increases(self):
+        """Test rastućeg rednog broja promjena igre."""
+        first = state_sync.next_sequence('test-igra')
+        self.assertEqual(state_sync.next_sequence('test-igra'), first + 1)
+        self.assertEqual(state_sync.current_sequence('test-igra'), first + 1)
+
+
+class WireProtocolTest(TestCase):
+    """Testovi za binarni (MessagePack) format poruka veze igre."""
+
+    def test_negotiate(self):
+        """Test odabira formata prema podprotokolima klijenta."""
+        self.assertEqual(wire_protocol.negotiate([]), (wire_protocol.JSON, None))
+        if wire_protocol.HAS_MSGPACK:
+            self.assertEqual(
+                wire_protocol.negotiate(['x', wire_protocol.MSGPACK_SUBPROTOCOL]),
+                (wire_protocol.MSGPACK, wire_protocol.MSGPACK_SUBPROTOCOL)
+            )
+
+    def test_compact_delta(self):
+        """Test kratkih ključeva, brojčanih operacija i karata kao indeksa."""
+        message = {'type': 'delta', 'seq': 4, 'ops': [['card', '3', '10S'], ['hand', '3', ['AH', '7S']], ['turn', '4']]}
+        compacted = wire_protocol.compact(message)
+        self.assertEqual(compacted['t'], 'delta')
+        self.assertEqual(compacted['o'][0], [0, '3', card_mask.card_index('10S')])
+        self.assertEqual(compacted['o'][1], [7, '3', [card_mask.card_index('AH'), card_mask.card_index('7S')]])
+        self.assertEqual(compacted['o'][2], [2, '4'])
+
+    @unittest.skipUnless(wire_protocol.HAS_MSGPACK, "msgpack nije instaliran")
+    def test_client_message_roundtrip(self):
+        """Test čitanja binarne poruke klijenta i binarne promjene."""
+        payload = wire_protocol.encode({'action': 'make_move', 'card': 'KD'}, wire_protocol.MSGPACK)
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(wire_protocol.decode(payload, wire_protocol.MSGPACK), {'action': 'make_move', 'card': 'KD'})
+        with self.assertRaises(ValueError):
+            wire_protocol.decode(b'\x01', wire_protocol.MSGPACK)
+
+        event = state_sync.delta_event(2, [['turn', '1']])
+        frame = state_sync.frame_for(event, 1, wire_protocol.MSGPACK)
+        self.assertLess(len(frame), len(state_sync.frame_for(event, 1)))
+
+
+class TimerWheelTest(TestCase):
+    """Testovi za zajednički raspored rokova veza."""
+
+    def setUp(self):
+        self.now = 100.0
+        self.wheel = TimerWheel(tick=1.0, clock=lambda: self.now)
+        self.fired = []
+
+    def callback(self, name):
+        async def fire():
+            self.fired.append(name)
+        return fire
+
+    def test_expire_and_reschedule(self):
+        """Test isteka rokova u pretincima i pomicanja roka bez novog zadatka."""
+        self.wheel.schedule('a', 5, self.callback('a'))
+        self.wheel.schedule('b', 2, self.callback('b'))
+        self.assertEqual(self.wheel.expire(101.5), [])
+
+        # Pomicanje roka: ključ ostaje u starom pretincu i premješta se pri obradi
+        self.now = 101.5
+        self.wheel.schedule('b', 3, self.callback('b'))
+        self.assertEqual(self.wheel.expire(103.0), [])
+        self.assertEqual(len(self.wheel.expire(105.0)), 2)
+        self.assertEqual(self.wheel.entries, {})
+
+    def test_cancel_and_batch_run(self):
+        """Test otkazivanja i zajedničkog poziva isteklih rokova."""
+        for name in ('a', 'b', 'c'):
+            self.wheel.schedule(name, 1, self.callback(name))
+        self.wheel.cancel('b')
+        self.assertEqual(async_to_sync(self.wheel.run_expired)(102.0), 2)
+        self.assertEqual(sorted(self.fired), ['a', 'c'])
+
+
+class ActorForwardingTest(unittest.TestCase):
+    """Testovi za obradu poteza proslijeđenih procesu vlasniku igre."""
+
+    def setUp(self):
+        from channels.layers import InMemoryChannelLayer
+        from game import consumers
+        self.consumers = consumers
+        self.layer = InMemoryChannelLayer()
+
+    def forward(self, result):
+        message = {
+            'game_id': 'g1', 'user_id': 11, 'action': 'make_move',
+            'content': {'card': 'AS'}, 'reply_channel': 'igrac.reply',
+        }
+        ops = [['card', '11', 'AS'], ['turn', '12']]
+        outcome = (7, ops, result) if result['valid'] else (None, None, result)
+
+        async def scenario():
+            await self.layer.group_add('game_g1', 'igrac.delta')
+            with patch.object(self.consumers, 'run_game_action', return_value=outcome) as run:
+                await self.consumers.handle_forwarded_action(self.layer, message)
+            run.assert_called_once_with('g1', 11, 'make_move', {'card': 'AS'})
+            channel = 'igrac.delta' if result['valid'] else 'igrac.reply'
+            return await self.layer.receive(channel)
+
+        return async_to_sync(scenario)()
+
+    def test_valid_move_is_published(self):
+        """Test da vlasnik šalje promjenu proslijeđenog poteza svim igračima."""
+        event = self.forward({'valid': True})
+        self.assertEqual(event['type'], 'game_delta')
+        self.assertEqual(event['seq'], 7)
+
+    def test_invalid_move_replies_to_player(self):
+        """Test da greška proslijeđenog poteza ide samo vezi igrača."""
+        event = self.forward({'valid': False, 'message': 'Nije tvoj red za igranje'})
+        self.assertEqual(event, {'type': 'game_error', 'message': 'Nije tvoj red za igranje'})
+
+
+class SpectatorHubTest(unittest.TestCase):
+    """Testovi za prijenos igre gledateljima jednog procesa."""
+
+    class Watcher:
+        protocol = wire_protocol.JSON
+
+        def __init__(self):
+            self.frames = []
+            self.closed = False
+
+        async def send_encoded(self, payload, close=False):
+            self.frames.append(json.loads(payload))
+
+    def setUp(self):
+        from channels.layers import InMemoryChannelLayer
+        self.loads = []
+        self.layer = InMemoryChannelLayer()
+        self.hub = spectators.SpectatorHub(self.layer, load_state=self.load_state, max_backlog=2)
+
+    def load_state(self, game_id):
+        self.loads.append(game_id)
+        if game_id == 'privatna':
+            return 0, {'error': 'Privatnu igru nije moguće gledati'}
+        return 5, {'status': 'in_progress', 'your_cards': []}
+
+    def test_fan_out_without_extra_loads(self):
+        """Test da svi gledatelji procesa dijele jednu snimku i jednu poruku po promjeni."""
+        first, second = self.Watcher(), self.Watcher()
+
+        async def scenario():
+            self.assertTrue(await self.hub.join('g1', first))
+            feed = self.hub.feeds['g1']
+            event = state_sync.delta_event(6, [['card', '1', 'AS'], ['hand', '1', ['KH']], ['turn', '2']])
+            await self.hub.dispatch(feed, spectators.spectator_event(event))
+            self.assertTrue(await self.hub.join('g1', second))
+            await self.hub.leave('g1', first)
+            await self.hub.leave('g1', second)
+
+        async_to_sync(scenario)()
+        self.assertEqual(self.loads, ['g1'])
+        self.assertEqual([frame['type'] for frame in second.frames], ['game_state', 'delta'])
+        self.assertTrue(second.frames[0]['spectator'])
+        self.assertEqual(second.frames[1]['ops'], [['card', '1', 'AS'], ['turn', '2']])
+        self.assertEqual(first.frames[1], second.frames[1])
+        self.assertEqual(self.hub.feeds, {})
+
+    def test_private_game_and_gap(self):
+        """Test odbijanja privatne igre i nove snimke nakon propuštene promjene."""
+        watcher = self.Watcher()
+
+        async def scenario():
+            self.assertFalse(await self.hub.join('privatna', self.Watcher()))
+            await self.hub.join('g2', watcher)
+            feed = self.hub.feeds['g2']
+            await self.hub.dispatch(feed, spectators.spectator_event(state_sync.delta_event(9, [['turn', '1']])))
+            await self.hub.leave('g2', watcher)
+
+        async_to_sync(scenario)()
+        self.assertEqual(self.loads, ['privatna', 'g2', 'g2'])
+        self.assertEqual([frame['type'] for frame in watcher.frames], ['game_state', 'game_state'])
+
+    def test_leave_during_join(self):
+        """Test da se gledatelj koji ode dok čeka snimku ne dodaje i ne zadržava igru."""
+        watcher, other = self.Watcher(), self.Watcher()
+        refresh = self.hub._refresh
+
+        async def scenario():
+            loading, release = asyncio.Event(), asyncio.Event()
+
+            async def slow_refresh(feed):
+                loading.set()
+                await release.wait()
+                return await refresh(feed)
+
+            with patch.object(self.hub, '_refresh', side_effect=slow_refresh):
+                join = asyncio.ensure_future(self.hub.join('g3', watcher))
+                await loading.wait()
+                watcher.closed = True
+                leave = asyncio.ensure_future(self.hub.leave('g3', watcher))
+                await asyncio.sleep(0)
+                release.set()
+                self.assertFalse(await join)
+                await leave
+            self.assertEqual(self.hub.feeds, {})
+
+            self.assertTrue(await self.hub.join('g3', other))
+            await self.hub.leave('g3', other)
+
+        async_to_sync(scenario)()
+        self.assertEqual(watcher.frames, [])
+        self.assertEqual([frame['type'] for frame in other.frames], ['game_state'])
+        self.assertEqual(self.hub.feeds, {})
+
+    def test_join_after_last_leave(self):
+        """Test da gledatelj koji čeka dok zadnji gledatelj odlazi dobiva novi prijenos."""
+        first, second = self.Watcher(), self.Watcher()
+
+        async def scenario():
+            self.assertTrue(await self.hub.join('g4', first))
+            feed = self.hub.feeds['g4']
+            await feed.lock.acquire()
+            leave = asyncio.ensure_future(self.hub.leave('g4', first))
+            await asyncio.sleep(0)
+            join = asyncio.ensure_future(self.hub.join('g4', second))
+            await asyncio.sleep(0)
+            feed.lock.release()
+            await leave
+            self.assertTrue(await join)
+            self.assertIsNot(self.hub.feeds['g4'], feed)
+            await self.hub.leave('g4', second)
+
+        async_to_sync(scenario)()
+        self.assertEqual(self.loads, ['g4', 'g4'])
+        self.assertEqual([frame['type'] for frame in second.frames], ['game_state'])
+        self.assertEqual(self.hub.feeds, {})
+
+
+class StateProjectionTest(TestCase):
+    """Testovi za javno stanje igre i podatke pojedinog igrača."""
+
+    def test_project_state_overlays_viewer(self):
+        """Test da projekcija dodaje podatke igrača bez izmjene javnog stanja."""
+        public_state = {
+            'players': [{'id': '1', 'username': 'igrac1'}, {'id': '2', 'username': 'igrac2'}],
+            'teams': {'1': 'a', '2': 'b'},
+            'round': {'current_player': '2', 'status': 'bidding', 'trump_suit': None},
+            'current_trick': [],
+        }
+        context = SimpleNamespace(
+            is_user=lambda user_id: str(user_id) == '2',
+            hand=lambda user_id: ['AS', 'KH'],
+            current_round=None,
+        )
+        service = game_service.GameService(game_id=1, context=context)
+
+        state = service._project_state(public_state, context, 2)
+        self.assertTrue(state['your_turn'])
+        self.assertEqual(state['your_team'], 'b')
+        self.assertEqual(state['your_cards'], ['AS', 'KH'])
+        self.assertEqual([player['is_you'] for player in state['players']], [False, True])
+        self.assertNotIn('is_you', public_state['players'][0])
+        self.assertNotIn('your_cards', public_state)
+
+    def test_live_actor_state_overlays_snapshot(self):
+        """Test da vlasnik igre gradi stanje s igračem na potezu, štihom i rukom iz memorije."""
+        deal = dealing.Deal(2024, player_ids=[11, 12, 13, 14])
+        actor = GameActor(
+            game_id=1, round_id=7, seats=deal.player_ids, teams=['a', 'b', 'a', 'b'],
+            hands=[deal.hand_mask(seat) for seat in range(4)], trump_suit='hearts', dealer_seat=3
+        )
+        card = actor.hand(11)[0]
+        actor.play_card(11, card)
+
+        public_state = {
+            'players': [{'id': '11', 'username': 'igrac11'}, {'id': '12', 'username': 'igrac12'}],
+            'teams': {'11': 'a', '12': 'b'},
+            'round': {'current_player': '11', 'status': 'in_progress', 'trump_suit': 'hearts'},
+            'current_trick': [],
+        }
+        context = SimpleNamespace(
+            game=SimpleNamespace(id=1),
+            current_round=SimpleNamespace(id=7),
+            is_user=lambda user_id: str(user_id) == '12',
+            hand=lambda user_id: [],
+        )
+        service = game_service.GameService(game_id=1, context=context)
+
+        with patch.object(game_service.game_actors, 'peek', return_value=actor):
+            live_state = service._overlay_actor_state(public_state, service._live_actor(context))
+            state = service._project_state(live_state, context, 12)
+
+        self.assertEqual(live_state['round']['current_player'], '12')
+        self.assertEqual(live_state['current_trick'], [{'player': '11', 'card': card}])
+        self.assertEqual(public_state['round']['current_player'], '11')
+        self.assertTrue(state['your_turn'])
+        self.assertEqual(state['your_cards'], actor.hand(12))
+        gate = state_sync.TurnGate()
+        gate.reset(state)
+        self.assertFalse(gate.allows(11))
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_cache_key_follows_version(self):
+        """Test da verzija igre i poništavanje keša mijenjaju ključ projekcije."""
+        game = SimpleNamespace(id='projekcija', game_data={'version': 3})
+        first = game_service.game_state_cache_key(game)
+        self.assertEqual(game_service.game_state_cache_key(game), first)
+
+        game_service.invalidate_game_cache(game.id)
+        second = game_service.game_state_cache_key(game)
+        self.assertNotEqual(second, first)
+
+        game.game_data['version'] = 4
+        self.assertNotEqual(game_service.game_state_cache_key(game), second)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_declaration_changes_cache_key(self):
+        """Test da zvanje preko baze povećava verziju igre i tako mijenja ključ projekcije."""
+        from game.services.card_service import CardService
+
+        game = SimpleNamespace(id='zvanje', status='in_progress', game_data={'version': 3})
+        context = SimpleNamespace(
+            game=game, version=3, user=SimpleNamespace(id=1, username='igrac1'),
+            current_round=SimpleNamespace(id=7),
+            is_member=lambda user_id: True, is_active=lambda user_id: True,
+            hand=lambda user_id: ['JS', 'JH', 'JD', 'JC'],
+        )
+        service = game_service.GameService(game_id=game.id, context=context)
+        before = game_service.game_state_cache_key(game)
+
+        def claim(claimed_game, expected_version):
+            claimed_game.game_data = {'version': expected_version + 1}
+            return expected_version + 1
+
+        with patch.object(game_service, 'claim_version', side_effect=claim) as claim_version, \
+                patch.object(CardService, 'validate_declaration', return_value=(True, None)), \
+                patch.object(game_service.Declaration.objects, 'create', return_value=SimpleNamespace(id=9)), \
+                patch.object(service, '_update_game_history'):
+            result = service.process_declaration(1, 'four_jacks', ['JS', 'JH', 'JD', 'JC'])
+
+        self.assertTrue(result['valid'])
+        claim_version.assert_called_once_with(game, 3)
+        self.assertNotEqual(game_service.game_state_cache_key(game), before)
+
+
+class RoundScoreTest(TestCase):
+    """Testovi za bodove runde zbrojene štih po štih."""
+
+    def test_last_trick_bonus_and_totals(self):
+        """Test bodova za zadnji štih i zbroja po timu."""
+        score = round_score.RoundScore()
+        for number in range(7):
+            self.assertEqual(score.add_trick(1 + number % 2, 'a' if number % 2 == 0 else 'b', 10), 10)
+        self.assertEqual(score.add_trick(2, 'b', 12), 12 + Scoring.LAST_TRICK_BONUS)
+
+        self.assertTrue(score.is_complete)
+        self.assertEqual(score.tricks_won, {'a': 4, 'b': 4})
+        self.assertEqual(score.trick_totals(), (40, 42 + Scoring.LAST_TRICK_BONUS))
+        self.assertEqual(score.last_winner(), 2)
+        with self.assertRaises(ValueError):
+            score.add_trick(1, 'a', 0)
+
+    def test_clean_sweep_and_roundtrip(self):
+        """Test štih-mača i obnove stanja iz round_data."""
+        score = round_score.RoundScore()
+        for _ in range(8):
+            score.add_trick(3, 'a', 19)
+        team_a, team_b = score.trick_totals()
+        self.assertEqual(team_a, 8 * 19 + Scoring.LAST_TRICK_BONUS + Scoring.CLEAN_SWEEP_BONUS)
+        self.assertEqual(team_b, 0)
+
+        restored = round_score.RoundScore.from_dict(score.to_dict())
+        self.assertEqual(restored.trick_points, score.trick_points)
+        self.assertEqual(restored.trick_totals(), (team_a, team_b))
+        self.assertEqual(round_score.RoundScore.from_dict(None).tricks_completed, 0)
+
+
+class BiddingTest(TestCase):
+    """Testovi za zvanje aduta kao automat stanja."""
+
+    def test_order_and_must_call(self):
+        """Test redoslijeda od igrača nakon djelitelja i obaveznog zvanja djelitelja."""
+        state = bidding.Bidding.for_deal([1, 2, 3, 4], dealer_id=2)
+        self.assertEqual(state.order, [3, 4, 1, 2])
+        self.assertTrue(state.is_turn('3'))
+
+        with self.assertRaises(ValueError):
+            state.pass_turn(4)
+        self.assertEqual(state.pass_turn(3), 4)
+        self.assertEqual(state.pass_turn(4), 1)
+        self.assertFalse(state.must_call)
+        self.assertEqual(state.pass_turn(1), 2)
+
+        self.assertTrue(state.must_call)
+        with self.assertRaises(ValueError):
+            state.pass_turn(2)
+        with self.assertRaises(ValueError):
+            state.call(2, 'X')
+        state.call(2, 'H')
+        self.assertTrue(state.is_finished)
+        self.assertIsNone(state.current_bidder)
+        self.assertEqual((state.caller, state.suit), (2, 'H'))
+
+    def test_written_at_deal_and_roundtrip(self):
+        """Test da se redoslijed zvanja sprema s dijeljenjem i obnavlja iz round_data."""
+        round_obj = RoundModel(round_data={}, dealer_id=4)
+        players = [SimpleNamespace(id=player_id) for player_id in (1, 2, 3, 4)]
+        round_obj.get_deal(players)
+        state = round_obj.get_bidding()
+        self.assertEqual(state.order, [1, 2, 3, 4])
+
+        state.pass_turn(1)
+        state.call(2, 'S')
+        restored = bidding.Bidding.from_dict(state.to_dict())
+        self.assertEqual(restored.passes, [1])
+        self.assertEqual(restored.contract, [2, 'S'])
+
+
+class SeatingTest(TestCase):
+    """Testovi za raspored igrača za stolom."""
+
+    def test_seat_arithmetic(self):
+        """Test sljedeće pozicije, partnera, protivnika i tima."""
+        self.assertEqual(seating.next_seat(3), 0)
+        self.assertEqual(seating.next_seat(1, 3), 0)
+        self.assertEqual(seating.partner_seat(1), 3)
+        self.assertEqual(seating.opponent_seats(0), (1, 3))
+        self.assertEqual([seating.seat_team(seat) for seat in range(4)], ['a', 'b', 'a', 'b'])
+
+    def test_seat_map_from_teams(self):
+        """Test da partneri sjede nasuprot i da rotacija ide redom pozicija."""
+        seats = seating.SeatMap.from_teams([3, 8], [5, 13])
+        self.assertEqual(seats.to_list(), [3, 5, 8, 13])
+        self.assertEqual(seats.next_player(13), 3)
+        self.assertEqual(seats.partner(5), 13)
+        self.assertEqual(seats.opponents(3), (5, 13))
+        self.assertEqual(seats.team(8), 'a')
+        self.assertEqual(seats.team_players('b'), (5, 13))
+        self.assertEqual(seats.first_to_act(8), 13)
+        self.assertIsNone(seats.next_player(99))
+        self.assertIsNone(seats.team(99))
+
+    def test_invalid_seat_map(self):
+        """Test odbijanja rasporeda s pogrešnim brojem igrača."""
+        with self.assertRaises(ValueError):
+            seating.SeatMap([1, 2, 3])
+        with self.assertRaises(ValueError):
+            seating.SeatMap([1, 2, 2, 3])
+        with self.assertRaises(ValueError):
+            seating.SeatMap.from_teams([1], [2, 3, 4])
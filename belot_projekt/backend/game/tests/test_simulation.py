@@ -0,0 +1,109 @@
+"""
+Testovi za simulacijski pogon Belot igre.
+
+Ovaj modul provjerava da brza simulacija poštuje pravila i bodovanje
+ostatka paketa game_logic te da su partije i serije partija ponovljive
+za isti seed.
+"""
+
+import unittest
+
+from game.game_logic import card_mask
+from game.game_logic import legal_moves
+from game.game_logic.batch_simulation import BatchStats, run_batch, shard_seeds
+from game.game_logic.simulation import SimulationEngine, Strategy, RandomStrategy
+
+
+class RecordingStrategy(RandomStrategy):
+    """Nasumična strategija koja provjerava dozvoljene karte pri svakom potezu."""
+
+    def play_card(self, state, seat, legal_bits, rng):
+        trick = [card_mask.CARD_CODES[index] for _, index in state.trick]
+        expected = legal_moves.legal_moves_mask(state.hands[seat], trick, state.trump)
+        assert legal_bits == expected, (trick, state.trump)
+        return super().play_card(state, seat, legal_bits, rng)
+
+
+class IllegalStrategy(RandomStrategy):
+    """Strategija koja uvijek igra kartu koja nije dozvoljena."""
+
+    def play_card(self, state, seat, legal_bits, rng):
+        return (~legal_bits & card_mask.FULL_MASK).bit_length() - 1
+
+
+class SimulationEngineTest(unittest.TestCase):
+    """Testovi za SimulationEngine."""
+
+    def test_round_points(self):
+        """Test da runda raspodjeljuje svih 162 boda iz štihova."""
+        engine = SimulationEngine(RecordingStrategy(), seed=7)
+        for dealer in range(4):
+            result = engine.play_round(dealer)
+            self.assertEqual(sum(result['trick_points']), 162)
+            self.assertEqual(sum(result['tricks_won']), 8)
+            self.assertIn(result['trump_suit'], card_mask.SUITS)
+
+            calling = 0 if result['calling_team'] == 'a' else 1
+            if not result['passed']:
+                self.assertEqual(result['points'][calling], 0)
+
+    def test_game_is_deterministic(self):
+        """Test ponovljivosti partije za isti seed."""
+        first = SimulationEngine(['greedy', 'random', 'greedy', 'random'], seed=42).play_game()
+        second = SimulationEngine(['greedy', 'random', 'greedy', 'random'], seed=42).play_game()
+        self.assertEqual(first, second)
+        self.assertIn(first['winner_team'], ('a', 'b'))
+        self.assertGreaterEqual(max(first['team_a_score'], first['team_b_score']), 1001)
+
+    def test_illegal_move_rejected(self):
+        """Test da simulacija odbija nedozvoljeni potez strategije."""
+        engine = SimulationEngine(IllegalStrategy(), seed=3)
+        with self.assertRaises(ValueError):
+            for dealer in range(4):
+                engine.play_round(dealer)
+
+    def test_invalid_strategies(self):
+        """Test provjere strategija."""
+        with self.assertRaises(ValueError):
+            SimulationEngine(['random', 'random'])
+        with self.assertRaises(ValueError):
+            SimulationEngine('nepoznata')
+        with self.assertRaises(NotImplementedError):
+            Strategy().play_card(None, 0, 1, None)
+
+
+class BatchSimulationTest(unittest.TestCase):
+    """Testovi za višeprocesno pokretanje serija simulacija."""
+
+    def test_batch_is_deterministic(self):
+        """Test da rezultat serije ne ovisi o broju procesa."""
+        single = run_batch(6, 'greedy', workers=1, seed=11, chunk_size=2)
+        pooled = run_batch(6, 'greedy', workers=2, seed=11, chunk_size=2)
+        self.assertEqual(single.to_dict(), pooled.to_dict())
+        self.assertEqual(single.games, 6)
+        self.assertEqual(sum(single.team_wins.values()) + single.unfinished_games, 6)
+        self.assertEqual(shard_seeds(11, 3), shard_seeds(11, 3))
+
+    def test_stats_merge_and_summary(self):
+        """Test spajanja brojača i izvedenih statistika."""
+        first = run_batch(3, ['greedy', 'random', 'greedy', 'random'], workers=1, seed=5)
+        second = run_batch(2, ['greedy', 'random', 'greedy', 'random'], workers=1, seed=6)
+
+        merged = BatchStats.from_dict(first.to_dict()).merge(second.to_dict())
+        self.assertEqual(merged.games, 5)
+        self.assertEqual(merged.rounds, first.rounds + second.rounds)
+        self.assertEqual(sum(merged.trick_points), 162 * merged.rounds)
+
+        summary = merged.summary()
+        self.assertAlmostEqual(
+            summary['strategy_win_rates']['greedy'] + summary['strategy_win_rates']['random'], 1.0
+        )
+        self.assertGreaterEqual(summary['contract_failure_rate'], 0.0)
+        self.assertLessEqual(summary['contract_failure_rate'], 1.0)
+
+    def test_invalid_parameters(self):
+        """Test provjere parametara serije."""
+        with self.assertRaises(ValueError):
+            run_batch(10, 'nepoznata', workers=1)
+        with self.assertRaises(ValueError):
+            run_batch(10, 'random', workers=1, chunk_size=0)
@@ -0,0 +1,354 @@
+"""
+Modul za jeftino mjerenje vremena izvršavanja vrućih metoda igre.
+
+Dekorator track_execution_time iz utils.decorators logira svaki poziv, što
+je za metode poput usporedbe karata ili dodavanja karte u ruku skuplje od
+samog posla. Ovdje se vrijeme mjeri samo za svaki N-ti poziv (uzorkovanje),
+trajanja se zbrajaju u histogram po funkciji u memoriji procesa, a sažetak
+se zapisuje u log jednom u zadanom intervalu.
+
+Mjerenje se može uključiti, isključiti ili promijeniti mu stopa uzorkovanja
+tijekom rada, bez ponovne objave: lokalno pozivom profiler.configure, a za
+sve procese pozivom profiler.publish_config koji postavke sprema u Django
+keš, odakle ih procesi povremeno čitaju.
+
+Primjer:
+    from game.utils.profiling import sampled_timer
+
+    class Rules:
+        @sampled_timer
+        def get_card_value_in_trick(self, card, lead_suit, trump_suit):
+            ...
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger('game.profiling')
+
+# Gornje granice razreda histograma u mikrosekundama (zadnji razred je otvoren)
+HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000, 100000)
+
+# Ključ u kešu pod kojim se dijele postavke mjerenja među procesima
+CONFIG_CACHE_KEY = 'belot:profiling:config'
+
+
+class TimerStats:
+    """
+    Zbirni podaci mjerenja jedne funkcije.
+
+    Attributes:
+        name (str): Kvalificirano ime funkcije (Klasa.metoda)
+        calls (int): Broj poziva od zadnjeg pražnjenja
+        samples (int): Broj izmjerenih poziva od zadnjeg pražnjenja
+        total (float): Zbroj izmjerenih trajanja u sekundama
+        min (float): Najkraće izmjereno trajanje
+        max (float): Najdulje izmjereno trajanje
+        buckets (list): Broj uzoraka po razredu histograma
+    """
+
+    __slots__ = ('name', 'calls', 'samples', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self, name):
+        """
+        Inicijalizira prazne podatke mjerenja.
+
+        Args:
+            name (str): Kvalificirano ime funkcije
+        """
+        self.name = name
+        self.calls = 0
+        self.reset()
+
+    def reset(self):
+        """Briše izmjerene uzorke (brojač poziva se ne briše jer određuje uzorkovanje)."""
+        self.samples = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def record(self, duration):
+        """
+        Dodaje jedno izmjereno trajanje.
+
+        Args:
+            duration (float): Trajanje poziva u sekundama
+        """
+        self.samples += 1
+        self.total += duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS, duration * 1e6)] += 1
+
+    def percentile(self, fraction):
+        """
+        Procjenjuje percentil trajanja iz histograma.
+
+        Args:
+            fraction (float): Udio između 0 i 1 (npr. 0.95)
+
+        Returns:
+            float: Gornja granica razreda u mikrosekundama ili None bez uzoraka
+        """
+        if not self.samples:
+            return None
+        target = fraction * self.samples
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                if index < len(HISTOGRAM_BOUNDS):
+                    return float(HISTOGRAM_BOUNDS[index])
+                return self.max * 1e6
+        return self.max * 1e6
+
+    def to_dict(self):
+        """
+        Vraća sažetak mjerenja.
+
+        Returns:
+            dict: Broj poziva i uzoraka, prosjek, minimum, maksimum i
+                  percentili u mikrosekundama te histogram
+        """
+        samples = self.samples or 1
+        return {
+            'calls': self.calls,
+            'samples': self.samples,
+            'avg_us': self.total / samples * 1e6,
+            'min_us': (self.min or 0.0) * 1e6,
+            'max_us': self.max * 1e6,
+            'p50_us': self.percentile(0.5),
+            'p95_us': self.percentile(0.95),
+            'p99_us': self.percentile(0.99),
+            'histogram': list(self.buckets),
+        }
+
+
+class HotPathProfiler:
+    """
+    Uzorkujući mjerač vremena za vruće metode igre.
+
+    Attributes:
+        enabled (bool): Je li mjerenje uključeno
+        sample_rate (int): Mjeri se svaki sample_rate-ti poziv funkcije
+        flush_interval (float): Interval zapisivanja sažetka u log (sekunde)
+        config_refresh_interval (float): Interval čitanja postavki iz keša (sekunde)
+    """
+
+    # Zadane postavke, mogu se nadjačati s BELOT_PROFILING u postavkama
+    DEFAULTS = {
+        'ENABLED': True,
+        'SAMPLE_RATE': 100,
+        'FLUSH_INTERVAL': 60,
+        'CONFIG_REFRESH_INTERVAL': 30,
+    }
+
+    def __init__(self, **options):
+        """
+        Inicijalizira mjerač s postavkama iz Django postavki.
+
+        Args:
+            **options: Postavke koje nadjačavaju zadane i Django postavke
+                (enabled, sample_rate, flush_interval, config_refresh_interval)
+        """
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_config_check = time.monotonic()
+        self._next_config_check = self._last_config_check
+
+        config = dict(self.DEFAULTS)
+        config.update(self._django_settings())
+        self.enabled = bool(config['ENABLED'])
+        self.sample_rate = max(1, int(config['SAMPLE_RATE']))
+        self.flush_interval = float(config['FLUSH_INTERVAL'])
+        self.config_refresh_interval = float(config['CONFIG_REFRESH_INTERVAL'])
+        self.configure(**options)
+
+    @staticmethod
+    def _django_settings():
+        """Vraća BELOT_PROFILING iz Django postavki ili prazan rječnik izvan Djanga."""
+        try:
+            from django.conf import settings
+            return dict(getattr(settings, 'BELOT_PROFILING', {}))
+        except Exception:
+            return {}
+
+    def configure(self, enabled=None, sample_rate=None, flush_interval=None,
+                  config_refresh_interval=None):
+        """
+        Mijenja postavke mjerenja u ovom procesu.
+
+        Args:
+            enabled (bool, optional): Uključuje ili isključuje mjerenje
+            sample_rate (int, optional): Mjeri se svaki N-ti poziv
+            flush_interval (float, optional): Interval zapisivanja sažetka
+            config_refresh_interval (float, optional): Interval čitanja postavki iz keša
+
+        Raises:
+            ValueError: Ako je stopa uzorkovanja manja od 1
+        """
+        if sample_rate is not None:
+            if int(sample_rate) < 1:
+                raise ValueError("Stopa uzorkovanja mora biti barem 1")
+            self.sample_rate = int(sample_rate)
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if flush_interval is not None:
+            self.flush_interval = float(flush_interval)
+        if config_refresh_interval is not None:
+            self.config_refresh_interval = float(config_refresh_interval)
+            self._next_config_check = self._last_config_check + self.config_refresh_interval
+
+    def publish_config(self, **options):
+        """
+        Primjenjuje postavke lokalno i sprema ih u keš za ostale procese.
+
+        Args:
+            **options: Postavke kao kod configure
+
+        Returns:
+            bool: True ako su postavke spremljene u keš
+        """
+        self.configure(**options)
+        try:
+            from django.core.cache import cache
+            cache.set(CONFIG_CACHE_KEY, {
+                'enabled': self.enabled,
+                'sample_rate': self.sample_rate,
+                'flush_interval': self.flush_interval,
+            }, None)
+            return True
+        except Exception as e:
+            logger.error(f"Greška pri spremanju postavki mjerenja u keš: {str(e)}", exc_info=True)
+            return False
+
+    def refresh_config(self, force=False):
+        """
+        Čita zajedničke postavke iz keša, najviše jednom u intervalu.
+
+        Args:
+            force (bool): Čita postavke bez obzira na interval
+        """
+        now = time.monotonic()
+        if not force and now < self._next_config_check:
+            return
+        self._last_config_check = now
+        self._next_config_check = now + self.config_refresh_interval
+        try:
+            from django.core.cache import cache
+            config = cache.get(CONFIG_CACHE_KEY)
+        except Exception:
+            # Izvan Djanga ili bez keša ostaju lokalne postavke
+            return
+        if config:
+            self.configure(**config)
+
+    def stats_for(self, name):
+        """
+        Vraća (i po potrebi stvara) podatke mjerenja za funkciju.
+
+        Args:
+            name (str): Kvalificirano ime funkcije
+
+        Returns:
+            TimerStats: Podaci mjerenja
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = TimerStats(name)
+            return stats
+
+    def record(self, stats, duration):
+        """
+        Dodaje izmjereno trajanje i po isteku intervala zapisuje sažetak.
+
+        Args:
+            stats (TimerStats): Podaci mjerenja funkcije
+            duration (float): Trajanje poziva u sekundama
+        """
+        with self._lock:
+            stats.record(duration)
+            flush = time.monotonic() - self._last_flush >= self.flush_interval
+        if flush:
+            self.flush()
+
+    def snapshot(self):
+        """
+        Vraća sažetak mjerenja svih funkcija bez brisanja podataka.
+
+        Returns:
+            dict: Sažetak (TimerStats.to_dict) po imenu funkcije
+        """
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items() if stats.samples}
+
+    def flush(self):
+        """
+        Zapisuje sažetak u log (jedan redak po funkciji) i briše uzorke.
+
+        Returns:
+            dict: Zapisani sažetak po imenu funkcije
+        """
+        with self._lock:
+            summary = {}
+            for name, stats in self._stats.items():
+                if stats.samples:
+                    summary[name] = stats.to_dict()
+                    stats.reset()
+                stats.calls = 0
+            self._last_flush = time.monotonic()
+
+        for name, data in sorted(summary.items()):
+            logger.info(
+                f"PERF: {name} poziva={data['calls']} uzoraka={data['samples']} "
+                f"prosjek={data['avg_us']:.1f}us p50={data['p50_us']:.0f}us "
+                f"p95={data['p95_us']:.0f}us p99={data['p99_us']:.0f}us max={data['max_us']:.1f}us"
+            )
+        return summary
+
+    def timer(self, func):
+        """
+        Dekorator koji uzorkovano mjeri trajanje funkcije ili metode.
+
+        Kada je mjerenje isključeno ili poziv nije u uzorku, trošak je jedno
+        povećanje brojača, jedno čitanje monotonog sata i dvije usporedbe.
+        Postavke iz keša čitaju se po isteku config_refresh_interval, bez
+        obzira na to koliko se često funkcija poziva.
+
+        Args:
+            func: Funkcija ili metoda koja se dekorira
+
+        Returns:
+            Dekorirana funkcija ili metoda
+        """
+        stats = self.stats_for(func.__qualname__)
+        monotonic = time.monotonic
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats.calls += 1
+            if monotonic() >= self._next_config_check:
+                self.refresh_config()
+            if not self.enabled or stats.calls % self.sample_rate:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stats, time.perf_counter() - start)
+
+        return wrapper
+
+
+# Zajednički mjerač procesa i njegov dekorator
+profiler = HotPathProfiler()
+sampled_timer = profiler.timer
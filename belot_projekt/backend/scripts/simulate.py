@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Skripta za pokretanje serije simuliranih Belot partija.
+
+Partije se dijele na dijelove i izvršavaju paralelno na više procesa,
+a na kraju se ispisuju zbirne statistike (postotci pobjeda po strategiji,
+prosječni bodovi po rundi, učestalost zvanja, postotak palih aduta).
+
+Korištenje:
+    python scripts/simulate.py [opcije]
+
+Opcije:
+    --games N              Broj partija (zadano: 1000)
+    --strategies S [S ...] Jedna strategija za sva sjedala ili četiri po sjedalu (zadano: random)
+    --workers N            Broj procesa (zadano: broj jezgri)
+    --seed N               Osnovni seed serije (zadano: nasumično)
+    --points N             Broj bodova potreban za pobjedu (zadano: 1001)
+    --chunk-size N         Broj partija po dijelu (zadano: 500)
+    --json                 Ispisuje rezultat kao JSON
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# Dodaj projektni direktorij u Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from game.game_logic.batch_simulation import iter_batch, DEFAULT_CHUNK_SIZE
+from game.game_logic.simulation import STRATEGIES, SimulationEngine
+
+
+def print_summary(summary, elapsed):
+    """
+    Ispisuje zbirne statistike u čitljivom obliku.
+
+    Args:
+        summary (dict): Rezultat BatchStats.summary
+        elapsed (float): Trajanje serije u sekundama
+    """
+    print(f"Partija: {summary['games']}, rundi: {summary['rounds']} "
+          f"({summary['rounds'] / max(elapsed, 1e-9):.0f} rundi/s, {elapsed:.1f} s)")
+    print(f"Prosječno rundi po partiji: {summary['average_rounds_per_game']:.2f}")
+    print("Postotak pobjeda po timu:")
+    for team, rate in summary['team_win_rates'].items():
+        print(f"  {team}: {rate:.2%}")
+    print("Postotak pobjeda po strategiji:")
+    for name, rate in summary['strategy_win_rates'].items():
+        print(f"  {name}: {rate:.2%}")
+    print("Prosječni bodovi po rundi:")
+    for team, points in summary['average_round_points'].items():
+        print(f"  {team}: {points:.1f}")
+    print(f"Pali aduti: {summary['contract_failure_rate']:.2%}")
+    for name, rate in summary['strategy_contract_failure_rates'].items():
+        print(f"  {name}: {rate:.2%}")
+    print(f"Štiglja: {summary['sweep_rate']:.2%}, bela: {summary['bela_rate']:.2%}")
+    print("Učestalost zvanja po rundi:")
+    for declaration_type, rate in summary['declaration_frequencies'].items():
+        print(f"  {declaration_type}: {rate:.3%}")
+
+
+def main():
+    """Glavna funkcija za pokretanje serije simulacija."""
+    parser = argparse.ArgumentParser(description="Skripta za pokretanje serije simuliranih Belot partija.")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="Broj partija (zadano: 1000)")
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=["random"],
+                        help="Jedna strategija za sva sjedala ili četiri po sjedalu (zadano: random)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Broj procesa (zadano: broj jezgri)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Osnovni seed serije (zadano: nasumično)")
+    parser.add_argument("--points", type=int, default=SimulationEngine.POINTS_TO_WIN,
+                        help="Broj bodova potreban za pobjedu (zadano: 1001)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Broj partija po dijelu (zadano: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--json", action="store_true",
+                        help="Ispisuje rezultat kao JSON")
+
+    args = parser.parse_args()
+
+    strategies = args.strategies
+    if len(strategies) == 1:
+        strategies = strategies[0]
+    elif len(strategies) != 4:
+        parser.error("--strategies prima jednu ili četiri strategije")
+
+    start = time.time()
+    stats = None
+    for stats in iter_batch(args.games, strategies, args.workers, args.seed,
+                            args.points, args.chunk_size):
+        if not args.json:
+            print(f"\rOdigrano partija: {stats.games}/{args.games}", end="", file=sys.stderr, flush=True)
+    elapsed = time.time() - start
+    if not args.json:
+        print(file=sys.stderr)
+
+    if stats is None:
+        print("Nema partija za simulaciju", file=sys.stderr)
+        return 1
+
+    summary = stats.summary()
+    if args.json:
+        print(json.dumps({'summary': summary, 'counters': stats.to_dict(), 'elapsed': elapsed}, indent=2))
+    else:
+        print_summary(summary, elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,7 @@ from .models import (
     DailyStats, StatisticsSnapshot, Leaderboard
 )
 from game.models import Game, Round, Declaration, Move
+from game.game_logic import card_mask, legal_moves, vector_scoring
 
 User = get_user_model()
 logger = logging.getLogger('stats.tasks')
@@ -327,6 +328,108 @@ def update_leaderboards():
         }
 
 
+def _score_rounds_from_moves(round_ids):
+    """
+    Iznova boduje završene runde iz spremljenih poteza, sve odjednom.
+
+    Potezi, članovi timova i zvanja dohvaćaju se s po jednim upitom za sve
+    runde, pobjednik svakog štiha određuje se nad bitmask prikazom karata,
+    a bodovanje se izvršava jednim pozivom vector_scoring.score_rounds.
+    Runde koje nemaju svih 32 poteza ili imaju nepoznatog aduta se
+    preskaču, pa pozivatelj za njih koristi spremljene bodove.
+
+    Zvanja (osim bele) boduje samo tim s najjačim zvanjem, sva svoja;
+    kod jednako jakih zvanja prednost ima tim koji je zvao aduta.
+
+    Args:
+        round_ids (list): ID-evi rundi
+
+    Returns:
+        dict: Bodovi (tim A, tim B) po ID-u runde
+    """
+    cards_per_round = vector_scoring.TRICKS_PER_ROUND * vector_scoring.CARDS_PER_TRICK
+    round_rows = list(
+        Round.objects.filter(id__in=round_ids).values_list('id', 'game_id', 'trump_suit', 'calling_team')
+    )
+    if not round_rows:
+        return {}
+
+    team_a_members = set(
+        Game.team_a_players.through.objects.filter(
+            game_id__in={row[1] for row in round_rows}
+        ).values_list('game_id', 'user_id')
+    )
+
+    moves = {}
+    for round_id, player_id, card in Move.objects.filter(
+        round_id__in=round_ids, is_valid=True
+    ).order_by('round_id', 'order').values_list('round_id', 'player_id', 'card'):
+        moves.setdefault(round_id, []).append((player_id, card))
+
+    declarations = {}
+    for round_id, player_id, declaration_type, value in Declaration.objects.filter(
+        round_id__in=round_ids, is_confirmed=True
+    ).values_list('round_id', 'player_id', 'type', 'value'):
+        declarations.setdefault(round_id, []).append((player_id, declaration_type, value))
+
+    scored_ids, tricks, trumps, winners = [], [], [], []
+    calling_teams, declaration_points, bela_points = [], [], []
+    for round_id, game_id, trump_suit, calling_team in round_rows:
+        round_moves = moves.get(round_id, [])
+        if len(round_moves) != cards_per_round:
+            continue
+
+        def team_of(player_id):
+            return 0 if (game_id, player_id) in team_a_members else 1
+
+        try:
+            trump_row = vector_scoring.trump_row(trump_suit)
+            round_tricks, round_winners = [], []
+            for start in range(0, cards_per_round, vector_scoring.CARDS_PER_TRICK):
+                trick = round_moves[start:start + vector_scoring.CARDS_PER_TRICK]
+                codes = [card for _, card in trick]
+                _, winning = legal_moves.trick_state(codes, trump_suit)
+                indices = [card_mask.card_index(code) for code in codes]
+                round_tricks.append(indices)
+                round_winners.append(team_of(trick[indices.index(winning)][0]))
+        except ValueError:
+            logger.warning(f"Runda {round_id} ima nevažeću kartu ili aduta, koriste se spremljeni bodovi")
+            continue
+
+        calling_index = 0 if calling_team == 'a' else 1
+        round_declarations = [0, 0]
+        round_bela = [0, 0]
+        best_value, best_team = 0, None
+        for player_id, declaration_type, value in declarations.get(round_id, []):
+            team = team_of(player_id)
+            if declaration_type == 'bela':
+                round_bela[team] += value
+                continue
+            round_declarations[team] += value
+            if value > best_value or (value == best_value and team == calling_index):
+                best_value, best_team = value, team
+        if best_team is not None:
+            round_declarations[1 - best_team] = 0
+
+        scored_ids.append(round_id)
+        tricks.append(round_tricks)
+        trumps.append(trump_row)
+        winners.append(round_winners)
+        calling_teams.append(calling_index)
+        declaration_points.append(round_declarations)
+        bela_points.append(round_bela)
+
+    if not scored_ids:
+        return {}
+    result = vector_scoring.score_rounds(
+        tricks, trumps, winners,
+        calling_teams=calling_teams,
+        declaration_points=declaration_points,
+        bela_points=bela_points,
+    )
+    return {round_id: tuple(points) for round_id, points in zip(scored_ids, result['points'])}
+
+
 @shared_task(name='stats.tasks.recalculate_player_stats')
 def recalculate_player_stats(user_id):
     """
@@ -475,16 +578,29 @@ def recalculate_player_stats(user_id):
                     player_stats.straight_declarations += count
             
             # 5. Pobjede i porazi kao zvač
-            # Ovo zahtijeva malo složeniji upit jer moramo provjeriti tim korisnika
-            for round_obj in caller_rounds:
-                game = round_obj.game
-                
-                # Odredi tim korisnika
-                in_team_a = user.id in game.team_a_players
-                
+            # Spremljeni bodovi runde su konačni; iz poteza se u jednom skupnom
+            # izračunu boduju samo runde bez spremljenog rezultata, a pripadnost
+            # timu A dohvaća se jednim upitom umjesto po rundi
+            caller_round_rows = list(
+                caller_rounds.values_list('id', 'game_id', 'team_a_score', 'team_b_score')
+            )
+            rescored = _score_rounds_from_moves(
+                [row[0] for row in caller_round_rows if not (row[2] or row[3])]
+            )
+            team_a_games = set(
+                Game.team_a_players.through.objects.filter(
+                    game_id__in={row[1] for row in caller_round_rows},
+                    user_id=user.id
+                ).values_list('game_id', flat=True)
+            )
+
+            for round_id, game_id, team_a_score, team_b_score in caller_round_rows:
+                team_a_score, team_b_score = rescored.get(round_id, (team_a_score, team_b_score))
+                in_team_a = game_id in team_a_games
+
                 # Odredi pobjednika runde
-                round_winner = 'a' if round_obj.team_a_score > round_obj.team_b_score else 'b'
-                
+                round_winner = 'a' if team_a_score > team_b_score else 'b'
+
                 if (round_winner == 'a' and in_team_a) or (round_winner == 'b' and not in_team_a):
                     player_stats.rounds_won_as_caller += 1
                 else: